@@ -1,9 +1,18 @@
-from fastapi import HTTPException, Depends, Query
-from sqlalchemy.orm import Session
-from config.databaseConfig import get_database
-from all_module.AllService import AllService
+from fastapi import HTTPException, Depends, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from config.databaseConfig import get_database_async
+from all_module.AllServiceAsync import AllServiceAsync
+from all_module.allModel import registros_para_json
+from all_module.ingestao import normalizar_mensagem, ingerir_mensagens
+from http_module.respostas import RespostaJSONRapida
+from http_module.lote import ler_corpo_lote, ler_itens_lote, ErroLote
+from tarefas_module.TarefaController import TarefaController
 from typing import List, Optional
 
+# Limites do POST /data/lote (gateways enviam horas de mensagens acumuladas)
+MAX_MENSAGENS_LOTE = 100000
+MAX_ERROS_RESPOSTA = 100
+
 class AllController:
     """
     Controller para endpoints da tabela All (dados JSON)
@@ -13,26 +22,26 @@ class AllController:
     async def listar_todos(
         limite: int = Query(100, description="Número máximo de registros"),
         offset: int = Query(0, description="Número de registros para pular"),
-        db: Session = Depends(get_database)
+        db: AsyncSession = Depends(get_database_async)
     ) -> List[dict]:
         """
         Lista todos os registros JSON com paginação
         """
         try:
-            service = AllService(db)
-            registros = service.listar_com_limite(limite, offset)
-            return [registro.to_dict() for registro in registros]
+            service = AllServiceAsync(db)
+            linhas = await service.listar_com_limite_linhas(limite, offset)
+            return RespostaJSONRapida(registros_para_json(linhas))
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
     
     @staticmethod
-    async def obter_por_id(record_id: int, db: Session = Depends(get_database)) -> dict:
+    async def obter_por_id(record_id: int, db: AsyncSession = Depends(get_database_async)) -> dict:
         """
         Obtém um registro específico por ID
         """
         try:
-            service = AllService(db)
-            registro = service.buscar_por_id(record_id)
+            service = AllServiceAsync(db)
+            registro = await service.buscar_por_id(record_id)
             
             if registro is None:
                 raise HTTPException(status_code=404, detail="Registro não encontrado")
@@ -44,14 +53,14 @@ class AllController:
             raise HTTPException(status_code=500, detail=str(e))
     
     @staticmethod
-    async def listar_por_topico(topic: str, db: Session = Depends(get_database)) -> List[dict]:
+    async def listar_por_topico(topic: str, db: AsyncSession = Depends(get_database_async)) -> List[dict]:
         """
         Lista registros por tópico MQTT
         """
         try:
-            service = AllService(db)
-            registros = service.buscar_por_topico(topic)
-            return [registro.to_dict() for registro in registros]
+            service = AllServiceAsync(db)
+            linhas = await service.buscar_por_topico_linhas(topic)
+            return RespostaJSONRapida(registros_para_json(linhas))
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
     
@@ -59,7 +68,7 @@ class AllController:
     async def criar_registro(
         topic: str,
         payload: str,
-        db: Session = Depends(get_database)
+        db: AsyncSession = Depends(get_database_async)
     ) -> dict:
         """
         Cria um novo registro JSON manualmente
@@ -69,8 +78,8 @@ class AllController:
             if not topic or not payload:
                 raise HTTPException(status_code=400, detail="Tópico e payload são obrigatórios")
             
-            service = AllService(db)
-            novo_registro = service.criar(topic, payload)
+            service = AllServiceAsync(db)
+            novo_registro = await service.criar(topic, payload)
             
             return novo_registro.to_dict()
         except HTTPException:
@@ -79,13 +88,51 @@ class AllController:
             raise HTTPException(status_code=500, detail=str(e))
     
     @staticmethod
-    async def deletar_registro(record_id: int, db: Session = Depends(get_database)) -> dict:
+    async def ingerir_lote(request: Request) -> dict:
+        """
+        Ingere um lote de mensagens brutas ({topic, payload, received_at}),
+        em NDJSON ou array JSON, opcionalmente comprimido com gzip
+        """
+        try:
+            itens = ler_itens_lote(
+                await ler_corpo_lote(request),
+                request.headers.get("content-type", ""),
+                request.headers.get("content-encoding", ""),
+                max_itens=MAX_MENSAGENS_LOTE
+            )
+        except ErroLote as e:
+            raise HTTPException(status_code=e.status_code, detail=str(e))
+        
+        mensagens = []
+        erros = []
+        for indice, item in enumerate(itens):
+            try:
+                mensagens.append(normalizar_mensagem(item.get("topic"), item.get("payload"), item.get("received_at")))
+            except ValueError as e:
+                erros.append({"indice": indice, "erro": str(e)})
+        
+        try:
+            ids = await ingerir_mensagens(mensagens)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+        
+        return {
+            "recebidos": len(itens),
+            "aceitos": len(ids),
+            "duplicados": len(mensagens) - len(ids),
+            "rejeitados": len(erros),
+            "erros": erros[:MAX_ERROS_RESPOSTA],
+            "cursor": max(ids) if ids else None
+        }
+    
+    @staticmethod
+    async def deletar_registro(record_id: int, db: AsyncSession = Depends(get_database_async)) -> dict:
         """
         Deleta um registro
         """
         try:
-            service = AllService(db)
-            sucesso = service.deletar(record_id)
+            service = AllServiceAsync(db)
+            sucesso = await service.deletar(record_id)
             
             if not sucesso:
                 raise HTTPException(status_code=404, detail="Registro não encontrado")
@@ -97,7 +144,7 @@ class AllController:
             raise HTTPException(status_code=500, detail=str(e))
     
     @staticmethod
-    async def buscar_no_payload(search_term: str, db: Session = Depends(get_database)) -> List[dict]:
+    async def buscar_no_payload(search_term: str, db: AsyncSession = Depends(get_database_async)) -> List[dict]:
         """
         Busca registros que contenham um termo no payload
         """
@@ -105,34 +152,34 @@ class AllController:
             if not search_term:
                 raise HTTPException(status_code=400, detail="Termo de busca é obrigatório")
             
-            service = AllService(db)
-            registros = service.buscar_por_payload(search_term)
-            return [registro.to_dict() for registro in registros]
+            service = AllServiceAsync(db)
+            linhas = await service.buscar_por_payload_linhas(search_term)
+            return RespostaJSONRapida(registros_para_json(linhas))
         except HTTPException:
             raise
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
     
     @staticmethod
-    async def listar_topicos(db: Session = Depends(get_database)) -> List[str]:
+    async def listar_topicos(db: AsyncSession = Depends(get_database_async)) -> List[str]:
         """
         Lista todos os tópicos únicos
         """
         try:
-            service = AllService(db)
-            return service.listar_topicos_unicos()
+            service = AllServiceAsync(db)
+            return await service.listar_topicos_unicos()
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
     
     @staticmethod
-    async def estatisticas(db: Session = Depends(get_database)) -> dict:
+    async def estatisticas(db: AsyncSession = Depends(get_database_async)) -> dict:
         """
         Retorna estatísticas dos dados JSON
         """
         try:
-            service = AllService(db)
-            total = service.contar_total()
-            topicos = service.listar_topicos_unicos()
+            service = AllServiceAsync(db)
+            total = await service.contar_total()
+            topicos = await service.listar_topicos_unicos()
             
             return {
                 "total_registros": total,
@@ -143,23 +190,11 @@ class AllController:
             raise HTTPException(status_code=500, detail=str(e))
     
     @staticmethod
-    async def limpar_antigos(dias: int = 30, db: Session = Depends(get_database)) -> dict:
+    async def limpar_antigos(dias: int = 30):
         """
-        Remove registros mais antigos que X dias
+        Remove registros mais antigos que X dias em segundo plano (tarefa
+        limpeza_dados, em blocos). Responde 202 com a tarefa para acompanhar.
         """
-        try:
-            if dias < 1:
-                raise HTTPException(status_code=400, detail="Número de dias deve ser maior que 0")
-            
-            service = AllService(db)
-            removidos = service.limpar_registros_antigos(dias)
-            
-            return {
-                "message": f"Limpeza concluída",
-                "registros_removidos": removidos,
-                "dias": dias
-            }
-        except HTTPException:
-            raise
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        if dias < 1:
+            raise HTTPException(status_code=400, detail="Número de dias deve ser maior que 0")
+        return await TarefaController.enviar("limpeza_dados", {"dias": dias})
\ No newline at end of file
@@ -1,9 +1,30 @@
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
-from all_module.allModel import All
-from typing import List, Optional
+from all_module.allModel import All, COLUNAS_REGISTRO
+from config.databaseConfig import apos_commit
+from cache_module.versoes import incrementar_versoes
+from model.sensoresModel import formatar_timestamp
+from cache_module.cacheLeitura import registrar_cache
+from stream_module.barramento import barramento
+from typing import Callable, Iterator, List, Optional, Set
+from datetime import datetime
 import json
 
+# Cache de leitura da tabela all (contagem e tópicos únicos)
+cache_all = registrar_cache("all", max_itens=16, ttl=60.0)
+
+# Funções chamadas após o commit de novos registros: observador(tópicos)
+observadores_gravacao: List[Callable[[Set[str]], None]] = []
+
+def observar_gravacoes(funcao: Callable[[Set[str]], None]) -> Callable[[Set[str]], None]:
+    """
+    Registra um observador dos registros gravados (ex.: processamento contínuo)
+    """
+    if funcao not in observadores_gravacao:
+        observadores_gravacao.append(funcao)
+    return funcao
+
 class AllService:
     """
     Service para operações CRUD da tabela All (dados JSON)
@@ -12,15 +33,6 @@ class AllService:
     def __init__(self, db: Session):
         self.db = db
     
-    def listar_todos(self) -> List[All]:
-        """
-        Lista todos os registros
-        """
-        try:
-            return self.db.query(All).order_by(All.data_recebimento.desc()).all()
-        except SQLAlchemyError as e:
-            raise Exception(f"Erro ao listar registros: {str(e)}")
-    
     def buscar_por_id(self, record_id: int) -> Optional[All]:
         """
         Busca um registro por ID
@@ -30,15 +42,6 @@ class AllService:
         except SQLAlchemyError as e:
             raise Exception(f"Erro ao buscar registro: {str(e)}")
     
-    def buscar_por_topico(self, topic: str) -> List[All]:
-        """
-        Busca registros por tópico
-        """
-        try:
-            return self.db.query(All).filter(All.topic == topic).order_by(All.data_recebimento.desc()).all()
-        except SQLAlchemyError as e:
-            raise Exception(f"Erro ao buscar registros por tópico: {str(e)}")
-    
     def criar(self, topic: str, payload: str) -> All:
         """
         Cria um novo registro
@@ -48,6 +51,9 @@ class AllService:
             
             self.db.add(novo_registro)
             self.db.commit()
+            
+            apos_commit(self.db, lambda: self._atualizar_cache_apos_criar({topic}))
+            
             self.db.refresh(novo_registro)
             
             return novo_registro
@@ -55,6 +61,78 @@ class AllService:
             self.db.rollback()
             raise Exception(f"Erro ao criar registro: {str(e)}")
     
+    def criar_lote(self, mensagens: List[dict], deduplicar: bool = False) -> List[int]:
+        """
+        Insere mensagens já normalizadas ({topic, payload, data_recebimento})
+        com um único executemany e publica cada uma no barramento após o commit.
+        Com deduplicar=True, ignora mensagens repetidas no lote ou já gravadas
+        (mesmo tópico, payload e data de recebimento). Retorna os IDs criados.
+        """
+        try:
+            if deduplicar:
+                mensagens = self._remover_duplicadas(mensagens)
+            if not mensagens:
+                return []
+            
+            # executemany direto no driver (o insert ORM com RETURNING
+            # ordenado grava uma linha por vez no SQLite); com o lock de
+            # escrita da transação, os IDs são consecutivos até o último
+            conexao = self.db.connection()
+            conexao.exec_driver_sql(
+                'INSERT INTO "all" (topic, payload, data_recebimento) VALUES (?, ?, ?)',
+                [(m["topic"], m["payload"], formatar_timestamp(m["data_recebimento"])) for m in mensagens]
+            )
+            ultimo_id = conexao.exec_driver_sql("SELECT last_insert_rowid()").scalar()
+            incrementar_versoes(self.db, "all")
+            ids = list(range(ultimo_id - len(mensagens) + 1, ultimo_id + 1))
+            self.db.commit()
+            
+            topicos = {m["topic"] for m in mensagens}
+            
+            def apos_gravar():
+                self._atualizar_cache_apos_criar(topicos, len(ids))
+                for id_registro, mensagem in zip(ids, mensagens):
+                    publicar_mensagem(id_registro, mensagem["topic"], mensagem["payload"])
+            
+            apos_commit(self.db, apos_gravar)
+            return ids
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise Exception(f"Erro ao criar lote de registros: {str(e)}")
+    
+    def _remover_duplicadas(self, mensagens: List[dict]) -> List[dict]:
+        """
+        Remove mensagens repetidas no próprio lote e as que já estão no banco.
+        A busca usa o índice de data_recebimento, limitada ao intervalo do lote.
+        """
+        unicas = {}
+        for mensagem in mensagens:
+            unicas.setdefault((mensagem["topic"], mensagem["payload"], mensagem["data_recebimento"]), mensagem)
+        if not unicas:
+            return []
+        
+        datas = [chave[2] for chave in unicas]
+        existentes = self.db.execute(
+            select(All.topic, All.payload, All.data_recebimento).where(
+                All.data_recebimento.between(min(datas), max(datas)),
+                All.topic.in_({chave[0] for chave in unicas})
+            )
+        ).all()
+        for linha in existentes:
+            unicas.pop(tuple(linha), None)
+        return list(unicas.values())
+    
+    def _atualizar_cache_apos_criar(self, topicos, quantidade: int = 1):
+        """
+        Atualiza o cache sem descartá-lo a cada mensagem recebida
+        """
+        cache_all.ajustar("contar_total", lambda total: total + quantidade)
+        conhecidos = cache_all.espiar("topicos_unicos", None)
+        if conhecidos is not None and not set(topicos) <= set(conhecidos):
+            cache_all.invalidar("topicos_unicos")
+        for observador in observadores_gravacao:
+            observador(topicos)
+    
     def deletar(self, record_id: int) -> bool:
         """
         Deleta um registro
@@ -67,6 +145,7 @@ class AllService:
             
             self.db.delete(registro)
             self.db.commit()
+            apos_commit(self.db, cache_all.invalidar)
             
             return True
         except SQLAlchemyError as e:
@@ -78,16 +157,29 @@ class AllService:
         Conta total de registros
         """
         try:
-            return self.db.query(All).count()
+            return cache_all.obter_ou_calcular("contar_total", self.db.query(All).count)
         except SQLAlchemyError as e:
             raise Exception(f"Erro ao contar registros: {str(e)}")
     
-    def buscar_por_payload(self, search_term: str) -> List[All]:
+    def buscar_por_topico_linhas(self, topic: str) -> list:
+        """
+        Busca registros por tópico como linhas (id, topic, payload, payload_valido)
+        """
+        try:
+            return self.db.execute(
+                select(*COLUNAS_REGISTRO).where(All.topic == topic).order_by(All.id.desc())
+            ).all()
+        except SQLAlchemyError as e:
+            raise Exception(f"Erro ao buscar registros por tópico: {str(e)}")
+    
+    def buscar_por_payload_linhas(self, search_term: str) -> list:
         """
-        Busca registros que contenham um termo no payload
+        Busca por termo no payload como linhas (id, topic, payload, payload_valido)
         """
         try:
-            return self.db.query(All).filter(All.payload.contains(search_term)).order_by(All.data_recebimento.desc()).all()
+            return self.db.execute(
+                select(*COLUNAS_REGISTRO).where(All.payload.contains(search_term)).order_by(All.id.desc())
+            ).all()
         except SQLAlchemyError as e:
             raise Exception(f"Erro ao buscar registros por payload: {str(e)}")
     
@@ -96,34 +188,138 @@ class AllService:
         Lista todos os tópicos únicos
         """
         try:
-            result = self.db.query(All.topic).distinct().all()
-            return [row[0] for row in result]
+            return list(cache_all.obter_ou_calcular("topicos_unicos", self._carregar_topicos_unicos))
         except SQLAlchemyError as e:
             raise Exception(f"Erro ao listar tópicos únicos: {str(e)}")
     
-    def listar_com_limite(self, limite: int = 100, offset: int = 0) -> List[All]:
+    def _carregar_topicos_unicos(self) -> List[str]:
+        """
+        Consulta os tópicos únicos diretamente no banco
         """
-        Lista registros com paginação
+        result = self.db.query(All.topic).distinct().all()
+        return [row[0] for row in result]
+    
+    def listar_com_limite_linhas(self, limite: int = 100, offset: int = 0) -> list:
+        """
+        Lista registros com paginação como linhas (id, topic, payload, payload_valido),
+        sem materializar objetos ORM
         """
         try:
-            return self.db.query(All).order_by(All.data_recebimento.desc()).offset(offset).limit(limite).all()
+            return self.db.execute(
+                select(*COLUNAS_REGISTRO).order_by(All.id.desc()).offset(offset).limit(limite)
+            ).all()
         except SQLAlchemyError as e:
             raise Exception(f"Erro ao listar registros com limite: {str(e)}")
     
-    def limpar_registros_antigos(self, dias: int = 30) -> int:
+    def listar_apos_id(self, topic: str, ultimo_id: int, limite: int) -> list:
         """
-        Remove registros mais antigos que X dias
+        Lista até N registros de um tópico com ID maior que ultimo_id, em ordem
+        de ID, como linhas (id, payload, data_recebimento). Usado pelo
+        processamento incremental (checkpoint por tópico).
         """
         try:
-            from datetime import datetime, timedelta
-            data_limite = datetime.now() - timedelta(days=dias)
-            
-            registros_antigos = self.db.query(All).filter(All.data_recebimento < data_limite)
-            count = registros_antigos.count()
-            registros_antigos.delete()
-            
+            return self.db.execute(
+                select(All.id, All.payload, All.data_recebimento)
+                .where(All.topic == topic, All.id > ultimo_id)
+                .order_by(All.id)
+                .limit(limite)
+            ).all()
+        except SQLAlchemyError as e:
+            raise Exception(f"Erro ao listar registros novos: {str(e)}")
+    
+    def listar_intervalo(self, topic: str, inicio: int, fim: int) -> list:
+        """
+        Lista os registros de um tópico com inicio < ID <= fim, em ordem de
+        ID, como linhas (id, payload, data_recebimento). Usado pelo
+        processamento paralelo, que divide a faixa de IDs entre os processos.
+        """
+        try:
+            return self.db.execute(
+                select(All.id, All.payload, All.data_recebimento)
+                .where(All.topic == topic, All.id > inicio, All.id <= fim)
+                .order_by(All.id)
+            ).all()
+        except SQLAlchemyError as e:
+            raise Exception(f"Erro ao listar intervalo de registros: {str(e)}")
+    
+    def listar_por_ids(self, ids: List[int]) -> list:
+        """
+        Lista os registros com os IDs informados, em ordem de ID, como linhas
+        (id, payload, data_recebimento). Usado no reprocessamento dos
+        registros rejeitados; IDs já removidos são ignorados.
+        """
+        try:
+            return self.db.execute(
+                select(All.id, All.payload, All.data_recebimento)
+                .where(All.id.in_(ids))
+                .order_by(All.id)
+            ).all()
+        except SQLAlchemyError as e:
+            raise Exception(f"Erro ao listar registros por ID: {str(e)}")
+    
+    def maior_id(self, topic: str) -> int:
+        """
+        Retorna o maior ID de um tópico (0 se não houver registros)
+        """
+        try:
+            return self.db.scalar(select(func.max(All.id)).where(All.topic == topic)) or 0
+        except SQLAlchemyError as e:
+            raise Exception(f"Erro ao buscar maior ID: {str(e)}")
+    
+    def iterar_apos_id(self, topic: str, ultimo_id: int, tamanho_bloco: int) -> Iterator[list]:
+        """
+        Percorre os registros de um tópico com ID maior que ultimo_id, em
+        ordem de ID, entregando blocos de até tamanho_bloco linhas
+        (id, payload, data_recebimento). A consulta é uma só e as linhas são
+        lidas do cursor aos poucos (yield_per): a memória fica limitada a um
+        bloco, qualquer que seja o tamanho da tabela. Use uma sessão só para
+        a leitura: um commit na mesma sessão fecharia o cursor.
+        """
+        try:
+            resultado = self.db.execute(
+                select(All.id, All.payload, All.data_recebimento)
+                .where(All.topic == topic, All.id > ultimo_id)
+                .order_by(All.id)
+                .execution_options(yield_per=tamanho_bloco)
+            )
+            for bloco in resultado.partitions():
+                yield bloco
+        except SQLAlchemyError as e:
+            raise Exception(f"Erro ao ler registros novos: {str(e)}")
+    
+    def contar_anteriores(self, data_limite: datetime) -> int:
+        """
+        Conta registros recebidos antes da data limite (UTC)
+        """
+        try:
+            return self.db.query(All).filter(All.data_recebimento < data_limite).count()
+        except SQLAlchemyError as e:
+            raise Exception(f"Erro ao contar registros antigos: {str(e)}")
+    
+    def limpar_bloco_antigos(self, data_limite: datetime, tamanho: int) -> int:
+        """
+        Remove até N registros recebidos antes da data limite (UTC) e retorna
+        quantos foram removidos. Usado pela limpeza em segundo plano, que
+        repete blocos curtos em vez de uma única transação longa.
+        """
+        try:
+            bloco = select(All.id).where(All.data_recebimento < data_limite).limit(tamanho)
+            removidos = self.db.query(All).filter(All.id.in_(bloco)).delete(synchronize_session=False)
             self.db.commit()
-            return count
+            if removidos:
+                apos_commit(self.db, cache_all.invalidar)
+            return removidos
         except SQLAlchemyError as e:
             self.db.rollback()
-            raise Exception(f"Erro ao limpar registros antigos: {str(e)}")
\ No newline at end of file
+            raise Exception(f"Erro ao limpar bloco de registros antigos: {str(e)}")
+
+
+def publicar_mensagem(id_registro: int, topic: str, payload: str):
+    """
+    Publica uma mensagem gravada no barramento de tempo real (WebSocket/SSE)
+    """
+    try:
+        dados = json.loads(payload)
+    except json.JSONDecodeError:
+        dados = payload
+    barramento.publicar("mensagem", {"id": id_registro, "topic": topic, "payload": dados}, topico=topic)
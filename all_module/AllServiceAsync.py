@@ -0,0 +1,59 @@
+from all_module.allModel import All
+from all_module.AllService import AllService
+from service.ServicoAsync import ServicoAsync
+from typing import List, Optional
+
+class AllServiceAsync(ServicoAsync):
+    """
+    Versão assíncrona do service da tabela All (dados JSON)
+    """
+    
+    servico_sync = AllService
+    
+    async def buscar_por_id(self, record_id: int) -> Optional[All]:
+        """
+        Busca um registro por ID
+        """
+        return await self._executar(AllService.buscar_por_id, record_id)
+    
+    async def buscar_por_topico_linhas(self, topic: str) -> list:
+        """
+        Busca registros por tópico como linhas (id, topic, payload, payload_valido)
+        """
+        return await self._executar(AllService.buscar_por_topico_linhas, topic)
+    
+    async def criar(self, topic: str, payload: str) -> All:
+        """
+        Cria um novo registro
+        """
+        return await self._escrever(AllService.criar, topic, payload)
+    
+    async def deletar(self, record_id: int) -> bool:
+        """
+        Deleta um registro
+        """
+        return await self._escrever(AllService.deletar, record_id)
+    
+    async def contar_total(self) -> int:
+        """
+        Conta total de registros
+        """
+        return await self._executar(AllService.contar_total)
+    
+    async def buscar_por_payload_linhas(self, search_term: str) -> list:
+        """
+        Busca por termo no payload como linhas (id, topic, payload, payload_valido)
+        """
+        return await self._executar(AllService.buscar_por_payload_linhas, search_term)
+    
+    async def listar_topicos_unicos(self) -> List[str]:
+        """
+        Lista todos os tópicos únicos
+        """
+        return await self._executar(AllService.listar_topicos_unicos)
+    
+    async def listar_com_limite_linhas(self, limite: int = 100, offset: int = 0) -> list:
+        """
+        Lista registros com paginação como linhas, sem materializar objetos ORM
+        """
+        return await self._executar(AllService.listar_com_limite_linhas, limite, offset)
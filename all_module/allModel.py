@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, Text
+from sqlalchemy import Column, DateTime, Integer, Text, func
 from config.databaseConfig import Base, engine
 import json
+import orjson
 
 class All(Base):
     """
@@ -13,6 +14,7 @@ class All(Base):
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     topic = Column(Text, nullable=False, index=True)  # Tópico MQTT de origem
     payload = Column(Text, nullable=False)  # JSON como string
+    data_recebimento = Column(DateTime, nullable=True, index=True, default=func.now())  # Recebido pelo gateway/broker (UTC)
     
     def __init__(self, topic: str, payload: str):
         self.topic = topic
@@ -47,6 +49,31 @@ class All(Base):
         except json.JSONDecodeError:
             return None
 
+# Colunas usadas pelas listagens rápidas (linhas Core, sem objetos ORM).
+# json_valid é avaliado pelo próprio SQLite, evitando json.loads em Python.
+COLUNAS_REGISTRO = (
+    All.id,
+    All.topic,
+    All.payload,
+    func.json_valid(All.payload)
+)
+
+def registros_para_json(linhas) -> bytes:
+    """
+    Serializa linhas (id, topic, payload, payload_valido) direto para JSON,
+    no mesmo formato de All.to_dict(). Payloads JSON válidos são repassados
+    sem decodificar e recodificar; os demais são enviados como string.
+    """
+    partes = [
+        b'{"id":%d,"topic":%b,"payload":%b}' % (
+            id_registro,
+            orjson.dumps(topic),
+            payload.encode("utf-8") if valido else orjson.dumps(payload)
+        )
+        for id_registro, topic, payload, valido in linhas
+    ]
+    return b"[" + b",".join(partes) + b"]"
+
 def criar_tabela_all():
     """
     Função específica para criar a tabela all.
@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
-from config.databaseConfig import get_database
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from config.databaseConfig import get_database_async
 from all_module.AllController import AllController
+from cache_module.etag import gerar_etag, nao_modificado, com_etag
 
 # Criar router para dados JSON (tabela all)
 router = APIRouter(
@@ -12,20 +13,25 @@ router = APIRouter(
 
 @router.get("/")
 async def listar_dados(
+    request: Request,
     limite: int = Query(100, description="Número máximo de registros"),
     offset: int = Query(0, description="Número de registros para pular"),
-    db: Session = Depends(get_database)
+    db: AsyncSession = Depends(get_database_async)
 ):
     """Lista todos os dados JSON recebidos via MQTT"""
-    return await AllController.listar_todos(limite, offset, db)
+    etag = await gerar_etag(request, db, "all")
+    resposta = nao_modificado(request, etag)
+    if resposta:
+        return resposta
+    return com_etag(await AllController.listar_todos(limite, offset, db), etag)
 
 @router.get("/{record_id}")
-async def obter_dado(record_id: int, db: Session = Depends(get_database)):
+async def obter_dado(record_id: int, db: AsyncSession = Depends(get_database_async)):
     """Obtém um registro específico por ID"""
     return await AllController.obter_por_id(record_id, db)
 
 @router.get("/topic/{topic}")
-async def listar_por_topico(topic: str, db: Session = Depends(get_database)):
+async def listar_por_topico(topic: str, db: AsyncSession = Depends(get_database_async)):
     """Lista registros por tópico MQTT"""
     return await AllController.listar_por_topico(topic, db)
 
@@ -33,32 +39,42 @@ async def listar_por_topico(topic: str, db: Session = Depends(get_database)):
 async def criar_dado(
     topic: str,
     payload: str,
-    db: Session = Depends(get_database)
+    db: AsyncSession = Depends(get_database_async)
 ):
     """Cria um novo registro JSON manualmente"""
     return await AllController.criar_registro(topic, payload, db)
 
+@router.post("/lote")
+async def ingerir_lote(request: Request):
+    """
+    Ingestão em lote para gateways sem MQTT: NDJSON (ou array JSON) de
+    {topic, payload, received_at}, opcionalmente com Content-Encoding: gzip.
+    Usa o mesmo pipeline do MQTT e retorna os aceitos e um cursor (último ID).
+    Corpos maiores que MAX_BYTES_LOTE, como enviados ou descomprimidos, recebem 413.
+    """
+    return await AllController.ingerir_lote(request)
+
 @router.delete("/{record_id}")
-async def deletar_dado(record_id: int, db: Session = Depends(get_database)):
+async def deletar_dado(record_id: int, db: AsyncSession = Depends(get_database_async)):
     """Deleta um registro"""
     return await AllController.deletar_registro(record_id, db)
 
 @router.get("/search/{search_term}")
-async def buscar_no_payload(search_term: str, db: Session = Depends(get_database)):
+async def buscar_no_payload(search_term: str, db: AsyncSession = Depends(get_database_async)):
     """Busca registros que contenham um termo no payload"""
     return await AllController.buscar_no_payload(search_term, db)
 
 @router.get("/topics/list")
-async def listar_topicos(db: Session = Depends(get_database)):
+async def listar_topicos(db: AsyncSession = Depends(get_database_async)):
     """Lista todos os tópicos únicos"""
     return await AllController.listar_topicos(db)
 
 @router.get("/stats/estatisticas")
-async def estatisticas_dados(db: Session = Depends(get_database)):
+async def estatisticas_dados(db: AsyncSession = Depends(get_database_async)):
     """Estatísticas dos dados JSON"""
     return await AllController.estatisticas(db)
 
 @router.delete("/cleanup/{dias}")
-async def limpar_dados_antigos(dias: int, db: Session = Depends(get_database)):
-    """Remove registros mais antigos que X dias"""
-    return await AllController.limpar_antigos(dias, db)
\ No newline at end of file
+async def limpar_dados_antigos(dias: int):
+    """Remove registros mais antigos que X dias (tarefa em segundo plano, acompanhar em /tarefas/{id})"""
+    return await AllController.limpar_antigos(dias)
\ No newline at end of file
@@ -0,0 +1,99 @@
+import asyncio
+from concurrent.futures import Future
+from datetime import datetime
+from typing import Any, List, Optional
+import orjson
+from config.escritorBanco import escritor
+from all_module.AllService import AllService
+from http_module.lote import ler_horario_evento, ler_timestamp
+from processamento_module.conversao import CAMPO_HORARIO
+from metricas_module.instrumentacao import ingestao_atraso
+
+# Mensagens por tarefa do escritor: lotes grandes são divididos para que
+# outras escritas não esperem uma única transação longa
+TAMANHO_BLOCO = 2000
+
+
+def normalizar_mensagem(topic: Any, payload: Any, data_recebimento: Any = None) -> dict:
+    """
+    Valida e normaliza uma mensagem bruta para a tabela all.
+    Payloads que não são texto são gravados como JSON compacto e
+    a data de recebimento (ISO 8601) é convertida para UTC. O horário de
+    publicação do payload, se houver, vai em publicado_em (só para medir
+    o atraso da ingestão; não é gravado).
+    """
+    if not isinstance(topic, str) or not topic.strip():
+        raise ValueError("Tópico inválido")
+
+    if isinstance(payload, (bytes, bytearray)):
+        payload = payload.decode("utf-8")
+    elif payload is None or payload == "":
+        raise ValueError("Payload inválido")
+
+    data = ler_timestamp(data_recebimento) or datetime.utcnow()
+    publicado_em = _horario_publicacao(payload, data)
+
+    if not isinstance(payload, str):
+        # Objetos, arrays, números e booleanos JSON
+        payload = orjson.dumps(payload).decode("utf-8")
+
+    return {"topic": topic.strip(), "payload": payload, "data_recebimento": data, "publicado_em": publicado_em}
+
+
+def _horario_publicacao(payload: Any, recebido: datetime) -> Optional[datetime]:
+    """
+    Horário informado pelo dispositivo no payload (campo timestamp), se for
+    válido: com ele o atraso inclui o broker e o próprio dispositivo
+    """
+    if isinstance(payload, str):
+        try:
+            payload = orjson.loads(payload)
+        except orjson.JSONDecodeError:
+            return None
+    if not isinstance(payload, dict):
+        return None
+    try:
+        return ler_horario_evento(payload.get(CAMPO_HORARIO), recebido)
+    except ValueError:
+        return None
+
+
+def enviar_mensagens(mensagens: List[dict], deduplicar: bool = False, origem: str = "mqtt") -> Future:
+    """
+    Envia mensagens normalizadas ao escritor único sem bloquear (usado pelo MQTT).
+    O Future resolve com os IDs criados, depois do commit.
+    """
+    futuro = escritor.enviar(lambda db: AllService(db).criar_lote(mensagens, deduplicar))
+    futuro.add_done_callback(lambda f: _medir_atraso(f, mensagens, origem))
+    return futuro
+
+
+def _medir_atraso(futuro: Future, mensagens: List[dict], origem: str):
+    """
+    Registra o atraso entre a publicação (timestamp do payload) e o commit,
+    ou entre o recebimento (data_recebimento) e o commit sem o timestamp
+    """
+    if futuro.cancelled() or futuro.exception() is not None:
+        return
+    agora = datetime.utcnow()
+    for mensagem in mensagens:
+        publicado_em = mensagem.get("publicado_em")
+        if publicado_em is not None:
+            referencia, inicio = "payload", publicado_em
+        else:
+            referencia, inicio = "recebimento", mensagem["data_recebimento"]
+        ingestao_atraso.observar(max(0.0, (agora - inicio).total_seconds()), origem, referencia)
+
+
+async def ingerir_mensagens(mensagens: List[dict], deduplicar: bool = True, origem: str = "http",
+                            tamanho_bloco: int = TAMANHO_BLOCO) -> List[int]:
+    """
+    Grava um lote de mensagens normalizadas em blocos pelo escritor único
+    e retorna os IDs criados, na ordem do lote
+    """
+    blocos = [mensagens[i:i + tamanho_bloco] for i in range(0, len(mensagens), tamanho_bloco)]
+    resultados = await asyncio.gather(*[
+        asyncio.wrap_future(enviar_mensagens(bloco, deduplicar, origem)) for bloco in blocos
+    ])
+    return [id_registro for ids in resultados for id_registro in ids]
+
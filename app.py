@@ -1,14 +1,17 @@
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
-import uvicorn
 import asyncio
+import os
 
 # Importações locais
-from config.databaseConfig import create_tables
-from model.sensoresModel import criar_tabelas_sensores
-from all_module.allModel import criar_tabela_all
-from scripts.router import configure_routes
+from config.databaseConfig import create_tables, async_engine
+from config.escritorBanco import escritor
+from tarefas_module.executorTarefas import executor_tarefas
+from scripts.router import carregar_rotas_em_segundo_plano, RotasSobDemanda
 from mqtt_module.MQTTService import configure_mqtt_service, start_mqtt_service, stop_mqtt_service
+from http_module.compressao import CompressaoMiddleware
+from debug_module.perfilador import PerfilMiddleware
+from metricas_module.instrumentacao import MetricasMiddleware
 
 
 # ==============================================================
@@ -24,6 +27,20 @@ async def lifespan(app: FastAPI):
     create_tables()
     print("✅ Banco de dados configurado!")
 
+    # Escritor único: todas as escritas da API e do MQTT passam por ele
+    escritor.iniciar()
+
+    # Tarefas em segundo plano (limpezas): retoma as pendentes sem atrasar a inicialização
+    loop = asyncio.get_event_loop()
+    loop.run_in_executor(None, executor_tarefas.iniciar)
+
+    # Conversão contínua da tabela all em leituras (opcional; também pode
+    # rodar fora da API com scripts/Tratar_dados.py --continuo)
+    processador_continuo = None
+    if os.getenv("PROCESSAMENTO_CONTINUO", "0") == "1":
+        from processamento_module.processadorContinuo import processador_continuo
+        loop.run_in_executor(None, processador_continuo.iniciar)
+
     # --------------------------
     # Configurar e iniciar MQTT
     # --------------------------
@@ -37,10 +54,13 @@ async def lifespan(app: FastAPI):
     print("✅ Serviço MQTT configurado!")
 
     # Iniciar o MQTT em background (thread separada)
-    loop = asyncio.get_event_loop()
     loop.run_in_executor(None, start_mqtt_service)
     print("🚀 Serviço MQTT iniciado em background!")
 
+    # Carrega routers, controllers e serviços em segundo plano, depois que
+    # o servidor já está no ar (a primeira requisição espera, se preciso)
+    carregar_rotas_em_segundo_plano(app)
+
     # Libera o controle para o FastAPI
     yield
 
@@ -48,9 +68,21 @@ async def lifespan(app: FastAPI):
     # SHUTDOWN (encerramento)
     # --------------------------
     print("🔧 Parando serviço MQTT...")
-    await stop_mqtt_service()
+    stop_mqtt_service()
     print("✅ Serviço MQTT parado!")
 
+    if processador_continuo is not None:
+        processador_continuo.parar()
+
+    # Interrompe as tarefas no fim do bloco atual (voltam a pendentes)
+    executor_tarefas.parar()
+
+    # Grava as escritas pendentes antes de encerrar
+    escritor.parar()
+
+    # Fecha as conexões assíncronas (cada uma mantém uma thread do aiosqlite)
+    await async_engine.dispose()
+
 
 # ==============================================================
 # CRIAÇÃO DA APLICAÇÃO FASTAPI
@@ -63,8 +95,17 @@ app = FastAPI(
     lifespan=lifespan
 )
 
-# Configura todas as rotas da aplicação
-configure_routes(app)
+# Comprime respostas grandes (gzip/brotli) para redes móveis
+app.add_middleware(CompressaoMiddleware, tamanho_minimo=1024)
+
+# Perfilamento sob demanda (cabeçalho X-Perfil = PERFIL_TOKEN ou PERFIL_AMOSTRAGEM)
+app.add_middleware(PerfilMiddleware)
+
+# Latência por rota e requisições em andamento (expostas em /metrics)
+app.add_middleware(MetricasMiddleware)
+
+# Rotas carregadas sob demanda (ver lifespan e scripts/router.py)
+app.add_middleware(RotasSobDemanda, aplicacao=app)
 
 
 # ==============================================================
@@ -72,6 +113,8 @@ configure_routes(app)
 # ==============================================================
 
 if __name__ == "__main__":
+    import uvicorn
+
     uvicorn.run(
         "app:app",
         host="0.0.0.0",  # Aceita conexões de qualquer IP da rede
@@ -0,0 +1 @@
+# Módulo Cache - Versionamento de tabelas, ETags e cache de leitura
\ No newline at end of file
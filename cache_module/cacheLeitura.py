@@ -0,0 +1,160 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+# Sentinela para diferenciar "não encontrado" de um valor None em cache
+_AUSENTE = object()
+
+
+class CacheLeitura:
+    """
+    Cache em memória com expiração (TTL) e descarte LRU por tamanho.
+    Usado pelos services para consultas de leitura que mudam pouco.
+    """
+
+    def __init__(self, nome: str, max_itens: int = 128, ttl: float = 60.0):
+        self.nome = nome
+        self.max_itens = max_itens
+        self.ttl = ttl
+        self._itens: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+        self.descartes = 0
+        self.invalidacoes = 0
+        # Incrementada a cada invalidação: um valor calculado enquanto o
+        # cache era invalidado pode estar desatualizado e não é guardado
+        self._geracao = 0
+
+    def obter(self, chave: Hashable, padrao: Any = None) -> Any:
+        """
+        Retorna o valor em cache (ou o padrão se ausente/expirado)
+        """
+        valor = self._buscar(chave)
+        return padrao if valor is _AUSENTE else valor
+
+    def espiar(self, chave: Hashable, padrao: Any = None) -> Any:
+        """
+        Igual a obter(), mas sem alterar métricas nem a ordem LRU
+        """
+        with self._lock:
+            item = self._itens.get(chave)
+        if item is None or item[1] < time.monotonic():
+            return padrao
+        return item[0]
+
+    def definir(self, chave: Hashable, valor: Any):
+        """
+        Armazena um valor, descartando os menos usados se passar do limite
+        """
+        with self._lock:
+            self._guardar(chave, valor)
+
+    def obter_ou_calcular(self, chave: Hashable, calcular: Callable[[], Any]) -> Any:
+        """
+        Retorna o valor em cache ou calcula, armazena e retorna. O cálculo
+        roda fora do lock; se o cache for invalidado nesse meio tempo, o
+        resultado é devolvido mas não é guardado.
+        """
+        valor = self._buscar(chave)
+        if valor is _AUSENTE:
+            geracao = self._geracao
+            valor = calcular()
+            with self._lock:
+                if self._geracao == geracao:
+                    self._guardar(chave, valor)
+        return valor
+
+    def ajustar(self, chave: Hashable, funcao: Callable[[Any], Any]):
+        """
+        Aplica uma alteração atômica ao valor em cache, se ele existir
+        (ex.: incrementar um contador sem invalidá-lo)
+        """
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is not None:
+                self._itens[chave] = (funcao(item[0]), item[1])
+
+    def invalidar(self, chave: Optional[Hashable] = None):
+        """
+        Remove uma chave específica ou, sem chave, todo o conteúdo
+        """
+        with self._lock:
+            if chave is None:
+                self._itens.clear()
+            else:
+                self._itens.pop(chave, None)
+            self.invalidacoes += 1
+            self._geracao += 1
+
+    def estatisticas(self) -> dict:
+        """
+        Retorna métricas de uso do cache
+        """
+        total = self.acertos + self.falhas
+        return {
+            "nome": self.nome,
+            "itens": len(self._itens),
+            "max_itens": self.max_itens,
+            "ttl_segundos": self.ttl,
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "taxa_acerto": round(self.acertos / total, 4) if total else 0.0,
+            "descartes": self.descartes,
+            "invalidacoes": self.invalidacoes
+        }
+
+    def _guardar(self, chave: Hashable, valor: Any):
+        # Chamado com o lock adquirido
+        self._itens[chave] = (valor, time.monotonic() + self.ttl)
+        self._itens.move_to_end(chave)
+        while len(self._itens) > self.max_itens:
+            self._itens.popitem(last=False)
+            self.descartes += 1
+
+    def _buscar(self, chave: Hashable) -> Any:
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is not None and item[1] < time.monotonic():
+                del self._itens[chave]
+                item = None
+            if item is None:
+                self.falhas += 1
+                return _AUSENTE
+            self._itens.move_to_end(chave)
+            self.acertos += 1
+            return item[0]
+
+
+# ==============================================================
+# REGISTRO GLOBAL DE CACHES
+# ==============================================================
+
+_caches: Dict[str, CacheLeitura] = {}
+
+
+def registrar_cache(nome: str, max_itens: int = 128, ttl: float = 60.0) -> CacheLeitura:
+    """
+    Cria (ou retorna, se já existir) um cache nomeado
+    """
+    if nome not in _caches:
+        _caches[nome] = CacheLeitura(nome, max_itens, ttl)
+    return _caches[nome]
+
+
+def invalidar_caches(*nomes: str):
+    """
+    Invalida os caches informados (ou todos, se nenhum for informado)
+    """
+    for nome in (nomes or list(_caches)):
+        cache = _caches.get(nome)
+        if cache:
+            cache.invalidar()
+
+
+def estatisticas_caches() -> Dict[str, dict]:
+    """
+    Retorna as métricas de todos os caches registrados
+    """
+    return {nome: cache.estatisticas() for nome, cache in _caches.items()}
@@ -0,0 +1,47 @@
+import zlib
+from typing import Any, Optional
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from cache_module.versoes import versoes
+
+# Os clientes sempre revalidam; o ETag evita o download repetido
+CACHE_CONTROL = "no-cache"
+
+
+async def gerar_etag(request: Request, db: AsyncSession, tabela: str, chave: Any = None) -> str:
+    """
+    Gera um ETag forte a partir da versão da tabela (ou da chave) lida do
+    banco e da representação pedida: caminho, parâmetros de consulta e chave.
+    """
+    versao = await db.run_sync(lambda sessao: versoes.versao(sessao, tabela, chave))
+    representacao = format(zlib.crc32(f"{request.url.path}?{request.url.query}#{chave}".encode()), "x")
+    return f'"{versoes.epoca}-{tabela}-{versao}-{representacao}"'
+
+
+def nao_modificado(request: Request, etag: str) -> Optional[Response]:
+    """
+    Retorna uma resposta 304 se o If-None-Match coincidir com o ETag,
+    ou None se a requisição precisar ser processada normalmente.
+    """
+    cabecalho = request.headers.get("if-none-match")
+    if not cabecalho:
+        return None
+
+    candidatos = [c.strip() for c in cabecalho.split(",")]
+    if "*" in candidatos or etag in [c[2:] if c.startswith("W/") else c for c in candidatos]:
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+    return None
+
+
+def com_etag(conteudo: Any, etag: str) -> Response:
+    """
+    Serializa o conteúdo e anexa os cabeçalhos de cache
+    """
+    if isinstance(conteudo, Response):
+        resposta = conteudo
+    else:
+        resposta = JSONResponse(content=conteudo)
+    resposta.headers["ETag"] = etag
+    resposta.headers["Cache-Control"] = CACHE_CONTROL
+    return resposta
@@ -0,0 +1,144 @@
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+from sqlalchemy import event, inspect
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from cache_module.cacheLeitura import invalidar_caches
+
+# Tabelas versionadas -> coluna usada para versionar por chave
+# (ex.: valores por sensor); None = só a tabela inteira
+TABELAS_VERSIONADAS = {
+    "valores_sensor": "id_sensor",
+    "sensores": None,
+    "all": None,
+    "alerta": None,
+}
+
+# Caches em memória montados a partir de cada tabela: invalidados quando a
+# versão lida do banco muda, para que um ETag novo nunca acompanhe um valor
+# antigo em cache (ex.: leituras gravadas pelo Tratar_dados separado da API)
+CACHES_TABELAS = {
+    "valores_sensor": ("ultimos_valores",),
+    "sensores": ("sensores",),
+    "all": ("all",),
+}
+
+# Linha com a época do banco (gravada na criação da tabela de versões):
+# um banco recriado não reaproveita ETags antigas
+_EPOCA = "_epoca"
+
+# Chave das alterações que valem para a tabela inteira (todas as chaves):
+# os IDs das tabelas começam em 1
+TODAS = 0
+
+_INCREMENTAR = (
+    "INSERT INTO versoes_tabelas (tabela, chave, versao) VALUES (?, ?, 1) "
+    "ON CONFLICT (tabela, chave) DO UPDATE SET versao = versao + 1"
+)
+
+
+def preparar_versoes(conexao: Connection):
+    """
+    Grava a época do banco e remove os gatilhos por linha das versões
+    anteriores (o incremento agora é feito uma vez por comando, abaixo)
+    """
+    conexao.exec_driver_sql(
+        "INSERT OR IGNORE INTO versoes_tabelas (tabela, chave, versao) VALUES (?, 0, ?)",
+        (_EPOCA, time.time_ns())
+    )
+    for tabela in TABELAS_VERSIONADAS:
+        for operacao in ("insert", "update", "delete"):
+            conexao.exec_driver_sql(f'DROP TRIGGER IF EXISTS "versao_{tabela}_{operacao}"')
+
+
+def incrementar_versoes(db: Session, tabela: str, chaves: Iterable[Any] = (TODAS,)):
+    """
+    Incrementa as versões das chaves alteradas de uma tabela (TODAS = a
+    tabela inteira) com um único executemany, na transação da escrita:
+    o incremento é desfeito junto com ela. Chamado uma vez por comando:
+    pelos eventos abaixo nas escritas do ORM e pelos services nas
+    inserções em massa direto no driver.
+    """
+    if tabela not in TABELAS_VERSIONADAS:
+        return
+    if TABELAS_VERSIONADAS[tabela] is None:
+        chaves = (TODAS,)
+    parametros = [(tabela, TODAS if chave is None else chave) for chave in set(chaves)]
+    if parametros:
+        db.connection().exec_driver_sql(_INCREMENTAR, parametros)
+
+
+@event.listens_for(Session, "after_flush")
+def _versoes_apos_flush(session: Session, contexto):
+    # Objetos gravados pelo ORM: uma chave por objeto (e a antiga, se mudou)
+    alteradas: Dict[str, set] = {}
+    for objeto in (*session.new, *session.dirty, *session.deleted):
+        tabela = getattr(getattr(objeto, "__table__", None), "name", None)
+        if tabela not in TABELAS_VERSIONADAS:
+            continue
+        coluna = TABELAS_VERSIONADAS[tabela]
+        chaves = alteradas.setdefault(tabela, set())
+        if coluna is None:
+            chaves.add(TODAS)
+            continue
+        chaves.add(getattr(objeto, coluna))
+        chaves.update(inspect(objeto).attrs[coluna].history.deleted)
+    for tabela, chaves in alteradas.items():
+        incrementar_versoes(session, tabela, chaves)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _versoes_em_comandos(estado):
+    # INSERT/UPDATE/DELETE em massa pelo ORM (ex.: query(...).delete()):
+    # sem saber as chaves, vale para a tabela inteira
+    if estado.is_insert or estado.is_update or estado.is_delete:
+        tabela = getattr(getattr(estado.statement, "table", None), "name", None)
+        if tabela in TABELAS_VERSIONADAS:
+            incrementar_versoes(estado.session, tabela)
+
+
+class VersoesTabelas:
+    """
+    Leitura das versões por tabela e por chave (ex.: por sensor) gravadas
+    nas escritas, usadas para gerar ETags. Lembra a última versão vista
+    de cada uma para invalidar os caches da tabela quando ela muda.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._vistas: Dict[Tuple[str, Any], int] = {}
+        self.epoca: Optional[str] = None
+
+    def versao(self, db: Session, tabela: str, chave: Any = None) -> int:
+        """
+        Retorna a versão atual da tabela (soma das chaves) ou de uma chave
+        da tabela (a chave mais as alterações da tabela inteira). Uma
+        consulta pela chave primária de versoes_tabelas.
+        """
+        conexao = db.connection()
+        if self.epoca is None:
+            epoca = conexao.exec_driver_sql(
+                "SELECT versao FROM versoes_tabelas WHERE tabela = ? AND chave = 0", (_EPOCA,)
+            ).scalar()
+            self.epoca = format(epoca or 0, "x")
+        if chave is None:
+            versao = conexao.exec_driver_sql(
+                "SELECT coalesce(sum(versao), 0) FROM versoes_tabelas WHERE tabela = ?", (tabela,)
+            ).scalar()
+        else:
+            versao = conexao.exec_driver_sql(
+                "SELECT coalesce(sum(versao), 0) FROM versoes_tabelas WHERE tabela = ? AND chave IN (?, ?)",
+                (tabela, chave, TODAS)
+            ).scalar()
+
+        with self._lock:
+            mudou = self._vistas.get((tabela, chave)) != versao
+            self._vistas[(tabela, chave)] = versao
+        if mudou and tabela in CACHES_TABELAS:
+            invalidar_caches(*CACHES_TABELAS[tabela])
+        return versao
+
+
+# Instância global compartilhada pela aplicação
+versoes = VersoesTabelas()
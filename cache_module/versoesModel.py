@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, Text
+from config.databaseConfig import Base
+
+class VersaoTabela(Base):
+    """
+    Modelo da tabela versoes_tabelas no banco de dados.
+    Contador de alterações por tabela e por chave (ex.: por sensor),
+    incrementado uma vez por comando na transação da escrita
+    (cache_module/versoes.py): vale para as escritas de qualquer processo
+    que use os services (API, Tratar_dados, scripts).
+    """
+    __tablename__ = "versoes_tabelas"
+
+    # Campos da tabela
+    tabela = Column(Text, primary_key=True)
+    chave = Column(Integer, primary_key=True, default=0)  # 0 = tabela sem chave
+    versao = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<VersaoTabela(tabela='{self.tabela}', chave={self.chave}, versao={self.versao})>"
@@ -1,54 +1,348 @@
-from sqlalchemy import create_engine, MetaData
+from sqlalchemy import create_engine, event, inspect, MetaData
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.schema import CreateIndex
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, Session
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Iterator, List
 import os
+import re
+import threading
+import time
+from config.monitorConexoes import monitor_conexoes, QueuePoolMonitorado, AsyncAdaptedQueuePoolMonitorado
 
  # Configuração do banco de dados SQLite
 DATABASE_URL = "sqlite:///./estacao_esp32.db"
 
+# Mesmo banco, somente leitura, acessado pelo driver assíncrono (aiosqlite).
+# As escritas da API passam pelo escritor único (config/escritorBanco.py)
+ASYNC_DATABASE_URL = "sqlite+aiosqlite:///file:./estacao_esp32.db?mode=ro&uri=true"
+
+# Tempo (ms) que uma conexão espera por um lock antes de falhar
+BUSY_TIMEOUT_MS = 5000
+
 # Criar o engine do SQLAlchemy
 engine = create_engine(
     DATABASE_URL,
-    connect_args={"check_same_thread": False}  # Necessário para SQLite
+    connect_args={"check_same_thread": False},  # Necessário para SQLite
+    poolclass=QueuePoolMonitorado,
+    pool_logging_name="principal"
 )
+monitor_conexoes.instrumentar(engine)
+
+@event.listens_for(engine, "connect")
+def _configurar_conexao(dbapi_connection, connection_record):
+    """
+    WAL permite leituras concorrentes com a escrita; busy_timeout evita
+    erros imediatos de "database is locked" entre processos (ex.: scripts)
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+    cursor.close()
 
 # Criar SessionLocal para interagir com o banco
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Engine e sessões assíncronas (pool de leitura), usadas pelas rotas GET.
+# expire_on_commit=False evita recarregamentos implícitos (que exigiriam await).
+# O pool reaproveita as conexões (cada conexão aiosqlite mantém sua própria thread)
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    poolclass=AsyncAdaptedQueuePoolMonitorado,
+    pool_size=5,
+    max_overflow=10,
+    pool_logging_name="leitura"
+)
+monitor_conexoes.instrumentar(async_engine.sync_engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+@event.listens_for(async_engine.sync_engine, "connect")
+def _configurar_conexao_leitura(dbapi_connection, connection_record):
+    """
+    Conexões do pool de leitura recusam qualquer escrita
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA query_only=1")
+    cursor.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+    cursor.close()
+
+# Chave em Session.info com as ações adiadas até o commit real do lote
+# (usada pelo escritor único, que agrupa várias tarefas em uma transação)
+APOS_COMMIT_REAL = "apos_commit_real"
+
+def apos_commit(db: Session, funcao: Callable[[], None]):
+    """
+    Executa uma ação (ex.: invalidar cache) depois que os dados forem
+    efetivamente gravados. Em sessões comuns, chame logo após o commit();
+    no escritor único, a ação é adiada até o commit do lote.
+    """
+    adiadas = db.info.get(APOS_COMMIT_REAL)
+    if adiadas is not None:
+        adiadas.append(funcao)
+    else:
+        funcao()
+
+# Chave em Session.info com as ações que esperam o commit de quem chamou
+APOS_PROXIMO_COMMIT = "apos_proximo_commit"
+
+def apos_proximo_commit(db: Session, funcao: Callable[[], None]):
+    """
+    Para métodos que gravam SEM fazer commit (o commit é de quem chamou,
+    ex.: leituras + checkpoint): a ação espera o próximo commit da sessão
+    (e segue as regras de apos_commit); um rollback a descarta.
+    """
+    db.info.setdefault(APOS_PROXIMO_COMMIT, []).append(funcao)
+
+@event.listens_for(Session, "after_commit")
+def _executar_apos_proximo_commit(session):
+    for funcao in session.info.pop(APOS_PROXIMO_COMMIT, ()):
+        apos_commit(session, funcao)
+
+@event.listens_for(Session, "after_rollback")
+def _descartar_apos_proximo_commit(session):
+    session.info.pop(APOS_PROXIMO_COMMIT, None)
+
+# ==============================================================
+# TEMPO DAS CONSULTAS: um único par de eventos de cursor, em todos os
+# engines (principal, leitura e escritor), mede cada consulta uma vez
+# e repassa o resultado aos observadores (métricas, perfis, consultas lentas)
+# ==============================================================
+
+# Funções chamadas ao fim de cada consulta:
+# observador(conexao, cursor, statement, parameters, executemany, inicio, duracao)
+observadores_consultas: List[Callable] = []
+
+def observar_consultas(funcao: Callable) -> Callable:
+    """
+    Registra um observador das consultas SQL (pode ser usado como decorador)
+    """
+    observadores_consultas.append(funcao)
+    return funcao
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _inicio_consulta(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("inicio_consultas", []).append(time.perf_counter())
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _fim_consulta(conn, cursor, statement, parameters, context, executemany):
+    inicios = conn.info.get("inicio_consultas")
+    if not inicios:
+        return
+    inicio = inicios.pop()
+    duracao = time.perf_counter() - inicio
+    for observador in observadores_consultas:
+        observador(conn, cursor, statement, parameters, executemany, inicio, duracao)
+
+@event.listens_for(Engine, "handle_error")
+def _erro_consulta(contexto):
+    # A consulta falhou: descarta o início pendente
+    conexao = contexto.connection
+    if conexao is not None and conexao.info.get("inicio_consultas"):
+        conexao.info["inicio_consultas"].pop()
+
+# Máximo de textos SQL com o formato já calculado (os usados há mais tempo
+# são descartados e recalculados se voltarem)
+MAX_FORMATOS_SQL = 300
+
+_formatos_sql: "OrderedDict[str, str]" = OrderedDict()
+_lock_formatos = threading.Lock()
+_ESPACOS = re.compile(r"\s+")
+_LITERAIS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_LISTA_PARAMETROS = re.compile(r"\?(?:\s*,\s*\?)+")
+_SAVEPOINT = re.compile(r"sa_savepoint_\d+")
+
+def formato_consulta(statement: str) -> str:
+    """
+    Normaliza o SQL para agrupar consultas iguais: espaços compactados,
+    savepoints numerados (um por tarefa do escritor) agrupados, literais
+    (textos e números) trocados por ? e listas de parâmetros
+    (IN (?, ?, ...)) reduzidas. O resultado é guardado por texto (LRU),
+    então a normalização roda uma vez por consulta distinta em uso.
+    """
+    with _lock_formatos:
+        formato = _formatos_sql.get(statement)
+        if formato is not None:
+            _formatos_sql.move_to_end(statement)
+            return formato
+    formato = _SAVEPOINT.sub("sa_savepoint_N", _ESPACOS.sub(" ", statement).strip())
+    formato = _LISTA_PARAMETROS.sub("?, ...", _LITERAIS.sub("?", formato))
+    with _lock_formatos:
+        _formatos_sql[statement] = formato
+        if len(_formatos_sql) > MAX_FORMATOS_SQL:
+            _formatos_sql.popitem(last=False)
+    return formato
+
 # Base para os modelos
 Base = declarative_base()
 
 # Metadados para operações de esquema
 metadata = MetaData()
 
-def get_database():
+@contextmanager
+def sessao_banco() -> Iterator[Session]:
     """
-    Função generator para obter uma sessão do banco de dados.
-    Usado como dependency no FastAPI.
+    Escopo gerenciado de sessão para scripts e serviços fora das rotas.
+    Desfaz a transação em caso de erro e sempre fecha a sessão,
+    devolvendo a conexão ao pool.
     """
     db = SessionLocal()
     try:
         yield db
+    except Exception:
+        db.rollback()
+        raise
     finally:
         db.close()
 
+def get_database():
+    """
+    Função generator para obter uma sessão do banco de dados.
+    Usado como dependency no FastAPI.
+    """
+    with sessao_banco() as db:
+        yield db
+
+async def get_database_async():
+    """
+    Função generator assíncrona para obter uma AsyncSession.
+    Usado como dependency nas rotas async do FastAPI, sem bloquear o event loop.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# Versão do esquema gravada no banco (PRAGMA user_version). Incremente ao
+# adicionar tabelas, colunas ou índices aos modelos: bancos com versão menor
+# passam pela migração na próxima inicialização.
+VERSAO_ESQUEMA = 11
+
+# Índices que saíram dos modelos (substituídos por outros): removidos na
+# migração, depois que os novos índices forem criados
+INDICES_REMOVIDOS = [
+    "ux_sensores_nome_lower",  # trocado por ux_sensores_dispositivo_nome
+    "ux_sensores_dispositivo_nome",  # lower() do SQLite só trata ASCII: trocado pelo nome normalizado
+]
+
+# Valor inicial das colunas novas nas linhas que já existiam: (tabela,
+# coluna) -> expressão SQL, aplicada quando a coluna é adicionada
+COLUNAS_PREENCHIDAS = {
+    # Antes da coluna, o timestamp das leituras era o do recebimento
+    ("valores_sensor", "recebido_em"): "timestamp",
+    # Função Python registrada na conexão da migração (normalizar_nome)
+    ("sensores", "nome_normalizado"): "normalizar_nome(nome)",
+}
+
+def versao_esquema() -> int:
+    """
+    Retorna a versão do esquema gravada no banco (0 em bancos novos ou antigos)
+    """
+    with engine.connect() as conexao:
+        return conexao.exec_driver_sql("PRAGMA user_version").scalar()
+
 def create_tables():
     """
     Função para criar todas as tabelas no banco de dados.
+    Se o banco já estiver na versão atual do esquema, nada é verificado:
+    a leitura da versão substitui a reflexão de todas as tabelas.
     """
+    versao = versao_esquema()
+    if versao >= VERSAO_ESQUEMA:
+        print(f"✅ Esquema do banco atualizado (versão {versao})")
+        return
+
     # Importar todos os modelos para garantir que sejam registrados
+    from model.dispositivosModel import Dispositivo
     from model.sensoresModel import Sensor, ValoresSensor
     from model.usuariosModel import Usuarios
     from all_module.allModel import All
     from model.alertaModel import Alerta
+    from tarefas_module.tarefaModel import Tarefa
+    from processamento_module.checkpointModel import CheckpointProcessamento
+    from processamento_module.rejeitadoModel import RegistroRejeitado
+    from processamento_module.mapeamentoModel import RegraMapeamento
+    from model.agregadosModel import AgregadoValores
+    from cache_module.versoesModel import VersaoTabela
+    from cache_module.versoes import preparar_versoes
     
+    novas = set(Base.metadata.tables) - set(inspect(engine).get_table_names())
     Base.metadata.create_all(bind=engine)
-    print("Tabelas criadas com sucesso!")
+    completo = adicionar_colunas_novas()
+    if "agregados_valores" in novas:
+        preencher_agregados()
+    with engine.begin() as conexao:
+        preparar_versoes(conexao)
+    if completo:
+        with engine.begin() as conexao:
+            conexao.exec_driver_sql(f"PRAGMA user_version={VERSAO_ESQUEMA}")
+    print(f"Tabelas criadas com sucesso! (esquema versão {versao} -> {VERSAO_ESQUEMA})")
+    print("- Tabela 'dispositivos' criada")
     print("- Tabela 'sensores' criada")
     print("- Tabela 'valores_sensor' criada")
     print("- Tabela 'usuarios' criada")
     print("- Tabela 'all' criada")
     print("- Tabela 'alerta' criada")
+    print("- Tabela 'tarefas' criada")
+    print("- Tabela 'checkpoints_processamento' criada")
+    print("- Tabela 'registros_rejeitados' criada")
+    print("- Tabela 'regras_mapeamento' criada")
+    print("- Tabela 'agregados_valores' criada")
+    print("- Tabela 'versoes_tabelas' criada")
+
+def preencher_agregados():
+    """
+    Calcula os agregados por hora das leituras que já existiam quando a
+    tabela agregados_valores foi criada (as novas são somadas na inserção)
+    """
+    from service.AgregadosService import AgregadosService
+    with sessao_banco() as db:
+        horas = AgregadosService(db).recalcular(None)
+        db.commit()
+    print(f"- Agregados das leituras existentes calculados ({horas} horas)")
+
+def adicionar_colunas_novas() -> bool:
+    """
+    O create_all só cria tabelas que não existem: colunas (anuláveis) e
+    índices adicionados aos modelos depois são criados aqui em bancos antigos
+    (colunas de COLUNAS_PREENCHIDAS recebem o valor inicial), e os índices
+    de INDICES_REMOVIDOS são apagados.
+    Retorna False se algum índice único não pôde ser criado por causa de
+    dados duplicados (a versão do esquema não avança e a criação é tentada
+    de novo na próxima inicialização).
+    """
+    from model.sensoresModel import normalizar_nome
+    completo = True
+    inspetor = inspect(engine)
+    with engine.begin() as conexao:
+        conexao.connection.driver_connection.create_function(
+            "normalizar_nome", 1, normalizar_nome, deterministic=True
+        )
+        for tabela in Base.metadata.sorted_tables:
+            existentes = {coluna["name"] for coluna in inspetor.get_columns(tabela.name)}
+            for coluna in tabela.columns:
+                if coluna.name not in existentes:
+                    tipo = coluna.type.compile(dialect=engine.dialect)
+                    conexao.exec_driver_sql(f'ALTER TABLE "{tabela.name}" ADD COLUMN "{coluna.name}" {tipo}')
+                    expressao = COLUNAS_PREENCHIDAS.get((tabela.name, coluna.name))
+                    if expressao is not None:
+                        conexao.exec_driver_sql(f'UPDATE "{tabela.name}" SET "{coluna.name}" = {expressao}')
+                    print(f"- Coluna '{tabela.name}.{coluna.name}' adicionada")
+            for indice in tabela.indexes:
+                try:
+                    # IF NOT EXISTS em vez de checkfirst: a reflexão do SQLite
+                    # não enxerga índices de expressão (ex.: lower(nome))
+                    with conexao.begin_nested():
+                        conexao.execute(CreateIndex(indice, if_not_exists=True))
+                except IntegrityError:
+                    # Índice único sobre dados que já têm duplicatas
+                    print(f"⚠️ Índice '{indice.name}' não criado: há valores duplicados em '{tabela.name}'")
+                    completo = False
+        if completo:
+            for nome in INDICES_REMOVIDOS:
+                conexao.exec_driver_sql(f'DROP INDEX IF EXISTS "{nome}"')
+    return completo
 
 def get_database_path():
     """
@@ -61,3 +355,6 @@ def database_exists():
     Verifica se o arquivo do banco de dados existe.
     """
     return os.path.exists(get_database_path())
+
+# Registra os eventos de sessão que incrementam as versões das tabelas (ETags)
+import cache_module.versoes  # noqa: E402,F401
@@ -0,0 +1,221 @@
+import asyncio
+import contextvars
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from config.databaseConfig import DATABASE_URL, BUSY_TIMEOUT_MS, APOS_COMMIT_REAL
+
+logger = logging.getLogger(__name__)
+
+# Máximo de tarefas agrupadas em uma mesma transação (group commit)
+MAX_LOTE = 200
+
+# Máximo de tarefas aguardando na fila (acima disso, quem envia espera)
+TAMANHO_FILA = 10000
+
+
+class TarefaEscrita:
+    """
+    Tarefa de escrita: uma função que recebe a Session do escritor
+    e um Future com o resultado para quem enviou. A função roda no
+    contexto (contextvars) de quem enviou, como perfis e métricas da requisição.
+    """
+    __slots__ = ("funcao", "futuro", "contexto")
+
+    def __init__(self, funcao: Callable[[Session], Any]):
+        self.funcao = funcao
+        self.futuro: Future = Future()
+        self.contexto = contextvars.copy_context()
+
+
+class EscritorBanco:
+    """
+    Escritor único do SQLite. Uma thread dedicada mantém a única conexão
+    de escrita, recebe tarefas por uma fila e grava várias tarefas em uma
+    só transação. Cada tarefa roda em um SAVEPOINT próprio: os commit()/
+    rollback() dos services afetam apenas a tarefa, não o lote inteiro.
+    """
+
+    def __init__(self, url: str = DATABASE_URL, max_lote: int = MAX_LOTE, tamanho_fila: int = TAMANHO_FILA):
+        self.url = url
+        self.max_lote = max_lote
+        self._fila: "queue.Queue[Optional[TarefaEscrita]]" = queue.Queue(maxsize=tamanho_fila)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.lotes = 0
+        self.tarefas = 0
+        self.falhas = 0
+        self.maior_lote = 0
+
+    # ==============================================================
+    # ENVIO DE TAREFAS
+    # ==============================================================
+
+    def enviar(self, funcao: Callable[[Session], Any]) -> Future:
+        """
+        Enfileira uma tarefa de escrita e retorna um Future com o resultado
+        """
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("Tarefas do escritor não podem enviar novas tarefas e aguardá-las")
+        self.iniciar()
+        tarefa = TarefaEscrita(funcao)
+        self._fila.put(tarefa)
+        return tarefa.futuro
+
+    async def executar(self, funcao: Callable[[Session], Any]) -> Any:
+        """
+        Versão assíncrona: aguarda o resultado sem bloquear o event loop
+        """
+        return await asyncio.wrap_future(self.enviar(funcao))
+
+    def executar_sync(self, funcao: Callable[[Session], Any], timeout: Optional[float] = None) -> Any:
+        """
+        Versão síncrona: bloqueia até a tarefa ser gravada
+        """
+        return self.enviar(funcao).result(timeout)
+
+    # ==============================================================
+    # CICLO DE VIDA
+    # ==============================================================
+
+    def iniciar(self):
+        """
+        Inicia a thread do escritor (se ainda não estiver rodando)
+        """
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._executar_loop, name="escritor-banco", daemon=True)
+                self._thread.start()
+
+    def parar(self, timeout: float = 10.0):
+        """
+        Grava as tarefas pendentes e encerra a thread do escritor
+        """
+        with self._lock:
+            thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        self._fila.put(None)
+        thread.join(timeout)
+
+    def estatisticas(self) -> dict:
+        """
+        Retorna métricas do escritor
+        """
+        return {
+            "fila": self._fila.qsize(),
+            "lotes": self.lotes,
+            "tarefas": self.tarefas,
+            "falhas": self.falhas,
+            "maior_lote": self.maior_lote,
+            "media_por_lote": round(self.tarefas / self.lotes, 2) if self.lotes else 0.0
+        }
+
+    # ==============================================================
+    # THREAD DO ESCRITOR
+    # ==============================================================
+
+    def _criar_engine(self):
+        engine = create_engine(self.url, connect_args={"check_same_thread": False}, pool_logging_name="escritor")
+
+        @event.listens_for(engine, "connect")
+        def _configurar(dbapi_connection, connection_record):
+            # Controle manual de transação (necessário para SAVEPOINT no pysqlite)
+            dbapi_connection.isolation_level = None
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+            cursor.close()
+
+        @event.listens_for(engine, "begin")
+        def _begin(conexao):
+            # Reserva o lock de escrita no início, evitando falhas ao promover o lock
+            conexao.exec_driver_sql("BEGIN IMMEDIATE")
+
+        return engine
+
+    def _executar_loop(self):
+        engine = self._criar_engine()
+        try:
+            with engine.connect() as conexao:
+                encerrar = False
+                while not encerrar:
+                    tarefa = self._fila.get()
+                    if tarefa is None:
+                        break
+
+                    # Agrupa o que já estiver na fila (group commit)
+                    lote = [tarefa]
+                    while len(lote) < self.max_lote:
+                        try:
+                            proxima = self._fila.get_nowait()
+                        except queue.Empty:
+                            break
+                        if proxima is None:
+                            encerrar = True
+                            break
+                        lote.append(proxima)
+
+                    self._processar_lote(conexao, lote)
+        finally:
+            engine.dispose()
+
+    def _processar_lote(self, conexao, lote: List[TarefaEscrita]):
+        adiadas: List[Callable[[], None]] = []
+        resultados = []
+
+        try:
+            with conexao.begin():
+                for tarefa in lote:
+                    if not tarefa.futuro.set_running_or_notify_cancel():
+                        continue
+                    # Ações adiadas da tarefa: descartadas se o SAVEPOINT dela for desfeito
+                    adiadas_tarefa: List[Callable[[], None]] = []
+                    sessao = Session(
+                        bind=conexao,
+                        join_transaction_mode="create_savepoint",
+                        autoflush=False,
+                        expire_on_commit=False,
+                        info={APOS_COMMIT_REAL: adiadas_tarefa}
+                    )
+                    try:
+                        resultados.append((tarefa, True, tarefa.contexto.run(tarefa.funcao, sessao)))
+                        adiadas.extend(adiadas_tarefa)
+                    except Exception as e:
+                        sessao.rollback()
+                        resultados.append((tarefa, False, e))
+                    finally:
+                        sessao.close()
+        except Exception as e:
+            logger.error(f"❌ Falha ao gravar lote de {len(lote)} tarefas: {e}")
+            self.falhas += len(resultados)
+            for tarefa, _, _ in resultados:
+                tarefa.futuro.set_exception(e)
+            return
+
+        self.lotes += 1
+        self.tarefas += len(resultados)
+        self.maior_lote = max(self.maior_lote, len(resultados))
+
+        # Ações pós-commit (cache, versões, barramento) só após a gravação real
+        for funcao in adiadas:
+            try:
+                funcao()
+            except Exception as e:
+                logger.error(f"❌ Erro em ação pós-commit: {e}")
+
+        for tarefa, sucesso, valor in resultados:
+            if sucesso:
+                tarefa.futuro.set_result(valor)
+            else:
+                self.falhas += 1
+                tarefa.futuro.set_exception(valor)
+
+
+# Instância global compartilhada pela aplicação
+escritor = EscritorBanco()
@@ -0,0 +1,194 @@
+import logging
+import os
+import random
+import threading
+import time
+import traceback
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+logger = logging.getLogger(__name__)
+
+# Conexões em uso há mais tempo que isso (s) são tratadas como possíveis vazamentos
+LIMITE_CONEXAO_LONGA = 30.0
+
+# Quantidade de frames guardados da pilha de quem pegou a conexão
+LIMITE_PILHA = 25
+
+# Fração dos checkouts que guardam a pilha de quem pegou a conexão
+# (0 = nenhum, 1 = todos). Capturar a pilha custa caro e o checkout
+# acontece em toda requisição e tarefa do escritor: ligue para investigar
+# vazamentos (MONITOR_PILHA_CONEXOES=1 guarda sempre)
+AMOSTRAGEM_PILHA = 1.0 if os.getenv("MONITOR_PILHA_CONEXOES", "0") == "1" else \
+    float(os.getenv("MONITOR_AMOSTRAGEM_PILHA", "0"))
+
+
+class _EstatisticasPool:
+    """
+    Contadores de um pool: checkouts, tempo de espera e conexões em uso
+    """
+
+    def __init__(self, nome: str):
+        self.nome = nome
+        self.pool = None
+        self.checkouts = 0
+        self.espera_total = 0.0
+        self.espera_maxima = 0.0
+        # id do registro da conexão -> (início, thread, pilha ou None)
+        self.em_uso: Dict[int, Tuple[float, str, Optional[traceback.StackSummary]]] = {}
+
+
+class MonitorConexoes:
+    """
+    Observa os pools de conexão do SQLAlchemy: conexões em uso, tempo de
+    espera no checkout e conexões presas por muito tempo, com a thread e,
+    se amostrada (amostragem_pilha), a pilha de quem as pegou. Uma conexão em uso corresponde a uma sessão com
+    transação aberta, que no SQLite mantém um snapshot de leitura e
+    impede o checkpoint do WAL.
+    """
+
+    def __init__(self, limite_conexao_longa: float = LIMITE_CONEXAO_LONGA, amostragem_pilha: float = AMOSTRAGEM_PILHA):
+        self.limite_conexao_longa = limite_conexao_longa
+        self.amostragem_pilha = amostragem_pilha
+        self._lock = threading.Lock()
+        self._pools: Dict[str, _EstatisticasPool] = {}
+
+    def instrumentar(self, engine: Engine):
+        """
+        Registra os eventos de checkout/checkin no pool do engine.
+        O nome do pool vem de pool_logging_name no create_engine.
+        """
+        nome = engine.pool.logging_name or engine.url.render_as_string(hide_password=True)
+        estatisticas = self._estatisticas(nome)
+        estatisticas.pool = engine.pool
+
+        @event.listens_for(engine, "checkout")
+        def _checkout(dbapi_connection, connection_record, connection_proxy):
+            pilha = None
+            if self.amostragem_pilha and random.random() < self.amostragem_pilha:
+                pilha = traceback.extract_stack(limit=LIMITE_PILHA)
+            with self._lock:
+                estatisticas.checkouts += 1
+                estatisticas.em_uso[id(connection_record)] = (
+                    time.monotonic(), threading.current_thread().name, pilha
+                )
+
+        @event.listens_for(engine, "checkin")
+        def _checkin(dbapi_connection, connection_record):
+            with self._lock:
+                registro = estatisticas.em_uso.pop(id(connection_record), None)
+            if registro is None:
+                return
+            duracao = time.monotonic() - registro[0]
+            if duracao > self.limite_conexao_longa:
+                logger.warning(
+                    f"⚠️ Conexão do pool '{nome}' ficou em uso por {duracao:.1f}s "
+                    f"(thread {registro[1]}):\n{''.join(_formatar_pilha(registro[2]))}"
+                )
+
+        @event.listens_for(engine, "engine_disposed")
+        def _descartado(engine_descartado):
+            # dispose() recria o pool: passa a observar o novo
+            estatisticas.pool = engine_descartado.pool
+
+    def registrar_espera(self, nome: Optional[str], duracao: float):
+        """
+        Registra o tempo que um checkout esperou por uma conexão livre
+        """
+        estatisticas = self._estatisticas(nome or "")
+        with self._lock:
+            estatisticas.espera_total += duracao
+            estatisticas.espera_maxima = max(estatisticas.espera_maxima, duracao)
+
+    def conexoes_longas(self, limite: Optional[float] = None) -> List[dict]:
+        """
+        Lista as conexões em uso há mais de `limite` segundos, com a pilha
+        de quem as pegou (candidatas a sessões vazadas)
+        """
+        limite = self.limite_conexao_longa if limite is None else limite
+        agora = time.monotonic()
+        with self._lock:
+            em_uso = [(e.nome, r) for e in self._pools.values() for r in e.em_uso.values()]
+
+        longas = [
+            {
+                "pool": nome,
+                "segundos": round(agora - inicio, 1),
+                "thread": thread,
+                "pilha": _formatar_pilha(pilha)
+            }
+            for nome, (inicio, thread, pilha) in em_uso
+            if agora - inicio > limite
+        ]
+        return sorted(longas, key=lambda c: c["segundos"], reverse=True)
+
+    def estatisticas(self, limite: Optional[float] = None) -> dict:
+        """
+        Retorna o estado de cada pool e as conexões presas há muito tempo
+        """
+        pools = {}
+        with self._lock:
+            for nome, e in self._pools.items():
+                pools[nome] = {
+                    "tamanho": e.pool.size() if e.pool is not None else None,
+                    "em_uso": len(e.em_uso),
+                    "overflow": e.pool.overflow() if e.pool is not None else None,
+                    "checkouts": e.checkouts,
+                    "espera_media_ms": round(e.espera_total / e.checkouts * 1000, 3) if e.checkouts else 0.0,
+                    "espera_maxima_ms": round(e.espera_maxima * 1000, 3)
+                }
+        return {"pools": pools, "conexoes_longas": self.conexoes_longas(limite)}
+
+    def _estatisticas(self, nome: str) -> _EstatisticasPool:
+        with self._lock:
+            if nome not in self._pools:
+                self._pools[nome] = _EstatisticasPool(nome)
+            return self._pools[nome]
+
+
+def _formatar_pilha(pilha: Optional[traceback.StackSummary]) -> List[str]:
+    """
+    Mantém só os frames da aplicação (sem SQLAlchemy, bibliotecas e o próprio monitor)
+    """
+    if pilha is None:
+        return ["(pilha não capturada: use MONITOR_PILHA_CONEXOES=1 ou MONITOR_AMOSTRAGEM_PILHA)\n"]
+    frames = [
+        f for f in pilha
+        if "site-packages" not in f.filename
+        and not f.filename.startswith("<")
+        and not f.filename.endswith("monitorConexoes.py")
+    ]
+    return traceback.format_list(frames)
+
+
+# Instância global compartilhada pela aplicação
+monitor_conexoes = MonitorConexoes()
+
+
+class _MedicaoEspera:
+    """
+    Mede quanto tempo cada checkout espera por uma conexão do pool
+    (inclui abrir uma conexão nova quando o pool ainda não a tem)
+    """
+
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            monitor_conexoes.registrar_espera(self.logging_name, time.perf_counter() - inicio)
+
+
+class QueuePoolMonitorado(_MedicaoEspera, QueuePool):
+    """QueuePool com medição do tempo de espera no checkout"""
+
+    # Mantém os logs do pool no namespace do SQLAlchemy
+    _sqla_logger_namespace = "sqlalchemy.pool.impl.QueuePool"
+
+
+class AsyncAdaptedQueuePoolMonitorado(_MedicaoEspera, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool com medição do tempo de espera no checkout"""
+
+    _sqla_logger_namespace = "sqlalchemy.pool.impl.AsyncAdaptedQueuePool"
@@ -1,40 +1,47 @@
-from fastapi import APIRouter, HTTPException
-from service.AlertaService import AlertaService
+from fastapi import APIRouter, HTTPException, Request, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from config.databaseConfig import get_database_async
+from service.AlertaServiceAsync import AlertaServiceAsync
+from cache_module.etag import gerar_etag, nao_modificado, com_etag
 
 router = APIRouter(prefix="/alertas", tags=["Alertas"])
 
 @router.get("/", summary="Listar todos os alertas")
-def listar_alertas():
-    service = AlertaService()
-    alertas = service.get_all_alertas()
-    return [a.to_dict() for a in alertas]
+async def listar_alertas(request: Request, db: AsyncSession = Depends(get_database_async)):
+    etag = await gerar_etag(request, db, "alerta")
+    resposta = nao_modificado(request, etag)
+    if resposta:
+        return resposta
+    service = AlertaServiceAsync(db)
+    alertas = await service.get_all_alertas()
+    return com_etag([a.to_dict() for a in alertas], etag)
 
 @router.get("/{alerta_id}", summary="Obter alerta por ID")
-def obter_alerta(alerta_id: int):
-    service = AlertaService()
-    alerta = service.get_alerta_by_id(alerta_id)
+async def obter_alerta(alerta_id: int, db: AsyncSession = Depends(get_database_async)):
+    service = AlertaServiceAsync(db)
+    alerta = await service.get_alerta_by_id(alerta_id)
     if not alerta:
         raise HTTPException(status_code=404, detail="Alerta não encontrado")
     return alerta.to_dict()
 
 @router.post("/", summary="Criar novo alerta")
-def criar_alerta(alerta: dict):
-    service = AlertaService()
-    novo_alerta = service.create_alerta(alerta)
+async def criar_alerta(alerta: dict, db: AsyncSession = Depends(get_database_async)):
+    service = AlertaServiceAsync(db)
+    novo_alerta = await service.create_alerta(alerta)
     return novo_alerta.to_dict()
 
 @router.put("/{alerta_id}", summary="Atualizar alerta")
-def atualizar_alerta(alerta_id: int, alerta: dict):
-    service = AlertaService()
-    alerta_atualizado = service.update_alerta(alerta_id, alerta)
+async def atualizar_alerta(alerta_id: int, alerta: dict, db: AsyncSession = Depends(get_database_async)):
+    service = AlertaServiceAsync(db)
+    alerta_atualizado = await service.update_alerta(alerta_id, alerta)
     if not alerta_atualizado:
         raise HTTPException(status_code=404, detail="Alerta não encontrado")
     return alerta_atualizado.to_dict()
 
 @router.delete("/{alerta_id}", summary="Deletar alerta")
-def deletar_alerta(alerta_id: int):
-    service = AlertaService()
-    sucesso = service.delete_alerta(alerta_id)
+async def deletar_alerta(alerta_id: int, db: AsyncSession = Depends(get_database_async)):
+    service = AlertaServiceAsync(db)
+    sucesso = await service.delete_alerta(alerta_id)
     if not sucesso:
         raise HTTPException(status_code=404, detail="Alerta não encontrado")
     return {"detail": "Alerta deletado com sucesso"}
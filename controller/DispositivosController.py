@@ -0,0 +1,116 @@
+from fastapi import HTTPException, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from config.databaseConfig import get_database_async
+from service.DispositivosServiceAsync import DispositivosServiceAsync
+from service.ValoresSensorServiceAsync import ValoresSensorServiceAsync
+from model.sensoresModel import valores_para_json
+from http_module.respostas import RespostaJSONRapida
+from typing import List, Optional
+
+class DispositivosController:
+    """
+    Controller para endpoints de Dispositivos
+    """
+    
+    @staticmethod
+    async def listar_dispositivos(db: AsyncSession = Depends(get_database_async)) -> List[dict]:
+        """
+        Lista todos os dispositivos
+        """
+        try:
+            service = DispositivosServiceAsync(db)
+            dispositivos = await service.listar_todos()
+            return [dispositivo.to_dict() for dispositivo in dispositivos]
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+    
+    @staticmethod
+    async def obter_dispositivo(identificador: str, db: AsyncSession = Depends(get_database_async)) -> dict:
+        """
+        Obtém um dispositivo pelo identificador
+        """
+        try:
+            service = DispositivosServiceAsync(db)
+            dispositivo = await service.buscar_por_identificador(identificador)
+            
+            if dispositivo is None:
+                raise HTTPException(status_code=404, detail="Dispositivo não encontrado")
+            
+            return dispositivo.to_dict()
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+    
+    @staticmethod
+    async def criar_dispositivo(
+        identificador: str,
+        nome: Optional[str] = None,
+        db: AsyncSession = Depends(get_database_async)
+    ) -> dict:
+        """
+        Cadastra um dispositivo
+        """
+        try:
+            if not identificador or not identificador.strip():
+                raise HTTPException(status_code=400, detail="Identificador é obrigatório")
+            
+            service = DispositivosServiceAsync(db)
+            dispositivo = await service.criar(identificador.strip(), nome)
+            
+            return dispositivo.to_dict()
+        except HTTPException:
+            raise
+        except Exception as e:
+            if "Dispositivo já cadastrado" in str(e):
+                raise HTTPException(status_code=409, detail=str(e))
+            raise HTTPException(status_code=500, detail=str(e))
+    
+    @staticmethod
+    async def atualizar_dispositivo(
+        identificador: str,
+        nome: Optional[str] = None,
+        db: AsyncSession = Depends(get_database_async)
+    ) -> dict:
+        """
+        Atualiza o nome de um dispositivo
+        """
+        try:
+            service = DispositivosServiceAsync(db)
+            dispositivo = await service.atualizar(identificador, nome)
+            
+            if dispositivo is None:
+                raise HTTPException(status_code=404, detail="Dispositivo não encontrado")
+            
+            return dispositivo.to_dict()
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+    
+    @staticmethod
+    async def listar_valores(
+        identificador: str,
+        sensor: Optional[int] = None,
+        limit: int = 100,
+        db: AsyncSession = Depends(get_database_async)
+    ) -> RespostaJSONRapida:
+        """
+        Lista os valores enviados por um dispositivo (mais recentes
+        primeiro), de todos os sensores ou de um sensor
+        """
+        try:
+            id_dispositivo = await DispositivosServiceAsync(db).id_por_identificador(identificador)
+            if id_dispositivo is None:
+                raise HTTPException(status_code=404, detail="Dispositivo não encontrado")
+            
+            service = ValoresSensorServiceAsync(db)
+            if sensor is None:
+                linhas = await service.listar_todos_valores_linhas(limit=limit, id_dispositivo=id_dispositivo)
+            else:
+                linhas = await service.listar_valores_por_sensor_linhas(sensor, limit, id_dispositivo)
+            return RespostaJSONRapida(valores_para_json(linhas))
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
@@ -1,7 +1,8 @@
 from fastapi import HTTPException, Depends
-from sqlalchemy.orm import Session
-from config.databaseConfig import get_database
-from service.SensoresService import SensoresService
+from sqlalchemy.ext.asyncio import AsyncSession
+from config.databaseConfig import get_database_async
+from service.SensoresServiceAsync import SensoresServiceAsync
+from service.DispositivosServiceAsync import DispositivosServiceAsync
 from typing import List, Optional
 
 class SensoresController:
@@ -10,25 +11,34 @@ class SensoresController:
     """
     
     @staticmethod
-    async def listar_sensores(db: Session = Depends(get_database)) -> List[dict]:
+    async def listar_sensores(dispositivo: Optional[str] = None,
+                              db: AsyncSession = Depends(get_database_async)) -> List[dict]:
         """
-        Lista todos os sensores
+        Lista todos os sensores, ou os que valem para um dispositivo
+        (os gerais e os próprios dele)
         """
         try:
-            service = SensoresService(db)
-            sensores = service.listar_todos()
+            service = SensoresServiceAsync(db)
+            sensores = await service.listar_todos()
+            if dispositivo is not None:
+                id_dispositivo = await DispositivosServiceAsync(db).id_por_identificador(dispositivo)
+                if id_dispositivo is None:
+                    raise HTTPException(status_code=404, detail=f"Dispositivo '{dispositivo}' não encontrado")
+                sensores = [sensor for sensor in sensores if sensor.id_dispositivo in (None, id_dispositivo)]
             return [sensor.to_dict() for sensor in sensores]
+        except HTTPException:
+            raise
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
     
     @staticmethod
-    async def obter_sensor(sensor_id: int, db: Session = Depends(get_database)) -> dict:
+    async def obter_sensor(sensor_id: int, db: AsyncSession = Depends(get_database_async)) -> dict:
         """
         Obtém um sensor específico por ID
         """
         try:
-            service = SensoresService(db)
-            sensor = service.buscar_por_id(sensor_id)
+            service = SensoresServiceAsync(db)
+            sensor = await service.buscar_por_id(sensor_id)
             
             if sensor is None:
                 raise HTTPException(status_code=404, detail="Sensor não encontrado")
@@ -40,13 +50,13 @@ class SensoresController:
             raise HTTPException(status_code=500, detail=str(e))
     
     @staticmethod
-    async def listar_sensores_por_tipo(tipo_sensor: str, db: Session = Depends(get_database)) -> List[dict]:
+    async def listar_sensores_por_tipo(tipo_sensor: str, db: AsyncSession = Depends(get_database_async)) -> List[dict]:
         """
         Lista sensores por tipo
         """
         try:
-            service = SensoresService(db)
-            sensores = service.buscar_por_tipo(tipo_sensor)
+            service = SensoresServiceAsync(db)
+            sensores = await service.buscar_por_tipo(tipo_sensor)
             return [sensor.to_dict() for sensor in sensores]
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
@@ -56,23 +66,28 @@ class SensoresController:
         nome: str,
         tipo: str,
         unidade: str,
-        db: Session = Depends(get_database)
+        dispositivo: Optional[str] = None,
+        db: AsyncSession = Depends(get_database_async)
     ) -> dict:
         """
-        Cria um novo sensor
+        Cria um novo sensor (geral ou próprio de um dispositivo)
         """
         try:
             # Validações básicas
             if not nome or not tipo or not unidade:
                 raise HTTPException(status_code=400, detail="Nome, tipo e unidade são obrigatórios")
             
-            service = SensoresService(db)
-            novo_sensor = service.criar(nome, tipo, unidade)
+            service = SensoresServiceAsync(db)
+            novo_sensor = await service.criar(nome, tipo, unidade, dispositivo)
             
             return novo_sensor.to_dict()
         except HTTPException:
             raise
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         except Exception as e:
+            if "Sensor já cadastrado" in str(e):
+                raise HTTPException(status_code=409, detail=str(e))
             raise HTTPException(status_code=500, detail=str(e))
     
     @staticmethod
@@ -81,14 +96,14 @@ class SensoresController:
         nome: Optional[str] = None,
         tipo: Optional[str] = None,
         unidade: Optional[str] = None,
-        db: Session = Depends(get_database)
+        db: AsyncSession = Depends(get_database_async)
     ) -> dict:
         """
         Atualiza um sensor existente
         """
         try:
-            service = SensoresService(db)
-            sensor_atualizado = service.atualizar(sensor_id, nome, tipo, unidade)
+            service = SensoresServiceAsync(db)
+            sensor_atualizado = await service.atualizar(sensor_id, nome, tipo, unidade)
             
             if sensor_atualizado is None:
                 raise HTTPException(status_code=404, detail="Sensor não encontrado")
@@ -97,16 +112,18 @@ class SensoresController:
         except HTTPException:
             raise
         except Exception as e:
+            if "Sensor já cadastrado" in str(e):
+                raise HTTPException(status_code=409, detail=str(e))
             raise HTTPException(status_code=500, detail=str(e))
     
     @staticmethod
-    async def deletar_sensor(sensor_id: int, db: Session = Depends(get_database)) -> dict:
+    async def deletar_sensor(sensor_id: int, db: AsyncSession = Depends(get_database_async)) -> dict:
         """
         Deleta um sensor
         """
         try:
-            service = SensoresService(db)
-            sucesso = service.deletar(sensor_id)
+            service = SensoresServiceAsync(db)
+            sucesso = await service.deletar(sensor_id)
             
             if not sucesso:
                 raise HTTPException(status_code=404, detail="Sensor não encontrado")
@@ -118,7 +135,7 @@ class SensoresController:
             raise HTTPException(status_code=500, detail=str(e))
     
     @staticmethod
-    async def buscar_sensores_por_nome(nome: str, db: Session = Depends(get_database)) -> List[dict]:
+    async def buscar_sensores_por_nome(nome: str, db: AsyncSession = Depends(get_database_async)) -> List[dict]:
         """
         Busca sensores por nome
         """
@@ -126,8 +143,8 @@ class SensoresController:
             if not nome:
                 raise HTTPException(status_code=400, detail="Nome é obrigatório para busca")
             
-            service = SensoresService(db)
-            sensores = service.buscar_por_nome(nome)
+            service = SensoresServiceAsync(db)
+            sensores = await service.buscar_por_nome(nome)
             return [sensor.to_dict() for sensor in sensores]
         except HTTPException:
             raise
@@ -135,16 +152,16 @@ class SensoresController:
             raise HTTPException(status_code=500, detail=str(e))
     
     @staticmethod
-    async def estatisticas_sensores(db: Session = Depends(get_database)) -> dict:
+    async def estatisticas_sensores(db: AsyncSession = Depends(get_database_async)) -> dict:
         """
         Retorna estatísticas dos sensores
         """
         try:
-            service = SensoresService(db)
-            total = service.contar_total()
+            service = SensoresServiceAsync(db)
+            total = await service.contar_total()
             
             # Contar por tipo
-            sensores = service.listar_todos()
+            sensores = await service.listar_todos()
             tipos = {}
             for sensor in sensores:
                 if sensor.tipo in tipos:
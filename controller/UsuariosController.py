@@ -1,7 +1,7 @@
 from fastapi import HTTPException, Depends
-from sqlalchemy.orm import Session
-from config.databaseConfig import get_database
-from service.UsuariosService import UsuariosService
+from sqlalchemy.ext.asyncio import AsyncSession
+from config.databaseConfig import get_database_async
+from service.UsuariosServiceAsync import UsuariosServiceAsync
 from typing import List, Optional
 
 class UsuariosController:
@@ -10,25 +10,25 @@ class UsuariosController:
     """
     
     @staticmethod
-    async def listar_usuarios(db: Session = Depends(get_database)) -> List[dict]:
+    async def listar_usuarios(db: AsyncSession = Depends(get_database_async)) -> List[dict]:
         """
         Lista todos os usuários
         """
         try:
-            service = UsuariosService(db)
-            usuarios = service.listar_todos()
+            service = UsuariosServiceAsync(db)
+            usuarios = await service.listar_todos()
             return [usuario.to_dict() for usuario in usuarios]
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
     
     @staticmethod
-    async def obter_usuario(usuario_id: int, db: Session = Depends(get_database)) -> dict:
+    async def obter_usuario(usuario_id: int, db: AsyncSession = Depends(get_database_async)) -> dict:
         """
         Obtém um usuário específico por ID
         """
         try:
-            service = UsuariosService(db)
-            usuario = service.buscar_por_id(usuario_id)
+            service = UsuariosServiceAsync(db)
+            usuario = await service.buscar_por_id(usuario_id)
             
             if usuario is None:
                 raise HTTPException(status_code=404, detail="Usuário não encontrado")
@@ -40,7 +40,7 @@ class UsuariosController:
             raise HTTPException(status_code=500, detail=str(e))
     
     @staticmethod
-    async def obter_usuario_por_email(email: str, db: Session = Depends(get_database)) -> dict:
+    async def obter_usuario_por_email(email: str, db: AsyncSession = Depends(get_database_async)) -> dict:
         """
         Obtém um usuário por email
         """
@@ -48,8 +48,8 @@ class UsuariosController:
             if not email:
                 raise HTTPException(status_code=400, detail="Email é obrigatório")
             
-            service = UsuariosService(db)
-            usuario = service.buscar_por_email(email)
+            service = UsuariosServiceAsync(db)
+            usuario = await service.buscar_por_email(email)
             
             if usuario is None:
                 raise HTTPException(status_code=404, detail="Usuário não encontrado")
@@ -65,7 +65,7 @@ class UsuariosController:
         nome: str,
         email: str,
         senha: str,
-        db: Session = Depends(get_database)
+        db: AsyncSession = Depends(get_database_async)
     ) -> dict:
         """
         Cria um novo usuário
@@ -81,8 +81,8 @@ class UsuariosController:
             if "@" not in email:
                 raise HTTPException(status_code=400, detail="Email inválido")
             
-            service = UsuariosService(db)
-            novo_usuario = service.criar(nome, email, senha)
+            service = UsuariosServiceAsync(db)
+            novo_usuario = await service.criar(nome, email, senha)
             
             return novo_usuario.to_dict()
         except HTTPException:
@@ -98,7 +98,7 @@ class UsuariosController:
         nome: Optional[str] = None,
         email: Optional[str] = None,
         senha: Optional[str] = None,
-        db: Session = Depends(get_database)
+        db: AsyncSession = Depends(get_database_async)
     ) -> dict:
         """
         Atualiza um usuário existente
@@ -111,8 +111,8 @@ class UsuariosController:
             if senha is not None and len(senha) < 6:
                 raise HTTPException(status_code=400, detail="Senha deve ter pelo menos 6 caracteres")
             
-            service = UsuariosService(db)
-            usuario_atualizado = service.atualizar(usuario_id, nome, email, senha)
+            service = UsuariosServiceAsync(db)
+            usuario_atualizado = await service.atualizar(usuario_id, nome, email, senha)
             
             if usuario_atualizado is None:
                 raise HTTPException(status_code=404, detail="Usuário não encontrado")
@@ -126,13 +126,13 @@ class UsuariosController:
             raise HTTPException(status_code=500, detail=str(e))
     
     @staticmethod
-    async def deletar_usuario(usuario_id: int, db: Session = Depends(get_database)) -> dict:
+    async def deletar_usuario(usuario_id: int, db: AsyncSession = Depends(get_database_async)) -> dict:
         """
         Deleta um usuário
         """
         try:
-            service = UsuariosService(db)
-            sucesso = service.deletar(usuario_id)
+            service = UsuariosServiceAsync(db)
+            sucesso = await service.deletar(usuario_id)
             
             if not sucesso:
                 raise HTTPException(status_code=404, detail="Usuário não encontrado")
@@ -144,7 +144,7 @@ class UsuariosController:
             raise HTTPException(status_code=500, detail=str(e))
     
     @staticmethod
-    async def buscar_usuarios_por_nome(nome: str, db: Session = Depends(get_database)) -> List[dict]:
+    async def buscar_usuarios_por_nome(nome: str, db: AsyncSession = Depends(get_database_async)) -> List[dict]:
         """
         Busca usuários por nome
         """
@@ -152,8 +152,8 @@ class UsuariosController:
             if not nome:
                 raise HTTPException(status_code=400, detail="Nome é obrigatório para busca")
             
-            service = UsuariosService(db)
-            usuarios = service.buscar_por_nome(nome)
+            service = UsuariosServiceAsync(db)
+            usuarios = await service.buscar_por_nome(nome)
             return [usuario.to_dict() for usuario in usuarios]
         except HTTPException:
             raise
@@ -161,7 +161,7 @@ class UsuariosController:
             raise HTTPException(status_code=500, detail=str(e))
     
     @staticmethod
-    async def autenticar_usuario(email: str, senha: str, db: Session = Depends(get_database)) -> dict:
+    async def autenticar_usuario(email: str, senha: str, db: AsyncSession = Depends(get_database_async)) -> dict:
         """
         Autentica um usuário
         """
@@ -169,8 +169,8 @@ class UsuariosController:
             if not email or not senha:
                 raise HTTPException(status_code=400, detail="Email e senha são obrigatórios")
             
-            service = UsuariosService(db)
-            usuario = service.autenticar(email, senha)
+            service = UsuariosServiceAsync(db)
+            usuario = await service.autenticar(email, senha)
             
             if usuario is None:
                 raise HTTPException(status_code=401, detail="Credenciais inválidas")
@@ -185,7 +185,7 @@ class UsuariosController:
             raise HTTPException(status_code=500, detail=str(e))
     
     @staticmethod
-    async def verificar_email(email: str, db: Session = Depends(get_database)) -> dict:
+    async def verificar_email(email: str, db: AsyncSession = Depends(get_database_async)) -> dict:
         """
         Verifica se um email já existe
         """
@@ -193,8 +193,8 @@ class UsuariosController:
             if not email:
                 raise HTTPException(status_code=400, detail="Email é obrigatório")
             
-            service = UsuariosService(db)
-            existe = service.email_existe(email)
+            service = UsuariosServiceAsync(db)
+            existe = await service.email_existe(email)
             
             return {"email": email, "existe": existe}
         except HTTPException:
@@ -203,13 +203,13 @@ class UsuariosController:
             raise HTTPException(status_code=500, detail=str(e))
     
     @staticmethod
-    async def estatisticas_usuarios(db: Session = Depends(get_database)) -> dict:
+    async def estatisticas_usuarios(db: AsyncSession = Depends(get_database_async)) -> dict:
         """
         Retorna estatísticas dos usuários
         """
         try:
-            service = UsuariosService(db)
-            total = service.contar_total()
+            service = UsuariosServiceAsync(db)
+            total = await service.contar_total()
             
             return {
                 "total_usuarios": total
@@ -1,70 +1,142 @@
-from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
-from config.databaseConfig import get_database
-from service.ValoresSensorService import ValoresSensorService
+from fastapi import APIRouter, HTTPException, Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from config.databaseConfig import get_database_async
+from service.ValoresSensorServiceAsync import ValoresSensorServiceAsync
+from service.DispositivosServiceAsync import DispositivosServiceAsync
+from service.AgregadosServiceAsync import AgregadosServiceAsync
+from model.sensoresModel import valores_para_json
+from http_module.respostas import RespostaJSONRapida
+from http_module.lote import ler_corpo_lote, ler_itens_lote, ler_timestamp, ErroLote
+from cache_module.etag import gerar_etag, nao_modificado, com_etag
+from tarefas_module.TarefaController import TarefaController
 
 router = APIRouter(prefix="/valores", tags=["Valores dos Sensores"])
 
+async def id_dispositivo(db: AsyncSession, dispositivo: Optional[str]) -> Optional[int]:
+    """
+    Converte o filtro ?dispositivo= (identificador) no ID do dispositivo
+    (404 se não existir)
+    """
+    if dispositivo is None:
+        return None
+    id_encontrado = await DispositivosServiceAsync(db).id_por_identificador(dispositivo)
+    if id_encontrado is None:
+        raise HTTPException(status_code=404, detail=f"Dispositivo '{dispositivo}' não encontrado")
+    return id_encontrado
+
+@router.post("/lote", summary="Inserir valores em lote")
+async def criar_valores_lote(request: Request, db: AsyncSession = Depends(get_database_async)):
+    """
+    Insere várias leituras de uma vez. O corpo é um array JSON (ou NDJSON,
+    com content-type application/x-ndjson) de objetos com id_sensor ou
+    sensor (nome), valor, timestamp opcional (horário da medição: leituras
+    enviadas com atraso ficam no horário certo) e dispositivo
+    (identificador) opcional. Retorna o status de cada item.
+    """
+    try:
+        itens = ler_itens_lote(await ler_corpo_lote(request), request.headers.get("content-type", ""))
+    except ErroLote as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+    try:
+        resultados = await ValoresSensorServiceAsync(db).criar_valores_lote(itens)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    inseridos = sum(1 for r in resultados if r["status"] == "ok")
+    return RespostaJSONRapida({
+        "recebidos": len(itens),
+        "inseridos": inseridos,
+        "erros": len(itens) - inseridos,
+        "itens": resultados
+    })
+
 @router.post("/{id_sensor}", summary="Criar novo valor para sensor")
-async def criar_valor(id_sensor: int, valor: float, db: Session = Depends(get_database)):
+async def criar_valor(id_sensor: int, valor: float, dispositivo: Optional[str] = None,
+                      db: AsyncSession = Depends(get_database_async)):
     """
-    Cria um novo valor para um sensor específico
+    Cria um novo valor para um sensor específico (enviado pelo dispositivo
+    informado, cadastrado se ainda não existir)
     """
     try:
-        service = ValoresSensorService(db)
-        novo_valor = service.criar_valor(valor=valor, id_sensor=id_sensor)
+        service = ValoresSensorServiceAsync(db)
+        novo_valor = await service.criar_valor(valor=valor, id_sensor=id_sensor, dispositivo=dispositivo)
         return novo_valor.to_dict()
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/{id_sensor}", summary="Listar valores de um sensor")
-async def listar_valores_sensor(id_sensor: int, limit: int = 100, db: Session = Depends(get_database)):
+async def listar_valores_sensor(request: Request, id_sensor: int, limit: int = 100, dispositivo: Optional[str] = None,
+                                db: AsyncSession = Depends(get_database_async)):
     """
-    Lista os valores de um sensor específico (mais recentes primeiro)
+    Lista os valores de um sensor específico (mais recentes primeiro),
+    opcionalmente só os de um dispositivo
     """
+    etag = await gerar_etag(request, db, "valores_sensor", id_sensor)
+    resposta = nao_modificado(request, etag)
+    if resposta:
+        return resposta
+
+    filtro = await id_dispositivo(db, dispositivo)
     try:
-        service = ValoresSensorService(db)
-        valores = service.listar_valores_por_sensor(id_sensor=id_sensor, limit=limit)
-        return [valor.to_dict() for valor in valores]
+        service = ValoresSensorServiceAsync(db)
+        linhas = await service.listar_valores_por_sensor_linhas(id_sensor=id_sensor, limit=limit, id_dispositivo=filtro)
+        return com_etag(RespostaJSONRapida(valores_para_json(linhas)), etag)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/{id_sensor}/ultimo", summary="Obter último valor de um sensor")
-async def obter_ultimo_valor(id_sensor: int, db: Session = Depends(get_database)):
+async def obter_ultimo_valor(request: Request, id_sensor: int, dispositivo: Optional[str] = None,
+                             db: AsyncSession = Depends(get_database_async)):
     """
-    Obtém o último valor registrado de um sensor
+    Obtém o último valor registrado de um sensor (de um dispositivo, se informado)
     """
+    etag = await gerar_etag(request, db, "valores_sensor", id_sensor)
+    resposta = nao_modificado(request, etag)
+    if resposta:
+        return resposta
+
+    filtro = await id_dispositivo(db, dispositivo)
     try:
-        service = ValoresSensorService(db)
-        ultimo_valor = service.obter_ultimo_valor(id_sensor=id_sensor)
+        service = ValoresSensorServiceAsync(db)
+        ultimo_valor = await service.ultimo_valor(id_sensor=id_sensor, id_dispositivo=filtro)
         
         if not ultimo_valor:
-            return {"valor": None, "timestamp": None}
+            return com_etag({"valor": None, "timestamp": None}, etag)
         
-        return ultimo_valor.to_dict()
+        return com_etag(ultimo_valor, etag)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/", summary="Listar todos os valores")
-async def listar_todos_valores(limit: int = 1000, db: Session = Depends(get_database)):
+async def listar_todos_valores(request: Request, limit: int = 1000, dispositivo: Optional[str] = None,
+                               db: AsyncSession = Depends(get_database_async)):
     """
-    Lista todos os valores de todos os sensores (mais recentes primeiro)
+    Lista todos os valores de todos os sensores (mais recentes primeiro),
+    opcionalmente só os de um dispositivo
     """
+    etag = await gerar_etag(request, db, "valores_sensor")
+    resposta = nao_modificado(request, etag)
+    if resposta:
+        return resposta
+
+    filtro = await id_dispositivo(db, dispositivo)
     try:
-        service = ValoresSensorService(db)
-        valores = service.listar_todos_valores(limit=limit)
-        return [valor.to_dict() for valor in valores]
+        service = ValoresSensorServiceAsync(db)
+        linhas = await service.listar_todos_valores_linhas(limit=limit, id_dispositivo=filtro)
+        return com_etag(RespostaJSONRapida(valores_para_json(linhas)), etag)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.delete("/valor/{id_valor}", summary="Deletar um valor específico")
-async def deletar_valor(id_valor: int, db: Session = Depends(get_database)):
+async def deletar_valor(id_valor: int, db: AsyncSession = Depends(get_database_async)):
     """
     Deleta um valor específico
     """
     try:
-        service = ValoresSensorService(db)
-        sucesso = service.deletar_valor(id_valor=id_valor)
+        service = ValoresSensorServiceAsync(db)
+        sucesso = await service.deletar_valor(id_valor=id_valor)
         
         if not sucesso:
             raise HTTPException(status_code=404, detail="Valor não encontrado")
@@ -74,36 +146,55 @@ async def deletar_valor(id_valor: int, db: Session = Depends(get_database)):
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/{id_sensor}/estatisticas", summary="Estatísticas de um sensor")
-async def estatisticas_sensor(id_sensor: int, db: Session = Depends(get_database)):
+async def estatisticas_sensor(id_sensor: int, dispositivo: Optional[str] = None,
+                              db: AsyncSession = Depends(get_database_async)):
     """
-    Obtém estatísticas de um sensor (total de valores, último valor, etc.)
+    Obtém estatísticas de um sensor (total de valores, último valor, etc.),
+    opcionalmente só as de um dispositivo
     """
+    filtro = await id_dispositivo(db, dispositivo)
     try:
-        service = ValoresSensorService(db)
+        service = ValoresSensorServiceAsync(db)
         
-        total_valores = service.contar_valores_por_sensor(id_sensor=id_sensor)
-        ultimo_valor = service.obter_ultimo_valor(id_sensor=id_sensor)
+        total_valores = await service.contar_valores_por_sensor(id_sensor=id_sensor, id_dispositivo=filtro)
+        ultimo_valor = await service.ultimo_valor(id_sensor=id_sensor, id_dispositivo=filtro)
         
         return {
             "id_sensor": id_sensor,
+            "dispositivo": dispositivo,
             "total_valores": total_valores,
-            "ultimo_valor": ultimo_valor.to_dict() if ultimo_valor else None
+            "ultimo_valor": ultimo_valor
         }
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-@router.delete("/{id_sensor}/limpeza", summary="Limpar valores antigos")
-async def limpar_valores_antigos(id_sensor: int, manter_ultimos: int = 1000, db: Session = Depends(get_database)):
+@router.get("/{id_sensor}/agregados", summary="Agregados de um sensor por hora ou por dia")
+async def agregados_sensor(id_sensor: int, intervalo: str = "hora", inicio: Optional[str] = None,
+                           fim: Optional[str] = None, dispositivo: Optional[str] = None,
+                           db: AsyncSession = Depends(get_database_async)):
     """
-    Remove valores antigos de um sensor, mantendo apenas os N mais recentes
+    Quantidade, média, mínimo, máximo e último valor por hora (ou dia) pelo
+    horário das medições, mais recentes primeiro, entre inicio e fim (ISO
+    8601). Intervalos com "fechado": false ainda estão na janela de
+    reordenação e podem mudar com leituras atrasadas; "atrasadas" conta as
+    que chegaram depois dela. Sem ETag: "fechado" muda com o passar do tempo.
     """
+    filtro = await id_dispositivo(db, dispositivo)
     try:
-        service = ValoresSensorService(db)
-        deletados = service.deletar_valores_antigos(id_sensor=id_sensor, manter_ultimos=manter_ultimos)
-        
-        return {
-            "detail": f"{deletados} valores antigos foram removidos",
-            "mantidos": manter_ultimos
-        }
+        agregados = await AgregadosServiceAsync(db).listar(
+            id_sensor, filtro, intervalo, ler_timestamp(inicio), ler_timestamp(fim)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+    return RespostaJSONRapida({"id_sensor": id_sensor, "intervalo": intervalo, "agregados": agregados})
+
+@router.delete("/{id_sensor}/limpeza", summary="Limpar valores antigos")
+async def limpar_valores_antigos(id_sensor: int, manter_ultimos: int = 1000):
+    """
+    Remove valores antigos de um sensor, mantendo apenas os N mais recentes.
+    Roda em segundo plano (tarefa limpeza_valores, em blocos): responde 202
+    com a tarefa, acompanhada em /tarefas/{id}.
+    """
+    return await TarefaController.enviar("limpeza_valores", {"id_sensor": id_sensor, "manter_ultimos": manter_ultimos})
\ No newline at end of file
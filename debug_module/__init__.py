@@ -0,0 +1 @@
+# Módulo Debug - Perfis de requisições e diagnóstico de desempenho
\ No newline at end of file
@@ -0,0 +1,134 @@
+import collections
+import logging
+import os
+from datetime import datetime
+from typing import Any, List, Optional
+from config.databaseConfig import observar_consultas, formato_consulta
+
+logger = logging.getLogger(__name__)
+
+# Consultas acima deste tempo (ms) são registradas
+LIMITE_CONSULTA_LENTA_MS = float(os.getenv("CONSULTA_LENTA_MS", "100"))
+
+# Quantidade de consultas lentas mantidas em memória (as mais antigas são descartadas)
+MAX_CONSULTAS_LENTAS = 100
+
+# Só consultas de dados têm plano (PRAGMA, BEGIN, SAVEPOINT e DDL são ignorados)
+_COMANDOS_COM_PLANO = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+
+
+class DetectorConsultasLentas:
+    """
+    Registra consultas lentas e consultas cujo plano faz varredura completa.
+    O EXPLAIN QUERY PLAN roda uma única vez por formato de consulta, na
+    primeira execução, então uma varredura (ex.: LIKE '%...%', NOT IN com
+    subconsulta) aparece logo no primeiro uso, e não só quando ficar lenta.
+    """
+
+    def __init__(self, limite_ms: float = LIMITE_CONSULTA_LENTA_MS, max_consultas: int = MAX_CONSULTAS_LENTAS):
+        self.limite = limite_ms / 1000
+        self._consultas = collections.deque(maxlen=max_consultas)
+        # Plano por formato de consulta (None = sem plano)
+        self._planos = {}
+
+    def observar(self, conn, cursor, statement, parameters, executemany, inicio, duracao):
+        formato = formato_consulta(statement)
+        conhecida = formato in self._planos
+        if conhecida and duracao < self.limite:
+            # Caminho comum: consulta rápida já analisada
+            return
+
+        if not conhecida:
+            self._planos[formato] = self._explicar(conn, statement, parameters, executemany)
+        plano = self._planos[formato]
+
+        if duracao >= self.limite:
+            motivo = "lenta"
+        elif plano and _tem_varredura(plano, formato):
+            motivo = "varredura"
+        else:
+            return
+
+        self._consultas.append({
+            "quando": datetime.now().isoformat(),
+            "banco": conn.engine.pool.logging_name or "outro",
+            "motivo": motivo,
+            "duracao_ms": round(duracao * 1000, 2),
+            "sql": formato,
+            "parametros": _formato_parametros(parameters, executemany),
+            "plano": plano
+        })
+        if motivo == "lenta":
+            logger.warning(f"🐢 Consulta lenta ({duracao * 1000:.0f} ms): {formato[:200]}")
+        else:
+            logger.warning(f"🔍 Consulta com varredura completa: {formato[:200]}")
+
+    def _explicar(self, conn, statement: str, parameters: Any, executemany: bool) -> Optional[List[str]]:
+        """
+        Executa EXPLAIN QUERY PLAN na mesma conexão DBAPI (sem disparar
+        os eventos do SQLAlchemy) e retorna as linhas do plano indentadas
+        """
+        if not statement.lstrip()[:6].upper().startswith(_COMANDOS_COM_PLANO):
+            return None
+        if executemany:
+            parameters = parameters[0] if parameters else ()
+        try:
+            cursor = conn.connection.dbapi_connection.cursor()
+            try:
+                cursor.execute("EXPLAIN QUERY PLAN " + statement, parameters)
+                linhas = cursor.fetchall()
+            finally:
+                cursor.close()
+        except Exception as e:
+            logger.debug(f"Não foi possível obter o plano da consulta: {e}")
+            return None
+
+        # Cada linha: (id, pai, não usado, detalhe); a indentação segue a árvore do plano
+        niveis = {0: -1}
+        plano = []
+        for id_no, pai, _, detalhe in linhas:
+            niveis[id_no] = niveis.get(pai, -1) + 1
+            plano.append("  " * niveis[id_no] + detalhe)
+        return plano
+
+    def listar(self) -> List[dict]:
+        return list(reversed(self._consultas))
+
+    def limpar(self):
+        """
+        Esvazia o registro e esquece os planos (voltam a ser analisados)
+        """
+        self._consultas.clear()
+        self._planos.clear()
+
+
+def _tem_varredura(plano: List[str], formato: str) -> bool:
+    """
+    Varredura completa de tabela (sem índice) em consulta com filtro,
+    ou ordenação em árvore temporária (ORDER BY sem índice)
+    """
+    com_filtro = " WHERE " in formato.upper()
+    for linha in plano:
+        detalhe = linha.strip()
+        if detalhe.startswith("USE TEMP B-TREE"):
+            return True
+        if com_filtro and detalhe.startswith("SCAN ") and not detalhe.startswith(("SCAN (", "SCAN CONSTANT ROW")) and " USING " not in detalhe:
+            return True
+    return False
+
+
+def _formato_parametros(parameters: Any, executemany: bool) -> str:
+    """
+    Descreve só a forma dos parâmetros (tipos e quantidade), nunca os valores
+    """
+    if executemany:
+        quantidade = len(parameters)
+        return f"{quantidade} x {_formato_parametros(parameters[0], False)}" if quantidade else "0 x ()"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{nome}: {type(valor).__name__}" for nome, valor in parameters.items()) + "}"
+    return "(" + ", ".join(type(valor).__name__ for valor in parameters or ()) + ")"
+
+
+# Instância global compartilhada pela aplicação
+detector_consultas_lentas = DetectorConsultasLentas()
+observar_consultas(detector_consultas_lentas.observar)
@@ -0,0 +1,44 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import Response
+from debug_module.perfilador import repositorio_perfis
+from debug_module.consultasLentas import detector_consultas_lentas
+
+# Criar router para diagnóstico de desempenho
+router = APIRouter(
+    prefix="/api/debug",
+    tags=["debug"]
+)
+
+@router.get("/perfis")
+async def listar_perfis():
+    """Lista os perfis de requisições guardados (mais recentes primeiro)"""
+    return repositorio_perfis.listar()
+
+@router.get("/perfis/{perfil_id}")
+async def baixar_perfil(perfil_id: int):
+    """Baixa um perfil no formato speedscope (abrir em https://www.speedscope.app)"""
+    perfil = repositorio_perfis.obter(perfil_id)
+    if perfil is None:
+        raise HTTPException(status_code=404, detail="Perfil não encontrado")
+    return Response(
+        perfil.speedscope(),
+        media_type="application/json",
+        headers={"Content-Disposition": f'attachment; filename="perfil-{perfil_id}.speedscope.json"'}
+    )
+
+@router.get("/slow-queries")
+async def listar_consultas_lentas():
+    """
+    Lista as consultas lentas e as que fazem varredura completa
+    (mais recentes primeiro), com o plano de execução de cada uma
+    """
+    return {
+        "limite_ms": detector_consultas_lentas.limite * 1000,
+        "consultas": detector_consultas_lentas.listar()
+    }
+
+@router.delete("/slow-queries")
+async def limpar_consultas_lentas():
+    """Esvazia o registro de consultas lentas e reanalisa os planos"""
+    detector_consultas_lentas.limpar()
+    return {"message": "Registro de consultas lentas limpo"}
@@ -0,0 +1,207 @@
+import collections
+import itertools
+import logging
+import os
+import random
+import re
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime
+from typing import List, Optional, Tuple
+import orjson
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from config.databaseConfig import observar_consultas
+
+try:
+    from pyinstrument import Profiler
+    from pyinstrument.renderers import SpeedscopeRenderer
+except ImportError:  # pyinstrument é opcional; sem ele o perfilador fica desativado
+    Profiler = None
+
+logger = logging.getLogger(__name__)
+
+# Valor esperado no cabeçalho X-Perfil para perfilar uma requisição (vazio desativa)
+TOKEN_PERFIL = os.getenv("PERFIL_TOKEN", "")
+
+# Fração das requisições perfiladas por amostragem (ex.: 0.01 = 1%)
+AMOSTRAGEM_PERFIL = float(os.getenv("PERFIL_AMOSTRAGEM", "0"))
+
+# Intervalo (s) entre amostras do profiler
+INTERVALO_AMOSTRAS = 0.001
+
+# Quantidade de perfis mantidos em memória (os mais antigos são descartados)
+MAX_PERFIS = 20
+
+# Consultas SQL da requisição perfilada atual: (início, fim, SQL)
+_consultas_perfil: ContextVar[Optional[List[Tuple[float, float, str]]]] = ContextVar("consultas_perfil", default=None)
+
+_ESPACOS = re.compile(r"\s+")
+
+
+@observar_consultas
+def _registrar_consulta(conn, cursor, statement, parameters, executemany, inicio, duracao):
+    # Sem perfil ativo, custa apenas um ContextVar.get
+    consultas = _consultas_perfil.get()
+    if consultas is not None:
+        consultas.append((inicio, inicio + duracao, statement))
+
+
+class Perfil:
+    """
+    Perfil de uma requisição: sessão do pyinstrument e consultas SQL
+    """
+
+    def __init__(self, id: int, metodo: str, caminho: str, inicio: float):
+        self.id = id
+        self.metodo = metodo
+        self.caminho = caminho
+        self.inicio = inicio
+        self.criado_em = datetime.now()
+        self.status: Optional[int] = None
+        self.duracao = 0.0
+        self.consultas: List[Tuple[float, float, str]] = []
+        self.sessao = None
+
+    @property
+    def tempo_sql(self) -> float:
+        return sum(fim - inicio for inicio, fim, _ in self.consultas)
+
+    def resumo(self) -> dict:
+        return {
+            "id": self.id,
+            "metodo": self.metodo,
+            "caminho": self.caminho,
+            "status": self.status,
+            "criado_em": self.criado_em.isoformat(),
+            "duracao_ms": round(self.duracao * 1000, 2),
+            "sql_ms": round(self.tempo_sql * 1000, 2),
+            "consultas": len(self.consultas)
+        }
+
+    def speedscope(self) -> bytes:
+        """
+        Gera o arquivo speedscope (https://www.speedscope.app): o perfil de CPU
+        do pyinstrument e um segundo perfil, "SQL", com cada consulta executada
+        """
+        arquivo = orjson.loads(SpeedscopeRenderer().render(self.sessao))
+        frames = arquivo["shared"]["frames"]
+        indices = {}
+        eventos = []
+        fim_anterior = 0.0
+        for inicio, fim, sql in sorted(self.consultas):
+            nome = _ESPACOS.sub(" ", sql).strip()[:300]
+            if nome not in indices:
+                indices[nome] = len(frames)
+                frames.append({"name": nome, "file": "sql", "line": 0})
+            # Consultas concorrentes (ex.: gather) são serializadas na linha do tempo
+            abertura = max(inicio - self.inicio, fim_anterior)
+            fim_anterior = max(fim - self.inicio, abertura)
+            eventos.append({"type": "O", "at": abertura, "frame": indices[nome]})
+            eventos.append({"type": "C", "at": fim_anterior, "frame": indices[nome]})
+
+        arquivo["profiles"].append({
+            "type": "evented",
+            "name": f"SQL ({len(self.consultas)} consultas, {self.tempo_sql * 1000:.1f} ms)",
+            "unit": "seconds",
+            "startValue": 0,
+            "endValue": max(self.duracao, fim_anterior),
+            "events": eventos
+        })
+        arquivo["name"] = f"{self.metodo} {self.caminho}"
+        return orjson.dumps(arquivo)
+
+
+class RepositorioPerfis:
+    """
+    Guarda os últimos perfis em memória. O arquivo speedscope só é
+    gerado quando o perfil é baixado, fora do caminho da requisição.
+    """
+
+    def __init__(self, max_perfis: int = MAX_PERFIS):
+        self._perfis = collections.OrderedDict()
+        self._max_perfis = max_perfis
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def novo_id(self) -> int:
+        return next(self._ids)
+
+    def adicionar(self, perfil: Perfil):
+        with self._lock:
+            self._perfis[perfil.id] = perfil
+            while len(self._perfis) > self._max_perfis:
+                self._perfis.popitem(last=False)
+
+    def obter(self, id: int) -> Optional[Perfil]:
+        with self._lock:
+            return self._perfis.get(id)
+
+    def listar(self) -> List[dict]:
+        with self._lock:
+            perfis = list(self._perfis.values())
+        return [perfil.resumo() for perfil in reversed(perfis)]
+
+
+# Instância global compartilhada pela aplicação
+repositorio_perfis = RepositorioPerfis()
+
+
+class PerfilMiddleware:
+    """
+    Middleware ASGI de perfilamento sob demanda. Uma requisição é perfilada
+    quando traz o cabeçalho X-Perfil com o token configurado ou quando é
+    sorteada pela amostragem. A resposta recebe X-Perfil-Id e Server-Timing
+    (tempo total e de SQL); o perfil fica em /api/debug/perfis/{id}.
+    Desativado, o custo é só verificar os cabeçalhos.
+    """
+
+    def __init__(self, app: ASGIApp, token: str = TOKEN_PERFIL, amostragem: float = AMOSTRAGEM_PERFIL):
+        self.app = app
+        self.token = token.encode("latin-1")
+        self.amostragem = amostragem
+        if Profiler is None and (token or amostragem):
+            logger.warning("⚠️ Perfilador configurado, mas o pyinstrument não está instalado")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not self._deve_perfilar(scope):
+            await self.app(scope, receive, send)
+            return
+
+        perfil = Perfil(repositorio_perfis.novo_id(), scope["method"], scope["path"], time.perf_counter())
+        consultas: List[Tuple[float, float, str]] = []
+        token_consultas = _consultas_perfil.set(consultas)
+        profiler = Profiler(interval=INTERVALO_AMOSTRAS, async_mode="enabled")
+
+        async def enviar(message: Message):
+            if message["type"] == "http.response.start":
+                perfil.status = message["status"]
+                sql_ms = sum(fim - inicio for inicio, fim, _ in consultas) * 1000
+                total_ms = (time.perf_counter() - perfil.inicio) * 1000
+                headers = MutableHeaders(scope=message)
+                headers.append("X-Perfil-Id", str(perfil.id))
+                headers.append("Server-Timing", f'sql;dur={sql_ms:.2f};desc="{len(consultas)} consultas", app;dur={total_ms:.2f}')
+            await send(message)
+
+        profiler.start()
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            profiler.stop()
+            _consultas_perfil.reset(token_consultas)
+            perfil.duracao = time.perf_counter() - perfil.inicio
+            perfil.consultas = consultas
+            perfil.sessao = profiler.last_session
+            repositorio_perfis.adicionar(perfil)
+
+    def _deve_perfilar(self, scope: Scope) -> bool:
+        if Profiler is None:
+            return False
+        if self.amostragem and random.random() < self.amostragem:
+            return True
+        if self.token:
+            for nome, valor in scope["headers"]:
+                if nome == b"x-perfil":
+                    return valor == self.token
+        return False
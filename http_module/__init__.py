@@ -0,0 +1 @@
+# Módulo HTTP - Respostas, middlewares e utilitários da camada web
\ No newline at end of file
@@ -0,0 +1,112 @@
+import gzip
+from typing import Iterable, Optional
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from cache_module.cacheLeitura import registrar_cache
+
+try:
+    import brotli
+except ImportError:  # brotli é opcional; sem ele usamos apenas gzip
+    brotli = None
+
+# Tipos de conteúdo que valem a pena comprimir
+TIPOS_COMPRESSIVEIS = ("application/json", "text/plain", "text/html", "text/csv")
+
+# Respostas já comprimidas, indexadas por (método, caminho, consulta, ETag,
+# codificação): o ETag só identifica a versão dentro do mesmo recurso
+cache_comprimidos = registrar_cache("compressao", max_itens=64, ttl=600.0)
+
+
+class CompressaoMiddleware:
+    """
+    Middleware ASGI que comprime respostas com brotli (se disponível) ou gzip.
+    Respostas com ETag são guardadas já comprimidas, evitando recomprimir
+    o mesmo conteúdo a cada requisição.
+    """
+
+    def __init__(self, app: ASGIApp, tamanho_minimo: int = 1024,
+                 tipos: Iterable[str] = TIPOS_COMPRESSIVEIS,
+                 nivel_gzip: int = 6, qualidade_brotli: int = 5):
+        self.app = app
+        self.tamanho_minimo = tamanho_minimo
+        self.tipos = tuple(tipos)
+        self.nivel_gzip = nivel_gzip
+        self.qualidade_brotli = qualidade_brotli
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        codificacao = self._escolher_codificacao(Headers(scope=scope).get("accept-encoding", ""))
+        if codificacao is None:
+            await self.app(scope, receive, send)
+            return
+
+        inicio: Optional[Message] = None
+        repassar = False
+
+        async def enviar(message: Message):
+            nonlocal inicio, repassar
+
+            if message["type"] == "http.response.start":
+                inicio = message
+                return
+            if message["type"] != "http.response.body" or repassar:
+                await send(message)
+                return
+
+            # Respostas em streaming (ex.: SSE) são repassadas sem compressão
+            corpo = message.get("body", b"")
+            if message.get("more_body", False) or not self._deve_comprimir(inicio, corpo):
+                repassar = True
+                await send(inicio)
+                await send(message)
+                return
+
+            headers = MutableHeaders(scope=inicio)
+            comprimido = self._comprimir(corpo, codificacao, scope, headers.get("etag"))
+            headers["Content-Encoding"] = codificacao
+            headers["Content-Length"] = str(len(comprimido))
+            headers.add_vary_header("Accept-Encoding")
+            if "etag" in headers and not headers["etag"].startswith("W/"):
+                # O corpo comprimido não é idêntico byte a byte: o ETag passa a ser fraco
+                headers["ETag"] = "W/" + headers["etag"]
+
+            await send(inicio)
+            await send({"type": "http.response.body", "body": comprimido, "more_body": False})
+
+        await self.app(scope, receive, enviar)
+
+    def _comprimir(self, corpo: bytes, codificacao: str, scope: Scope, etag: Optional[str]) -> bytes:
+        """
+        Comprime o corpo, reaproveitando o resultado em cache quando há ETag
+        """
+        if etag is None:
+            return self._executar_compressao(corpo, codificacao)
+        return cache_comprimidos.obter_ou_calcular(
+            (scope["method"], scope["path"], scope["query_string"], etag, codificacao),
+            lambda: self._executar_compressao(corpo, codificacao)
+        )
+
+    def _executar_compressao(self, corpo: bytes, codificacao: str) -> bytes:
+        if codificacao == "br":
+            return brotli.compress(corpo, quality=self.qualidade_brotli)
+        return gzip.compress(corpo, compresslevel=self.nivel_gzip)
+
+    def _escolher_codificacao(self, accept_encoding: str) -> Optional[str]:
+        aceitas = {parte.split(";")[0].strip().lower() for parte in accept_encoding.split(",")}
+        if brotli is not None and "br" in aceitas:
+            return "br"
+        if "gzip" in aceitas:
+            return "gzip"
+        return None
+
+    def _deve_comprimir(self, inicio: Message, corpo: bytes) -> bool:
+        headers = Headers(raw=inicio["headers"])
+        return (
+            inicio["status"] == 200
+            and len(corpo) >= self.tamanho_minimo
+            and "content-encoding" not in headers
+            and headers.get("content-type", "").startswith(self.tipos)
+        )
@@ -0,0 +1,138 @@
+import os
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import Any, List, Optional
+import orjson
+from starlette.requests import Request
+
+# Máximo de itens aceitos em uma requisição de lote
+MAX_ITENS_LOTE = 10000
+
+# Tamanho máximo do corpo, como recebido e depois de descomprimido
+# (protege contra "gzip bombs")
+MAX_BYTES_LOTE = 64 * 1024 * 1024
+
+# Quanto o relógio de um dispositivo pode estar adiantado em relação ao
+# recebimento da leitura
+TOLERANCIA_FUTURO = timedelta(seconds=float(os.getenv("VALORES_TOLERANCIA_FUTURO", "300")))
+
+# Horários anteriores a este vêm de relógios nunca sincronizados (ex.: RTC
+# que começa em 1970 ou 2000) e não são usados
+HORARIO_MINIMO = datetime(2001, 1, 1)
+
+
+class ErroLote(ValueError):
+    """
+    Corpo de lote inválido (formato, tamanho ou itens que não são objetos)
+    """
+
+    def __init__(self, mensagem: str, status_code: int = 400):
+        super().__init__(mensagem)
+        self.status_code = status_code
+
+
+async def ler_corpo_lote(request: Request, max_bytes: int = MAX_BYTES_LOTE) -> bytes:
+    """
+    Lê o corpo de uma requisição de lote recusando (413) os maiores que
+    max_bytes: pelo Content-Length, antes de ler, e durante a leitura
+    (corpos sem Content-Length, em chunks)
+    """
+    tamanho = request.headers.get("content-length", "")
+    if tamanho.isdigit() and int(tamanho) > max_bytes:
+        raise ErroLote(f"Lote de {tamanho} bytes excede {max_bytes} bytes", status_code=413)
+
+    partes = []
+    recebidos = 0
+    async for parte in request.stream():
+        recebidos += len(parte)
+        if recebidos > max_bytes:
+            raise ErroLote(f"Lote excede {max_bytes} bytes", status_code=413)
+        partes.append(parte)
+    return b"".join(partes)
+
+
+def ler_itens_lote(corpo: bytes, content_type: str = "", content_encoding: str = "",
+                   max_itens: int = MAX_ITENS_LOTE) -> List[dict]:
+    """
+    Lê o corpo de uma requisição de lote: um array JSON ou NDJSON (um objeto
+    JSON por linha), opcionalmente comprimido com gzip (Content-Encoding: gzip)
+    """
+    if "gzip" in content_encoding.lower():
+        corpo = descomprimir_gzip(corpo)
+
+    # NDJSON quando declarado no content-type ou quando o corpo não é um array
+    ndjson = "ndjson" in content_type or not corpo.lstrip().startswith(b"[")
+    try:
+        if ndjson:
+            itens = [orjson.loads(linha) for linha in corpo.splitlines() if linha.strip()]
+        else:
+            itens = orjson.loads(corpo)
+    except orjson.JSONDecodeError as e:
+        raise ErroLote(f"JSON inválido: {e}")
+
+    if not isinstance(itens, list):
+        raise ErroLote("O corpo deve ser um array JSON ou NDJSON")
+    if len(itens) > max_itens:
+        raise ErroLote(f"Lote com {len(itens)} itens excede o máximo de {max_itens}", status_code=413)
+    if not all(isinstance(item, dict) for item in itens):
+        raise ErroLote("Todos os itens do lote devem ser objetos JSON")
+    return itens
+
+
+def descomprimir_gzip(corpo: bytes, max_bytes: int = MAX_BYTES_LOTE) -> bytes:
+    """
+    Descomprime um corpo gzip, recusando resultados maiores que max_bytes
+    """
+    descompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    try:
+        resultado = descompressor.decompress(corpo, max_bytes)
+    except zlib.error as e:
+        raise ErroLote(f"Corpo gzip inválido: {e}")
+    if descompressor.unconsumed_tail:
+        raise ErroLote(f"Lote descomprimido excede {max_bytes} bytes", status_code=413)
+    return resultado
+
+
+def ler_timestamp(valor: Any) -> Optional[datetime]:
+    """
+    Converte um timestamp ISO 8601 (ou datetime) de um item de lote para
+    datetime UTC sem fuso (mesmo formato do CURRENT_TIMESTAMP do SQLite).
+    None se ausente.
+    """
+    if valor is None:
+        return None
+    if isinstance(valor, datetime):
+        data = valor
+    else:
+        try:
+            data = datetime.fromisoformat(valor)
+        except (TypeError, ValueError):
+            raise ValueError(f"Timestamp inválido: {valor!r}")
+    if data.tzinfo is not None:
+        data = data.astimezone(timezone.utc).replace(tzinfo=None)
+    return data
+
+
+def ler_horario_evento(valor: Any, recebido: datetime) -> Optional[datetime]:
+    """
+    Horário do evento informado pelo dispositivo (ISO 8601 ou segundos/ms
+    Unix), validado em relação ao horário de recebimento: ValueError se o
+    relógio do dispositivo estiver adiantado além de TOLERANCIA_FUTURO ou
+    não sincronizado. None se ausente.
+    """
+    if isinstance(valor, (int, float)) and not isinstance(valor, bool):
+        # Milissegundos a partir de ~1973 em segundos (ESP32: millis de época)
+        segundos = valor / 1000 if valor > 1e11 else valor
+        try:
+            data = datetime.fromtimestamp(segundos, timezone.utc).replace(tzinfo=None)
+        except (OverflowError, OSError, ValueError):
+            raise ValueError(f"Timestamp inválido: {valor!r}")
+    else:
+        data = ler_timestamp(valor)
+        if data is None:
+            return None
+    if data > recebido + TOLERANCIA_FUTURO:
+        raise ValueError(f"Timestamp no futuro: {data.isoformat()}")
+    if data < HORARIO_MINIMO:
+        raise ValueError(f"Timestamp de relógio não sincronizado: {data.isoformat()}")
+    return data
@@ -0,0 +1,16 @@
+from typing import Any
+import orjson
+from fastapi import Response
+
+
+class RespostaJSONRapida(Response):
+    """
+    Resposta JSON serializada com orjson.
+    Aceita bytes já serializados (repassados sem alteração) ou objetos Python.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, (bytes, bytearray)):
+            return bytes(content)
+        return orjson.dumps(content)
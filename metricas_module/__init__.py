@@ -0,0 +1 @@
+# Módulo Métricas - Contadores e histogramas expostos em /metrics (formato Prometheus)
\ No newline at end of file
@@ -0,0 +1,109 @@
+import time
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from metricas_module.metricas import registro_metricas
+from config.monitorConexoes import monitor_conexoes
+from config.escritorBanco import escritor
+from config.databaseConfig import observar_consultas, formato_consulta
+
+
+# ==============================================================
+# MÉTRICAS
+# ==============================================================
+
+http_duracao = registro_metricas.histograma(
+    "http_requisicoes_duracao_segundos", "Duração das requisições HTTP por rota", ("metodo", "rota", "status")
+)
+http_em_andamento = registro_metricas.medidor(
+    "http_requisicoes_em_andamento", "Requisições HTTP sendo atendidas"
+)
+sql_duracao = registro_metricas.histograma(
+    "sql_consultas_duracao_segundos", "Duração das consultas SQL por banco e formato da consulta", ("banco", "consulta")
+)
+mqtt_recebidas = registro_metricas.contador(
+    "mqtt_mensagens_recebidas", "Mensagens MQTT recebidas por tópico", ("topico",)
+)
+mqtt_gravadas = registro_metricas.contador(
+    "mqtt_mensagens_gravadas", "Mensagens MQTT gravadas no banco por tópico", ("topico",)
+)
+mqtt_descartadas = registro_metricas.contador(
+    "mqtt_mensagens_descartadas", "Mensagens MQTT que falharam ao gravar por tópico", ("topico",)
+)
+ingestao_atraso = registro_metricas.histograma(
+    "ingestao_atraso_segundos",
+    "Tempo entre a publicação (timestamp do payload) ou, sem ele, o recebimento da mensagem e o commit no banco",
+    ("origem", "referencia"),
+    limites=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0, 60.0, 300.0, 3600.0, 86400.0)
+)
+registro_metricas.medidor_coletado(
+    "escritor_fila_tamanho", "Tarefas aguardando o escritor único do banco", (),
+    lambda: {(): escritor.estatisticas()["fila"]}
+)
+
+
+def _estado_pools(campo: str):
+    return lambda: {
+        (nome,): valor[campo]
+        for nome, valor in monitor_conexoes.estatisticas(limite=float("inf"))["pools"].items()
+        if valor[campo] is not None
+    }
+
+
+registro_metricas.medidor_coletado("pool_conexoes_em_uso", "Conexões do pool em uso", ("pool",), _estado_pools("em_uso"))
+registro_metricas.medidor_coletado("pool_tamanho", "Tamanho configurado do pool", ("pool",), _estado_pools("tamanho"))
+registro_metricas.medidor_coletado("pool_overflow", "Conexões além do tamanho do pool", ("pool",), _estado_pools("overflow"))
+registro_metricas.medidor_coletado(
+    "pool_conexoes_longas", "Conexões em uso há mais que o limite do monitor", (),
+    lambda: {(): len(monitor_conexoes.conexoes_longas())}
+)
+
+
+# ==============================================================
+# SQL: duração por formato de consulta
+# ==============================================================
+
+@observar_consultas
+def _medir_consulta(conn, cursor, statement, parameters, executemany, inicio, duracao):
+    sql_duracao.observar(duracao, conn.engine.pool.logging_name or "outro", formato_consulta(statement)[:200])
+
+
+# ==============================================================
+# HTTP: latência por rota (template) e requisições em andamento
+# ==============================================================
+
+class MetricasMiddleware:
+    """
+    Middleware ASGI que mede a duração de cada requisição HTTP, agrupada
+    pelo template da rota (ex.: /valores/{id_sensor}) para não criar uma
+    série por ID
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        inicio = time.perf_counter()
+        status = 500
+
+        async def enviar(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        http_em_andamento.inc()
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            http_em_andamento.dec()
+            # O roteamento do FastAPI guarda a rota encontrada no scope
+            rota = scope.get("route")
+            http_duracao.observar(
+                time.perf_counter() - inicio,
+                scope["method"],
+                rota.path if rota is not None else "sem_rota",
+                str(status)
+            )
@@ -0,0 +1,212 @@
+import abc
+import bisect
+import math
+import threading
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+# Limites padrão dos histogramas de latência (s)
+LIMITES_LATENCIA = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Rotulos = Tuple[str, ...]
+
+
+class _Metrica(abc.ABC):
+    """
+    Base das métricas. Cada thread atualiza o seu próprio fragmento
+    (um dict), sem locks no caminho das requisições; a coleta soma os
+    fragmentos de todas as threads. Copiar um dict é atômico sob o GIL.
+    """
+
+    tipo = ""
+
+    def __init__(self, nome: str, ajuda: str, rotulos: Sequence[str] = ()):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.rotulos = tuple(rotulos)
+        self._local = threading.local()
+        self._fragmentos: List[dict] = []
+        self._lock = threading.Lock()
+
+    def _fragmento(self) -> dict:
+        fragmento = getattr(self._local, "fragmento", None)
+        if fragmento is None:
+            fragmento = self._local.fragmento = {}
+            # Só na primeira atualização de cada thread
+            with self._lock:
+                self._fragmentos.append(fragmento)
+        return fragmento
+
+    def _copias(self) -> List[dict]:
+        with self._lock:
+            fragmentos = list(self._fragmentos)
+        return [dict(fragmento) for fragmento in fragmentos]
+
+    @abc.abstractmethod
+    def amostras(self) -> Iterable[Tuple[str, Rotulos, float]]:
+        """
+        Gera (nome da série, valores dos rótulos, valor) para /metrics
+        """
+
+
+class Contador(_Metrica):
+    """
+    Contador que só aumenta (ex.: requisições, mensagens recebidas)
+    """
+
+    tipo = "counter"
+
+    def inc(self, *valores_rotulos: str, valor: float = 1.0):
+        fragmento = self._fragmento()
+        fragmento[valores_rotulos] = fragmento.get(valores_rotulos, 0.0) + valor
+
+    def amostras(self):
+        totais: Dict[Rotulos, float] = {}
+        for copia in self._copias():
+            for chave, valor in copia.items():
+                totais[chave] = totais.get(chave, 0.0) + valor
+        for chave, valor in totais.items():
+            yield self.nome + "_total", chave, valor
+
+
+class Medidor(_Metrica):
+    """
+    Valor que sobe e desce (ex.: requisições em andamento). Cada thread
+    acumula a sua variação; o valor é a soma de todas.
+    """
+
+    tipo = "gauge"
+
+    def inc(self, *valores_rotulos: str, valor: float = 1.0):
+        fragmento = self._fragmento()
+        fragmento[valores_rotulos] = fragmento.get(valores_rotulos, 0.0) + valor
+
+    def dec(self, *valores_rotulos: str, valor: float = 1.0):
+        self.inc(*valores_rotulos, valor=-valor)
+
+    def amostras(self):
+        totais: Dict[Rotulos, float] = {}
+        for copia in self._copias():
+            for chave, valor in copia.items():
+                totais[chave] = totais.get(chave, 0.0) + valor
+        for chave, valor in totais.items():
+            yield self.nome, chave, valor
+
+
+class MedidorColetado(_Metrica):
+    """
+    Medidor calculado no momento da coleta por uma função que retorna
+    {valores dos rótulos: valor} (ex.: estado do pool, fila do escritor)
+    """
+
+    tipo = "gauge"
+
+    def __init__(self, nome: str, ajuda: str, rotulos: Sequence[str], funcao: Callable[[], Dict[Rotulos, float]]):
+        super().__init__(nome, ajuda, rotulos)
+        self.funcao = funcao
+
+    def amostras(self):
+        for chave, valor in self.funcao().items():
+            yield self.nome, chave, valor
+
+
+class Histograma(_Metrica):
+    """
+    Histograma de durações/tamanhos com limites fixos
+    """
+
+    tipo = "histogram"
+
+    def __init__(self, nome: str, ajuda: str, rotulos: Sequence[str] = (), limites: Sequence[float] = LIMITES_LATENCIA):
+        super().__init__(nome, ajuda, rotulos)
+        self.limites = tuple(sorted(limites))
+
+    def observar(self, valor: float, *valores_rotulos: str):
+        fragmento = self._fragmento()
+        dados = fragmento.get(valores_rotulos)
+        if dados is None:
+            # Contagem por faixa (+Inf no final), soma e total
+            dados = fragmento[valores_rotulos] = [0] * (len(self.limites) + 1) + [0.0, 0]
+        dados[bisect.bisect_left(self.limites, valor)] += 1
+        dados[-2] += valor
+        dados[-1] += 1
+
+    def amostras(self):
+        totais: Dict[Rotulos, list] = {}
+        for copia in self._copias():
+            for chave, dados in copia.items():
+                dados = list(dados)
+                if chave in totais:
+                    totais[chave] = [a + b for a, b in zip(totais[chave], dados)]
+                else:
+                    totais[chave] = dados
+        for chave, dados in totais.items():
+            acumulado = 0
+            for limite, quantidade in zip(self.limites + (math.inf,), dados):
+                acumulado += quantidade
+                yield self.nome + "_bucket", chave + (_formatar_numero(limite),), acumulado
+            yield self.nome + "_sum", chave, dados[-2]
+            yield self.nome + "_count", chave, dados[-1]
+
+
+class RegistroMetricas:
+    """
+    Registro das métricas da aplicação e geração do texto para /metrics
+    """
+
+    def __init__(self):
+        self._metricas: List[_Metrica] = []
+
+    def registrar(self, metrica: _Metrica) -> _Metrica:
+        self._metricas.append(metrica)
+        return metrica
+
+    def contador(self, nome: str, ajuda: str, rotulos: Sequence[str] = ()) -> Contador:
+        return self.registrar(Contador(nome, ajuda, rotulos))
+
+    def medidor(self, nome: str, ajuda: str, rotulos: Sequence[str] = ()) -> Medidor:
+        return self.registrar(Medidor(nome, ajuda, rotulos))
+
+    def medidor_coletado(self, nome: str, ajuda: str, rotulos: Sequence[str],
+                         funcao: Callable[[], Dict[Rotulos, float]]) -> MedidorColetado:
+        return self.registrar(MedidorColetado(nome, ajuda, rotulos, funcao))
+
+    def histograma(self, nome: str, ajuda: str, rotulos: Sequence[str] = (),
+                   limites: Sequence[float] = LIMITES_LATENCIA) -> Histograma:
+        return self.registrar(Histograma(nome, ajuda, rotulos, limites))
+
+    def gerar_texto(self) -> str:
+        """
+        Gera as métricas no formato de texto do Prometheus (versão 0.0.4)
+        """
+        linhas = []
+        for metrica in self._metricas:
+            linhas.append(f"# HELP {metrica.nome} {metrica.ajuda}")
+            linhas.append(f"# TYPE {metrica.nome} {metrica.tipo}")
+            nomes_rotulos = metrica.rotulos
+            for nome, valores, valor in metrica.amostras():
+                rotulos = nomes_rotulos + ("le",) if len(valores) > len(nomes_rotulos) else nomes_rotulos
+                linhas.append(f"{nome}{_formatar_rotulos(rotulos, valores)} {_formatar_numero(valor)}")
+        return "\n".join(linhas) + "\n"
+
+
+def _formatar_rotulos(nomes: Rotulos, valores: Rotulos) -> str:
+    if not nomes:
+        return ""
+    pares = ",".join(f'{nome}="{_escapar(str(valor))}"' for nome, valor in zip(nomes, valores))
+    return "{" + pares + "}"
+
+
+def _escapar(valor: str) -> str:
+    return valor.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _formatar_numero(valor: float) -> str:
+    if valor == math.inf:
+        return "+Inf"
+    if float(valor).is_integer():
+        return str(int(valor))
+    return repr(float(valor))
+
+
+# Instância global compartilhada pela aplicação
+registro_metricas = RegistroMetricas()
@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from metricas_module.metricas import registro_metricas
+
+# Router da coleta de métricas (fora do prefixo /api, como esperado pelo Prometheus)
+router = APIRouter(tags=["métricas"])
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metricas():
+    """Métricas da API, do banco e do MQTT no formato de texto do Prometheus"""
+    return PlainTextResponse(registro_metricas.gerar_texto(), media_type="text/plain; version=0.0.4")
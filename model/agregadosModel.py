@@ -0,0 +1,37 @@
+from sqlalchemy import Column, Integer, Float, ForeignKey, DateTime, Index
+from sqlalchemy.sql import func
+from config.databaseConfig import Base
+
+class AgregadoValores(Base):
+    """
+    Modelo da tabela agregados_valores no banco de dados.
+    Resumo por hora (pelo horário do evento) das leituras de cada sensor e
+    dispositivo, atualizado junto com a inserção das leituras: somas,
+    contagens, mínimo e máximo não dependem da ordem de chegada, então
+    leituras atrasadas só alteram a hora delas.
+    """
+    __tablename__ = "agregados_valores"
+
+    # Campos da tabela
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    id_sensor = Column(Integer, ForeignKey('sensores.id'), nullable=False)
+    id_dispositivo = Column(Integer, nullable=False, default=0)  # 0 = leituras sem dispositivo
+    inicio = Column(DateTime, nullable=False)  # início da hora
+    quantidade = Column(Integer, nullable=False, default=0)
+    soma = Column(Float, nullable=False, default=0.0)
+    minimo = Column(Float, nullable=False)
+    maximo = Column(Float, nullable=False)
+    ultimo_valor = Column(Float, nullable=True)  # valor com o maior horário de evento da hora
+    ultimo_timestamp = Column(DateTime, nullable=True)
+    atrasadas = Column(Integer, nullable=False, default=0)  # recebidas depois da hora fechada
+    atualizado_em = Column(DateTime, nullable=False, server_default=func.now())
+
+    def __repr__(self):
+        return f"<AgregadoValores(id_sensor={self.id_sensor}, id_dispositivo={self.id_dispositivo}, inicio={self.inicio})>"
+
+# Uma linha por sensor, dispositivo e hora
+Index(
+    "ux_agregados_serie_inicio",
+    AgregadoValores.id_sensor, AgregadoValores.id_dispositivo, AgregadoValores.inicio,
+    unique=True
+)
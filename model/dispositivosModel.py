@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from config.databaseConfig import Base
+
+class Dispositivo(Base):
+    """
+    Modelo da tabela dispositivos no banco de dados.
+    Cada dispositivo é identificado pelo device_id dos payloads
+    (ex.: "raspberry_pi_001") e é cadastrado na primeira leitura recebida.
+    """
+    __tablename__ = "dispositivos"
+
+    # Campos da tabela
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    identificador = Column(String(100), nullable=False, unique=True)  # device_id do payload
+    nome = Column(String(100), nullable=True)  # nome amigável (opcional)
+    criado_em = Column(DateTime, nullable=False, server_default=func.now())
+
+    def __repr__(self):
+        return f"<Dispositivo(id={self.id}, identificador='{self.identificador}')>"
+
+    def to_dict(self):
+        """
+        Converte o objeto Dispositivo em dicionário para serialização JSON.
+        """
+        return {
+            "id": self.id,
+            "identificador": self.identificador,
+            "nome": self.nome,
+            "criado_em": self.criado_em.isoformat() if self.criado_em else None
+        }
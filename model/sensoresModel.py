@@ -1,7 +1,17 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey, DateTime
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey, DateTime, Index
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 from config.databaseConfig import Base, engine
+from model.dispositivosModel import Dispositivo
+import orjson
+
+def normalizar_nome(nome: str) -> str:
+    """
+    Forma do nome usada para comparar sensores sem diferenciar maiúsculas.
+    Feita no Python (casefold) e gravada em nome_normalizado: o lower() do
+    SQLite só converte letras ASCII ('PRESSÃO' -> 'pressÃo').
+    """
+    return nome.casefold()
 
 class Sensor(Base):
     """
@@ -12,16 +22,25 @@ class Sensor(Base):
     # Campos da tabela
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     nome = Column(String(100), nullable=False, index=True)
+    nome_normalizado = Column(String(100), nullable=False)  # normalizar_nome(nome), preenchido junto com o nome
     tipo = Column(String(50), nullable=False)  # ex: "temperatura", "umidade", "pressao"
     unidade = Column(String(20), nullable=False)  # ex: "°C", "%", "hPa"
+    # Sensor próprio de um dispositivo (None = vale para todos os dispositivos)
+    id_dispositivo = Column(Integer, ForeignKey(Dispositivo.id), nullable=True)
     
     # Relacionamento com valores
     valores = relationship("ValoresSensor", back_populates="sensor", cascade="all, delete-orphan")
     
-    def __init__(self, nome, tipo, unidade):
+    def __init__(self, nome, tipo, unidade, id_dispositivo=None):
         self.nome = nome
         self.tipo = tipo
         self.unidade = unidade
+        self.id_dispositivo = id_dispositivo
+    
+    @validates("nome")
+    def _validar_nome(self, chave, nome):
+        self.nome_normalizado = normalizar_nome(nome)
+        return nome
     
     def __repr__(self):
         return f"<Sensor(id={self.id}, nome='{self.nome}', tipo='{self.tipo}', unidade='{self.unidade}')>"
@@ -34,13 +53,27 @@ class Sensor(Base):
             "id": self.id,
             "nome": self.nome,
             "tipo": self.tipo,
-            "unidade": self.unidade
+            "unidade": self.unidade,
+            "id_dispositivo": self.id_dispositivo
         }
 
+# Nomes únicos sem diferenciar maiúsculas, por dispositivo (0 = sensores
+# gerais): é o que o ResolvedorSensores usa para achar o sensor de cada
+# campo dos payloads
+Index(
+    "ux_sensores_dispositivo_nome_normalizado",
+    func.coalesce(Sensor.id_dispositivo, 0), Sensor.nome_normalizado,
+    unique=True
+)
+
 
 class ValoresSensor(Base):
     """
     Modelo da tabela valores_sensor no banco de dados.
+    O timestamp é o horário do evento (informado pelo dispositivo, ou o do
+    recebimento quando o payload não traz um válido); recebido_em é quando
+    a leitura chegou ao servidor. Leituras enviadas depois (store-and-forward)
+    ficam no horário em que foram medidas.
     """
     __tablename__ = "valores_sensor"
     
@@ -48,14 +81,20 @@ class ValoresSensor(Base):
     id_valor = Column(Integer, primary_key=True, index=True, autoincrement=True)
     valor = Column(Float, nullable=False)
     id_sensor = Column(Integer, ForeignKey('sensores.id'), nullable=False)
-    timestamp = Column(DateTime, nullable=False, default=func.now())
+    timestamp = Column(DateTime, nullable=False, default=func.now())  # horário do evento
+    recebido_em = Column(DateTime, nullable=True, default=func.now())  # horário de recebimento
+    # Dispositivo que enviou a leitura (None = leituras sem device_id)
+    id_dispositivo = Column(Integer, ForeignKey(Dispositivo.id), nullable=True)
     
     # Relacionamento com sensor
     sensor = relationship("Sensor", back_populates="valores")
     
-    def __init__(self, valor, id_sensor):
+    def __init__(self, valor, id_sensor, id_dispositivo=None, timestamp=None, recebido_em=None):
         self.valor = valor
         self.id_sensor = id_sensor
+        self.id_dispositivo = id_dispositivo
+        self.timestamp = timestamp
+        self.recebido_em = recebido_em
     
     def __repr__(self):
         return f"<ValoresSensor(id={self.id_valor}, valor={self.valor}, id_sensor={self.id_sensor}, timestamp={self.timestamp})>"
@@ -68,9 +107,44 @@ class ValoresSensor(Base):
             "id_valor": self.id_valor,
             "valor": self.valor,
             "id_sensor": self.id_sensor,
-            "timestamp": self.timestamp.isoformat() if self.timestamp else None
+            "id_dispositivo": self.id_dispositivo,
+            "timestamp": self.timestamp.isoformat() if self.timestamp else None,
+            "recebido_em": self.recebido_em.isoformat() if self.recebido_em else None
         }
 
+# Séries por sensor e por dispositivo + sensor, em ordem de tempo: as
+# listagens e o último valor leem só a faixa da série pedida
+Index("ix_valores_sensor_timestamp", ValoresSensor.id_sensor, ValoresSensor.timestamp)
+Index(
+    "ix_valores_dispositivo_sensor_timestamp",
+    ValoresSensor.id_dispositivo, ValoresSensor.id_sensor, ValoresSensor.timestamp
+)
+
+# Colunas usadas pelas listagens rápidas (linhas Core, sem objetos ORM)
+COLUNAS_VALORES = (
+    ValoresSensor.id_valor,
+    ValoresSensor.valor,
+    ValoresSensor.id_sensor,
+    ValoresSensor.id_dispositivo,
+    ValoresSensor.timestamp,
+    ValoresSensor.recebido_em
+)
+
+# Converte datetime no texto que o SQLAlchemy grava no SQLite: usado pelas
+# inserções em massa, que passam tuplas direto para o driver
+formatar_timestamp = ValoresSensor.__table__.c.timestamp.type.dialect_impl(engine.dialect).bind_processor(engine.dialect)
+
+def valores_para_json(linhas) -> bytes:
+    """
+    Serializa linhas (COLUNAS_VALORES) direto para JSON, no mesmo formato
+    de ValoresSensor.to_dict().
+    """
+    return orjson.dumps([
+        {"id_valor": id_valor, "valor": valor, "id_sensor": id_sensor,
+         "id_dispositivo": id_dispositivo, "timestamp": timestamp, "recebido_em": recebido_em}
+        for id_valor, valor, id_sensor, id_dispositivo, timestamp, recebido_em in linhas
+    ])
+
 def criar_tabelas_sensores():
     """
     Função específica para criar as tabelas de sensores e valores.
@@ -4,9 +4,8 @@ import logging
 from datetime import datetime
 from typing import Optional
 import paho.mqtt.client as mqtt
-from sqlalchemy.orm import Session
-from config.databaseConfig import SessionLocal
-from all_module.AllService import AllService
+from all_module.ingestao import normalizar_mensagem, enviar_mensagens
+from metricas_module.instrumentacao import mqtt_recebidas, mqtt_gravadas, mqtt_descartadas
 
 # ==============================================================
 # CONFIGURAÇÃO DE LOG
@@ -60,6 +59,7 @@ class MQTTService:
         topic = msg.topic
         payload = msg.payload.decode("utf-8")
         logger.info(f"📨 Mensagem recebida - Tópico: {topic} | Dados: {payload}")
+        mqtt_recebidas.inc(topic)
         self.save_to_database(topic, payload)
 
     def on_disconnect(self, client, userdata, rc):
@@ -74,26 +74,41 @@ class MQTTService:
     # ==============================================================
 
     def save_to_database(self, topic: str, payload: str):
+        """
+        Envia a mensagem ao escritor único do banco sem bloquear a thread do MQTT,
+        pelo mesmo pipeline de ingestão do POST /data/lote.
+        Mensagens que chegam juntas são gravadas na mesma transação.
+        """
+        try:
+            futuro = enviar_mensagens([normalizar_mensagem(topic, payload)])
+            futuro.add_done_callback(lambda f: self.on_saved(topic, payload, f))
+        except Exception as e:
+            mqtt_descartadas.inc(topic)
+            logger.error(f"❌ Erro ao salvar no banco: {e}")
+
+    def on_saved(self, topic: str, payload: str, futuro):
+        """
+        Chamado pelo escritor depois que a mensagem foi gravada (ou falhou)
+        """
         try:
-            db = SessionLocal()
-            service = AllService(db)
-            result = service.criar(topic, payload)
+            ids = futuro.result()
 
-            if result:
+            if ids:
+                mqtt_gravadas.inc(topic)
                 print("\n🎯 === DADOS RECEBIDOS DO RASPBERRY PI ===")
                 print(f"🕒 Horário: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}")
                 print(f"📡 Tópico: {topic}")
                 print(f"📦 Dados: {payload}")
-                print(f"💾 Salvo no banco - ID: {result.id}")
+                print(f"💾 Salvo no banco - ID: {ids[0]}")
                 print("=" * 40)
-                logger.info(f"✅ Dados salvos na tabela 'all' - ID: {result.id}")
+                logger.info(f"✅ Dados salvos na tabela 'all' - ID: {ids[0]}")
             else:
+                mqtt_descartadas.inc(topic)
                 logger.error("❌ Falha ao salvar no banco de dados")
 
         except Exception as e:
+            mqtt_descartadas.inc(topic)
             logger.error(f"❌ Erro ao salvar no banco: {e}")
-        finally:
-            db.close()
 
     # ==============================================================
     # CONTROLE DO SERVIÇO MQTT
@@ -0,0 +1,79 @@
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+from processamento_module.checkpointModel import CheckpointProcessamento
+from typing import Dict, List, Optional
+
+class CheckpointService:
+    """
+    Service dos checkpoints de processamento (último registro processado por tópico)
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def listar(self) -> List[CheckpointProcessamento]:
+        """
+        Lista os checkpoints de todos os tópicos
+        """
+        try:
+            return self.db.query(CheckpointProcessamento).order_by(CheckpointProcessamento.topico).all()
+        except SQLAlchemyError as e:
+            raise Exception(f"Erro ao listar checkpoints: {str(e)}")
+
+    def ultimos_ids(self) -> Dict[str, int]:
+        """
+        Retorna {tópico: último ID processado}
+        """
+        try:
+            linhas = self.db.execute(select(CheckpointProcessamento.topico, CheckpointProcessamento.ultimo_id)).all()
+            return {topico: ultimo_id for topico, ultimo_id in linhas}
+        except SQLAlchemyError as e:
+            raise Exception(f"Erro ao carregar checkpoints: {str(e)}")
+
+    def avancar(self, topico: str, ultimo_id: int, quantidade: int, anterior: Optional[int] = None) -> bool:
+        """
+        Avança o checkpoint de um tópico SEM fazer commit: deve ser gravado
+        no mesmo commit das leituras geradas pelos registros, para que uma
+        execução interrompida não perca nem repita registros.
+
+        Com anterior, só avança se o checkpoint ainda estiver nesse ID
+        e retorna False caso outro processador já o
+        tenha movido: quem chamou deve desfazer as leituras do bloco.
+        """
+        condicao = CheckpointProcessamento.ultimo_id == anterior if anterior is not None else None
+        try:
+            resultado = self.db.execute(
+                insert(CheckpointProcessamento)
+                .values(topico=topico, ultimo_id=ultimo_id, processados=quantidade)
+                .on_conflict_do_update(
+                    index_elements=[CheckpointProcessamento.topico],
+                    set_={
+                        "ultimo_id": ultimo_id,
+                        "processados": CheckpointProcessamento.processados + quantidade,
+                        "atualizado_em": func.now()
+                    },
+                    where=condicao
+                )
+            )
+            return resultado.rowcount > 0
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise Exception(f"Erro ao avançar checkpoint: {str(e)}")
+
+    def reiniciar(self, topico: Optional[str] = None) -> int:
+        """
+        Apaga o checkpoint de um tópico (ou de todos): o próximo
+        processamento recomeça do primeiro registro
+        """
+        try:
+            consulta = delete(CheckpointProcessamento)
+            if topico is not None:
+                consulta = consulta.where(CheckpointProcessamento.topico == topico)
+            removidos = self.db.execute(consulta).rowcount
+            self.db.commit()
+            return removidos
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise Exception(f"Erro ao reiniciar checkpoints: {str(e)}")
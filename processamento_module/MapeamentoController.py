@@ -0,0 +1,79 @@
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from processamento_module.MapeamentoServiceAsync import MapeamentoServiceAsync
+from typing import List, Optional
+
+class MapeamentoController:
+    """
+    Controller das regras de mapeamento dos payloads
+    """
+
+    @staticmethod
+    async def listar(topico: Optional[str], db: AsyncSession) -> List[dict]:
+        """
+        Lista as regras (todas ou de um tópico)
+        """
+        try:
+            regras = await MapeamentoServiceAsync(db).listar(topico)
+            return [regra.to_dict() for regra in regras]
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+    @staticmethod
+    async def criar(dados: dict, db: AsyncSession) -> dict:
+        """
+        Cria uma regra (vale para os próximos registros do tópico)
+        """
+        try:
+            regra = await MapeamentoServiceAsync(db).criar(dados)
+            return regra.to_dict()
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            if "Regra já cadastrada" in str(e):
+                raise HTTPException(status_code=409, detail=str(e))
+            raise HTTPException(status_code=500, detail=str(e))
+
+    @staticmethod
+    async def atualizar(regra_id: int, dados: dict, db: AsyncSession) -> dict:
+        """
+        Atualiza os campos informados de uma regra
+        """
+        try:
+            regra = await MapeamentoServiceAsync(db).atualizar(regra_id, dados)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            if "Regra já cadastrada" in str(e):
+                raise HTTPException(status_code=409, detail=str(e))
+            raise HTTPException(status_code=500, detail=str(e))
+        if regra is None:
+            raise HTTPException(status_code=404, detail="Regra não encontrada")
+        return regra.to_dict()
+
+    @staticmethod
+    async def deletar(regra_id: int, db: AsyncSession) -> dict:
+        """
+        Deleta uma regra
+        """
+        try:
+            removida = await MapeamentoServiceAsync(db).deletar(regra_id)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+        if not removida:
+            raise HTTPException(status_code=404, detail="Regra não encontrada")
+        return {"detail": "Regra deletada com sucesso"}
+
+    @staticmethod
+    async def testar(dados: dict, db: AsyncSession) -> dict:
+        """
+        Aplica as regras do tópico a um payload de exemplo, sem gravar
+        """
+        topico, payload = dados.get("topico"), dados.get("payload")
+        if not isinstance(topico, str) or not isinstance(payload, dict):
+            raise HTTPException(status_code=400, detail="Informe 'topico' (texto) e 'payload' (objeto JSON)")
+        try:
+            campos = await MapeamentoServiceAsync(db).testar(topico, payload)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+        return {"topico": topico, "campos": campos}
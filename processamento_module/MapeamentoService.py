@@ -0,0 +1,174 @@
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from config.databaseConfig import apos_commit
+from cache_module.cacheLeitura import registrar_cache
+from service.SensoresService import SensoresService
+from processamento_module.mapeamentoModel import RegraMapeamento
+from processamento_module.conversao import ler_dispositivo
+from processamento_module.mapeamento import CONVERSOES, MapeamentoTopicos, Regra, partes_caminho
+from typing import Dict, List, Optional
+
+# Regras compiladas por tópico. Alterações feitas neste processo invalidam
+# o cache no commit; as feitas por outro processo (ex.: Tratar_dados
+# --continuo separado da API) valem em até ttl segundos
+cache_mapeamento = registrar_cache("mapeamento", max_itens=4, ttl=10.0)
+
+# Campos aceitos na criação e na atualização das regras
+CAMPOS_REGRA = ("topico", "caminho", "sensor", "escala", "deslocamento", "conversao", "ativa")
+
+class MapeamentoService:
+    """
+    Service das regras de mapeamento dos payloads (caminho JSON -> sensor)
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def mapeamento(self) -> MapeamentoTopicos:
+        """
+        Retorna as regras ativas agrupadas por tópico, em cache, com os
+        extratores compilados sob demanda
+        """
+        try:
+            return cache_mapeamento.obter_ou_calcular("mapeamento", self._carregar_mapeamento)
+        except SQLAlchemyError as e:
+            raise Exception(f"Erro ao carregar regras de mapeamento: {str(e)}")
+
+    def _carregar_mapeamento(self) -> MapeamentoTopicos:
+        regras: Dict[str, List[Regra]] = {}
+        linhas = self.db.execute(
+            select(RegraMapeamento.topico, RegraMapeamento.caminho, RegraMapeamento.sensor,
+                   RegraMapeamento.escala, RegraMapeamento.deslocamento, RegraMapeamento.conversao)
+            .where(RegraMapeamento.ativa.is_(True))
+            .order_by(RegraMapeamento.id)
+        ).all()
+        for topico, *campos in linhas:
+            regras.setdefault(topico, []).append(Regra(*campos))
+        return MapeamentoTopicos(regras)
+
+    def listar(self, topico: Optional[str] = None) -> List[RegraMapeamento]:
+        """
+        Lista as regras (todas ou de um tópico)
+        """
+        try:
+            consulta = self.db.query(RegraMapeamento)
+            if topico is not None:
+                consulta = consulta.filter(RegraMapeamento.topico == topico)
+            return consulta.order_by(RegraMapeamento.topico, RegraMapeamento.id).all()
+        except SQLAlchemyError as e:
+            raise Exception(f"Erro ao listar regras de mapeamento: {str(e)}")
+
+    def buscar_por_id(self, regra_id: int) -> Optional[RegraMapeamento]:
+        """
+        Busca uma regra por ID
+        """
+        try:
+            return self.db.query(RegraMapeamento).filter(RegraMapeamento.id == regra_id).first()
+        except SQLAlchemyError as e:
+            raise Exception(f"Erro ao buscar regra de mapeamento: {str(e)}")
+
+    def criar(self, dados: dict) -> RegraMapeamento:
+        """
+        Cria uma regra. Levanta ValueError se os dados forem inválidos.
+        """
+        valores = self._validar({"escala": 1.0, "deslocamento": 0.0, "conversao": "numero", "ativa": True, **dados})
+        try:
+            regra = RegraMapeamento(**valores)
+            self.db.add(regra)
+            self.db.commit()
+            apos_commit(self.db, cache_mapeamento.invalidar)
+            self.db.refresh(regra)
+            return regra
+        except IntegrityError:
+            self.db.rollback()
+            raise Exception(f"Regra já cadastrada: {valores['topico']} {valores['caminho']}")
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise Exception(f"Erro ao criar regra de mapeamento: {str(e)}")
+
+    def atualizar(self, regra_id: int, dados: dict) -> Optional[RegraMapeamento]:
+        """
+        Atualiza os campos informados de uma regra
+        """
+        try:
+            regra = self.db.query(RegraMapeamento).filter(RegraMapeamento.id == regra_id).first()
+            if not regra:
+                return None
+            valores = self._validar({**{campo: getattr(regra, campo) for campo in CAMPOS_REGRA}, **dados})
+            for campo, valor in valores.items():
+                setattr(regra, campo, valor)
+            self.db.commit()
+            apos_commit(self.db, cache_mapeamento.invalidar)
+            self.db.refresh(regra)
+            return regra
+        except IntegrityError:
+            self.db.rollback()
+            raise Exception(f"Regra já cadastrada: {dados.get('topico', regra.topico)} {dados.get('caminho', regra.caminho)}")
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise Exception(f"Erro ao atualizar regra de mapeamento: {str(e)}")
+
+    def deletar(self, regra_id: int) -> bool:
+        """
+        Deleta uma regra
+        """
+        try:
+            regra = self.db.query(RegraMapeamento).filter(RegraMapeamento.id == regra_id).first()
+            if not regra:
+                return False
+            self.db.delete(regra)
+            self.db.commit()
+            apos_commit(self.db, cache_mapeamento.invalidar)
+            return True
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise Exception(f"Erro ao deletar regra de mapeamento: {str(e)}")
+
+    def testar(self, topico: str, payload: dict) -> List[dict]:
+        """
+        Aplica as regras ativas do tópico a um payload, sem gravar nada:
+        mostra os campos extraídos, os valores e os sensores encontrados
+        """
+        resolvedor = SensoresService(self.db).resolvedor()
+        dispositivo = ler_dispositivo(payload)
+        campos = []
+        for campo, nome_sensor, valor_convertido, valor in self.mapeamento().extrator(topico)(payload):
+            sensor = resolvedor.resolver(nome_sensor, dispositivo)
+            campos.append({
+                "campo": campo,
+                "sensor": nome_sensor,
+                "id_sensor": sensor.id if sensor else None,
+                "valor": valor_convertido,
+                "valor_original": valor
+            })
+        return campos
+
+    @staticmethod
+    def _validar(dados: dict) -> dict:
+        """
+        Confere e normaliza os campos de uma regra (ValueError se inválidos)
+        """
+        desconhecidos = set(dados) - set(CAMPOS_REGRA) - {"id", "atualizado_em"}
+        if desconhecidos:
+            raise ValueError(f"Campos desconhecidos: {', '.join(sorted(desconhecidos))}")
+        for campo in ("topico", "caminho", "sensor"):
+            if not isinstance(dados.get(campo), str) or not dados[campo].strip():
+                raise ValueError(f"Campo '{campo}' é obrigatório")
+        partes_caminho(dados["caminho"].strip())
+        if dados["conversao"] not in CONVERSOES:
+            raise ValueError(f"Conversão inválida: {dados['conversao']} (use {', '.join(CONVERSOES)})")
+        for campo in ("escala", "deslocamento"):
+            if isinstance(dados[campo], bool) or not isinstance(dados[campo], (int, float)):
+                raise ValueError(f"Campo '{campo}' deve ser numérico")
+        if not isinstance(dados["ativa"], bool):
+            raise ValueError("Campo 'ativa' deve ser true ou false")
+        return {
+            "topico": dados["topico"].strip(),
+            "caminho": dados["caminho"].strip(),
+            "sensor": dados["sensor"].strip(),
+            "escala": float(dados["escala"]),
+            "deslocamento": float(dados["deslocamento"]),
+            "conversao": dados["conversao"],
+            "ativa": dados["ativa"]
+        }
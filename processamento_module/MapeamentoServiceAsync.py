@@ -0,0 +1,47 @@
+from processamento_module.mapeamentoModel import RegraMapeamento
+from processamento_module.MapeamentoService import MapeamentoService
+from service.ServicoAsync import ServicoAsync
+from typing import List, Optional
+
+class MapeamentoServiceAsync(ServicoAsync):
+    """
+    Versão assíncrona do service de regras de mapeamento
+    """
+
+    servico_sync = MapeamentoService
+
+    async def listar(self, topico: Optional[str] = None) -> List[RegraMapeamento]:
+        """
+        Lista as regras (todas ou de um tópico)
+        """
+        return await self._executar(MapeamentoService.listar, topico)
+
+    async def buscar_por_id(self, regra_id: int) -> Optional[RegraMapeamento]:
+        """
+        Busca uma regra por ID
+        """
+        return await self._executar(MapeamentoService.buscar_por_id, regra_id)
+
+    async def criar(self, dados: dict) -> RegraMapeamento:
+        """
+        Cria uma regra
+        """
+        return await self._escrever(MapeamentoService.criar, dados)
+
+    async def atualizar(self, regra_id: int, dados: dict) -> Optional[RegraMapeamento]:
+        """
+        Atualiza uma regra
+        """
+        return await self._escrever(MapeamentoService.atualizar, regra_id, dados)
+
+    async def deletar(self, regra_id: int) -> bool:
+        """
+        Deleta uma regra
+        """
+        return await self._escrever(MapeamentoService.deletar, regra_id)
+
+    async def testar(self, topico: str, payload: dict) -> List[dict]:
+        """
+        Aplica as regras do tópico a um payload, sem gravar
+        """
+        return await self._executar(MapeamentoService.testar, topico, payload)
@@ -0,0 +1,111 @@
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+from processamento_module.rejeitadoModel import RegistroRejeitado
+from processamento_module.conversao import Rejeicao
+from typing import List, Optional
+
+class RejeitadoService:
+    """
+    Service dos registros rejeitados pelo processamento (dead letters)
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def registrar(self, topico: str, rejeitados: List[Rejeicao]) -> int:
+        """
+        Grava os registros rejeitados de um bloco SEM fazer commit (vão no
+        mesmo commit do checkpoint), com um único executemany direto no
+        driver. Um registro que já estava rejeitado na mesma etapa e campo só
+        tem as tentativas e a última vez atualizadas.
+        """
+        if not rejeitados:
+            return 0
+        try:
+            self.db.connection().exec_driver_sql(
+                "INSERT INTO registros_rejeitados (id_registro, topico, etapa, classe_erro, campo, detalhe, tentativas) "
+                "VALUES (?, ?, ?, ?, ?, ?, 1) "
+                "ON CONFLICT (id_registro, etapa, campo) DO UPDATE SET "
+                "classe_erro = excluded.classe_erro, detalhe = excluded.detalhe, "
+                "ultima_vez = CURRENT_TIMESTAMP, tentativas = tentativas + 1",
+                [
+                    (id_registro, topico, etapa, classe_erro, campo, detalhe)
+                    for id_registro, etapa, classe_erro, campo, detalhe in rejeitados
+                ]
+            )
+            return len(rejeitados)
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise Exception(f"Erro ao registrar rejeitados: {str(e)}")
+
+    def remover(self, ids: List[int]) -> int:
+        """
+        Remove registros rejeitados (já reprocessados) SEM fazer commit
+        """
+        if not ids:
+            return 0
+        try:
+            return self.db.execute(delete(RegistroRejeitado).where(RegistroRejeitado.id.in_(ids))).rowcount
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise Exception(f"Erro ao remover rejeitados: {str(e)}")
+
+    def listar(self, etapa: Optional[str] = None, topico: Optional[str] = None,
+               limite: int = 100, apos_id: int = 0) -> List[RegistroRejeitado]:
+        """
+        Lista os registros rejeitados em ordem de ID, a partir de apos_id
+        (paginação por cursor), com filtros opcionais de etapa e tópico
+        """
+        try:
+            consulta = self.db.query(RegistroRejeitado).filter(RegistroRejeitado.id > apos_id)
+            if etapa is not None:
+                consulta = consulta.filter(RegistroRejeitado.etapa == etapa)
+            if topico is not None:
+                consulta = consulta.filter(RegistroRejeitado.topico == topico)
+            return consulta.order_by(RegistroRejeitado.id).limit(limite).all()
+        except SQLAlchemyError as e:
+            raise Exception(f"Erro ao listar rejeitados: {str(e)}")
+
+    def contar(self, etapa: Optional[str] = None, topico: Optional[str] = None) -> int:
+        """
+        Conta os registros rejeitados (com os mesmos filtros de listar)
+        """
+        try:
+            consulta = select(func.count(RegistroRejeitado.id))
+            if etapa is not None:
+                consulta = consulta.where(RegistroRejeitado.etapa == etapa)
+            if topico is not None:
+                consulta = consulta.where(RegistroRejeitado.topico == topico)
+            return self.db.scalar(consulta) or 0
+        except SQLAlchemyError as e:
+            raise Exception(f"Erro ao contar rejeitados: {str(e)}")
+
+    def resumo(self) -> List[dict]:
+        """
+        Quantidade de rejeitados por tópico, etapa e classe de erro
+        """
+        try:
+            linhas = self.db.execute(
+                select(
+                    RegistroRejeitado.topico, RegistroRejeitado.etapa, RegistroRejeitado.classe_erro,
+                    func.count(RegistroRejeitado.id), func.sum(RegistroRejeitado.tentativas),
+                    func.min(RegistroRejeitado.primeira_vez), func.max(RegistroRejeitado.ultima_vez)
+                )
+                .group_by(RegistroRejeitado.topico, RegistroRejeitado.etapa, RegistroRejeitado.classe_erro)
+                .order_by(func.count(RegistroRejeitado.id).desc())
+            ).all()
+        except SQLAlchemyError as e:
+            raise Exception(f"Erro ao resumir rejeitados: {str(e)}")
+        return [
+            {
+                "topico": topico,
+                "etapa": etapa,
+                "classe_erro": classe_erro,
+                "quantidade": quantidade,
+                "tentativas": tentativas,
+                "primeira_vez": primeira_vez.isoformat() if primeira_vez else None,
+                "ultima_vez": ultima_vez.isoformat() if ultima_vez else None
+            }
+            for topico, etapa, classe_erro, quantidade, tentativas, primeira_vez, ultima_vez in linhas
+        ]
@@ -0,0 +1,30 @@
+from processamento_module.rejeitadoModel import RegistroRejeitado
+from processamento_module.RejeitadoService import RejeitadoService
+from service.ServicoAsync import ServicoAsync
+from typing import List, Optional
+
+class RejeitadoServiceAsync(ServicoAsync):
+    """
+    Versão assíncrona do service de registros rejeitados
+    """
+
+    servico_sync = RejeitadoService
+
+    async def listar(self, etapa: Optional[str] = None, topico: Optional[str] = None,
+                     limite: int = 100, apos_id: int = 0) -> List[RegistroRejeitado]:
+        """
+        Lista os registros rejeitados a partir de apos_id
+        """
+        return await self._executar(RejeitadoService.listar, etapa, topico, limite, apos_id)
+
+    async def contar(self, etapa: Optional[str] = None, topico: Optional[str] = None) -> int:
+        """
+        Conta os registros rejeitados
+        """
+        return await self._executar(RejeitadoService.contar, etapa, topico)
+
+    async def resumo(self) -> List[dict]:
+        """
+        Quantidade de rejeitados por tópico, etapa e classe de erro
+        """
+        return await self._executar(RejeitadoService.resumo)
@@ -0,0 +1 @@
+# Módulo Processamento - Conversão dos dados brutos da tabela 'all' em leituras dos sensores
\ No newline at end of file
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, Text, DateTime
+from sqlalchemy.sql import func
+from config.databaseConfig import Base
+
+class CheckpointProcessamento(Base):
+    """
+    Modelo da tabela checkpoints_processamento no banco de dados.
+    Guarda, por tópico, o último registro da tabela all já convertido
+    em leituras, para que cada execução processe só os registros novos.
+    """
+    __tablename__ = "checkpoints_processamento"
+
+    # Campos da tabela
+    topico = Column(Text, primary_key=True)
+    ultimo_id = Column(Integer, nullable=False, default=0)  # último All.id processado
+    processados = Column(Integer, nullable=False, default=0)  # total acumulado de registros
+    atualizado_em = Column(DateTime, nullable=False, server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<CheckpointProcessamento(topico='{self.topico}', ultimo_id={self.ultimo_id})>"
+
+    def to_dict(self):
+        """
+        Converte o checkpoint em dicionário para serialização JSON.
+        """
+        return {
+            "topico": self.topico,
+            "ultimo_id": self.ultimo_id,
+            "processados": self.processados,
+            "atualizado_em": self.atualizado_em.isoformat() if self.atualizado_em else None
+        }
@@ -0,0 +1,169 @@
+from collections import Counter
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+import orjson
+from model.sensoresModel import formatar_timestamp
+from http_module.lote import ler_horario_evento
+from service.resolvedorSensores import ResolvedorSensores
+from processamento_module.rejeitadoModel import ETAPA_JSON, ETAPA_VALOR
+
+# Campos do payload que não são sensores (tópicos sem regras de mapeamento)
+CAMPOS_IGNORADOS = {"timestamp", "device_id", "botao", "location", "battery"}
+
+# Campos do payload (no primeiro nível) com o identificador do dispositivo
+# e o horário da medição
+CAMPO_DISPOSITIVO = "device_id"
+CAMPO_HORARIO = "timestamp"
+
+# Linha de valores_sensor: (valor, id_sensor, horário do evento e de
+# recebimento já em texto, identificador do dispositivo ou None). O ID do
+# dispositivo é resolvido (ou cadastrado) na inserção.
+Linha = Tuple[float, int, str, str, Optional[str]]
+
+# Leitura de um sensor que não está no mapa: (id do registro, campo, nome
+# do sensor, valor, horário do evento e de recebimento já em texto,
+# dispositivo). O gravador resolve (ou cadastra, ver provisionamento.py)
+# antes de inserir.
+LeituraDesconhecida = Tuple[int, str, str, float, str, str, Optional[str]]
+
+# Registro (ou campo) rejeitado: (id do registro, etapa, classe do erro,
+# campo ("" = registro inteiro), detalhe). Vai para registros_rejeitados.
+Rejeicao = Tuple[int, str, str, str, Optional[str]]
+
+# Campo extraído de um payload: (campo, nome do sensor, valor convertido
+# (None = não numérico), valor bruto)
+Campo = Tuple[str, str, Optional[float], Any]
+
+# Função payload -> campos: extrair_campos ou o extrator compilado das
+# regras de mapeamento do tópico (ver mapeamento.py)
+Extrator = Callable[[dict], List[Campo]]
+
+
+class Conversao(NamedTuple):
+    """
+    Resultado da conversão de um bloco de registros
+    """
+    linhas: List[Linha]
+    desconhecidas: List[LeituraDesconhecida]
+    rejeitados: List[Rejeicao]
+    problemas: Counter
+    invalidos: int
+
+
+def converter_valor(valor) -> Optional[float]:
+    """
+    Converte o valor para float (números ou texto numérico); None se não for possível
+    """
+    if isinstance(valor, bool):
+        return None
+    if isinstance(valor, (int, float)):
+        return float(valor)
+    if isinstance(valor, str):
+        try:
+            return float(valor)
+        except ValueError:
+            return None
+    return None
+
+
+def extrair_campos(dados: dict) -> List[Campo]:
+    """
+    Extrator padrão: cada campo do payload (exceto CAMPOS_IGNORADOS) é um
+    sensor com o mesmo nome
+    """
+    return [
+        (nome, nome, converter_valor(valor), valor)
+        for nome, valor in dados.items()
+        if valor is not None and nome.lower() not in CAMPOS_IGNORADOS
+    ]
+
+
+def ler_dispositivo(dados: dict) -> Optional[str]:
+    """
+    Identificador do dispositivo que enviou o payload (None se ausente)
+    """
+    dispositivo = dados.get(CAMPO_DISPOSITIVO)
+    if isinstance(dispositivo, (int, str)) and not isinstance(dispositivo, bool):
+        dispositivo = str(dispositivo).strip()[:100]
+        return dispositivo or None
+    return None
+
+
+def _selecionado(campo: str, selecionados: Set[str]) -> bool:
+    # Campos rejeitados antes de uma regra de mapeamento apontar para dentro
+    # deles (ex.: "sensores" -> regra "sensores.temperatura") também contam
+    return campo in selecionados or any(
+        campo.startswith(selecionado) and campo[len(selecionado)] in ".[" for selecionado in selecionados
+    )
+
+
+def converter_registros(registros: Iterable, resolvedor: ResolvedorSensores,
+                        campos: Optional[Dict[int, Optional[Set[str]]]] = None,
+                        extrator: Extrator = extrair_campos) -> Conversao:
+    """
+    Converte registros (id, payload, data_recebimento) da tabela 'all' nas
+    linhas de valores_sensor, com os campos extraídos pelo extrator do
+    tópico. Registros e campos que não puderem ser convertidos voltam em
+    rejeitados.
+
+    Com campos ({id do registro: nomes dos campos}), só os campos listados
+    de cada registro são convertidos (None = todos): o reprocessamento dos
+    rejeitados não repete as leituras que já foram geradas.
+
+    Não acessa o banco nem estado global: roda igual no processo principal
+    e nos processos do modo paralelo. A leitura recebe o horário do evento
+    (campo timestamp do payload, se válido, ou a data de recebimento do
+    registro), a data de recebimento e o device_id do payload, usado também
+    para achar sensores próprios do dispositivo: reprocessar gera sempre
+    os mesmos valores.
+    """
+    linhas: List[Linha] = []
+    desconhecidas: List[LeituraDesconhecida] = []
+    rejeitados: List[Rejeicao] = []
+    problemas = Counter()
+    invalidos = 0
+
+    for registro in registros:
+        try:
+            dados_json = orjson.loads(registro.payload)
+        except orjson.JSONDecodeError as e:
+            invalidos += 1
+            problemas["JSON inválido"] += 1
+            rejeitados.append((registro.id, ETAPA_JSON, "JSONInvalido", "", str(e)[:200]))
+            continue
+
+        if not isinstance(dados_json, dict):
+            invalidos += 1
+            problemas[f"Formato de dados não reconhecido: {type(dados_json).__name__}"] += 1
+            rejeitados.append((registro.id, ETAPA_JSON, "FormatoNaoSuportado", "", type(dados_json).__name__))
+            continue
+
+        selecionados = campos.get(registro.id) if campos is not None else None
+        recebido = registro.data_recebimento or datetime.utcnow()
+        recebido_em = formatar_timestamp(recebido)
+        try:
+            evento = ler_horario_evento(dados_json.get(CAMPO_HORARIO), recebido)
+        except ValueError:
+            evento = None
+            problemas["Horário do dispositivo inválido (usado o do recebimento)"] += 1
+        data = formatar_timestamp(evento) if evento is not None else recebido_em
+        dispositivo = ler_dispositivo(dados_json)
+        encontrados = 0
+        for campo, nome_sensor, valor_float, valor in extrator(dados_json):
+            if selecionados is not None and not _selecionado(campo, selecionados):
+                continue
+            if valor_float is None:
+                problemas[f"Valor não numérico para o sensor '{nome_sensor}'"] += 1
+                rejeitados.append((registro.id, ETAPA_VALOR, "ValorNaoNumerico", campo, repr(valor)[:200]))
+                continue
+            sensor = resolvedor.resolver(nome_sensor, dispositivo)
+            if sensor is None:
+                desconhecidas.append((registro.id, campo, nome_sensor, valor_float, data, recebido_em, dispositivo))
+            else:
+                linhas.append((valor_float, sensor.id, data, recebido_em, dispositivo))
+            encontrados += 1
+
+        if not encontrados and selecionados is None:
+            problemas["Nenhum dado de sensor válido encontrado"] += 1
+
+    return Conversao(linhas, desconhecidas, rejeitados, problemas, invalidos)
@@ -0,0 +1,145 @@
+import math
+import re
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+from processamento_module.conversao import Campo, Extrator, converter_valor, extrair_campos
+
+# Conversões de tipo aceitas nas regras: valor do payload -> float (None = inválido)
+def _converter_inteiro(valor) -> Optional[float]:
+    numero = converter_valor(valor)
+    return float(int(numero)) if numero is not None and math.isfinite(numero) else None
+
+_BOOLEANOS = {"true": 1.0, "false": 0.0, "on": 1.0, "off": 0.0, "ligado": 1.0, "desligado": 0.0, "1": 1.0, "0": 0.0}
+
+def _converter_booleano(valor) -> Optional[float]:
+    if isinstance(valor, bool):
+        return 1.0 if valor else 0.0
+    if isinstance(valor, (int, float)) and valor in (0, 1):
+        return float(valor)
+    if isinstance(valor, str):
+        return _BOOLEANOS.get(valor.strip().lower())
+    return None
+
+CONVERSOES: Dict[str, Callable[[Any], Optional[float]]] = {
+    "numero": converter_valor,
+    "inteiro": _converter_inteiro,
+    "booleano": _converter_booleano,
+}
+
+# Caminho JSON das regras: chaves separadas por ponto e índices de lista
+# entre colchetes, ex.: "sensores.temperatura" ou "leituras[0].valor"
+_PARTE_CAMINHO = re.compile(r"([^.\[\]]+)|\[(\d+)\]")
+_CAMINHO_VALIDO = re.compile(r"[^.\[\]]+(\[\d+\])*(\.[^.\[\]]+(\[\d+\])*)*")
+
+
+class Regra(NamedTuple):
+    """
+    Regra de mapeamento já validada (sem ORM: vai para os processos do modo paralelo)
+    """
+    caminho: str
+    sensor: str
+    escala: float = 1.0
+    deslocamento: float = 0.0
+    conversao: str = "numero"
+
+
+def partes_caminho(caminho: str) -> Tuple[Union[str, int], ...]:
+    """
+    Divide o caminho JSON em chaves (str) e índices (int).
+    Levanta ValueError se o caminho não for válido.
+    """
+    if not _CAMINHO_VALIDO.fullmatch(caminho or ""):
+        raise ValueError(f"Caminho inválido: {caminho!r} (ex.: sensores.temperatura ou leituras[0].valor)")
+    return tuple(
+        int(indice) if indice else chave
+        for chave, indice in _PARTE_CAMINHO.findall(caminho)
+    )
+
+
+def _compilar_caminho(caminho: str) -> Callable[[dict], Any]:
+    """
+    Função que lê o valor do caminho em um payload (None se não existir)
+    """
+    partes = partes_caminho(caminho)
+    if len(partes) == 1:
+        chave = partes[0]
+        return lambda dados: dados.get(chave)
+
+    def obter(dados: dict) -> Any:
+        atual = dados
+        for parte in partes:
+            try:
+                atual = atual[parte]
+            except (KeyError, IndexError, TypeError):
+                return None
+        return atual
+    return obter
+
+
+def _compilar_conversao(regra: Regra) -> Callable[[Any], Optional[float]]:
+    """
+    Função que converte o valor e aplica a calibração (valor * escala + deslocamento)
+    """
+    converter = CONVERSOES[regra.conversao]
+    escala, deslocamento = float(regra.escala), float(regra.deslocamento)
+    if escala == 1.0 and deslocamento == 0.0:
+        return converter
+
+    def calibrar(valor) -> Optional[float]:
+        numero = converter(valor)
+        return numero * escala + deslocamento if numero is not None else None
+    return calibrar
+
+
+def compilar_extrator(regras: Iterable[Regra]) -> Extrator:
+    """
+    Compila as regras de um tópico em uma função payload -> campos
+    (campo, sensor, valor convertido, valor bruto). Caminhos e conversões
+    são resolvidos aqui, uma vez: a extração só chama as funções prontas.
+    Campos ausentes ou nulos no payload são ignorados.
+    """
+    passos = [
+        (regra.caminho, regra.sensor, _compilar_caminho(regra.caminho), _compilar_conversao(regra))
+        for regra in regras
+    ]
+
+    def extrair(dados: dict) -> List[Campo]:
+        campos = []
+        for caminho, sensor, obter, converter in passos:
+            valor = obter(dados)
+            if valor is not None:
+                campos.append((caminho, sensor, converter(valor), valor))
+        return campos
+    return extrair
+
+
+class MapeamentoTopicos:
+    """
+    Regras de mapeamento por tópico, com o extrator de cada tópico compilado
+    na primeira vez que é pedido. Tópicos sem regras usam extrair_campos
+    (cada campo do payload é um sensor com o mesmo nome).
+
+    Só as regras (tuplas) são serializadas: os processos do modo paralelo
+    recebem uma cópia e compilam os seus extratores.
+    """
+
+    def __init__(self, regras: Dict[str, List[Regra]]):
+        self.regras = regras
+        self._extratores: Dict[str, Extrator] = {}
+
+    def extrator(self, topico: str) -> Extrator:
+        extrator = self._extratores.get(topico)
+        if extrator is None:
+            regras = self.regras.get(topico)
+            extrator = compilar_extrator(regras) if regras else extrair_campos
+            self._extratores[topico] = extrator
+        return extrator
+
+    def __contains__(self, topico: str) -> bool:
+        return topico in self.regras
+
+    def __getstate__(self):
+        return {"regras": self.regras}
+
+    def __setstate__(self, estado):
+        self.regras = estado["regras"]
+        self._extratores = {}
@@ -0,0 +1,46 @@
+from sqlalchemy import Column, Integer, String, Float, Boolean, Text, DateTime, Index
+from sqlalchemy.sql import func
+from config.databaseConfig import Base
+
+class RegraMapeamento(Base):
+    """
+    Modelo da tabela regras_mapeamento no banco de dados.
+    Define, por tópico, quais campos dos payloads são leituras: caminho
+    JSON -> sensor, com conversão de tipo e calibração opcional
+    (valor * escala + deslocamento). Tópicos sem regras continuam com o
+    mapeamento padrão (cada campo é um sensor com o mesmo nome).
+    """
+    __tablename__ = "regras_mapeamento"
+
+    # Campos da tabela
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    topico = Column(Text, nullable=False)
+    caminho = Column(Text, nullable=False)  # ex: "sensores.temperatura", "leituras[0].valor"
+    sensor = Column(String(100), nullable=False)  # nome do sensor (sem diferenciar maiúsculas)
+    escala = Column(Float, nullable=False, default=1.0)
+    deslocamento = Column(Float, nullable=False, default=0.0)
+    conversao = Column(String(20), nullable=False, default="numero")  # "numero", "inteiro", "booleano"
+    ativa = Column(Boolean, nullable=False, default=True)
+    atualizado_em = Column(DateTime, nullable=False, server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<RegraMapeamento(topico='{self.topico}', caminho='{self.caminho}', sensor='{self.sensor}')>"
+
+    def to_dict(self):
+        """
+        Converte a regra em dicionário para serialização JSON.
+        """
+        return {
+            "id": self.id,
+            "topico": self.topico,
+            "caminho": self.caminho,
+            "sensor": self.sensor,
+            "escala": self.escala,
+            "deslocamento": self.deslocamento,
+            "conversao": self.conversao,
+            "ativa": self.ativa,
+            "atualizado_em": self.atualizado_em.isoformat() if self.atualizado_em else None
+        }
+
+# Um caminho mapeado uma vez por tópico
+Index("ux_regras_mapeamento_topico_caminho", RegraMapeamento.topico, RegraMapeamento.caminho, unique=True)
@@ -0,0 +1,83 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, Optional, Tuple
+from config.databaseConfig import engine, sessao_banco
+from all_module.AllService import AllService
+from service.resolvedorSensores import ResolvedorSensores
+from processamento_module.conversao import Conversao, converter_registros
+from processamento_module.mapeamento import MapeamentoTopicos
+
+# Faixas em andamento por processo: mantém todos ocupados enquanto o
+# processo principal grava, sem acumular resultados na memória
+FAIXAS_POR_TRABALHADOR = 2
+
+# Resultado de uma faixa: (fim da faixa, registros lidos, conversão)
+ResultadoFaixa = Tuple[int, int, Conversao]
+
+# Mapa de sensores e regras de mapeamento do processo trabalhador
+# (recebidos na inicialização; os extratores são compilados no trabalhador)
+_resolvedor: Optional[ResolvedorSensores] = None
+_mapeamento: Optional[MapeamentoTopicos] = None
+
+
+def _iniciar_trabalhador(resolvedor: ResolvedorSensores, mapeamento: MapeamentoTopicos):
+    global _resolvedor, _mapeamento
+    # Conexões herdadas do processo principal (fork) não podem ser usadas aqui
+    engine.dispose(close=False)
+    _resolvedor = resolvedor
+    _mapeamento = mapeamento
+
+
+def _converter_faixa(topico: str, inicio: int, fim: int) -> Tuple[int, Conversao]:
+    """
+    Executada nos processos trabalhadores: lê uma faixa de IDs e a converte
+    """
+    with sessao_banco() as db:
+        registros = AllService(db).listar_intervalo(topico, inicio, fim)
+    return len(registros), converter_registros(registros, _resolvedor, extrator=_mapeamento.extrator(topico))
+
+
+class ProcessadorParalelo:
+    """
+    Pool de processos para o backfill da tabela 'all'. A faixa de IDs de um
+    tópico é dividida em faixas de tamanho_bloco IDs; cada processo lê e
+    converte (JSON + regras de mapeamento + sensores) as suas faixas, e os resultados
+    são entregues na ordem dos IDs para um único gravador no processo
+    principal. Assim o resultado é o mesmo do processamento sequencial.
+    """
+
+    def __init__(self, trabalhadores: int, resolvedor: ResolvedorSensores, mapeamento: MapeamentoTopicos,
+                 tamanho_bloco: int):
+        self.trabalhadores = trabalhadores
+        self.tamanho_bloco = tamanho_bloco
+        self._pool = ProcessPoolExecutor(
+            max_workers=trabalhadores,
+            initializer=_iniciar_trabalhador,
+            initargs=(resolvedor, mapeamento)
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, erro, rastro):
+        self.fechar()
+
+    def converter_topico(self, topico: str, inicio: int, fim: int) -> Iterator[ResultadoFaixa]:
+        """
+        Converte os registros de um tópico com inicio < ID <= fim, entregando
+        o resultado de cada faixa em ordem crescente de ID
+        """
+        pendentes = deque()
+        limite = self.trabalhadores * FAIXAS_POR_TRABALHADOR
+        for inicio_faixa in range(inicio, fim, self.tamanho_bloco):
+            fim_faixa = min(inicio_faixa + self.tamanho_bloco, fim)
+            pendentes.append((fim_faixa, self._pool.submit(_converter_faixa, topico, inicio_faixa, fim_faixa)))
+            if len(pendentes) >= limite:
+                fim_faixa, futuro = pendentes.popleft()
+                yield (fim_faixa, *futuro.result())
+        while pendentes:
+            fim_faixa, futuro = pendentes.popleft()
+            yield (fim_faixa, *futuro.result())
+
+    def fechar(self):
+        self._pool.shutdown(wait=True, cancel_futures=True)
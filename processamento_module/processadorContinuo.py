@@ -0,0 +1,238 @@
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional, Set
+from sqlalchemy.orm import Session
+from config.databaseConfig import sessao_banco
+from config.escritorBanco import escritor
+from all_module.AllService import AllService, observar_gravacoes
+from service.SensoresService import SensoresService
+from service.ValoresSensorService import ValoresSensorService
+from processamento_module.CheckpointService import CheckpointService
+from processamento_module.MapeamentoService import MapeamentoService
+from processamento_module.RejeitadoService import RejeitadoService
+from processamento_module.conversao import Conversao, converter_registros
+from processamento_module.provisionamento import AUTO_CADASTRO, resolver_desconhecidas
+from metricas_module.metricas import registro_metricas
+
+logger = logging.getLogger(__name__)
+
+# Tempo máximo (s) entre a gravação de um registro e a sua conversão em
+# leituras, quando a notificação não chega (ex.: gravado por outro processo)
+LATENCIA_MAXIMA = float(os.getenv("PROCESSAMENTO_LATENCIA", "1.0"))
+
+# Registros por micro-lote (uma transação do escritor por micro-lote)
+TAMANHO_MICROLOTE = int(os.getenv("PROCESSAMENTO_MICROLOTE", "500"))
+
+
+class CheckpointDesatualizado(Exception):
+    """O checkpoint foi avançado por outro processador (o micro-lote é desfeito)"""
+
+
+def gravar_bloco(db: Session, topico: str, anterior: int, ultimo_id: int, quantidade: int,
+                 conversao: Conversao, auto_cadastro: bool = AUTO_CADASTRO) -> int:
+    """
+    Insere as leituras de um bloco, grava os registros rejeitados e avança o
+    checkpoint do tópico em um único commit. Se outro processador já tiver
+    avançado o checkpoint, nada é gravado (CheckpointDesatualizado), e as
+    leituras não são duplicadas. Leituras de sensores fora do mapa são
+    resolvidas (ou cadastradas) antes; as que sobram viram rejeitadas.
+    Retorna a quantidade de leituras inseridas.
+    """
+    linhas, rejeitados = conversao.linhas, list(conversao.rejeitados)
+    if conversao.desconhecidas:
+        linhas = linhas + resolver_desconhecidas(
+            db, conversao.desconhecidas, conversao.problemas, rejeitados, auto_cadastro
+        )
+    ValoresSensorService(db).inserir_linhas(linhas)
+    RejeitadoService(db).registrar(topico, rejeitados)
+    if not CheckpointService(db).avancar(topico, ultimo_id, quantidade, anterior):
+        db.rollback()
+        raise CheckpointDesatualizado(topico)
+    db.commit()
+    if rejeitados:
+        processamento_rejeitados.inc(topico, valor=len(rejeitados))
+    return len(linhas)
+
+
+class ProcessadorContinuo:
+    """
+    Processamento contínuo da tabela 'all': uma thread acompanha os
+    registros novos (pelo ID, a partir dos checkpoints) e os converte em
+    leituras em micro-lotes gravados pelo escritor único. A gravação de
+    registros neste processo acorda a thread na hora (observar_gravacoes);
+    registros gravados por outros processos são vistos em até LATENCIA_MAXIMA.
+
+    Roda dentro da API (PROCESSAMENTO_CONTINUO=1) ou pelo
+    scripts/Tratar_dados.py --continuo.
+    """
+
+    def __init__(self, latencia: float = LATENCIA_MAXIMA, tamanho_lote: int = TAMANHO_MICROLOTE):
+        self.latencia = latencia
+        self.tamanho_lote = tamanho_lote
+        self._novos = threading.Event()
+        self._parar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.registros = 0
+        self.leituras = 0
+        self.conflitos = 0
+        self.ultimo_ciclo: Optional[float] = None
+        # Recebimento do registro mais antigo ainda pendente por tópico
+        # (None = em dia), atualizado a cada micro-lote pela própria thread
+        self._pendentes: Dict[str, Optional[datetime]] = {}
+
+    def notificar(self, topicos: Optional[Set[str]] = None):
+        """
+        Avisa que há registros novos (chamado após o commit da gravação)
+        """
+        self._novos.set()
+
+    @property
+    def em_execucao(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    # ==============================================================
+    # CICLO DE VIDA
+    # ==============================================================
+
+    def iniciar(self):
+        with self._lock:
+            if self.em_execucao:
+                return
+            self._parar.clear()
+            observar_gravacoes(self.notificar)
+            self._thread = threading.Thread(target=self._executar_loop, name="processamento-continuo", daemon=True)
+            self._thread.start()
+        logger.info(f"🔄 Processamento contínuo iniciado (latência máxima {self.latencia}s)")
+
+    def parar(self, timeout: float = 10.0):
+        """
+        Termina o micro-lote atual e encerra a thread
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._parar.set()
+        self._novos.set()
+        thread.join(timeout)
+
+    def _executar_loop(self):
+        while not self._parar.is_set():
+            self._novos.clear()
+            try:
+                self.processar_pendentes()
+            except Exception as e:
+                logger.error(f"❌ Erro no processamento contínuo: {e}")
+            self._novos.wait(self.latencia)
+
+    # ==============================================================
+    # PROCESSAMENTO
+    # ==============================================================
+
+    def processar_pendentes(self) -> int:
+        """
+        Converte todos os registros novos, tópico a tópico, em micro-lotes.
+        Retorna a quantidade de registros processados.
+        """
+        processados = 0
+        with sessao_banco() as db:
+            all_service = AllService(db)
+            ultimos_ids = CheckpointService(db).ultimos_ids()
+            for topico in all_service.listar_topicos_unicos():
+                processados += self._processar_topico(db, all_service, topico, ultimos_ids.get(topico, 0))
+        self.ultimo_ciclo = time.time()
+        return processados
+
+    def _processar_topico(self, db: Session, all_service: AllService, topico: str, ultimo_id: int) -> int:
+        processados = 0
+        while not self._parar.is_set():
+            registros = all_service.listar_apos_id(topico, ultimo_id, self.tamanho_lote)
+            # Encerra a transação de leitura: o próximo micro-lote vê os registros novos
+            db.rollback()
+            if not registros:
+                self._pendentes[topico] = None
+                break
+            self._pendentes[topico] = registros[0].data_recebimento
+
+            # Regras e sensores em cache: alterações valem a partir do próximo micro-lote
+            extrator = MapeamentoService(db).mapeamento().extrator(topico)
+            conversao = converter_registros(registros, SensoresService(db).resolvedor(), extrator=extrator)
+            anterior, ultimo_id = ultimo_id, registros[-1].id
+            try:
+                leituras = escritor.executar_sync(lambda db_escrita: gravar_bloco(
+                    db_escrita, topico, anterior, ultimo_id, len(registros), conversao
+                ))
+            except CheckpointDesatualizado:
+                # Outro processador avançou o tópico: recomeça do checkpoint gravado
+                self.conflitos += 1
+                logger.warning(f"⚠️ Checkpoint de '{topico}' avançado por outro processador")
+                break
+
+            agora = datetime.utcnow()
+            for registro in registros:
+                if registro.data_recebimento is not None:
+                    processamento_atraso.observar(max(0.0, (agora - registro.data_recebimento).total_seconds()), topico)
+            processamento_registros.inc(topico, valor=len(registros))
+            processados += len(registros)
+            self.registros += len(registros)
+            self.leituras += leituras
+            if conversao.problemas:
+                logger.debug(f"⚠️ {topico}: {dict(conversao.problemas)}")
+
+            if len(registros) < self.tamanho_lote:
+                self._pendentes[topico] = None
+                break
+        return processados
+
+    def atraso_pendente(self) -> Dict[str, float]:
+        """
+        Idade (s) do registro mais antigo ainda não processado, por tópico
+        (0 quando o tópico está em dia), pelo que a thread viu no último
+        micro-lote: não consulta o banco, e a idade continua crescendo se
+        o processamento parar
+        """
+        agora = datetime.utcnow()
+        return {
+            topico: max(0.0, (agora - data).total_seconds()) if data else 0.0
+            for topico, data in list(self._pendentes.items())
+        }
+
+    def estatisticas(self) -> dict:
+        return {
+            "em_execucao": self.em_execucao,
+            "latencia_maxima": self.latencia,
+            "tamanho_microlote": self.tamanho_lote,
+            "registros": self.registros,
+            "leituras": self.leituras,
+            "conflitos": self.conflitos,
+            "ultimo_ciclo": self.ultimo_ciclo
+        }
+
+
+# Instância global compartilhada pela aplicação
+processador_continuo = ProcessadorContinuo()
+
+
+# ==============================================================
+# MÉTRICAS
+# ==============================================================
+
+processamento_registros = registro_metricas.contador(
+    "processamento_registros", "Registros da tabela all convertidos em leituras por tópico", ("topico",)
+)
+processamento_rejeitados = registro_metricas.contador(
+    "processamento_rejeitados", "Registros (ou campos) rejeitados pelo processamento por tópico", ("topico",)
+)
+processamento_atraso = registro_metricas.histograma(
+    "processamento_atraso_segundos", "Tempo entre o recebimento do registro e a gravação das leituras", ("topico",),
+    limites=(0.01, 0.05, 0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0, 300.0, 3600.0)
+)
+registro_metricas.medidor_coletado(
+    "processamento_pendente_segundos", "Idade do registro mais antigo ainda não processado por tópico", ("topico",),
+    lambda: {(topico,): atraso for topico, atraso in processador_continuo.atraso_pendente().items()}
+    if processador_continuo.em_execucao else {}
+)
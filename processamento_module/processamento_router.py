@@ -0,0 +1,65 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from config.databaseConfig import get_database_async
+from processamento_module.RejeitadoServiceAsync import RejeitadoServiceAsync
+from processamento_module.rejeitadoModel import ETAPAS
+from processamento_module.MapeamentoController import MapeamentoController
+from tarefas_module.TarefaController import TarefaController
+
+# Criar router para o processamento da tabela all (rejeitados e mapeamentos)
+router = APIRouter(
+    prefix="/processamento",
+    tags=["processamento"]
+)
+
+def _validar_etapa(etapa: Optional[str]):
+    if etapa is not None and etapa not in ETAPAS:
+        raise HTTPException(status_code=400, detail=f"Etapa inválida: {etapa} (use {', '.join(ETAPAS)})")
+
+@router.get("/rejeitados")
+async def listar_rejeitados(etapa: Optional[str] = None, topico: Optional[str] = None, limite: int = 100,
+                            apos_id: int = 0, db: AsyncSession = Depends(get_database_async)):
+    """Lista os registros rejeitados (paginação: apos_id = último ID recebido)"""
+    _validar_etapa(etapa)
+    rejeitados = await RejeitadoServiceAsync(db).listar(etapa, topico, min(max(limite, 1), 1000), apos_id)
+    return {
+        "total": await RejeitadoServiceAsync(db).contar(etapa, topico),
+        "rejeitados": [rejeitado.to_dict() for rejeitado in rejeitados],
+        "proximo_apos_id": rejeitados[-1].id if rejeitados else None
+    }
+
+@router.get("/rejeitados/resumo")
+async def resumo_rejeitados(db: AsyncSession = Depends(get_database_async)):
+    """Quantidade de rejeitados por tópico, etapa e classe de erro"""
+    return await RejeitadoServiceAsync(db).resumo()
+
+@router.post("/rejeitados/reprocessar")
+async def reprocessar_rejeitados(dados: Optional[dict] = None):
+    """Reprocessa os rejeitados em segundo plano: {"etapa": "sensor", "topico": "...", "auto_cadastro": false}"""
+    return await TarefaController.enviar("reprocessar_rejeitados", dados or {})
+
+@router.get("/mapeamentos")
+async def listar_mapeamentos(topico: Optional[str] = None, db: AsyncSession = Depends(get_database_async)):
+    """Lista as regras de mapeamento (caminho JSON -> sensor) por tópico"""
+    return await MapeamentoController.listar(topico, db)
+
+@router.post("/mapeamentos")
+async def criar_mapeamento(dados: dict, db: AsyncSession = Depends(get_database_async)):
+    """Cria uma regra: {"topico": "...", "caminho": "sensores.temp", "sensor": "temperatura", "escala": 0.1}"""
+    return await MapeamentoController.criar(dados, db)
+
+@router.post("/mapeamentos/testar")
+async def testar_mapeamento(dados: dict, db: AsyncSession = Depends(get_database_async)):
+    """Mostra o que as regras do tópico extraem de um payload: {"topico": "...", "payload": {...}}"""
+    return await MapeamentoController.testar(dados, db)
+
+@router.put("/mapeamentos/{regra_id}")
+async def atualizar_mapeamento(regra_id: int, dados: dict, db: AsyncSession = Depends(get_database_async)):
+    """Atualiza uma regra de mapeamento"""
+    return await MapeamentoController.atualizar(regra_id, dados, db)
+
+@router.delete("/mapeamentos/{regra_id}")
+async def deletar_mapeamento(regra_id: int, db: AsyncSession = Depends(get_database_async)):
+    """Deleta uma regra (sem regras, o tópico volta ao mapeamento padrão)"""
+    return await MapeamentoController.deletar(regra_id, db)
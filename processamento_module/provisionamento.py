@@ -0,0 +1,75 @@
+import logging
+import os
+from collections import Counter
+from typing import Dict, List, Tuple
+from sqlalchemy.orm import Session
+from model.sensoresModel import normalizar_nome
+from service.SensoresService import SensoresService
+from service.resolvedorSensores import SensorResolvido
+from processamento_module.conversao import LeituraDesconhecida, Linha, Rejeicao
+from processamento_module.rejeitadoModel import ETAPA_SENSOR
+
+logger = logging.getLogger(__name__)
+
+# Cadastrar automaticamente os sensores que aparecem nos payloads
+# (desligado: campos sem sensor cadastrado são descartados)
+AUTO_CADASTRO = os.getenv("SENSORES_AUTO_CADASTRO", "0") == "1"
+
+# Tipo e unidade dos sensores cadastrados automaticamente, pelo nome do
+# campo: nome exato ou prefixo (ex.: temperatura_externa -> temperatura)
+TIPOS_SENSORES: Dict[str, Tuple[str, str]] = {
+    "temperatura": ("temperatura", "°C"),
+    "temp": ("temperatura", "°C"),
+    "umidade": ("umidade", "%"),
+    "luminosidade": ("luminosidade", "lux"),
+    "luz": ("luminosidade", "lux"),
+    "pressao": ("pressao", "hPa"),
+}
+
+# Tipo e unidade dos campos que não estão na tabela acima
+TIPO_PADRAO = ("generico", "")
+
+
+def inferir_tipo(nome: str) -> Tuple[str, str]:
+    """
+    Retorna (tipo, unidade) de um sensor pelo nome do campo
+    """
+    nome = nome.lower()
+    if nome in TIPOS_SENSORES:
+        return TIPOS_SENSORES[nome]
+    # Prefixo mais longo primeiro: "temperatura_x" não deve casar com "temp"
+    for prefixo in sorted(TIPOS_SENSORES, key=len, reverse=True):
+        if nome.startswith(prefixo):
+            return TIPOS_SENSORES[prefixo]
+    return TIPO_PADRAO
+
+
+def resolver_desconhecidas(db: Session, desconhecidas: List[LeituraDesconhecida], problemas: Counter,
+                           rejeitados: List[Rejeicao], auto_cadastro: bool = AUTO_CADASTRO) -> List[Linha]:
+    """
+    Converte as leituras de sensores que não estavam no mapa usado na
+    conversão: o sensor pode ter sido criado depois (ex.: mapa dos processos
+    do modo paralelo) ou, com auto_cadastro, é cadastrado agora, uma vez por
+    nome (como sensor geral). As que continuam sem sensor entram nos
+    problemas e nos rejeitados.
+    """
+    if not desconhecidas:
+        return []
+
+    service = SensoresService(db)
+    resolvedor = service.resolvedor()
+    # O cache só é invalidado depois do commit: guarda os cadastrados aqui
+    cadastrados: Dict[str, SensorResolvido] = {}
+    linhas: List[Linha] = []
+    for id_registro, campo, nome, valor, data, recebido_em, dispositivo in desconhecidas:
+        sensor = resolvedor.resolver(nome, dispositivo) or cadastrados.get(normalizar_nome(nome))
+        if sensor is None and auto_cadastro:
+            tipo, unidade = inferir_tipo(nome)
+            sensor = cadastrados[normalizar_nome(nome)] = service.garantir(nome, tipo, unidade)
+            logger.info(f"🆕 Sensor '{nome}' cadastrado automaticamente ({tipo}, {unidade or 'sem unidade'})")
+        if sensor is None:
+            problemas[f"Sensor '{nome}' não encontrado"] += 1
+            rejeitados.append((id_registro, ETAPA_SENSOR, "SensorNaoEncontrado", campo, nome if campo != nome else None))
+            continue
+        linhas.append((valor, sensor.id, data, recebido_em, dispositivo))
+    return linhas
@@ -0,0 +1,55 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
+from sqlalchemy.sql import func
+from config.databaseConfig import Base
+
+# Etapas do pipeline em que um registro da tabela all pode ser rejeitado
+ETAPA_JSON = "json"        # payload não é JSON ou não é um objeto
+ETAPA_VALOR = "valor"      # campo com valor não numérico
+ETAPA_SENSOR = "sensor"    # campo sem sensor cadastrado
+ETAPAS = (ETAPA_JSON, ETAPA_VALOR, ETAPA_SENSOR)
+
+class RegistroRejeitado(Base):
+    """
+    Modelo da tabela registros_rejeitados no banco de dados (dead letters).
+    Cada linha é um registro da tabela all (ou um campo dele) que não pôde
+    ser convertido em leitura. O checkpoint passa por cima do registro, que
+    não é convertido de novo a cada execução: fica aqui até ser reprocessado
+    (tarefa reprocessar_rejeitados), por exemplo depois de cadastrar o sensor.
+    """
+    __tablename__ = "registros_rejeitados"
+
+    # Campos da tabela
+    id = Column(Integer, primary_key=True, index=True)
+    id_registro = Column(Integer, nullable=False)  # All.id (sem FK: a limpeza da tabela all não é bloqueada)
+    topico = Column(Text, nullable=False)
+    etapa = Column(String(20), nullable=False)
+    classe_erro = Column(String(50), nullable=False)
+    campo = Column(Text, nullable=False, default="")  # "" quando o registro inteiro foi rejeitado
+    detalhe = Column(Text, nullable=True)
+    primeira_vez = Column(DateTime, nullable=False, server_default=func.now())
+    ultima_vez = Column(DateTime, nullable=False, server_default=func.now())
+    tentativas = Column(Integer, nullable=False, default=1)
+
+    def __repr__(self):
+        return f"<RegistroRejeitado(id_registro={self.id_registro}, etapa='{self.etapa}', campo='{self.campo}')>"
+
+    def to_dict(self):
+        """
+        Converte o registro rejeitado em dicionário para serialização JSON.
+        """
+        return {
+            "id": self.id,
+            "id_registro": self.id_registro,
+            "topico": self.topico,
+            "etapa": self.etapa,
+            "classe_erro": self.classe_erro,
+            "campo": self.campo,
+            "detalhe": self.detalhe,
+            "primeira_vez": self.primeira_vez.isoformat() if self.primeira_vez else None,
+            "ultima_vez": self.ultima_vez.isoformat() if self.ultima_vez else None,
+            "tentativas": self.tentativas
+        }
+
+# Um registro por (registro, etapa, campo): rejeitar de novo só soma tentativas
+Index("ux_rejeitados_registro", RegistroRejeitado.id_registro, RegistroRejeitado.etapa, RegistroRejeitado.campo, unique=True)
+Index("ix_rejeitados_etapa_topico", RegistroRejeitado.etapa, RegistroRejeitado.topico)
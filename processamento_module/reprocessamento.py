@@ -0,0 +1,124 @@
+from collections import Counter
+from typing import Dict, List, Optional, Set
+from sqlalchemy.orm import Session
+from config.databaseConfig import sessao_banco
+from all_module.AllService import AllService
+from service.SensoresService import SensoresService
+from service.ValoresSensorService import ValoresSensorService
+from processamento_module.MapeamentoService import MapeamentoService
+from processamento_module.RejeitadoService import RejeitadoService
+from processamento_module.conversao import converter_registros
+from processamento_module.provisionamento import AUTO_CADASTRO, resolver_desconhecidas
+from processamento_module.rejeitadoModel import ETAPAS, RegistroRejeitado
+from tarefas_module.executorTarefas import ContextoTarefa, tipo_tarefa
+
+# Registros rejeitados reprocessados por transação
+TAMANHO_BLOCO_REPROCESSAMENTO = 500
+
+
+def reprocessar_bloco(db: Session, rejeitados: List[RegistroRejeitado], auto_cadastro: bool = AUTO_CADASTRO) -> Counter:
+    """
+    Passa um bloco de registros rejeitados de novo pela conversão, em uma
+    transação, com as regras de mapeamento atuais: só os campos rejeitados
+    de cada registro são convertidos (o registro inteiro, se a rejeição foi
+    do payload). As leituras geradas são inseridas e os rejeitados
+    resolvidos são removidos; os que falham de novo têm as tentativas
+    somadas. Rejeitados de registros que não existem mais na tabela all
+    (limpeza) são descartados.
+    Retorna {"resolvidos", "descartados", "leituras"}.
+    """
+    campos: Dict[int, Optional[Set[str]]] = {}
+    topicos: Dict[int, str] = {}
+    for rejeitado in rejeitados:
+        atual = campos.get(rejeitado.id_registro, set())
+        if atual is not None:
+            campos[rejeitado.id_registro] = atual | {rejeitado.campo} if rejeitado.campo else None
+        topicos[rejeitado.id_registro] = rejeitado.topico
+
+    registros = AllService(db).listar_por_ids(list(campos))
+    existentes = {registro.id for registro in registros}
+    resolvedor = SensoresService(db).resolvedor()
+    mapeamento = MapeamentoService(db).mapeamento()
+    service = RejeitadoService(db)
+
+    totais = Counter()
+    pendentes = set()
+    for topico in sorted(set(topicos.values())):
+        conversao = converter_registros(
+            [registro for registro in registros if topicos[registro.id] == topico], resolvedor, campos,
+            extrator=mapeamento.extrator(topico)
+        )
+        linhas, novos_rejeitados = conversao.linhas, list(conversao.rejeitados)
+        if conversao.desconhecidas:
+            linhas = linhas + resolver_desconhecidas(
+                db, conversao.desconhecidas, conversao.problemas, novos_rejeitados, auto_cadastro
+            )
+        ValoresSensorService(db).inserir_linhas(linhas)
+        service.registrar(topico, novos_rejeitados)
+        pendentes.update((id_registro, etapa, campo) for id_registro, etapa, _, campo, _ in novos_rejeitados)
+        totais["leituras"] += len(linhas)
+
+    removidos = []
+    for rejeitado in rejeitados:
+        if rejeitado.id_registro not in existentes:
+            totais["descartados"] += 1
+        elif (rejeitado.id_registro, rejeitado.etapa, rejeitado.campo) not in pendentes:
+            totais["resolvidos"] += 1
+        else:
+            continue
+        removidos.append(rejeitado.id)
+    service.remover(removidos)
+    db.commit()
+    return totais
+
+
+# ==============================================================
+# REPROCESSAMENTO (POST /processamento/rejeitados/reprocessar)
+# ==============================================================
+
+def _validar_reprocessamento(parametros: dict) -> dict:
+    etapa = parametros.get("etapa")
+    if etapa is not None and etapa not in ETAPAS:
+        raise ValueError(f"Etapa inválida: {etapa} (use {', '.join(ETAPAS)})")
+    topico = parametros.get("topico")
+    if topico is not None and not isinstance(topico, str):
+        raise ValueError("topico deve ser texto")
+    auto_cadastro = parametros.get("auto_cadastro", AUTO_CADASTRO)
+    if not isinstance(auto_cadastro, bool):
+        raise ValueError("auto_cadastro deve ser true ou false")
+    return {"etapa": etapa, "topico": topico, "auto_cadastro": auto_cadastro}
+
+@tipo_tarefa("reprocessar_rejeitados", _validar_reprocessamento)
+def reprocessar_rejeitados(contexto: ContextoTarefa) -> dict:
+    """
+    Reprocessa os registros rejeitados (ex.: depois de cadastrar o sensor
+    que faltava), em blocos pelo ID, do mais antigo ao mais novo
+    """
+    etapa = contexto.parametros["etapa"]
+    topico = contexto.parametros["topico"]
+    auto_cadastro = contexto.parametros["auto_cadastro"]
+
+    with sessao_banco() as db:
+        contexto.definir_total(contexto.processados + RejeitadoService(db).contar(etapa, topico))
+
+    # Os que falham de novo continuam na tabela: o cursor passa por cima deles
+    cursor = {"apos_id": 0}
+    totais = Counter()
+
+    def reprocessar(db: Session) -> int:
+        rejeitados = RejeitadoService(db).listar(etapa, topico, TAMANHO_BLOCO_REPROCESSAMENTO, cursor["apos_id"])
+        if rejeitados:
+            totais.update(reprocessar_bloco(db, rejeitados, auto_cadastro))
+            cursor["apos_id"] = rejeitados[-1].id
+        return len(rejeitados)
+
+    reprocessados = contexto.repetir_em_blocos(reprocessar, TAMANHO_BLOCO_REPROCESSAMENTO)
+    return {
+        "reprocessados": reprocessados,
+        "resolvidos": totais["resolvidos"],
+        "descartados": totais["descartados"],
+        "ainda_rejeitados": reprocessados - totais["resolvidos"] - totais["descartados"],
+        "leituras_criadas": totais["leituras"],
+        "etapa": etapa,
+        "topico": topico
+    }
@@ -0,0 +1,49 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from config.databaseConfig import get_database_async
+from controller.DispositivosController import DispositivosController
+
+# Criar router para dispositivos
+router = APIRouter(
+    prefix="/dispositivos",
+    tags=["dispositivos"],
+    responses={404: {"description": "Dispositivo não encontrado"}}
+)
+
+@router.get("/")
+async def listar_dispositivos(db: AsyncSession = Depends(get_database_async)):
+    """Lista todos os dispositivos"""
+    return await DispositivosController.listar_dispositivos(db)
+
+@router.post("/")
+async def criar_dispositivo(
+    identificador: str,
+    nome: str = None,
+    db: AsyncSession = Depends(get_database_async)
+):
+    """Cadastra um dispositivo"""
+    return await DispositivosController.criar_dispositivo(identificador, nome, db)
+
+@router.get("/{identificador}")
+async def obter_dispositivo(identificador: str, db: AsyncSession = Depends(get_database_async)):
+    """Obtém um dispositivo pelo identificador (device_id)"""
+    return await DispositivosController.obter_dispositivo(identificador, db)
+
+@router.put("/{identificador}")
+async def atualizar_dispositivo(
+    identificador: str,
+    nome: str = None,
+    db: AsyncSession = Depends(get_database_async)
+):
+    """Atualiza o nome de um dispositivo"""
+    return await DispositivosController.atualizar_dispositivo(identificador, nome, db)
+
+@router.get("/{identificador}/valores")
+async def listar_valores_dispositivo(
+    identificador: str,
+    sensor: int = None,
+    limit: int = 100,
+    db: AsyncSession = Depends(get_database_async)
+):
+    """Lista os valores enviados por um dispositivo (opcionalmente de um sensor)"""
+    return await DispositivosController.listar_valores(identificador, sensor, limit, db)
@@ -1,6 +1,11 @@
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from config.databaseConfig import get_database
+from sqlalchemy.ext.asyncio import AsyncSession
+from config.databaseConfig import get_database_async
+from cache_module.cacheLeitura import estatisticas_caches
+from stream_module.barramento import barramento
+from config.escritorBanco import escritor
+from config.monitorConexoes import monitor_conexoes
 
 # Criar router para rotas gerais
 router = APIRouter(
@@ -19,23 +24,46 @@ async def health_check():
     return {"status": "healthy", "message": "API funcionando corretamente"}
 
 @router.get("/stats")
-async def estatisticas_gerais(db: Session = Depends(get_database)):
+async def estatisticas_gerais(db: AsyncSession = Depends(get_database_async)):
     """Estatísticas gerais da aplicação"""
     try:
-        from service.SensoresService import SensoresService
-        from service.UsuariosService import UsuariosService
+        from service.SensoresServiceAsync import SensoresServiceAsync
+        from service.UsuariosServiceAsync import UsuariosServiceAsync
         
-        sensor_service = SensoresService(db)
-        usuario_service = UsuariosService(db)
+        sensor_service = SensoresServiceAsync(db)
+        usuario_service = UsuariosServiceAsync(db)
         
         return {
-            "total_sensores": sensor_service.contar_total(),
-            "total_usuarios": usuario_service.contar_total(),
+            "total_sensores": await sensor_service.contar_total(),
+            "total_usuarios": await usuario_service.contar_total(),
             "status": "online"
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/cache")
+async def estatisticas_cache():
+    """Métricas de acertos/falhas dos caches de leitura"""
+    return estatisticas_caches()
+
+@router.get("/stream")
+async def estatisticas_stream():
+    """Assinantes e eventos do barramento de leituras em tempo real"""
+    return barramento.estatisticas()
+
+@router.get("/escritor")
+async def estatisticas_escritor():
+    """Fila e lotes do escritor único do banco (group commit)"""
+    return escritor.estatisticas()
+
+@router.get("/pool")
+async def estatisticas_pool(limite: Optional[float] = None):
+    """
+    Conexões em uso, espera no checkout e conexões presas há mais de
+    `limite` segundos (com a pilha de quem as pegou)
+    """
+    return monitor_conexoes.estatisticas(limite)
+
 @router.get("/info")
 async def info_api():
     """Informações sobre a API"""
@@ -48,6 +76,7 @@ async def info_api():
             "usuarios": "/usuarios", 
             "documentacao": "/docs",
             "saude": "/api/health",
-            "estatisticas": "/api/stats"
+            "estatisticas": "/api/stats",
+            "cache": "/api/cache"
         }
     }
\ No newline at end of file
@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from config.databaseConfig import get_database
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from config.databaseConfig import get_database_async
 from controller.SensoresController import SensoresController
+from cache_module.etag import gerar_etag, nao_modificado, com_etag
 
 # Criar router para sensores
 router = APIRouter(
@@ -11,17 +12,21 @@ router = APIRouter(
 )
 
 @router.get("/")
-async def listar_sensores(db: Session = Depends(get_database)):
-    """Lista todos os sensores"""
-    return await SensoresController.listar_sensores(db)
+async def listar_sensores(request: Request, dispositivo: str = None, db: AsyncSession = Depends(get_database_async)):
+    """Lista todos os sensores (ou os que valem para um dispositivo)"""
+    etag = await gerar_etag(request, db, "sensores")
+    resposta = nao_modificado(request, etag)
+    if resposta:
+        return resposta
+    return com_etag(await SensoresController.listar_sensores(dispositivo, db), etag)
 
 @router.get("/{sensor_id}")
-async def obter_sensor(sensor_id: int, db: Session = Depends(get_database)):
+async def obter_sensor(sensor_id: int, db: AsyncSession = Depends(get_database_async)):
     """Obtém um sensor específico"""
     return await SensoresController.obter_sensor(sensor_id, db)
 
 @router.get("/tipo/{tipo_sensor}")
-async def listar_sensores_por_tipo(tipo_sensor: str, db: Session = Depends(get_database)):
+async def listar_sensores_por_tipo(tipo_sensor: str, db: AsyncSession = Depends(get_database_async)):
     """Lista sensores por tipo"""
     return await SensoresController.listar_sensores_por_tipo(tipo_sensor, db)
 
@@ -30,10 +35,11 @@ async def criar_sensor(
     nome: str,
     tipo: str, 
     unidade: str,
-    db: Session = Depends(get_database)
+    dispositivo: str = None,
+    db: AsyncSession = Depends(get_database_async)
 ):
-    """Cria um novo sensor"""
-    return await SensoresController.criar_sensor(nome, tipo, unidade, db)
+    """Cria um novo sensor (geral ou próprio de um dispositivo)"""
+    return await SensoresController.criar_sensor(nome, tipo, unidade, dispositivo, db)
 
 @router.put("/{sensor_id}")
 async def atualizar_sensor(
@@ -41,22 +47,22 @@ async def atualizar_sensor(
     nome: str = None,
     tipo: str = None,
     unidade: str = None,
-    db: Session = Depends(get_database)
+    db: AsyncSession = Depends(get_database_async)
 ):
     """Atualiza um sensor"""
     return await SensoresController.atualizar_sensor(sensor_id, nome, tipo, unidade, db)
 
 @router.delete("/{sensor_id}")
-async def deletar_sensor(sensor_id: int, db: Session = Depends(get_database)):
+async def deletar_sensor(sensor_id: int, db: AsyncSession = Depends(get_database_async)):
     """Deleta um sensor"""
     return await SensoresController.deletar_sensor(sensor_id, db)
 
 @router.get("/buscar/{nome}")
-async def buscar_sensores_por_nome(nome: str, db: Session = Depends(get_database)):
+async def buscar_sensores_por_nome(nome: str, db: AsyncSession = Depends(get_database_async)):
     """Busca sensores por nome"""
     return await SensoresController.buscar_sensores_por_nome(nome, db)
 
 @router.get("/stats/estatisticas")
-async def estatisticas_sensores(db: Session = Depends(get_database)):
+async def estatisticas_sensores(db: AsyncSession = Depends(get_database_async)):
     """Estatísticas dos sensores"""
     return await SensoresController.estatisticas_sensores(db)
\ No newline at end of file
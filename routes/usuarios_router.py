@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from config.databaseConfig import get_database
+from sqlalchemy.ext.asyncio import AsyncSession
+from config.databaseConfig import get_database_async
 from controller.UsuariosController import UsuariosController
 
 # Criar router para usuários
@@ -11,17 +11,17 @@ router = APIRouter(
 )
 
 @router.get("/")
-async def listar_usuarios(db: Session = Depends(get_database)):
+async def listar_usuarios(db: AsyncSession = Depends(get_database_async)):
     """Lista todos os usuários"""
     return await UsuariosController.listar_usuarios(db)
 
 @router.get("/{usuario_id}")
-async def obter_usuario(usuario_id: int, db: Session = Depends(get_database)):
+async def obter_usuario(usuario_id: int, db: AsyncSession = Depends(get_database_async)):
     """Obtém um usuário específico"""
     return await UsuariosController.obter_usuario(usuario_id, db)
 
 @router.get("/email/{email}")
-async def obter_usuario_por_email(email: str, db: Session = Depends(get_database)):
+async def obter_usuario_por_email(email: str, db: AsyncSession = Depends(get_database_async)):
     """Obtém um usuário por email"""
     return await UsuariosController.obter_usuario_por_email(email, db)
 
@@ -30,7 +30,7 @@ async def criar_usuario(
     nome: str,
     email: str,
     senha: str,
-    db: Session = Depends(get_database)
+    db: AsyncSession = Depends(get_database_async)
 ):
     """Cria um novo usuário"""
     return await UsuariosController.criar_usuario(nome, email, senha, db)
@@ -41,32 +41,32 @@ async def atualizar_usuario(
     nome: str = None,
     email: str = None,
     senha: str = None,
-    db: Session = Depends(get_database)
+    db: AsyncSession = Depends(get_database_async)
 ):
     """Atualiza um usuário"""
     return await UsuariosController.atualizar_usuario(usuario_id, nome, email, senha, db)
 
 @router.delete("/{usuario_id}")
-async def deletar_usuario(usuario_id: int, db: Session = Depends(get_database)):
+async def deletar_usuario(usuario_id: int, db: AsyncSession = Depends(get_database_async)):
     """Deleta um usuário"""
     return await UsuariosController.deletar_usuario(usuario_id, db)
 
 @router.get("/buscar/{nome}")
-async def buscar_usuarios_por_nome(nome: str, db: Session = Depends(get_database)):
+async def buscar_usuarios_por_nome(nome: str, db: AsyncSession = Depends(get_database_async)):
     """Busca usuários por nome"""
     return await UsuariosController.buscar_usuarios_por_nome(nome, db)
 
 @router.post("/login")
-async def login_usuario(email: str, senha: str, db: Session = Depends(get_database)):
+async def login_usuario(email: str, senha: str, db: AsyncSession = Depends(get_database_async)):
     """Autentica um usuário"""
     return await UsuariosController.autenticar_usuario(email, senha, db)
 
 @router.get("/verificar-email/{email}")
-async def verificar_email(email: str, db: Session = Depends(get_database)):
+async def verificar_email(email: str, db: AsyncSession = Depends(get_database_async)):
     """Verifica se email já existe"""
     return await UsuariosController.verificar_email(email, db)
 
 @router.get("/stats/estatisticas")
-async def estatisticas_usuarios(db: Session = Depends(get_database)):
+async def estatisticas_usuarios(db: AsyncSession = Depends(get_database_async)):
     """Estatísticas dos usuários"""
     return await UsuariosController.estatisticas_usuarios(db)
\ No newline at end of file
@@ -1,260 +1,256 @@
 #!/usr/bin/env python3
 """
-Script para processar os dados JSON da tabela 'all' e inserir/atualizar sensores
+Script para processar os dados JSON da tabela 'all' e inserir/atualizar sensores.
+
+O processamento é incremental: o último registro processado de cada tópico
+fica na tabela checkpoints_processamento e é gravado no mesmo commit das
+leituras geradas. Cada execução processa só os registros novos, e repetir
+a execução (ou retomá-la após uma interrupção) não duplica leituras.
+
+Os registros passam por um pipeline de geradores: são lidos de um cursor
+em blocos ordenados por ID (yield_per), convertidos em leituras e cada
+bloco é inserido com um único executemany na transação do checkpoint.
+A memória fica limitada a um bloco, qualquer que seja o backlog.
+
+Com --workers N (N > 1) a leitura e a conversão dos blocos são divididas
+entre N processos; a gravação continua em um único gravador, na ordem dos
+IDs, e o resultado é o mesmo do modo sequencial.
+
+Com --continuo o script não termina: acompanha a tabela 'all' e converte
+os registros novos em micro-lotes em até --latencia segundos (o mesmo
+processamento que a API faz com PROCESSAMENTO_CONTINUO=1). Rode apenas um
+processador contínuo por banco; se dois avançarem o mesmo tópico, o
+checkpoint detecta o conflito e o micro-lote repetido é descartado.
+
+Os campos de cada payload que viram leituras vêm das regras de mapeamento
+do tópico (tabela regras_mapeamento, /processamento/mapeamentos); tópicos
+sem regras usam o mapeamento padrão (cada campo é um sensor com o mesmo nome).
+
+Registros que não puderem ser convertidos (JSON inválido, valor não
+numérico, sensor não cadastrado) vão para a tabela registros_rejeitados e
+não são lidos de novo nas próximas execuções; depois de corrigir a causa,
+reprocesse-os pela tarefa reprocessar_rejeitados.
+
+Uso: python3 scripts/Tratar_dados.py [--tamanho-bloco 1000] [--workers 1] [--reiniciar] [--verbose]
+     python3 scripts/Tratar_dados.py --continuo [--latencia 1.0]
 """
 
-import json
-import asyncio
-from datetime import datetime
+import argparse
+import logging
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Iterator
+
+# Garantir que o root do projeto esteja no sys.path quando o script for
+# executado diretamente (ex.: python3 scripts/Tratar_dados.py)
+project_root = Path(__file__).resolve().parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
 from all_module.AllService import AllService
 from service.SensoresService import SensoresService
 from service.ValoresSensorService import ValoresSensorService
-from config.databaseConfig import SessionLocal
+from processamento_module.CheckpointService import CheckpointService
+from processamento_module.MapeamentoService import MapeamentoService
+from processamento_module.conversao import converter_registros
+from processamento_module.paralelo import ProcessadorParalelo, ResultadoFaixa
+from processamento_module.processadorContinuo import ProcessadorContinuo, gravar_bloco, LATENCIA_MAXIMA, TAMANHO_MICROLOTE
+from processamento_module.provisionamento import AUTO_CADASTRO
+from config.databaseConfig import sessao_banco, create_tables
+from config.escritorBanco import escritor
+
+# Registros da tabela 'all' lidos e gravados por transação
+TAMANHO_BLOCO = 1000
 
 class TratarDados:
     """
     Classe responsável por processar dados JSON e gerenciar sensores
     """
-    
-    def __init__(self):
-        self.db = SessionLocal()
-        self.all_service = AllService(self.db)
+
+    def __init__(self, tamanho_bloco: int = TAMANHO_BLOCO, workers: int = 1, verbose: bool = False,
+                 auto_cadastro: bool = AUTO_CADASTRO):
+        self._escopo = sessao_banco()
+        self.db = self._escopo.__enter__()
+        # Sessão separada para o cursor da tabela 'all': os commits de cada
+        # bloco na sessão de escrita não interrompem a leitura
+        self._escopo_leitura = sessao_banco()
+        self.db_leitura = self._escopo_leitura.__enter__()
+        self.all_service = AllService(self.db_leitura)
         self.sensores_service = SensoresService(self.db)
         self.valores_service = ValoresSensorService(self.db)
-    
-    def __del__(self):
+        self.checkpoints = CheckpointService(self.db)
+        self.mapeamento_service = MapeamentoService(self.db)
+        self.tamanho_bloco = tamanho_bloco
+        self.workers = workers
+        self.verbose = verbose
+        self.auto_cadastro = auto_cadastro
+        self._paralelo = None
+        # Contadores da execução
+        self.registros = 0
+        self.leituras = 0
+        self.invalidos = 0
+        self.problemas = Counter()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, erro, rastro):
         """
-        Fecha a sessão do banco ao destruir o objeto
+        Encerra os processos trabalhadores e fecha as sessões do banco ao sair do bloco with
         """
-        if hasattr(self, 'db'):
-            self.db.close()
-        
-    async def processar_todos_dados(self):
+        if self._paralelo is not None:
+            self._paralelo.fechar()
+        self._escopo_leitura.__exit__(tipo, erro, rastro)
+        return self._escopo.__exit__(tipo, erro, rastro)
+
+    def processar_todos_dados(self):
         """
-        Processa todos os dados não processados da tabela 'all'
+        Processa os registros novos da tabela 'all' (após o checkpoint de cada tópico)
         """
         print("🔄 === INICIANDO PROCESSAMENTO DE DADOS ===")
-        
+        if self.workers > 1:
+            print(f"⚙️ Modo paralelo: {self.workers} processos")
+        inicio = time.perf_counter()
+
         try:
-            # Buscar todos os registros da tabela 'all'
-            registros = await self.all_service.get_all_data()
-            
-            if not registros:
-                print("📝 Nenhum dado para processar.")
-                return
-                
-            print(f"📊 Encontrados {len(registros)} registros para processar")
-            
-            processados = 0
-            erros = 0
-            
-            for registro in registros:
-                try:
-                    sucesso = await self.processar_registro(registro)
-                    if sucesso:
-                        processados += 1
-                    else:
-                        erros += 1
-                except Exception as e:
-                    print(f"❌ Erro ao processar registro ID {registro.id}: {e}")
-                    erros += 1
-            
-            print(f"\n📈 === RESUMO DO PROCESSAMENTO ===")
-            print(f"✅ Processados com sucesso: {processados}")
-            print(f"❌ Erros: {erros}")
-            print(f"📊 Total: {len(registros)}")
-            
+            ultimos_ids = self.checkpoints.ultimos_ids()
+
+            for topico in self.all_service.listar_topicos_unicos():
+                self.processar_topico(topico, ultimos_ids.get(topico, 0))
+
         except Exception as e:
             print(f"❌ Erro geral no processamento: {e}")
-    
-    async def processar_registro(self, registro):
-        """
-        Processa um registro específico da tabela 'all'
-        """
-        try:
-            print(f"\n🔍 Processando registro ID: {registro.id}")
-            print(f"📡 Tópico: {registro.topic}")
-            print(f"📦 Payload: {registro.payload}")
-            
-            # Tentar parsear o JSON
-            try:
-                dados_json = json.loads(registro.payload)
-            except json.JSONDecodeError as e:
-                print(f"❌ JSON inválido no registro {registro.id}: {e}")
-                return False
-                
-            # Processar diferentes formatos de dados
-            if await self.processar_dados_raspberry(dados_json):
-                print(f"✅ Registro {registro.id} processado com sucesso!")
-                return True
-            else:
-                print(f"⚠️ Registro {registro.id} não foi processado")
-                return False
-                
-        except Exception as e:
-            print(f"❌ Erro ao processar registro {registro.id}: {e}")
-            return False
-    
-    async def processar_dados_raspberry(self, dados_json):
-        """
-        Processa dados específicos do Raspberry Pi
-        """
-        try:
-            # Verificar se tem a estrutura esperada do Raspberry Pi
-            if isinstance(dados_json, dict):
-                # Filtrar campos que não são sensores
-                campos_ignorar = ['timestamp', 'device_id', 'botao']
-                sensores_data = {k: v for k, v in dados_json.items() 
-                               if k not in campos_ignorar and v is not None}
-                
-                if sensores_data:
-                    return await self.processar_sensores_dict(sensores_data)
-                else:
-                    print("⚠️ Nenhum dado de sensor válido encontrado")
-                    return False
-            
-            else:
-                print(f"⚠️ Formato de dados não reconhecido: {type(dados_json)}")
-                return False
-                
-        except Exception as e:
-            print(f"❌ Erro ao processar dados Raspberry Pi: {e}")
-            return False
-    
-    async def processar_sensores_dict(self, sensores_dict):
+
+        duracao = time.perf_counter() - inicio
+        taxa = self.registros / duracao if duracao > 0 else 0.0
+
+        print(f"\n📈 === RESUMO DO PROCESSAMENTO ===")
+        if not self.registros:
+            print("📝 Nenhum dado novo para processar.")
+        print(f"📊 Registros processados: {self.registros}")
+        print(f"✅ Leituras criadas: {self.leituras}")
+        print(f"❌ Registros inválidos: {self.invalidos}")
+        for problema, quantidade in self.problemas.most_common(10):
+            print(f"⚠️ {problema}: {quantidade}x")
+        if any("não encontrado" in problema for problema in self.problemas):
+            print("💡 Dica: Crie os sensores que faltam pelo frontend ou use --auto-cadastro")
+        if self.problemas:
+            print("🗃️ Registros rejeitados: GET /processamento/rejeitados (reprocessar: POST /processamento/rejeitados/reprocessar)")
+        print(f"⚡ {duracao:.2f}s ({taxa:,.0f} registros/s)")
+
+    def processar_topico(self, topico: str, ultimo_id: int):
         """
-        Processa um dicionário de sensores {nome: valor}
+        Processa os registros de um tópico a partir do checkpoint:
+        leitura em blocos -> conversão -> gravação de cada bloco
         """
-        sucessos = 0
-        
-        for nome_sensor, valor in sensores_dict.items():
-            try:
-                # Pular campos que não são sensores
-                if nome_sensor.lower() in ['device_id', 'timestamp', 'location', 'battery']:
-                    continue
-                    
-                print(f"  🔧 Processando sensor: {nome_sensor} = {valor}")
-                
-                # Verificar se o sensor já existe no banco
-                sensor_existente = self.buscar_sensor_por_nome(nome_sensor)
-                
-                if sensor_existente:
-                    # Criar novo valor para o sensor existente
-                    if self.criar_valor_sensor_sync(sensor_existente, valor):
-                        sucessos += 1
-                else:
-                    print(f"  ⚠️ Sensor '{nome_sensor}' não encontrado no banco de dados")
-                    print(f"  💡 Dica: Crie o sensor '{nome_sensor}' pelo frontend primeiro!")
-                    
-            except Exception as e:
-                print(f"  ❌ Erro ao processar sensor '{nome_sensor}': {e}")
-        
-        return sucessos > 0
-    
-    def buscar_sensor_por_nome(self, nome):
+        if self.workers > 1:
+            resultados = self.converter_em_paralelo(topico, ultimo_id)
+        else:
+            resultados = self.converter_blocos(topico, self.all_service.iterar_apos_id(topico, ultimo_id, self.tamanho_bloco))
+
+        for resultado in resultados:
+            self.gravar_bloco(topico, ultimo_id, resultado)
+            ultimo_id = resultado[0] if resultado[1] else ultimo_id
+            if self.verbose:
+                print(f"📡 {topico}: até o registro {resultado[0]} ({self.registros} registros, {self.leituras} leituras)")
+
+    def converter_blocos(self, topico: str, blocos: Iterator[list]) -> Iterator[ResultadoFaixa]:
         """
-        Busca um sensor pelo nome
+        Converte cada bloco de registros nas linhas de valores_sensor
         """
-        try:
-            sensores = self.sensores_service.listar_todos()
-            for sensor in sensores:
-                if sensor.nome.lower() == nome.lower():
-                    return sensor
-            return None
-        except Exception as e:
-            print(f"❌ Erro ao buscar sensor por nome '{nome}': {e}")
-            return None
-    
-    def criar_valor_sensor_sync(self, sensor, novo_valor):
+        for registros in blocos:
+            # Mapa nome -> sensor e regras do tópico em cache: uma consulta só quando mudam
+            resolvedor = self.sensores_service.resolvedor()
+            extrator = self.mapeamento_service.mapeamento().extrator(topico)
+            yield registros[-1].id, len(registros), converter_registros(registros, resolvedor, extrator=extrator)
+
+    def converter_em_paralelo(self, topico: str, ultimo_id: int) -> Iterator[ResultadoFaixa]:
         """
-        Versão síncrona de criar_valor_sensor
+        Divide a faixa de IDs do tópico entre os processos trabalhadores
         """
-        try:
-            # Converter valor para float se possível
-            if isinstance(novo_valor, (int, float)):
-                valor_float = float(novo_valor)
-            elif isinstance(novo_valor, str):
-                try:
-                    valor_float = float(novo_valor)
-                except ValueError:
-                    print(f"  ⚠️ Valor '{novo_valor}' não é numérico para sensor '{sensor.nome}'")
-                    return False
-            else:
-                print(f"  ⚠️ Tipo de valor inválido para sensor '{sensor.nome}': {type(novo_valor)}")
-                return False
-            
-            # Criar novo valor para o sensor
-            novo_valor_obj = self.valores_service.criar_valor(
-                valor=valor_float,
-                id_sensor=sensor.id
+        if self._paralelo is None:
+            # Os processos recebem o mapa de sensores e as regras do início da execução
+            self._paralelo = ProcessadorParalelo(
+                self.workers, self.sensores_service.resolvedor(), self.mapeamento_service.mapeamento(), self.tamanho_bloco
             )
-            
-            if novo_valor_obj:
-                print(f"  ✅ Valor criado para sensor '{sensor.nome}': {valor_float} {sensor.unidade}")
-                return True
-            else:
-                print(f"  ❌ Falha ao criar valor para sensor '{sensor.nome}'")
-                return False
-                
-        except Exception as e:
-            print(f"  ❌ Erro ao criar valor para sensor '{sensor.nome}': {e}")
-            return False
-    
-    async def criar_valor_sensor(self, sensor, novo_valor):
+        return self._paralelo.converter_topico(topico, ultimo_id, self.all_service.maior_id(topico))
+
+    def gravar_bloco(self, topico: str, anterior: int, resultado: ResultadoFaixa):
         """
-        Cria um novo valor para o sensor
+        Insere as leituras de um bloco e avança o checkpoint do tópico
+        (que estava em anterior) em um único commit
         """
-        try:
-            # Converter valor para float se possível
-            if isinstance(novo_valor, (int, float)):
-                valor_float = float(novo_valor)
-            elif isinstance(novo_valor, str):
-                try:
-                    valor_float = float(novo_valor)
-                except ValueError:
-                    print(f"  ⚠️ Valor '{novo_valor}' não é numérico para sensor '{sensor.nome}'")
-                    return False
-            else:
-                print(f"  ⚠️ Tipo de valor inválido para sensor '{sensor.nome}': {type(novo_valor)}")
-                return False
-            
-            # Criar novo valor para o sensor
-            novo_valor_obj = self.valores_service.criar_valor(
-                valor=valor_float,
-                id_sensor=sensor.id
-            )
-            
-            if novo_valor_obj:
-                print(f"  ✅ Valor criado para sensor '{sensor.nome}': {valor_float} {sensor.unidade}")
-                return True
-            else:
-                print(f"  ❌ Falha ao criar valor para sensor '{sensor.nome}'")
-                return False
-                
-        except Exception as e:
-            print(f"  ❌ Erro ao criar valor para sensor '{sensor.nome}': {e}")
-            return False
+        ultimo_id, quantidade, conversao = resultado
+        if quantidade:
+            self.leituras += gravar_bloco(self.db, topico, anterior, ultimo_id, quantidade, conversao, self.auto_cadastro)
 
-async def main():
+        self.registros += quantidade
+        self.invalidos += conversao.invalidos
+        self.problemas.update(conversao.problemas)
+
+def executar_continuo(latencia: float, tamanho_lote: int, verbose: bool):
+    """
+    Modo contínuo: processa os registros novos até o script ser interrompido
+    """
+    processador = ProcessadorContinuo(latencia=latencia, tamanho_lote=tamanho_lote)
+    escritor.iniciar()
+    processador.iniciar()
+    print(f"👀 Acompanhando a tabela 'all' (latência máxima {latencia}s). Ctrl+C para parar.")
+    try:
+        registros = 0
+        while True:
+            time.sleep(10)
+            if verbose or processador.registros != registros:
+                atrasos = processador.atraso_pendente()
+                print(f"📡 {processador.registros} registros, {processador.leituras} leituras; "
+                      f"pendente há {max(atrasos.values(), default=0.0):.1f}s")
+                registros = processador.registros
+    finally:
+        processador.parar()
+        escritor.parar()
+        print(f"⏹️ Processamento contínuo encerrado: {processador.registros} registros, {processador.leituras} leituras")
+
+def main():
     """
     Função principal do script
     """
+    parser = argparse.ArgumentParser(description="Processa os dados da tabela 'all' em leituras dos sensores")
+    parser.add_argument("--tamanho-bloco", type=int, default=TAMANHO_BLOCO)
+    parser.add_argument("--workers", type=int, default=1, help="processos para ler e converter os blocos (1 = sequencial)")
+    parser.add_argument("--reiniciar", action="store_true", help="apaga os checkpoints e reprocessa desde o início (leituras já criadas são mantidas e serão repetidas)")
+    parser.add_argument("--verbose", action="store_true", help="mostra o progresso de cada bloco")
+    parser.add_argument("--auto-cadastro", action="store_true", default=AUTO_CADASTRO,
+                        help="cadastra os sensores que aparecem nos payloads (padrão: SENSORES_AUTO_CADASTRO)")
+    parser.add_argument("--continuo", action="store_true", help="não termina: processa os registros novos conforme chegam")
+    parser.add_argument("--latencia", type=float, default=LATENCIA_MAXIMA, help="modo contínuo: atraso máximo (s) até processar um registro novo")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     print("🚀 === SCRIPT DE TRATAMENTO DE DADOS ===")
     print("Este script processa dados JSON da tabela 'all'")
     print("e atualiza sensores existentes no banco de dados.")
     print()
-    
-    tratador = TratarDados()
-    
+
     try:
-        await tratador.processar_todos_dados()
+        create_tables()
+        with TratarDados(tamanho_bloco=args.tamanho_bloco, workers=max(args.workers, 1), verbose=args.verbose,
+                         auto_cadastro=args.auto_cadastro) as tratador:
+            if args.reiniciar:
+                removidos = tratador.checkpoints.reiniciar()
+                print(f"🔁 {removidos} checkpoints apagados: reprocessando desde o início")
+            tratador.processar_todos_dados()
+        if args.continuo:
+            # O backlog já foi processado acima (em blocos grandes); daqui em diante, micro-lotes
+            executar_continuo(args.latencia, min(args.tamanho_bloco, TAMANHO_MICROLOTE), args.verbose)
     except KeyboardInterrupt:
         print("\n⏹️ Script interrompido pelo usuário")
     except Exception as e:
         print(f"❌ Erro crítico: {e}")
-    
+
     print("\n🏁 Script finalizado!")
 
 if __name__ == "__main__":
     # Executar o script
-    asyncio.run(main())
\ No newline at end of file
+    main()
@@ -1,5 +1,6 @@
 import time
 import json
+from config.databaseConfig import sessao_banco
 from service.AlertaService import AlertaService
 import paho.mqtt.client as mqtt
 
@@ -16,7 +17,6 @@ def buscar_alertas_nao_enviados(alerta_service, enviados):
     return novos
 
 def main():
-    alerta_service = AlertaService()
     enviados = set()
     
     # Configurar MQTT
@@ -26,7 +26,9 @@ def main():
     
     print("Monitorando tabela de alertas...")
     while True:
-        novos_alertas = buscar_alertas_nao_enviados(alerta_service, enviados)
+        # Sessão nova a cada consulta: não mantém um snapshot aberto entre as pesquisas
+        with sessao_banco() as db:
+            novos_alertas = buscar_alertas_nao_enviados(AlertaService(db), enviados)
         for alerta in novos_alertas:
             # Monta o JSON do alerta
             payload = json.dumps({"status": "ATIVADO", "id": alerta.id, "nome": alerta.nome, "data": alerta.data.isoformat() if alerta.data else None})
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Benchmark de concorrência: latência das rotas sob carga mista.
+Compara handlers async que chamam os services síncronos (bloqueiam o
+event loop) com handlers que usam os services assíncronos (aiosqlite).
+
+Enquanto algumas tarefas executam buscas lentas (varredura do payload),
+leituras rápidas por ID chegam a uma taxa fixa; mede-se o p50/p99 delas.
+
+Uso: python3 scripts/bench_concorrencia.py [--registros 200000] [--segundos 5]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from config.databaseConfig import Base
+from model.sensoresModel import Sensor
+from all_module.allModel import All
+from all_module.AllService import AllService
+from all_module.AllServiceAsync import AllServiceAsync
+from service.SensoresService import SensoresService
+from service.SensoresServiceAsync import SensoresServiceAsync
+
+# Termo inexistente: força a varredura completa da tabela all
+TERMO_LENTO = "termo-que-nao-existe"
+
+
+def popular_banco(SessionBench, registros: int):
+    """
+    Insere um sensor e N registros JSON no banco temporário
+    """
+    db = SessionBench()
+    try:
+        db.add(Sensor(nome="temperatura", tipo="temperatura", unidade="°C"))
+        payload = json.dumps({"device_id": "raspberry_pi_001", "temperatura": 23.5, "umidade": 65.2})
+        db.execute(insert(All), [{"topic": "raspberry/sensores", "payload": payload} for _ in range(registros)])
+        db.commit()
+    finally:
+        db.close()
+
+
+def percentil(valores, p):
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p))]
+
+
+async def carga_mista(rota_lenta, rota_rapida, segundos: float, lentas: int, taxa: float) -> dict:
+    """
+    Executa tarefas lentas contínuas enquanto leituras rápidas chegam a uma
+    taxa fixa. A latência das rápidas é medida a partir do instante previsto
+    de chegada, incluindo o tempo de espera por um event loop bloqueado.
+    """
+    fim = time.perf_counter() + segundos
+    intervalo = 1.0 / taxa
+    latencias = []
+
+    async def trabalhador_lento():
+        while time.perf_counter() < fim:
+            await rota_lenta()
+            # Cede o loop entre requisições, como o servidor faz
+            await asyncio.sleep(0)
+
+    async def requisicao_rapida(chegada: float):
+        await rota_rapida()
+        latencias.append((time.perf_counter() - chegada) * 1000)
+
+    async def gerador_rapidas():
+        chegada = time.perf_counter()
+        tarefas = []
+        while chegada < fim:
+            tarefas.append(asyncio.create_task(requisicao_rapida(chegada)))
+            chegada += intervalo
+            await asyncio.sleep(max(0.0, chegada - time.perf_counter()))
+        await asyncio.gather(*tarefas)
+
+    await asyncio.gather(gerador_rapidas(), *[trabalhador_lento() for _ in range(lentas)])
+    return {
+        "requisicoes": len(latencias),
+        "p50": statistics.median(latencias),
+        "p99": percentil(latencias, 0.99)
+    }
+
+
+async def main_async(args):
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "bench.db")
+        engine_bench = create_engine(f"sqlite:///{caminho}", connect_args={"check_same_thread": False})
+        Base.metadata.create_all(bind=engine_bench)
+        SessionBench = sessionmaker(autocommit=False, autoflush=False, bind=engine_bench)
+        popular_banco(SessionBench, args.registros)
+
+        async_engine_bench = create_async_engine(
+            f"sqlite+aiosqlite:///{caminho}", poolclass=AsyncAdaptedQueuePool, pool_size=10
+        )
+        AsyncSessionBench = async_sessionmaker(async_engine_bench, autoflush=False, expire_on_commit=False)
+
+        # Handler "async def" chamando o service síncrono (bloqueia o loop)
+        async def lenta_sync():
+            db = SessionBench()
+            try:
+                AllService(db).buscar_por_payload_linhas(TERMO_LENTO)
+            finally:
+                db.close()
+
+        async def rapida_sync():
+            db = SessionBench()
+            try:
+                SensoresService(db).buscar_por_id(1)
+            finally:
+                db.close()
+
+        # Handler "async def" usando o service assíncrono
+        async def lenta_async():
+            async with AsyncSessionBench() as db:
+                await AllServiceAsync(db).buscar_por_payload_linhas(TERMO_LENTO)
+
+        async def rapida_async():
+            async with AsyncSessionBench() as db:
+                await SensoresServiceAsync(db).buscar_por_id(1)
+
+        print(f"📊 {args.registros:,} registros, {args.lentas} tarefas lentas + "
+              f"{args.taxa:.0f} leituras rápidas/s por {args.segundos}s\n")
+        for nome, lenta, rapida in (("sync", lenta_sync, rapida_sync), ("async", lenta_async, rapida_async)):
+            resultado = await carga_mista(lenta, rapida, args.segundos, args.lentas, args.taxa)
+            print(f"  {nome:<6} rápidas: {resultado['requisicoes']:>6} req  "
+                  f"p50 {resultado['p50']:>8.2f} ms  p99 {resultado['p99']:>8.2f} ms")
+
+        await async_engine_bench.dispose()
+        engine_bench.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de latência sob carga mista")
+    parser.add_argument("--registros", type=int, default=200000)
+    parser.add_argument("--segundos", type=float, default=5.0)
+    parser.add_argument("--lentas", type=int, default=2)
+    parser.add_argument("--taxa", type=float, default=100.0, help="leituras rápidas por segundo")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
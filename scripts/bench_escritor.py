@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark do escritor único: gravações concorrentes na tabela all.
+Compara N threads gravando cada uma com sua própria sessão e commit
+(caminho antigo) com as mesmas gravações enviadas ao EscritorBanco,
+que agrupa as tarefas da fila em uma transação (group commit).
+
+Uso: python3 scripts/bench_escritor.py [--gravacoes 2000] [--threads 8]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from config.databaseConfig import Base, BUSY_TIMEOUT_MS
+from config.escritorBanco import EscritorBanco
+from all_module.AllService import AllService
+
+PAYLOAD = json.dumps({"device_id": "raspberry_pi_001", "temperatura": 23.5, "umidade": 65.2})
+
+
+def gravar_direto(SessionBench, gravacoes: int, threads: int) -> float:
+    """
+    Cada gravação abre uma sessão e faz o próprio commit
+    """
+    def gravar(_):
+        db = SessionBench()
+        try:
+            AllService(db).criar("raspberry/sensores", PAYLOAD)
+        finally:
+            db.close()
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(threads) as executor:
+        list(executor.map(gravar, range(gravacoes)))
+    return time.perf_counter() - inicio
+
+
+def gravar_escritor(url: str, gravacoes: int, threads: int) -> float:
+    """
+    As gravações são enviadas ao escritor único e aguardadas
+    """
+    escritor = EscritorBanco(url)
+    escritor.iniciar()
+
+    def gravar(_):
+        escritor.executar_sync(lambda db: AllService(db).criar("raspberry/sensores", PAYLOAD))
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(threads) as executor:
+        list(executor.map(gravar, range(gravacoes)))
+    duracao = time.perf_counter() - inicio
+    estatisticas = escritor.estatisticas()
+    escritor.parar()
+    print(f"  (escritor: {estatisticas['lotes']} lotes, média de {estatisticas['media_por_lote']} por lote)")
+    return duracao
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do escritor único (group commit)")
+    parser.add_argument("--gravacoes", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        url = f"sqlite:///{os.path.join(pasta, 'bench.db')}"
+        engine_bench = create_engine(url, connect_args={"check_same_thread": False})
+
+        @event.listens_for(engine_bench, "connect")
+        def _configurar(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+            cursor.close()
+
+        Base.metadata.create_all(bind=engine_bench)
+        SessionBench = sessionmaker(autocommit=False, autoflush=False, bind=engine_bench)
+
+        print(f"📊 {args.gravacoes} gravações com {args.threads} threads\n")
+        resultados = {}
+        for nome, funcao in (
+            ("direto", lambda: gravar_direto(SessionBench, args.gravacoes, args.threads)),
+            ("escritor", lambda: gravar_escritor(url, args.gravacoes, args.threads))
+        ):
+            duracao = funcao()
+            resultados[nome] = args.gravacoes / duracao
+            print(f"  {nome:<10} {resultados[nome]:>10,.0f} gravações/s")
+
+        print(f"\n  ⚡ ganho: {resultados['escritor'] / resultados['direto']:.1f}x")
+        engine_bench.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark da inicialização da API (cold start).
+Sobe o uvicorn N vezes em um diretório temporário (banco próprio) e mede
+o tempo até a porta aceitar conexões, até /api/health responder e até a
+primeira rota de dados (/sensores/) responder. A primeira rodada cria o banco (migração);
+as demais partem de um banco já na versão atual do esquema.
+
+Uso: python3 scripts/bench_inicializacao.py [--rodadas 5] [--orcamento 3000]
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent
+
+# Tempo máximo (s) esperando o servidor subir
+LIMITE_ESPERA = 60
+
+
+def porta_livre() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def esperar_porta(porta: int, inicio: float) -> float:
+    """
+    Tenta conectar até o servidor aceitar conexões e retorna o tempo desde o início
+    """
+    while time.perf_counter() - inicio < LIMITE_ESPERA:
+        try:
+            with socket.create_connection(("127.0.0.1", porta), timeout=1):
+                return time.perf_counter() - inicio
+        except OSError:
+            time.sleep(0.005)
+    raise TimeoutError(f"Servidor não abriu a porta {porta} em {LIMITE_ESPERA}s")
+
+
+def esperar_resposta(url: str, inicio: float) -> float:
+    """
+    Repete a requisição até receber 200 e retorna o tempo desde o início
+    """
+    while time.perf_counter() - inicio < LIMITE_ESPERA:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as resposta:
+                if resposta.status == 200:
+                    return time.perf_counter() - inicio
+        except (urllib.error.URLError, ConnectionError, OSError):
+            time.sleep(0.005)
+    raise TimeoutError(f"Servidor não respondeu em {LIMITE_ESPERA}s: {url}")
+
+
+def rodada(pasta: str) -> tuple:
+    """
+    Sobe a API uma vez e retorna (tempo até a porta abrir, até /api/health, até /sensores/)
+    """
+    porta = porta_livre()
+    ambiente = dict(os.environ, PYTHONPATH=str(project_root))
+    inicio = time.perf_counter()
+    processo = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app:app", "--port", str(porta), "--log-level", "warning"],
+        cwd=pasta, env=ambiente, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        porta_aberta = esperar_porta(porta, inicio)
+        saude = esperar_resposta(f"http://127.0.0.1:{porta}/api/health", inicio)
+        dados = esperar_resposta(f"http://127.0.0.1:{porta}/sensores/", inicio)
+        return porta_aberta, saude, dados
+    finally:
+        processo.terminate()
+        processo.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de inicialização da API")
+    parser.add_argument("--rodadas", type=int, default=5)
+    parser.add_argument("--orcamento", type=float, default=None, help="limite em ms para a mediana até /api/health")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        print(f"🚀 {args.rodadas} inicializações da API (banco em {pasta})\n")
+        tempos = []
+        for numero in range(args.rodadas):
+            porta_aberta, saude, dados = rodada(pasta)
+            tipo = "banco novo" if numero == 0 else "banco existente"
+            print(f"  #{numero + 1} ({tipo:<15}) porta {porta_aberta * 1000:>6.0f} ms   /api/health {saude * 1000:>7.0f} ms   /sensores/ {dados * 1000:>7.0f} ms")
+            if numero > 0 or args.rodadas == 1:
+                tempos.append(saude)
+
+    mediana = statistics.median(tempos) * 1000
+    print(f"\n📊 Mediana até /api/health (banco existente): {mediana:.0f} ms (mín {min(tempos) * 1000:.0f} ms)")
+
+    if args.orcamento is not None:
+        if mediana > args.orcamento:
+            print(f"❌ Orçamento excedido: {mediana:.0f} ms > {args.orcamento:.0f} ms")
+            sys.exit(1)
+        print(f"✅ Dentro do orçamento: {mediana:.0f} ms <= {args.orcamento:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark da serialização das listagens /valores/ e /data/.
+Compara o caminho antigo (objetos ORM + to_dict + JSONResponse)
+com o caminho rápido (linhas Core + orjson, payload repassado bruto).
+
+Uso: python3 scripts/bench_serializacao.py [--linhas 1000] [--repeticoes 50]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from config.databaseConfig import Base
+from model.sensoresModel import Sensor, ValoresSensor, valores_para_json
+from all_module.allModel import All, registros_para_json
+from all_module.AllService import AllService
+from service.ValoresSensorService import ValoresSensorService
+
+
+def popular_banco(SessionBench, linhas: int):
+    """
+    Insere um sensor, N valores e N registros JSON no banco temporário
+    """
+    db = SessionBench()
+    try:
+        sensor = Sensor(nome="temperatura", tipo="temperatura", unidade="°C")
+        db.add(sensor)
+        db.flush()
+        db.add_all([ValoresSensor(valor=random.uniform(15, 35), id_sensor=sensor.id) for _ in range(linhas)])
+        db.add_all([
+            All(topic="raspberry/sensores", payload=json.dumps({
+                "timestamp": "2025-11-06T14:30:00",
+                "device_id": "raspberry_pi_001",
+                "temperatura": round(random.uniform(15, 35), 1),
+                "umidade": round(random.uniform(30, 90), 1),
+                "luminosidade": random.randint(0, 1000),
+                "botao": False
+            }))
+            for _ in range(linhas)
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+
+def medir(nome: str, funcao, SessionBench, linhas: int, repeticoes: int) -> float:
+    """
+    Executa a função N vezes (com sessão nova a cada vez) e imprime linhas/s
+    """
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        db = SessionBench()
+        try:
+            corpo = funcao(db)
+        finally:
+            db.close()
+    duracao = time.perf_counter() - inicio
+    taxa = linhas * repeticoes / duracao
+    print(f"  {nome:<10} {taxa:>12,.0f} linhas/s  ({len(corpo):,} bytes por resposta)")
+    return taxa
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de serialização das listagens")
+    parser.add_argument("--linhas", type=int, default=1000)
+    parser.add_argument("--repeticoes", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        engine_bench = create_engine(f"sqlite:///{os.path.join(pasta, 'bench.db')}")
+        Base.metadata.create_all(bind=engine_bench)
+        SessionBench = sessionmaker(autocommit=False, autoflush=False, bind=engine_bench)
+        popular_banco(SessionBench, args.linhas)
+
+        casos = {
+            "/valores/": (
+                lambda db: JSONResponse(jsonable_encoder(
+                    [v.to_dict() for v in ValoresSensorService(db).listar_todos_valores(limit=args.linhas)]
+                )).body,
+                lambda db: valores_para_json(ValoresSensorService(db).listar_todos_valores_linhas(limit=args.linhas))
+            ),
+            "/data/": (
+                lambda db: JSONResponse(jsonable_encoder(
+                    [r.to_dict() for r in db.query(All).order_by(All.id.desc()).limit(args.linhas).all()]
+                )).body,
+                lambda db: registros_para_json(AllService(db).listar_com_limite_linhas(limite=args.linhas))
+            )
+        }
+
+        print(f"📊 {args.linhas} linhas por resposta, {args.repeticoes} repetições\n")
+        for rota, (antes, depois) in casos.items():
+            print(f"🔎 {rota}")
+            taxa_antes = medir("antes", antes, SessionBench, args.linhas, args.repeticoes)
+            taxa_depois = medir("depois", depois, SessionBench, args.linhas, args.repeticoes)
+            print(f"  ⚡ ganho: {taxa_depois / taxa_antes:.1f}x\n")
+
+        engine_bench.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmark do backfill da tabela 'all' (scripts/Tratar_dados.py) com 1..N processos.
+Gera um banco temporário com registros sintéticos, roda o Tratar_dados
+do zero com cada quantidade de workers e mede a vazão. Também confere que
+todas as execuções geram exatamente as mesmas leituras (mesma ordem).
+
+Uso: python3 scripts/bench_tratar_dados.py [--registros 200000] [--workers 1 2 4] [--tamanho-bloco 1000]
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import closing
+from datetime import datetime, timedelta
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent
+
+ARQUIVO_BANCO = "estacao_esp32.db"
+
+# Sensores cadastrados no banco de teste (luminosidade fica de fora de propósito)
+SENSORES = [("temperatura", "temperatura", "°C"), ("umidade", "umidade", "%")]
+
+
+def criar_banco(pasta: str, registros: int):
+    """
+    Cria o esquema pela aplicação e insere sensores e registros sintéticos
+    """
+    ambiente = dict(os.environ, PYTHONPATH=str(project_root))
+    subprocess.run(
+        [sys.executable, "-c", "from config.databaseConfig import create_tables; create_tables()"],
+        cwd=pasta, env=ambiente, check=True, stdout=subprocess.DEVNULL
+    )
+
+    aleatorio = random.Random(42)
+    inicio = datetime(2024, 1, 1)
+    with closing(sqlite3.connect(os.path.join(pasta, ARQUIVO_BANCO))) as conexao, conexao:
+        # Nomes já em minúsculas ASCII: o nome normalizado é o próprio nome
+        conexao.executemany(
+            "INSERT INTO sensores (nome, nome_normalizado, tipo, unidade) VALUES (?, ?, ?, ?)",
+            ((nome, nome, tipo, unidade) for nome, tipo, unidade in SENSORES)
+        )
+        conexao.executemany(
+            'INSERT INTO "all" (topic, payload, data_recebimento) VALUES (?, ?, ?)',
+            (
+                (
+                    "raspberry/sensores" if numero % 10 else "esp32/sensores",
+                    f'{{"timestamp":"{numero}","device_id":"pi","temperatura":{aleatorio.uniform(10, 40):.2f},'
+                    f'"umidade":"{aleatorio.uniform(20, 90):.1f}","luminosidade":{aleatorio.randint(0, 1000)},"botao":false}}',
+                    (inicio + timedelta(seconds=numero)).isoformat(sep=" ")
+                )
+                for numero in range(registros)
+            )
+        )
+
+
+def resumo_leituras(caminho: str) -> tuple:
+    """
+    Retorna (quantidade, hash) das leituras em ordem de inserção
+    """
+    resumo = hashlib.sha256()
+    quantidade = 0
+    with closing(sqlite3.connect(caminho)) as conexao:
+        for linha in conexao.execute("SELECT valor, id_sensor, timestamp FROM valores_sensor ORDER BY id_valor"):
+            resumo.update(repr(linha).encode())
+            quantidade += 1
+    return quantidade, resumo.hexdigest()[:16]
+
+
+def rodada(base: str, workers: int, tamanho_bloco: int) -> tuple:
+    """
+    Processa uma cópia do banco base (em uma pasta nova, sem WAL de rodadas
+    anteriores) e retorna (tempo do Tratar_dados em s, quantidade, hash)
+    """
+    with tempfile.TemporaryDirectory() as pasta:
+        destino = os.path.join(pasta, ARQUIVO_BANCO)
+        shutil.copy(base, destino)
+        ambiente = dict(os.environ, PYTHONPATH=str(project_root))
+        inicio = time.perf_counter()
+        subprocess.run(
+            [sys.executable, str(project_root / "scripts" / "Tratar_dados.py"),
+             "--workers", str(workers), "--tamanho-bloco", str(tamanho_bloco)],
+            cwd=pasta, env=ambiente, check=True, stdout=subprocess.DEVNULL
+        )
+        duracao = time.perf_counter() - inicio
+        return (duracao, *resumo_leituras(destino))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do Tratar_dados com 1..N processos")
+    parser.add_argument("--registros", type=int, default=200_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--tamanho-bloco", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pasta_base:
+        print(f"🧪 Gerando {args.registros:,} registros sintéticos...")
+        criar_banco(pasta_base, args.registros)
+        base = os.path.join(pasta_base, ARQUIVO_BANCO)
+
+        print(f"🚀 Processando com workers = {args.workers} (CPUs: {os.cpu_count()})\n")
+        referencia = None
+        tempo_sequencial = None
+        for workers in args.workers:
+            duracao, quantidade, resumo = rodada(base, workers, args.tamanho_bloco)
+            tempo_sequencial = tempo_sequencial or duracao
+            iguais = referencia is None or referencia == (quantidade, resumo)
+            referencia = referencia or (quantidade, resumo)
+            print(
+                f"  workers={workers:<2} {duracao:>6.2f}s  {args.registros / duracao:>9,.0f} registros/s  "
+                f"x{tempo_sequencial / duracao:.2f}  leituras={quantidade:,} hash={resumo} {'✅' if iguais else '❌ DIFERENTE'}"
+            )
+            if not iguais:
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,28 @@
+import asyncio
+import threading
 from fastapi import FastAPI
-from routes.sensores_router import router as sensores_router
-from routes.usuarios_router import router as usuarios_router
-from routes.geral_router import router as geral_router
-from all_module.all_router import router as all_router
-from routes.alerta_router import router as alerta_router
-from controller.ValoresSensorController import router as valores_router
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+_lock_rotas = threading.Lock()
 
 def configure_routes(app: FastAPI):
     """
-    Configura todas as rotas da aplicação
+    Configura todas as rotas da aplicação.
+    Os routers (e seus controllers/serviços) são importados aqui, e não no
+    carregamento do módulo, para não pesar na inicialização da API.
     """
+    from routes.sensores_router import router as sensores_router
+    from routes.dispositivos_router import router as dispositivos_router
+    from routes.usuarios_router import router as usuarios_router
+    from routes.geral_router import router as geral_router
+    from all_module.all_router import router as all_router
+    from routes.alerta_router import router as alerta_router
+    from controller.ValoresSensorController import router as valores_router
+    from stream_module.stream_router import router as stream_router
+    from debug_module.debug_router import router as debug_router
+    from metricas_module.metricas_router import router as metricas_router
+    from tarefas_module.tarefas_router import router as tarefas_router
+    from processamento_module.processamento_router import router as processamento_router
     
     # Incluir rotas gerais
     app.include_router(geral_router)
@@ -17,6 +30,9 @@ def configure_routes(app: FastAPI):
     # Incluir rotas de sensores
     app.include_router(sensores_router)
     
+    # Incluir rotas de dispositivos
+    app.include_router(dispositivos_router)
+    
     # Incluir rotas de usuários
     app.include_router(usuarios_router)
     
@@ -29,6 +45,21 @@ def configure_routes(app: FastAPI):
     # Incluir rotas de valores dos sensores
     app.include_router(valores_router)
     
+    # Incluir rotas de leituras em tempo real (WebSocket/SSE)
+    app.include_router(stream_router)
+    
+    # Incluir rotas de diagnóstico (perfis de requisições)
+    app.include_router(debug_router)
+    
+    # Incluir rota de métricas (Prometheus)
+    app.include_router(metricas_router)
+    
+    # Incluir rotas de tarefas em segundo plano (limpezas)
+    app.include_router(tarefas_router)
+    
+    # Incluir rotas do processamento da tabela all (rejeitados, regras de mapeamento)
+    app.include_router(processamento_router)
+    
     # Rota principal (fora dos prefixos)
     @app.get("/")
     async def root():
@@ -39,9 +70,57 @@ def configure_routes(app: FastAPI):
             "documentation": "/docs",
             "endpoints": {
                 "sensores": "/sensores",
+                "dispositivos": "/dispositivos",
                 "usuarios": "/usuarios",
                 "valores": "/valores",
                 "alertas": "/alertas",
-                "api_geral": "/api"
+                "tempo_real_ws": "/ws/leituras",
+                "tempo_real_sse": "/sse/leituras",
+                "api_geral": "/api",
+                "metricas": "/metrics",
+                "tarefas": "/tarefas",
+                "processamento": "/processamento"
             }
-        }
\ No newline at end of file
+        }
+
+def garantir_rotas(app: FastAPI):
+    """
+    Configura as rotas uma única vez (seguro entre threads). Roda em uma
+    thread do executor (carregar_rotas_em_segundo_plano), nunca no event loop.
+    """
+    if getattr(app.state, "rotas_carregadas", False):
+        return
+    with _lock_rotas:
+        if not getattr(app.state, "rotas_carregadas", False):
+            configure_routes(app)
+            app.state.rotas_carregadas = True
+
+def carregar_rotas_em_segundo_plano(app: FastAPI) -> asyncio.Future:
+    """
+    Inicia (uma vez) o carregamento das rotas em uma thread do executor
+    e retorna o future, aguardado pelas requisições que chegarem antes
+    do fim. Deve ser chamada no event loop.
+    """
+    loop = asyncio.get_running_loop()
+    futuro = getattr(app.state, "carregando_rotas", None)
+    # Recomeça se falhou ou se pertence a outro event loop (ex.: testes)
+    if futuro is None or futuro.get_loop() is not loop or (futuro.done() and futuro.exception() is not None):
+        futuro = app.state.carregando_rotas = loop.run_in_executor(None, garantir_rotas, app)
+    return futuro
+
+class RotasSobDemanda:
+    """
+    Middleware ASGI que garante as rotas carregadas antes de atender
+    a primeira requisição HTTP/WebSocket. As requisições que chegam
+    durante o carregamento aguardam o future, sem bloquear o event loop.
+    """
+
+    def __init__(self, app: ASGIApp, aplicacao: FastAPI):
+        self.app = app
+        self.aplicacao = aplicacao
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "lifespan" and not getattr(self.aplicacao.state, "rotas_carregadas", False):
+            # shield: uma requisição cancelada não cancela o carregamento das outras
+            await asyncio.shield(carregar_rotas_em_segundo_plano(self.aplicacao))
+        await self.app(scope, receive, send)
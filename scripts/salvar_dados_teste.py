@@ -61,12 +61,11 @@ def buscar_ou_criar_sensor(sensores_service, nome, tipo, unidade):
     Busca um sensor por nome ou cria se não existir
     """
     try:
-        # Buscar sensor existente
-        sensores = sensores_service.listar_todos()
-        for sensor in sensores:
-            if sensor.nome.lower() == nome.lower():
-                print(f"🔍 Sensor '{nome}' já existe (ID: {sensor.id})")
-                return sensor
+        # Buscar sensor existente (nome sem diferenciar maiúsculas)
+        sensor = sensores_service.resolvedor().resolver(nome)
+        if sensor is not None:
+            print(f"🔍 Sensor '{nome}' já existe (ID: {sensor.id})")
+            return sensor
         
         # Criar novo sensor se não existir
         novo_sensor = sensores_service.criar(nome=nome, tipo=tipo, unidade=unidade)
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Orçamento de tempo de importação da API.
+Importa um módulo (padrão: app) em um processo novo com -X importtime
+e resume o tempo por pacote e os módulos mais lentos. Com --orcamento,
+termina com código 1 se o total passar do limite (útil em CI).
+
+Uso: python3 scripts/tempo_importacao.py [--modulo app] [--top 15] [--orcamento 800]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent
+
+
+def medir_importacao(modulo: str):
+    """
+    Retorna [(módulo, tempo próprio µs, tempo acumulado µs, profundidade)]
+    lidos da saída do -X importtime
+    """
+    ambiente = dict(os.environ, PYTHONPATH=str(project_root))
+    processo = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+        cwd=project_root, env=ambiente, capture_output=True, text=True
+    )
+    if processo.returncode != 0:
+        print(processo.stderr)
+        raise SystemExit(f"❌ Erro ao importar '{modulo}'")
+
+    medidas = []
+    for linha in processo.stderr.splitlines():
+        if not linha.startswith("import time:") or "self [us]" in linha:
+            continue
+        proprio, acumulado, nome = linha[len("import time:"):].split("|")
+        profundidade = (len(nome) - len(nome.lstrip())) // 2
+        medidas.append((nome.strip(), int(proprio), int(acumulado), profundidade))
+    return medidas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tempo de importação por módulo e pacote")
+    parser.add_argument("--modulo", default="app")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--orcamento", type=float, default=None, help="limite total em ms")
+    args = parser.parse_args()
+
+    medidas = medir_importacao(args.modulo)
+    total_ms = sum(proprio for _, proprio, _, _ in medidas) / 1000
+
+    # Tempo próprio somado por pacote de primeiro nível
+    por_pacote = defaultdict(int)
+    for nome, proprio, _, _ in medidas:
+        por_pacote[nome.split(".")[0]] += proprio
+
+    print(f"⏱️ Importação de '{args.modulo}': {total_ms:.0f} ms ({len(medidas)} módulos)\n")
+    print("📦 Por pacote (tempo próprio):")
+    for pacote, proprio in sorted(por_pacote.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {pacote:<30} {proprio / 1000:>8.1f} ms  {proprio / 1000 / total_ms:>6.1%}")
+
+    print("\n🐢 Módulos mais lentos (tempo próprio):")
+    for nome, proprio, acumulado, _ in sorted(medidas, key=lambda medida: -medida[1])[:args.top]:
+        print(f"  {nome:<50} {proprio / 1000:>8.1f} ms  (acumulado {acumulado / 1000:.1f} ms)")
+
+    if args.orcamento is not None:
+        if total_ms > args.orcamento:
+            print(f"\n❌ Orçamento excedido: {total_ms:.0f} ms > {args.orcamento:.0f} ms")
+            sys.exit(1)
+        print(f"\n✅ Dentro do orçamento: {total_ms:.0f} ms <= {args.orcamento:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,7 +8,7 @@ import time
 import json
 import logging
 import random
-from datetime import datetime
+from datetime import datetime, timezone
 import paho.mqtt.client as mqtt
 
 # ==============================================================
@@ -275,7 +275,7 @@ class AplicacaoSensores:
                 
                 # Preparar dados para envio (equivale ao Serial.println() + WiFi.send())
                 dados = {
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": datetime.now(timezone.utc).isoformat(),  # horário da medição (com fuso)
                     "device_id": "raspberry_pi_001",
                     "temperatura": temperatura,
                     "umidade": umidade,
@@ -0,0 +1,270 @@
+import os
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+from model.agregadosModel import AgregadoValores
+from model.sensoresModel import formatar_timestamp
+from cache_module.cacheLeitura import registrar_cache
+
+# Duração de cada linha de agregados_valores
+DURACAO_HORA = timedelta(hours=1)
+
+# Janela de reordenação: uma hora é considerada fechada depois que o
+# relógio do servidor passa do fim dela mais a janela. Leituras fora de
+# ordem dentro da janela são o caso normal; as que chegam depois (ex.:
+# backlog de store-and-forward) também entram na hora delas, mas são
+# contadas em 'atrasadas', e quem já leu a hora fechada sabe que ela mudou.
+JANELA_REORDENACAO = timedelta(seconds=float(os.getenv("AGREGADOS_JANELA_REORDENACAO", "600")))
+
+# Intervalos aceitos na consulta (as horas são somadas por dia)
+INTERVALOS = {"hora": DURACAO_HORA, "dia": timedelta(days=1)}
+
+# Intervalos devolvidos quando a consulta não informa o início
+LIMITE_INTERVALOS = {"hora": 48, "dia": 31}
+
+# Leitura para os agregados: (valor, id_sensor, horário do evento e de
+# recebimento já em texto (formatar_timestamp), id_dispositivo ou None)
+LeituraAgregada = Tuple[float, int, str, str, Optional[int]]
+
+# Formato do início da hora em SQL, igual ao de inicio_hora()
+_HORA_SQL = "strftime('%Y-%m-%d %H:00:00.000000', timestamp)"
+
+# Último valor de cada série: (id_sensor, id_dispositivo ou None = todos)
+# -> to_dict() da leitura (ou None). As inserções deste processo só fazem a
+# série avançar: leituras mais antigas que a guardada não a alteram nem
+# invalidam. Remoções invalidam tudo; escritas de outros processos (ex.:
+# Tratar_dados separado da API) valem em até ttl segundos.
+cache_ultimos = registrar_cache("ultimos_valores", max_itens=1024, ttl=10.0)
+
+
+def inicio_hora(timestamp: str) -> str:
+    """
+    Início da hora de um timestamp em texto (formatar_timestamp)
+    """
+    return timestamp[:13] + ":00:00.000000"
+
+
+def _truncar_hora(data: datetime) -> datetime:
+    return data.replace(minute=0, second=0, microsecond=0)
+
+
+def leitura_atrasada(timestamp: datetime, recebido_em: datetime) -> bool:
+    """
+    A leitura chegou depois da janela de reordenação da hora dela
+    """
+    return recebido_em > _truncar_hora(timestamp) + DURACAO_HORA + JANELA_REORDENACAO
+
+
+def avancar_ultimos(leituras: Iterable[dict]):
+    """
+    Atualiza o último valor das séries em cache com leituras já gravadas
+    (to_dict()), só quando são mais recentes (horário do evento, id_valor)
+    """
+    for leitura in leituras:
+        for chave in ((leitura["id_sensor"], leitura["id_dispositivo"]), (leitura["id_sensor"], None)):
+            cache_ultimos.ajustar(
+                chave,
+                lambda atual: leitura if atual is None or
+                (leitura["timestamp"], leitura["id_valor"]) >= (atual["timestamp"], atual["id_valor"]) else atual
+            )
+
+
+def descartar_ultimos(maximos: Dict[Tuple[int, Optional[int]], str]):
+    """
+    Inserções em massa (sem id_valor): descarta do cache só as séries em
+    que o maior horário inserido (texto de formatar_timestamp) alcança o
+    último valor guardado
+    """
+    for (id_sensor, id_dispositivo), timestamp in maximos.items():
+        horario = timestamp.replace(" ", "T")
+        for chave in ((id_sensor, id_dispositivo), (id_sensor, None)):
+            atual = cache_ultimos.espiar(chave, False)
+            if atual is None or (atual and atual["timestamp"] <= horario):
+                cache_ultimos.invalidar(chave)
+
+
+class AgregadosService:
+    """
+    Service dos agregados por hora das leituras (mínimo, máximo, média,
+    último valor), mantidos incrementalmente a cada inserção
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def acumular(self, leituras: Iterable[LeituraAgregada]) -> int:
+        """
+        Soma as leituras de um lote nas horas delas SEM fazer commit (vai na
+        transação das leituras). As leituras são agrupadas por sensor,
+        dispositivo e hora antes de um único executemany: um lote grande
+        grava só as horas que tocou, em qualquer ordem de chegada.
+        Retorna a quantidade de horas atualizadas.
+        """
+        grupos: Dict[tuple, list] = {}
+        for valor, id_sensor, timestamp, recebido_em, id_dispositivo in leituras:
+            chave = (id_sensor, id_dispositivo or 0, inicio_hora(timestamp))
+            grupo = grupos.get(chave)
+            if grupo is None:
+                fechamento = datetime.fromisoformat(chave[2]) + DURACAO_HORA + JANELA_REORDENACAO
+                grupos[chave] = [1, valor, valor, valor, valor, timestamp,
+                                 int(recebido_em > formatar_timestamp(fechamento)), formatar_timestamp(fechamento)]
+                continue
+            grupo[0] += 1
+            grupo[1] += valor
+            if valor < grupo[2]:
+                grupo[2] = valor
+            if valor > grupo[3]:
+                grupo[3] = valor
+            if timestamp >= grupo[5]:
+                grupo[4], grupo[5] = valor, timestamp
+            if recebido_em > grupo[7]:
+                grupo[6] += 1
+        if not grupos:
+            return 0
+        try:
+            self.db.connection().exec_driver_sql(
+                "INSERT INTO agregados_valores (id_sensor, id_dispositivo, inicio, quantidade, soma, minimo, maximo, "
+                "ultimo_valor, ultimo_timestamp, atrasadas, atualizado_em) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP) "
+                "ON CONFLICT (id_sensor, id_dispositivo, inicio) DO UPDATE SET "
+                "quantidade = quantidade + excluded.quantidade, soma = soma + excluded.soma, "
+                "minimo = min(minimo, excluded.minimo), maximo = max(maximo, excluded.maximo), "
+                "ultimo_valor = CASE WHEN ultimo_timestamp IS NULL OR excluded.ultimo_timestamp >= ultimo_timestamp "
+                "THEN excluded.ultimo_valor ELSE ultimo_valor END, "
+                "ultimo_timestamp = max(coalesce(ultimo_timestamp, ''), excluded.ultimo_timestamp), "
+                "atrasadas = atrasadas + excluded.atrasadas, atualizado_em = CURRENT_TIMESTAMP",
+                [chave + tuple(grupo[:7]) for chave, grupo in grupos.items()]
+            )
+            return len(grupos)
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise Exception(f"Erro ao atualizar agregados: {str(e)}")
+
+    def recalcular(self, id_sensor: Optional[int], inicio: Optional[datetime] = None,
+                   fim: Optional[datetime] = None) -> int:
+        """
+        Refaz, a partir das leituras, as horas de um sensor (None = todos)
+        entre inicio e fim (todas, se não informados) SEM fazer commit. Usado
+        quando leituras são removidas, só nas horas afetadas, e para criar os
+        agregados das leituras que já existiam na migração.
+        Retorna a quantidade de horas recalculadas.
+        """
+        condicoes, parametros = [], []
+        if id_sensor is not None:
+            condicoes.append("id_sensor = ?")
+            parametros.append(id_sensor)
+        if inicio is not None:
+            condicoes.append("timestamp >= ?")
+            parametros.append(formatar_timestamp(_truncar_hora(inicio)))
+        if fim is not None:
+            condicoes.append("timestamp < ?")
+            parametros.append(formatar_timestamp(_truncar_hora(fim) + DURACAO_HORA))
+        filtro = " AND ".join(condicoes) or "1"
+        janela = f"+{int(JANELA_REORDENACAO.total_seconds()) + 3600} seconds"
+        try:
+            conexao = self.db.connection()
+            conexao.exec_driver_sql(
+                f"DELETE FROM agregados_valores WHERE {filtro.replace('timestamp', 'inicio')}", tuple(parametros)
+            )
+            conexao.exec_driver_sql(
+                "INSERT INTO agregados_valores (id_sensor, id_dispositivo, inicio, quantidade, soma, minimo, maximo, "
+                "ultimo_timestamp, atrasadas, atualizado_em) "
+                f"SELECT id_sensor, coalesce(id_dispositivo, 0), {_HORA_SQL}, count(*), sum(valor), min(valor), "
+                f"max(valor), max(timestamp), "
+                f"sum(recebido_em > datetime(strftime('%Y-%m-%d %H:00:00', timestamp), '{janela}')), CURRENT_TIMESTAMP "
+                f"FROM valores_sensor WHERE {filtro} GROUP BY id_sensor, coalesce(id_dispositivo, 0), {_HORA_SQL}",
+                tuple(parametros)
+            )
+            # Último valor de cada hora: a leitura com o maior horário (índice sensor + timestamp)
+            return conexao.exec_driver_sql(
+                "UPDATE agregados_valores SET ultimo_valor = ("
+                "SELECT v.valor FROM valores_sensor v WHERE v.id_sensor = agregados_valores.id_sensor "
+                "AND v.timestamp = agregados_valores.ultimo_timestamp "
+                "AND coalesce(v.id_dispositivo, 0) = agregados_valores.id_dispositivo "
+                "ORDER BY v.id_valor DESC LIMIT 1) "
+                f"WHERE ultimo_valor IS NULL AND {filtro.replace('timestamp', 'inicio')}",
+                tuple(parametros)
+            ).rowcount
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise Exception(f"Erro ao recalcular agregados: {str(e)}")
+
+    def remover_sensor(self, id_sensor: int) -> int:
+        """
+        Remove os agregados de um sensor (sensor deletado) SEM fazer commit
+        """
+        try:
+            return self.db.execute(delete(AgregadoValores).where(AgregadoValores.id_sensor == id_sensor)).rowcount
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise Exception(f"Erro ao remover agregados do sensor: {str(e)}")
+
+    def listar(self, id_sensor: int, id_dispositivo: Optional[int] = None, intervalo: str = "hora",
+               inicio: Optional[datetime] = None, fim: Optional[datetime] = None) -> List[dict]:
+        """
+        Agregados de um sensor por hora ou por dia (mais recentes primeiro),
+        de um dispositivo ou de todos somados. Sem início, devolve os
+        últimos LIMITE_INTERVALOS do intervalo. 'fechado' indica que o
+        intervalo já passou da janela de reordenação.
+        """
+        if intervalo not in INTERVALOS:
+            raise ValueError(f"Intervalo inválido: {intervalo} (use {', '.join(INTERVALOS)})")
+        duracao = INTERVALOS[intervalo]
+        agora = datetime.utcnow()
+        fim = fim or agora
+        if inicio is None:
+            inicio = fim - duracao * LIMITE_INTERVALOS[intervalo]
+        if intervalo == "dia":
+            inicio = inicio.replace(hour=0)
+        inicio = _truncar_hora(inicio)
+
+        consulta = select(
+            AgregadoValores.inicio, AgregadoValores.quantidade, AgregadoValores.soma, AgregadoValores.minimo,
+            AgregadoValores.maximo, AgregadoValores.ultimo_valor, AgregadoValores.ultimo_timestamp,
+            AgregadoValores.atrasadas
+        ).where(
+            AgregadoValores.id_sensor == id_sensor, AgregadoValores.inicio >= inicio, AgregadoValores.inicio < fim
+        )
+        if id_dispositivo is not None:
+            consulta = consulta.where(AgregadoValores.id_dispositivo == id_dispositivo)
+        try:
+            linhas = self.db.execute(consulta).all()
+        except SQLAlchemyError as e:
+            raise Exception(f"Erro ao listar agregados: {str(e)}")
+
+        # Soma as horas de cada intervalo (e os dispositivos, sem filtro)
+        intervalos: Dict[datetime, dict] = {}
+        for hora, quantidade, soma, minimo, maximo, ultimo_valor, ultimo_timestamp, atrasadas in linhas:
+            chave = hora.replace(hour=0) if intervalo == "dia" else hora
+            atual = intervalos.get(chave)
+            if atual is None:
+                intervalos[chave] = {
+                    "quantidade": quantidade, "soma": soma, "minimo": minimo, "maximo": maximo,
+                    "ultimo_valor": ultimo_valor, "ultimo_timestamp": ultimo_timestamp, "atrasadas": atrasadas
+                }
+                continue
+            atual["quantidade"] += quantidade
+            atual["soma"] += soma
+            atual["minimo"] = min(atual["minimo"], minimo)
+            atual["maximo"] = max(atual["maximo"], maximo)
+            atual["atrasadas"] += atrasadas
+            if ultimo_timestamp is not None and (atual["ultimo_timestamp"] is None or ultimo_timestamp >= atual["ultimo_timestamp"]):
+                atual["ultimo_valor"], atual["ultimo_timestamp"] = ultimo_valor, ultimo_timestamp
+
+        return [
+            {
+                "inicio": chave.isoformat(),
+                "fim": (chave + duracao).isoformat(),
+                "quantidade": dados["quantidade"],
+                "media": dados["soma"] / dados["quantidade"] if dados["quantidade"] else None,
+                "minimo": dados["minimo"],
+                "maximo": dados["maximo"],
+                "ultimo_valor": dados["ultimo_valor"],
+                "ultimo_timestamp": dados["ultimo_timestamp"].isoformat() if dados["ultimo_timestamp"] else None,
+                "atrasadas": dados["atrasadas"],
+                "fechado": chave + duracao + JANELA_REORDENACAO <= agora
+            }
+            for chave, dados in sorted(intervalos.items(), reverse=True)
+        ]
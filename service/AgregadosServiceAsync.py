@@ -0,0 +1,18 @@
+from datetime import datetime
+from service.AgregadosService import AgregadosService
+from service.ServicoAsync import ServicoAsync
+from typing import List, Optional
+
+class AgregadosServiceAsync(ServicoAsync):
+    """
+    Versão assíncrona do service de Agregados das leituras
+    """
+    
+    servico_sync = AgregadosService
+    
+    async def listar(self, id_sensor: int, id_dispositivo: Optional[int] = None, intervalo: str = "hora",
+                     inicio: Optional[datetime] = None, fim: Optional[datetime] = None) -> List[dict]:
+        """
+        Agregados de um sensor por hora ou por dia (mais recentes primeiro)
+        """
+        return await self._executar(AgregadosService.listar, id_sensor, id_dispositivo, intervalo, inicio, fim)
@@ -1,10 +1,9 @@
 from sqlalchemy.orm import Session
 from model.alertaModel import Alerta
-from config.databaseConfig import SessionLocal
 
 class AlertaService:
-    def __init__(self):
-        self.db: Session = SessionLocal()
+    def __init__(self, db: Session):
+        self.db: Session = db
 
     def get_all_alertas(self):
         return self.db.query(Alerta).all()
@@ -0,0 +1,26 @@
+from model.alertaModel import Alerta
+from service.AlertaService import AlertaService
+from service.ServicoAsync import ServicoAsync
+from typing import List, Optional
+
+class AlertaServiceAsync(ServicoAsync):
+    """
+    Versão assíncrona do service de Alertas
+    """
+    
+    servico_sync = AlertaService
+    
+    async def get_all_alertas(self) -> List[Alerta]:
+        return await self._executar(AlertaService.get_all_alertas)
+    
+    async def get_alerta_by_id(self, alerta_id: int) -> Optional[Alerta]:
+        return await self._executar(AlertaService.get_alerta_by_id, alerta_id)
+    
+    async def create_alerta(self, alerta_data: dict) -> Alerta:
+        return await self._escrever(AlertaService.create_alerta, alerta_data)
+    
+    async def update_alerta(self, alerta_id: int, alerta_data: dict) -> Optional[Alerta]:
+        return await self._escrever(AlertaService.update_alerta, alerta_id, alerta_data)
+    
+    async def delete_alerta(self, alerta_id: int) -> bool:
+        return await self._escrever(AlertaService.delete_alerta, alerta_id)
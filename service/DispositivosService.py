@@ -0,0 +1,116 @@
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy import select
+from model.dispositivosModel import Dispositivo
+from config.databaseConfig import apos_commit, apos_proximo_commit
+from cache_module.cacheLeitura import registrar_cache
+from typing import Dict, Iterable, List, Optional
+
+# Mapa identificador -> id dos dispositivos (invalidado ao criar/atualizar)
+cache_dispositivos = registrar_cache("dispositivos", max_itens=4, ttl=300.0)
+
+class DispositivosService:
+    """
+    Service para operações CRUD de Dispositivos
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def ids_por_identificador(self) -> Dict[str, int]:
+        """
+        Retorna o mapa identificador -> id de todos os dispositivos, em cache
+        """
+        try:
+            return cache_dispositivos.obter_ou_calcular("ids", self._carregar_ids)
+        except SQLAlchemyError as e:
+            raise Exception(f"Erro ao carregar dispositivos: {str(e)}")
+    
+    def _carregar_ids(self) -> Dict[str, int]:
+        return dict(self.db.execute(select(Dispositivo.identificador, Dispositivo.id)).all())
+    
+    def id_por_identificador(self, identificador: str) -> Optional[int]:
+        """
+        Retorna o ID do dispositivo (ou None se não existir)
+        """
+        return self.ids_por_identificador().get(identificador)
+    
+    def garantir(self, identificadores: Iterable[str]) -> Dict[str, int]:
+        """
+        Retorna identificador -> id dos dispositivos informados, cadastrando
+        os que ainda não existem, SEM commit (vai na transação das leituras).
+        O INSERT ignora conflitos no identificador: processos que recebem o
+        mesmo dispositivo novo ao mesmo tempo ficam com o mesmo ID.
+        """
+        conhecidos = self.ids_por_identificador()
+        ids = {identificador: conhecidos[identificador] for identificador in identificadores if identificador in conhecidos}
+        novos = sorted(set(identificadores) - set(ids))
+        if not novos:
+            return ids
+        try:
+            self.db.execute(
+                insert(Dispositivo).on_conflict_do_nothing(),
+                [{"identificador": identificador} for identificador in novos]
+            )
+            ids.update(self.db.execute(
+                select(Dispositivo.identificador, Dispositivo.id).where(Dispositivo.identificador.in_(novos))
+            ).all())
+            apos_proximo_commit(self.db, cache_dispositivos.invalidar)
+            return ids
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise Exception(f"Erro ao cadastrar dispositivos: {str(e)}")
+    
+    def listar_todos(self) -> List[Dispositivo]:
+        """
+        Lista todos os dispositivos
+        """
+        try:
+            return self.db.query(Dispositivo).order_by(Dispositivo.identificador).all()
+        except SQLAlchemyError as e:
+            raise Exception(f"Erro ao listar dispositivos: {str(e)}")
+    
+    def buscar_por_identificador(self, identificador: str) -> Optional[Dispositivo]:
+        """
+        Busca um dispositivo pelo identificador (device_id)
+        """
+        try:
+            return self.db.query(Dispositivo).filter(Dispositivo.identificador == identificador).first()
+        except SQLAlchemyError as e:
+            raise Exception(f"Erro ao buscar dispositivo: {str(e)}")
+    
+    def criar(self, identificador: str, nome: Optional[str] = None) -> Dispositivo:
+        """
+        Cadastra um dispositivo antes da primeira leitura (ex.: para criar
+        sensores próprios dele)
+        """
+        try:
+            dispositivo = Dispositivo(identificador=identificador, nome=nome)
+            self.db.add(dispositivo)
+            self.db.commit()
+            apos_commit(self.db, cache_dispositivos.invalidar)
+            self.db.refresh(dispositivo)
+            return dispositivo
+        except IntegrityError:
+            self.db.rollback()
+            raise Exception(f"Dispositivo já cadastrado: {identificador}")
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise Exception(f"Erro ao criar dispositivo: {str(e)}")
+    
+    def atualizar(self, identificador: str, nome: Optional[str]) -> Optional[Dispositivo]:
+        """
+        Atualiza o nome de um dispositivo
+        """
+        try:
+            dispositivo = self.db.query(Dispositivo).filter(Dispositivo.identificador == identificador).first()
+            if not dispositivo:
+                return None
+            dispositivo.nome = nome
+            self.db.commit()
+            self.db.refresh(dispositivo)
+            return dispositivo
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise Exception(f"Erro ao atualizar dispositivo: {str(e)}")
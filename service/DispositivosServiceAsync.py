@@ -0,0 +1,41 @@
+from model.dispositivosModel import Dispositivo
+from service.DispositivosService import DispositivosService
+from service.ServicoAsync import ServicoAsync
+from typing import List, Optional
+
+class DispositivosServiceAsync(ServicoAsync):
+    """
+    Versão assíncrona do service de Dispositivos
+    """
+    
+    servico_sync = DispositivosService
+    
+    async def listar_todos(self) -> List[Dispositivo]:
+        """
+        Lista todos os dispositivos
+        """
+        return await self._executar(DispositivosService.listar_todos)
+    
+    async def buscar_por_identificador(self, identificador: str) -> Optional[Dispositivo]:
+        """
+        Busca um dispositivo pelo identificador
+        """
+        return await self._executar(DispositivosService.buscar_por_identificador, identificador)
+    
+    async def id_por_identificador(self, identificador: str) -> Optional[int]:
+        """
+        Retorna o ID do dispositivo (ou None se não existir)
+        """
+        return await self._executar(DispositivosService.id_por_identificador, identificador)
+    
+    async def criar(self, identificador: str, nome: Optional[str] = None) -> Dispositivo:
+        """
+        Cadastra um dispositivo
+        """
+        return await self._escrever(DispositivosService.criar, identificador, nome)
+    
+    async def atualizar(self, identificador: str, nome: Optional[str]) -> Optional[Dispositivo]:
+        """
+        Atualiza o nome de um dispositivo
+        """
+        return await self._escrever(DispositivosService.atualizar, identificador, nome)
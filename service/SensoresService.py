@@ -1,8 +1,19 @@
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import SQLAlchemyError
-from model.sensoresModel import Sensor
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from model.sensoresModel import Sensor, normalizar_nome
+from model.dispositivosModel import Dispositivo
+from service.DispositivosService import DispositivosService
+from service.AgregadosService import AgregadosService, cache_ultimos
+from config.databaseConfig import apos_commit, apos_proximo_commit
+from cache_module.cacheLeitura import registrar_cache
+from service.resolvedorSensores import ResolvedorSensores, SensorResolvido
+from sqlalchemy import func, select
+from sqlalchemy.dialects.sqlite import insert
 from typing import List, Optional
 
+# Cache de leitura dos sensores (invalidado por criar/atualizar/deletar)
+cache_sensores = registrar_cache("sensores", max_itens=16, ttl=300.0)
+
 class SensoresService:
     """
     Service para operações CRUD de Sensores
@@ -16,10 +27,43 @@ class SensoresService:
         Lista todos os sensores
         """
         try:
-            return self.db.query(Sensor).all()
+            return list(cache_sensores.obter_ou_calcular("listar_todos", self._carregar_todos))
         except SQLAlchemyError as e:
             raise Exception(f"Erro ao listar sensores: {str(e)}")
     
+    def _carregar_todos(self) -> List[Sensor]:
+        """
+        Carrega os sensores como cópias desvinculadas da sessão,
+        para que possam ser compartilhadas entre requisições pelo cache
+        """
+        copias = []
+        for sensor in self.db.query(Sensor).all():
+            copia = Sensor(nome=sensor.nome, tipo=sensor.tipo, unidade=sensor.unidade,
+                           id_dispositivo=sensor.id_dispositivo)
+            copia.id = sensor.id
+            copias.append(copia)
+        return copias
+    
+    def resolvedor(self) -> ResolvedorSensores:
+        """
+        Retorna o resolvedor (nome, dispositivo) -> (id, unidade, tipo) em
+        cache, usado pela ingestão e pelo processamento para achar sensores
+        pelo nome sem consultar o banco a cada leitura
+        """
+        try:
+            return cache_sensores.obter_ou_calcular("resolvedor", self._carregar_resolvedor)
+        except SQLAlchemyError as e:
+            raise Exception(f"Erro ao carregar mapa de sensores: {str(e)}")
+    
+    def _carregar_resolvedor(self) -> ResolvedorSensores:
+        return ResolvedorSensores(
+            self.db.execute(
+                select(Sensor.id, Sensor.nome, Sensor.unidade, Sensor.tipo,
+                       Sensor.id_dispositivo, Dispositivo.identificador)
+                .outerjoin(Dispositivo, Sensor.id_dispositivo == Dispositivo.id)
+            ).all()
+        )
+    
     def buscar_por_id(self, sensor_id: int) -> Optional[Sensor]:
         """
         Busca um sensor por ID
@@ -38,26 +82,68 @@ class SensoresService:
         except SQLAlchemyError as e:
             raise Exception(f"Erro ao buscar sensores por tipo: {str(e)}")
     
-    def criar(self, nome: str, tipo: str, unidade: str) -> Sensor:
+    def criar(self, nome: str, tipo: str, unidade: str, dispositivo: Optional[str] = None) -> Sensor:
         """
-        Cria um novo sensor
+        Cria um novo sensor (geral ou, com dispositivo, próprio de um
+        dispositivo: as leituras dele com esse nome vão para este sensor)
         """
         try:
+            id_dispositivo = None
+            if dispositivo is not None:
+                id_dispositivo = DispositivosService(self.db).id_por_identificador(dispositivo)
+                if id_dispositivo is None:
+                    raise ValueError(f"Dispositivo '{dispositivo}' não encontrado")
+            
+            if self.resolvedor().exato(nome, id_dispositivo) is not None:
+                raise Exception(f"Sensor já cadastrado: {nome}")
+            
             novo_sensor = Sensor(
                 nome=nome,
                 tipo=tipo,
-                unidade=unidade
+                unidade=unidade,
+                id_dispositivo=id_dispositivo
             )
             
             self.db.add(novo_sensor)
             self.db.commit()
+            apos_commit(self.db, cache_sensores.invalidar)
             self.db.refresh(novo_sensor)
             
             return novo_sensor
+        except IntegrityError:
+            self.db.rollback()
+            raise Exception(f"Sensor já cadastrado: {nome}")
         except SQLAlchemyError as e:
             self.db.rollback()
             raise Exception(f"Erro ao criar sensor: {str(e)}")
     
+    def garantir(self, nome: str, tipo: str, unidade: str) -> SensorResolvido:
+        """
+        Retorna o sensor geral com o nome informado (sem diferenciar
+        maiúsculas), criando-o se não existir. O INSERT ignora conflitos no
+        índice único de (dispositivo, nome normalizado): processos que
+        cadastram o mesmo nome ao mesmo tempo recebem o mesmo sensor.
+        SEM commit: o sensor vai na transação de quem chamou (ex.: leituras
+        + checkpoint do processamento), e erros sobem para quem chamou
+        desfazer a transação.
+        """
+        nome_normalizado = normalizar_nome(nome)
+        criado = self.db.execute(
+            insert(Sensor).values(nome=nome, nome_normalizado=nome_normalizado, tipo=tipo, unidade=unidade)
+            .on_conflict_do_nothing()
+        ).rowcount > 0
+        linha = self.db.execute(
+            select(Sensor.id, Sensor.unidade, Sensor.tipo)
+            # Mesma expressão do índice único, para a busca usá-lo
+            .where(func.coalesce(Sensor.id_dispositivo, 0) == 0, Sensor.nome_normalizado == nome_normalizado)
+        ).first()
+        if linha is None:
+            raise Exception(f"Erro ao cadastrar sensor: '{nome}' conflita com outro sensor e não foi encontrado")
+        self.db.flush()
+        if criado:
+            apos_proximo_commit(self.db, cache_sensores.invalidar)
+        return SensorResolvido(*linha)
+    
     def atualizar(self, sensor_id: int, nome: Optional[str] = None, 
                   tipo: Optional[str] = None, unidade: Optional[str] = None) -> Optional[Sensor]:
         """
@@ -71,6 +157,9 @@ class SensoresService:
             
             # Atualizar apenas campos fornecidos
             if nome is not None:
+                existente = self.resolvedor().exato(nome, sensor.id_dispositivo)
+                if existente is not None and existente.id != sensor_id:
+                    raise Exception(f"Sensor já cadastrado: {nome}")
                 sensor.nome = nome
             if tipo is not None:
                 sensor.tipo = tipo
@@ -78,9 +167,13 @@ class SensoresService:
                 sensor.unidade = unidade
             
             self.db.commit()
+            apos_commit(self.db, cache_sensores.invalidar)
             self.db.refresh(sensor)
             
             return sensor
+        except IntegrityError:
+            self.db.rollback()
+            raise Exception(f"Sensor já cadastrado: {nome}")
         except SQLAlchemyError as e:
             self.db.rollback()
             raise Exception(f"Erro ao atualizar sensor: {str(e)}")
@@ -95,8 +188,11 @@ class SensoresService:
             if not sensor:
                 return False
             
+            AgregadosService(self.db).remover_sensor(sensor_id)
             self.db.delete(sensor)
             self.db.commit()
+            apos_commit(self.db, cache_sensores.invalidar)
+            apos_commit(self.db, cache_ultimos.invalidar)
             
             return True
         except SQLAlchemyError as e:
@@ -108,7 +204,7 @@ class SensoresService:
         Conta total de sensores
         """
         try:
-            return self.db.query(Sensor).count()
+            return cache_sensores.obter_ou_calcular("contar_total", self.db.query(Sensor).count)
         except SQLAlchemyError as e:
             raise Exception(f"Erro ao contar sensores: {str(e)}")
     
@@ -0,0 +1,60 @@
+from model.sensoresModel import Sensor
+from service.SensoresService import SensoresService
+from service.ServicoAsync import ServicoAsync
+from typing import List, Optional
+
+class SensoresServiceAsync(ServicoAsync):
+    """
+    Versão assíncrona do service de Sensores
+    """
+    
+    servico_sync = SensoresService
+    
+    async def listar_todos(self) -> List[Sensor]:
+        """
+        Lista todos os sensores
+        """
+        return await self._executar(SensoresService.listar_todos)
+    
+    async def buscar_por_id(self, sensor_id: int) -> Optional[Sensor]:
+        """
+        Busca um sensor por ID
+        """
+        return await self._executar(SensoresService.buscar_por_id, sensor_id)
+    
+    async def buscar_por_tipo(self, tipo: str) -> List[Sensor]:
+        """
+        Busca sensores por tipo
+        """
+        return await self._executar(SensoresService.buscar_por_tipo, tipo)
+    
+    async def criar(self, nome: str, tipo: str, unidade: str, dispositivo: Optional[str] = None) -> Sensor:
+        """
+        Cria um novo sensor (geral ou próprio de um dispositivo)
+        """
+        return await self._escrever(SensoresService.criar, nome, tipo, unidade, dispositivo)
+    
+    async def atualizar(self, sensor_id: int, nome: Optional[str] = None,
+                        tipo: Optional[str] = None, unidade: Optional[str] = None) -> Optional[Sensor]:
+        """
+        Atualiza um sensor existente
+        """
+        return await self._escrever(SensoresService.atualizar, sensor_id, nome, tipo, unidade)
+    
+    async def deletar(self, sensor_id: int) -> bool:
+        """
+        Deleta um sensor
+        """
+        return await self._escrever(SensoresService.deletar, sensor_id)
+    
+    async def contar_total(self) -> int:
+        """
+        Conta total de sensores
+        """
+        return await self._executar(SensoresService.contar_total)
+    
+    async def buscar_por_nome(self, nome: str) -> List[Sensor]:
+        """
+        Busca sensores por nome (busca parcial)
+        """
+        return await self._executar(SensoresService.buscar_por_nome, nome)
@@ -0,0 +1,34 @@
+from typing import Any, Callable
+from sqlalchemy.ext.asyncio import AsyncSession
+from config.escritorBanco import escritor
+
+class ServicoAsync:
+    """
+    Base para as versões assíncronas dos services.
+    Executa os métodos do service síncrono sem bloquear o event loop:
+    leituras rodam sobre a AsyncSession do pool somente leitura (run_sync)
+    e escritas são enviadas ao escritor único do banco. As regras de
+    negócio continuam em um único lugar.
+    """
+    
+    # Classe do service síncrono equivalente (definida nas subclasses)
+    servico_sync = None
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def _executar(self, metodo: Callable, *args, **kwargs) -> Any:
+        """
+        Executa um método de leitura do service síncrono com a sessão da AsyncSession
+        """
+        return await self.db.run_sync(
+            lambda sessao: metodo(self.servico_sync(sessao), *args, **kwargs)
+        )
+    
+    async def _escrever(self, metodo: Callable, *args, **kwargs) -> Any:
+        """
+        Envia um método de escrita do service síncrono ao escritor único
+        """
+        return await escritor.executar(
+            lambda sessao: metodo(self.servico_sync(sessao), *args, **kwargs)
+        )
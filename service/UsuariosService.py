@@ -1,8 +1,13 @@
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from model.usuariosModel import Usuarios
+from config.databaseConfig import apos_commit
+from cache_module.cacheLeitura import registrar_cache
 from typing import List, Optional
 
+# Cache de leitura dos usuários (invalidado por criar/atualizar/deletar)
+cache_usuarios = registrar_cache("usuarios", max_itens=16, ttl=300.0)
+
 class UsuariosService:
     """
     Service para operações CRUD de Usuários
@@ -64,6 +69,7 @@ class UsuariosService:
             
             self.db.add(novo_usuario)
             self.db.commit()
+            apos_commit(self.db, cache_usuarios.invalidar)
             self.db.refresh(novo_usuario)
             
             return novo_usuario
@@ -96,6 +102,7 @@ class UsuariosService:
                 usuario.senha = senha  # Em produção, deveria ser hashada
             
             self.db.commit()
+            apos_commit(self.db, cache_usuarios.invalidar)
             self.db.refresh(usuario)
             
             return usuario
@@ -115,6 +122,7 @@ class UsuariosService:
             
             self.db.delete(usuario)
             self.db.commit()
+            apos_commit(self.db, cache_usuarios.invalidar)
             
             return True
         except SQLAlchemyError as e:
@@ -126,7 +134,7 @@ class UsuariosService:
         Conta total de usuários
         """
         try:
-            return self.db.query(Usuarios).count()
+            return cache_usuarios.obter_ou_calcular("contar_total", self.db.query(Usuarios).count)
         except SQLAlchemyError as e:
             raise Exception(f"Erro ao contar usuários: {str(e)}")
     
@@ -0,0 +1,72 @@
+from model.usuariosModel import Usuarios
+from service.UsuariosService import UsuariosService
+from service.ServicoAsync import ServicoAsync
+from typing import List, Optional
+
+class UsuariosServiceAsync(ServicoAsync):
+    """
+    Versão assíncrona do service de Usuários
+    """
+    
+    servico_sync = UsuariosService
+    
+    async def listar_todos(self) -> List[Usuarios]:
+        """
+        Lista todos os usuários
+        """
+        return await self._executar(UsuariosService.listar_todos)
+    
+    async def buscar_por_id(self, usuario_id: int) -> Optional[Usuarios]:
+        """
+        Busca um usuário por ID
+        """
+        return await self._executar(UsuariosService.buscar_por_id, usuario_id)
+    
+    async def buscar_por_email(self, email: str) -> Optional[Usuarios]:
+        """
+        Busca um usuário por email
+        """
+        return await self._executar(UsuariosService.buscar_por_email, email)
+    
+    async def email_existe(self, email: str) -> bool:
+        """
+        Verifica se um email já existe
+        """
+        return await self._executar(UsuariosService.email_existe, email)
+    
+    async def criar(self, nome: str, email: str, senha: str) -> Usuarios:
+        """
+        Cria um novo usuário
+        """
+        return await self._escrever(UsuariosService.criar, nome, email, senha)
+    
+    async def atualizar(self, usuario_id: int, nome: Optional[str] = None,
+                        email: Optional[str] = None, senha: Optional[str] = None) -> Optional[Usuarios]:
+        """
+        Atualiza um usuário existente
+        """
+        return await self._escrever(UsuariosService.atualizar, usuario_id, nome, email, senha)
+    
+    async def deletar(self, usuario_id: int) -> bool:
+        """
+        Deleta um usuário
+        """
+        return await self._escrever(UsuariosService.deletar, usuario_id)
+    
+    async def contar_total(self) -> int:
+        """
+        Conta total de usuários
+        """
+        return await self._executar(UsuariosService.contar_total)
+    
+    async def buscar_por_nome(self, nome: str) -> List[Usuarios]:
+        """
+        Busca usuários por nome (busca parcial)
+        """
+        return await self._executar(UsuariosService.buscar_por_nome, nome)
+    
+    async def autenticar(self, email: str, senha: str) -> Optional[Usuarios]:
+        """
+        Autentica um usuário
+        """
+        return await self._executar(UsuariosService.autenticar, email, senha)
@@ -1,8 +1,18 @@
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import desc
-from model.sensoresModel import ValoresSensor, Sensor
-from typing import List, Optional
+from sqlalchemy import and_, desc, func, or_, select
+from datetime import datetime
+from model.sensoresModel import ValoresSensor, Sensor, COLUNAS_VALORES, formatar_timestamp
+from service.SensoresService import SensoresService
+from service.DispositivosService import DispositivosService
+from service.AgregadosService import (AgregadosService, avancar_ultimos, cache_ultimos,
+                                      descartar_ultimos, leitura_atrasada)
+from service.resolvedorSensores import ResolvedorSensores
+from stream_module.barramento import barramento
+from config.databaseConfig import apos_commit, apos_proximo_commit
+from cache_module.versoes import incrementar_versoes
+from http_module.lote import ler_horario_evento
+from typing import Dict, List, Optional, Tuple
 
 class ValoresSensorService:
     """
@@ -12,9 +22,10 @@ class ValoresSensorService:
     def __init__(self, db: Session):
         self.db = db
     
-    def criar_valor(self, valor: float, id_sensor: int) -> ValoresSensor:
+    def criar_valor(self, valor: float, id_sensor: int, dispositivo: Optional[str] = None) -> ValoresSensor:
         """
-        Cria um novo valor para um sensor
+        Cria um novo valor para um sensor (dispositivo: identificador de quem
+        enviou, cadastrado se ainda não existir)
         """
         try:
             # Verificar se o sensor existe
@@ -22,42 +33,253 @@ class ValoresSensorService:
             if not sensor:
                 raise Exception(f"Sensor com ID {id_sensor} não encontrado")
             
+            id_dispositivo = None
+            if dispositivo is not None:
+                id_dispositivo = DispositivosService(self.db).garantir([dispositivo])[dispositivo]
+            
+            agora = datetime.utcnow().replace(microsecond=0)
             novo_valor = ValoresSensor(
                 valor=valor,
-                id_sensor=id_sensor
+                id_sensor=id_sensor,
+                id_dispositivo=id_dispositivo,
+                timestamp=agora,
+                recebido_em=agora
             )
             
             self.db.add(novo_valor)
+            AgregadosService(self.db).acumular(
+                [(valor, id_sensor, formatar_timestamp(agora), formatar_timestamp(agora), id_dispositivo)]
+            )
             self.db.commit()
             self.db.refresh(novo_valor)
             
+            dados = novo_valor.to_dict()
+            apos_commit(self.db, lambda: avancar_ultimos([dados]))
+            apos_commit(self.db, lambda: barramento.publicar("leitura", dados, sensor=id_sensor))
+            
             return novo_valor
         except SQLAlchemyError as e:
             self.db.rollback()
             raise Exception(f"Erro ao criar valor do sensor: {str(e)}")
     
-    def listar_valores_por_sensor(self, id_sensor: int, limit: int = 100) -> List[ValoresSensor]:
+    def criar_valores_lote(self, itens: List[dict]) -> List[dict]:
         """
-        Lista os valores de um sensor específico (mais recentes primeiro)
+        Insere várias leituras em uma única transação (executemany).
+        Cada item tem id_sensor ou sensor (nome), valor e, opcionalmente,
+        timestamp (horário da medição, ISO 8601 ou Unix) e dispositivo
+        (identificador). Retorna o status de cada item, na ordem recebida.
+        """
+        resolvedor = SensoresService(self.db).resolvedor()
+        agora = datetime.utcnow().replace(microsecond=0)
+        
+        resultados = []
+        linhas = []
+        posicoes = []
+        for indice, item in enumerate(itens):
+            try:
+                linhas.append(self._validar_item_lote(item, resolvedor, agora))
+                posicoes.append(indice)
+                resultados.append({"indice": indice, "status": "ok"})
+            except ValueError as e:
+                resultados.append({"indice": indice, "status": "erro", "erro": str(e)})
+        
+        if not linhas:
+            return resultados
+        
+        try:
+            ids_dispositivos = DispositivosService(self.db).garantir(
+                {linha["id_dispositivo"] for linha in linhas if linha["id_dispositivo"] is not None}
+            )
+            for linha in linhas:
+                linha["id_dispositivo"] = ids_dispositivos.get(linha["id_dispositivo"])
+            recebido_em = formatar_timestamp(agora)
+            tuplas = [
+                (linha["valor"], linha["id_sensor"], formatar_timestamp(linha["timestamp"]), recebido_em,
+                 linha["id_dispositivo"])
+                for linha in linhas
+            ]
+            primeiro_id = self._executemany_valores(tuplas)
+            AgregadosService(self.db).acumular(tuplas)
+            self.db.commit()
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise Exception(f"Erro ao inserir lote de valores: {str(e)}")
+        
+        eventos = []
+        for posicao, linha, id_valor in zip(posicoes, linhas, range(primeiro_id, primeiro_id + len(linhas))):
+            resultados[posicao]["id_valor"] = id_valor
+            eventos.append({
+                "id_valor": id_valor,
+                "valor": linha["valor"],
+                "id_sensor": linha["id_sensor"],
+                "id_dispositivo": linha["id_dispositivo"],
+                "timestamp": linha["timestamp"].isoformat(),
+                "recebido_em": agora.isoformat()
+            })
+        
+        def publicar_eventos():
+            avancar_ultimos(eventos)
+            for dados, linha in zip(eventos, linhas):
+                # Leituras fora da janela de reordenação (backlog) vão marcadas,
+                # para que gráficos em tempo real não as tratem como atuais
+                barramento.publicar("leitura", {**dados, "atrasada": leitura_atrasada(linha["timestamp"], agora)},
+                                    sensor=dados["id_sensor"])
+        
+        apos_commit(self.db, publicar_eventos)
+        return resultados
+    
+    def inserir_linhas(self, linhas: List[Tuple[float, int, str, str, Optional[str]]]) -> int:
+        """
+        Insere linhas já validadas (valor, id_sensor, timestamp, recebido_em,
+        dispositivo) com um único executemany direto no driver e soma nos
+        agregados, SEM commit: usado pelo processamento em massa, que grava
+        as leituras e o checkpoint na mesma transação. Os horários já vêm
+        como texto (formatar_timestamp) e o dispositivo é o identificador do
+        payload (cadastrado aqui na primeira leitura). O cache de últimos
+        valores e o barramento só são atualizados depois do commit de quem
+        chamou; as versões das séries (ETags) vão na mesma transação.
+        """
+        if not linhas:
+            return 0
+        ids = DispositivosService(self.db).garantir({linha[4] for linha in linhas if linha[4] is not None}).get
+        linhas = [
+            (valor, id_sensor, timestamp, recebido_em, ids(dispositivo))
+            for valor, id_sensor, timestamp, recebido_em, dispositivo in linhas
+        ]
+        try:
+            primeiro_id = self._executemany_valores(linhas)
+            AgregadosService(self.db).acumular(linhas)
+            maximos: Dict[Tuple[int, Optional[int]], str] = {}
+            for _, id_sensor, timestamp, _, id_dispositivo in linhas:
+                if timestamp > maximos.get((id_sensor, id_dispositivo), ""):
+                    maximos[(id_sensor, id_dispositivo)] = timestamp
+            apos_proximo_commit(self.db, lambda: descartar_ultimos(maximos))
+            apos_proximo_commit(self.db, lambda: self._publicar_linhas(linhas, primeiro_id))
+            return len(linhas)
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise Exception(f"Erro ao inserir lote de valores: {str(e)}")
+    
+    def _executemany_valores(self, linhas: List[Tuple[float, int, str, str, Optional[int]]]) -> int:
+        """
+        Insere as linhas (valor, id_sensor, timestamp, recebido_em,
+        id_dispositivo) com um único executemany direto no driver e retorna
+        o ID da primeira, incrementando a versão de cada sensor uma vez
+        (escritas direto no driver não passam pelos eventos do ORM). Com o
+        lock de escrita da transação, os IDs do executemany são
+        consecutivos e terminam no último inserido.
+        """
+        conexao = self.db.connection()
+        conexao.exec_driver_sql(
+            "INSERT INTO valores_sensor (valor, id_sensor, timestamp, recebido_em, id_dispositivo) "
+            "VALUES (?, ?, ?, ?, ?)",
+            linhas
+        )
+        primeiro_id = conexao.exec_driver_sql("SELECT last_insert_rowid()").scalar() - len(linhas) + 1
+        incrementar_versoes(self.db, "valores_sensor", {linha[1] for linha in linhas})
+        return primeiro_id
+    
+    @staticmethod
+    def _publicar_linhas(linhas: List[Tuple[float, int, str, str, Optional[int]]], primeiro_id: int):
+        """
+        Publica no barramento as leituras inseridas por inserir_linhas, no
+        formato de ValoresSensor.to_dict() (só monta os eventos se houver
+        assinantes)
+        """
+        if not barramento.tem_assinantes:
+            return
+        for id_valor, (valor, id_sensor, timestamp, recebido_em, id_dispositivo) in enumerate(linhas, primeiro_id):
+            horario, recebido = datetime.fromisoformat(timestamp), datetime.fromisoformat(recebido_em)
+            barramento.publicar("leitura", {
+                "id_valor": id_valor,
+                "valor": valor,
+                "id_sensor": id_sensor,
+                "id_dispositivo": id_dispositivo,
+                "timestamp": horario.isoformat(),
+                "recebido_em": recebido.isoformat(),
+                "atrasada": leitura_atrasada(horario, recebido)
+            }, sensor=id_sensor)
+    
+    @staticmethod
+    def _validar_item_lote(item: dict, resolvedor: ResolvedorSensores, agora: datetime) -> dict:
+        """
+        Valida um item do lote e o converte em uma linha de valores_sensor
+        (com o identificador do dispositivo, trocado pelo ID na inserção)
+        """
+        dispositivo = item.get("dispositivo")
+        if dispositivo is not None and (not isinstance(dispositivo, str) or not dispositivo):
+            raise ValueError(f"Dispositivo inválido: {dispositivo!r}")
+        
+        if "id_sensor" in item:
+            id_sensor = item["id_sensor"]
+            if not isinstance(id_sensor, int) or id_sensor not in resolvedor.ids:
+                raise ValueError(f"Sensor com ID {id_sensor} não encontrado")
+        elif isinstance(item.get("sensor"), str):
+            id_sensor = resolvedor.id_por_nome(item["sensor"], dispositivo)
+            if id_sensor is None:
+                raise ValueError(f"Sensor '{item['sensor']}' não encontrado")
+        else:
+            raise ValueError("Informe id_sensor ou sensor (nome)")
+        
+        valor = item.get("valor")
+        if isinstance(valor, bool) or not isinstance(valor, (int, float)):
+            raise ValueError(f"Valor inválido: {valor!r}")
+        
+        timestamp = ler_horario_evento(item.get("timestamp"), agora) or agora
+        
+        return {"valor": float(valor), "id_sensor": id_sensor, "timestamp": timestamp, "recebido_em": agora,
+                "id_dispositivo": dispositivo}
+    
+    def listar_valores_por_sensor(self, id_sensor: int, limit: int = 100,
+                                  id_dispositivo: Optional[int] = None) -> List[ValoresSensor]:
+        """
+        Lista os valores de um sensor específico (mais recentes primeiro),
+        opcionalmente só os de um dispositivo
         """
         try:
             return self.db.query(ValoresSensor).filter(
-                ValoresSensor.id_sensor == id_sensor
+                ValoresSensor.id_sensor == id_sensor, *self._do_dispositivo(id_dispositivo)
             ).order_by(desc(ValoresSensor.timestamp)).limit(limit).all()
         except SQLAlchemyError as e:
             raise Exception(f"Erro ao listar valores do sensor: {str(e)}")
     
-    def obter_ultimo_valor(self, id_sensor: int) -> Optional[ValoresSensor]:
+    def listar_valores_por_sensor_linhas(self, id_sensor: int, limit: int = 100,
+                                         id_dispositivo: Optional[int] = None) -> list:
+        """
+        Lista os valores de um sensor como linhas (COLUNAS_VALORES),
+        sem materializar objetos ORM, opcionalmente só os de um dispositivo
+        """
+        try:
+            return self.db.execute(
+                select(*COLUNAS_VALORES).where(
+                    ValoresSensor.id_sensor == id_sensor, *self._do_dispositivo(id_dispositivo)
+                ).order_by(desc(ValoresSensor.timestamp)).limit(limit)
+            ).all()
+        except SQLAlchemyError as e:
+            raise Exception(f"Erro ao listar valores do sensor: {str(e)}")
+    
+    def obter_ultimo_valor(self, id_sensor: int, id_dispositivo: Optional[int] = None) -> Optional[ValoresSensor]:
         """
-        Obtém o último valor registrado de um sensor
+        Obtém o último valor registrado de um sensor (de um dispositivo, se informado)
         """
         try:
             return self.db.query(ValoresSensor).filter(
-                ValoresSensor.id_sensor == id_sensor
+                ValoresSensor.id_sensor == id_sensor, *self._do_dispositivo(id_dispositivo)
             ).order_by(desc(ValoresSensor.timestamp)).first()
         except SQLAlchemyError as e:
             raise Exception(f"Erro ao obter último valor do sensor: {str(e)}")
     
+    def ultimo_valor(self, id_sensor: int, id_dispositivo: Optional[int] = None) -> Optional[dict]:
+        """
+        Último valor de um sensor (de um dispositivo, se informado) como
+        dicionário, pelo cache de últimos valores
+        """
+        def calcular() -> Optional[dict]:
+            ultimo = self.obter_ultimo_valor(id_sensor, id_dispositivo)
+            return ultimo.to_dict() if ultimo else None
+        
+        return cache_ultimos.obter_ou_calcular((id_sensor, id_dispositivo), calcular)
+    
     def obter_valor_por_id(self, id_valor: int) -> Optional[ValoresSensor]:
         """
         Busca um valor por ID
@@ -78,19 +300,24 @@ class ValoresSensorService:
                 return False
             
             self.db.delete(valor)
+            self.db.flush()
+            AgregadosService(self.db).recalcular(valor.id_sensor, valor.timestamp, valor.timestamp)
             self.db.commit()
+            apos_commit(self.db, cache_ultimos.invalidar)
             
             return True
         except SQLAlchemyError as e:
             self.db.rollback()
             raise Exception(f"Erro ao deletar valor: {str(e)}")
     
-    def contar_valores_por_sensor(self, id_sensor: int) -> int:
+    def contar_valores_por_sensor(self, id_sensor: int, id_dispositivo: Optional[int] = None) -> int:
         """
-        Conta total de valores de um sensor
+        Conta total de valores de um sensor (de um dispositivo, se informado)
         """
         try:
-            return self.db.query(ValoresSensor).filter(ValoresSensor.id_sensor == id_sensor).count()
+            return self.db.query(ValoresSensor).filter(
+                ValoresSensor.id_sensor == id_sensor, *self._do_dispositivo(id_dispositivo)
+            ).count()
         except SQLAlchemyError as e:
             raise Exception(f"Erro ao contar valores do sensor: {str(e)}")
     
@@ -103,6 +330,19 @@ class ValoresSensorService:
         except SQLAlchemyError as e:
             raise Exception(f"Erro ao listar valores: {str(e)}")
     
+    def listar_todos_valores_linhas(self, limit: int = 1000, id_dispositivo: Optional[int] = None) -> list:
+        """
+        Lista todos os valores como linhas (COLUNAS_VALORES), sem
+        materializar objetos ORM, opcionalmente só os de um dispositivo
+        """
+        try:
+            return self.db.execute(
+                select(*COLUNAS_VALORES).where(*self._do_dispositivo(id_dispositivo))
+                .order_by(desc(ValoresSensor.timestamp)).limit(limit)
+            ).all()
+        except SQLAlchemyError as e:
+            raise Exception(f"Erro ao listar valores: {str(e)}")
+    
     def deletar_valores_antigos(self, id_sensor: int, manter_ultimos: int = 1000) -> int:
         """
         Deleta valores antigos de um sensor, mantendo apenas os N mais recentes
@@ -119,9 +359,80 @@ class ValoresSensorService:
                 ValoresSensor.id_valor.notin_(valores_manter)
             ).delete(synchronize_session=False)
             
+            AgregadosService(self.db).recalcular(id_sensor)
             self.db.commit()
+            apos_commit(self.db, cache_ultimos.invalidar)
             
             return deletados
         except SQLAlchemyError as e:
             self.db.rollback()
-            raise Exception(f"Erro ao deletar valores antigos: {str(e)}")
\ No newline at end of file
+            raise Exception(f"Erro ao deletar valores antigos: {str(e)}")
+    
+    def limite_valores_mantidos(self, id_sensor: int, manter_ultimos: int) -> Optional[Tuple[datetime, int]]:
+        """
+        Retorna (timestamp, id_valor) do mais antigo dos N valores mais recentes
+        de um sensor, ou None se o sensor tiver N valores ou menos
+        """
+        if manter_ultimos <= 0:
+            # Nada é mantido: todos os valores ficam antes do limite
+            return (datetime.max, 0)
+        try:
+            return self.db.execute(
+                select(ValoresSensor.timestamp, ValoresSensor.id_valor)
+                .where(ValoresSensor.id_sensor == id_sensor)
+                .order_by(desc(ValoresSensor.timestamp), desc(ValoresSensor.id_valor))
+                .offset(manter_ultimos - 1)
+                .limit(1)
+            ).first()
+        except SQLAlchemyError as e:
+            raise Exception(f"Erro ao buscar limite dos valores mantidos: {str(e)}")
+    
+    def contar_anteriores(self, id_sensor: int, limite: Tuple[datetime, int]) -> int:
+        """
+        Conta os valores de um sensor anteriores ao limite (timestamp, id_valor)
+        """
+        try:
+            return self.db.query(ValoresSensor).filter(
+                ValoresSensor.id_sensor == id_sensor, *self._anteriores(limite)
+            ).count()
+        except SQLAlchemyError as e:
+            raise Exception(f"Erro ao contar valores antigos: {str(e)}")
+    
+    def limpar_bloco_antigos(self, id_sensor: int, limite: Tuple[datetime, int], tamanho: int) -> int:
+        """
+        Remove até N valores de um sensor anteriores ao limite (timestamp, id_valor).
+        Usado pela limpeza em segundo plano, em blocos curtos.
+        """
+        try:
+            bloco = select(ValoresSensor.id_valor).where(
+                ValoresSensor.id_sensor == id_sensor, *self._anteriores(limite)
+            ).limit(tamanho)
+            # Horas das leituras do bloco: só elas têm os agregados refeitos
+            inicio, fim = self.db.execute(
+                select(func.min(ValoresSensor.timestamp), func.max(ValoresSensor.timestamp))
+                .where(ValoresSensor.id_valor.in_(bloco))
+            ).one()
+            removidos = self.db.query(ValoresSensor).filter(
+                ValoresSensor.id_valor.in_(bloco)
+            ).delete(synchronize_session=False)
+            if removidos:
+                AgregadosService(self.db).recalcular(id_sensor, inicio, fim)
+            self.db.commit()
+            apos_commit(self.db, cache_ultimos.invalidar)
+            return removidos
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise Exception(f"Erro ao limpar bloco de valores antigos: {str(e)}")
+    
+    @staticmethod
+    def _do_dispositivo(id_dispositivo: Optional[int]) -> tuple:
+        # Com o dispositivo, as consultas usam o índice (dispositivo, sensor, timestamp)
+        return () if id_dispositivo is None else (ValoresSensor.id_dispositivo == id_dispositivo,)
+    
+    @staticmethod
+    def _anteriores(limite: Tuple[datetime, int]) -> tuple:
+        timestamp, id_valor = limite
+        return (or_(
+            ValoresSensor.timestamp < timestamp,
+            and_(ValoresSensor.timestamp == timestamp, ValoresSensor.id_valor < id_valor)
+        ),)
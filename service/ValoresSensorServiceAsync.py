@@ -0,0 +1,87 @@
+from model.sensoresModel import ValoresSensor
+from service.ValoresSensorService import ValoresSensorService
+from service.ServicoAsync import ServicoAsync
+from typing import List, Optional
+
+class ValoresSensorServiceAsync(ServicoAsync):
+    """
+    Versão assíncrona do service de Valores dos Sensores
+    """
+    
+    servico_sync = ValoresSensorService
+    
+    async def criar_valor(self, valor: float, id_sensor: int, dispositivo: Optional[str] = None) -> ValoresSensor:
+        """
+        Cria um novo valor para um sensor
+        """
+        return await self._escrever(ValoresSensorService.criar_valor, valor=valor, id_sensor=id_sensor,
+                                    dispositivo=dispositivo)
+    
+    async def criar_valores_lote(self, itens: List[dict]) -> List[dict]:
+        """
+        Insere várias leituras em uma única transação, com status por item
+        """
+        return await self._escrever(ValoresSensorService.criar_valores_lote, itens)
+    
+    async def listar_valores_por_sensor(self, id_sensor: int, limit: int = 100,
+                                        id_dispositivo: Optional[int] = None) -> List[ValoresSensor]:
+        """
+        Lista os valores de um sensor específico (mais recentes primeiro)
+        """
+        return await self._executar(ValoresSensorService.listar_valores_por_sensor, id_sensor, limit, id_dispositivo)
+    
+    async def listar_valores_por_sensor_linhas(self, id_sensor: int, limit: int = 100,
+                                               id_dispositivo: Optional[int] = None) -> list:
+        """
+        Lista os valores de um sensor como linhas, sem materializar objetos ORM
+        """
+        return await self._executar(ValoresSensorService.listar_valores_por_sensor_linhas, id_sensor, limit,
+                                    id_dispositivo)
+    
+    async def obter_ultimo_valor(self, id_sensor: int, id_dispositivo: Optional[int] = None) -> Optional[ValoresSensor]:
+        """
+        Obtém o último valor registrado de um sensor
+        """
+        return await self._executar(ValoresSensorService.obter_ultimo_valor, id_sensor, id_dispositivo)
+    
+    async def ultimo_valor(self, id_sensor: int, id_dispositivo: Optional[int] = None) -> Optional[dict]:
+        """
+        Último valor de um sensor como dicionário, pelo cache de últimos valores
+        """
+        return await self._executar(ValoresSensorService.ultimo_valor, id_sensor, id_dispositivo)
+    
+    async def obter_valor_por_id(self, id_valor: int) -> Optional[ValoresSensor]:
+        """
+        Busca um valor por ID
+        """
+        return await self._executar(ValoresSensorService.obter_valor_por_id, id_valor)
+    
+    async def deletar_valor(self, id_valor: int) -> bool:
+        """
+        Deleta um valor
+        """
+        return await self._escrever(ValoresSensorService.deletar_valor, id_valor)
+    
+    async def contar_valores_por_sensor(self, id_sensor: int, id_dispositivo: Optional[int] = None) -> int:
+        """
+        Conta total de valores de um sensor
+        """
+        return await self._executar(ValoresSensorService.contar_valores_por_sensor, id_sensor, id_dispositivo)
+    
+    async def listar_todos_valores(self, limit: int = 1000) -> List[ValoresSensor]:
+        """
+        Lista todos os valores (mais recentes primeiro)
+        """
+        return await self._executar(ValoresSensorService.listar_todos_valores, limit)
+    
+    async def listar_todos_valores_linhas(self, limit: int = 1000, id_dispositivo: Optional[int] = None) -> list:
+        """
+        Lista todos os valores como linhas, sem materializar objetos ORM
+        """
+        return await self._executar(ValoresSensorService.listar_todos_valores_linhas, limit, id_dispositivo)
+    
+    async def deletar_valores_antigos(self, id_sensor: int, manter_ultimos: int = 1000) -> int:
+        """
+        Deleta valores antigos de um sensor, mantendo apenas os N mais recentes
+        """
+        return await self._escrever(ValoresSensorService.deletar_valores_antigos, id_sensor, manter_ultimos)
@@ -0,0 +1,71 @@
+from typing import Dict, FrozenSet, Iterable, NamedTuple, Optional, Tuple
+from model.sensoresModel import normalizar_nome
+
+
+class SensorResolvido(NamedTuple):
+    """
+    Dados de um sensor necessários para gravar leituras
+    """
+    id: int
+    unidade: str
+    tipo: str
+
+
+class ResolvedorSensores:
+    """
+    Mapa nome (sem diferenciar maiúsculas) -> sensor, montado com uma única
+    consulta e compartilhado pelo cache_sensores: resolver um nome é uma
+    busca em dicionário, sem acessar o banco. O SensoresService invalida o
+    cache em criar/atualizar/deletar, e o índice único em
+    (dispositivo, nome normalizado) garante que cada nome aponte para um único
+    sensor por dispositivo.
+
+    Sensores sem dispositivo valem para todos; um sensor de um dispositivo
+    (ex.: calibração ou unidade diferente) tem prioridade nas leituras dele.
+    """
+
+    def __init__(self, linhas: Iterable[Tuple[int, str, str, str, Optional[int], Optional[str]]]):
+        self._por_nome: Dict[str, SensorResolvido] = {}
+        self._por_dispositivo: Dict[Tuple[int, str], SensorResolvido] = {}
+        # identificador -> id, só dos dispositivos que têm sensores próprios
+        self._dispositivos: Dict[str, int] = {}
+        ids = []
+        for id_sensor, nome, unidade, tipo, id_dispositivo, identificador in linhas:
+            sensor = SensorResolvido(id_sensor, unidade, tipo)
+            if id_dispositivo is None:
+                self._por_nome[normalizar_nome(nome)] = sensor
+            else:
+                self._por_dispositivo[(id_dispositivo, normalizar_nome(nome))] = sensor
+                self._dispositivos[identificador] = id_dispositivo
+            ids.append(id_sensor)
+        self.ids: FrozenSet[int] = frozenset(ids)
+
+    def resolver(self, nome: str, dispositivo: Optional[str] = None) -> Optional[SensorResolvido]:
+        """
+        Retorna o sensor com o nome informado (ou None se não existir):
+        o do dispositivo (identificador), se houver, ou o sensor geral
+        """
+        if dispositivo is not None and dispositivo in self._dispositivos:
+            sensor = self._por_dispositivo.get((self._dispositivos[dispositivo], normalizar_nome(nome)))
+            if sensor is not None:
+                return sensor
+        return self._por_nome.get(normalizar_nome(nome))
+
+    def id_por_nome(self, nome: str, dispositivo: Optional[str] = None) -> Optional[int]:
+        sensor = self.resolver(nome, dispositivo)
+        return sensor.id if sensor is not None else None
+
+    def exato(self, nome: str, id_dispositivo: Optional[int] = None) -> Optional[SensorResolvido]:
+        """
+        Sensor com o nome no dispositivo informado (None = sensor geral),
+        sem cair no sensor geral: usado para conferir nomes duplicados
+        """
+        if id_dispositivo is None:
+            return self._por_nome.get(normalizar_nome(nome))
+        return self._por_dispositivo.get((id_dispositivo, normalizar_nome(nome)))
+
+    def __contains__(self, nome: str) -> bool:
+        return normalizar_nome(nome) in self._por_nome
+
+    def __len__(self) -> int:
+        return len(self.ids)
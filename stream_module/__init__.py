@@ -0,0 +1 @@
+# Módulo Stream - Barramento pub/sub e envio de leituras em tempo real (WebSocket/SSE)
\ No newline at end of file
@@ -0,0 +1,142 @@
+import asyncio
+import itertools
+import logging
+import threading
+from typing import Any, Optional, Set
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# Tamanho padrão da fila de cada cliente (eventos mais antigos são descartados)
+TAMANHO_FILA_PADRAO = 100
+
+
+class Evento:
+    """
+    Evento publicado no barramento. O JSON é gerado uma única vez,
+    na publicação, e compartilhado por todos os assinantes.
+    """
+    __slots__ = ("id", "tipo", "sensor", "topico", "json")
+
+    def __init__(self, id_evento: int, tipo: str, dados: dict,
+                 sensor: Optional[int] = None, topico: Optional[str] = None):
+        self.id = id_evento
+        self.tipo = tipo
+        self.sensor = sensor
+        self.topico = topico
+        self.json = orjson.dumps({"id": id_evento, "tipo": tipo, "dados": dados}).decode("utf-8")
+
+
+class Assinatura:
+    """
+    Assinatura de um cliente, com filtros por sensor/tópico e fila limitada.
+    Quando a fila enche, o evento mais antigo é descartado.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, sensores: Set[int], topicos: Set[str],
+                 tamanho_fila: int = TAMANHO_FILA_PADRAO):
+        self.loop = loop
+        self.sensores = sensores
+        self.topicos = topicos
+        self.fila: asyncio.Queue = asyncio.Queue(maxsize=tamanho_fila)
+        self.descartados = 0
+
+    def aceita(self, evento: Evento) -> bool:
+        """
+        Sem filtros aceita tudo; com filtros, basta coincidir sensor ou tópico
+        """
+        if not self.sensores and not self.topicos:
+            return True
+        return (evento.sensor is not None and evento.sensor in self.sensores) or \
+               (evento.topico is not None and evento.topico in self.topicos)
+
+    def _entregar(self, evento: Evento):
+        # Executado sempre no loop do cliente
+        if self.fila.full():
+            self.fila.get_nowait()
+            self.descartados += 1
+        self.fila.put_nowait(evento)
+
+    async def proximo(self, timeout: Optional[float] = None) -> Optional[Evento]:
+        """
+        Aguarda o próximo evento (None se o timeout expirar)
+        """
+        try:
+            return await asyncio.wait_for(self.fila.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class Barramento:
+    """
+    Barramento pub/sub em processo. Pode receber publicações de qualquer
+    thread (ex.: thread do MQTT) e entrega aos assinantes no loop asyncio.
+    """
+
+    def __init__(self):
+        self._assinaturas: Set[Assinatura] = set()
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self.publicados = 0
+
+    @property
+    def tem_assinantes(self) -> bool:
+        """
+        Há algum assinante (quem publica em massa pode pular a montagem dos eventos)
+        """
+        return bool(self._assinaturas)
+
+    def assinar(self, sensores: Optional[Set[int]] = None, topicos: Optional[Set[str]] = None,
+                tamanho_fila: int = TAMANHO_FILA_PADRAO) -> Assinatura:
+        """
+        Cria uma assinatura no loop atual (deve ser chamado dentro do loop)
+        """
+        assinatura = Assinatura(asyncio.get_running_loop(), sensores or set(), topicos or set(), tamanho_fila)
+        with self._lock:
+            self._assinaturas.add(assinatura)
+        return assinatura
+
+    def cancelar(self, assinatura: Assinatura):
+        """
+        Remove uma assinatura
+        """
+        with self._lock:
+            self._assinaturas.discard(assinatura)
+        if assinatura.descartados:
+            logger.info(f"📉 Cliente lento: {assinatura.descartados} eventos descartados")
+
+    def publicar(self, tipo: str, dados: Any, sensor: Optional[int] = None, topico: Optional[str] = None):
+        """
+        Publica um evento para todos os assinantes interessados
+        """
+        # Sem assinantes não há custo de serialização
+        if not self._assinaturas:
+            return
+
+        evento = Evento(next(self._ids), tipo, dados, sensor, topico)
+        with self._lock:
+            destinos = [a for a in self._assinaturas if a.aceita(evento)]
+        self.publicados += 1
+
+        for assinatura in destinos:
+            try:
+                assinatura.loop.call_soon_threadsafe(assinatura._entregar, evento)
+            except RuntimeError:
+                # Loop já encerrado: o cliente desconectou
+                self.cancelar(assinatura)
+
+    def estatisticas(self) -> dict:
+        """
+        Retorna informações sobre assinantes e eventos
+        """
+        with self._lock:
+            assinaturas = list(self._assinaturas)
+        return {
+            "assinantes": len(assinaturas),
+            "eventos_publicados": self.publicados,
+            "eventos_descartados": sum(a.descartados for a in assinaturas)
+        }
+
+
+# Instância global compartilhada pela aplicação
+barramento = Barramento()
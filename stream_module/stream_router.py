@@ -0,0 +1,92 @@
+import asyncio
+from typing import Optional, Set, Tuple
+from fastapi import APIRouter, HTTPException, Query, Request, WebSocket, status
+from fastapi.responses import StreamingResponse
+from stream_module.barramento import barramento
+
+# Intervalo (segundos) para enviar keep-alive quando não há eventos
+INTERVALO_KEEPALIVE = 15.0
+
+# Criar router para leituras em tempo real
+router = APIRouter(tags=["tempo-real"])
+
+
+def _filtros(sensores: Optional[str], topicos: Optional[str]) -> Tuple[Set[int], Set[str]]:
+    """
+    Converte os filtros "1,2,3" e "topico/a,topico/b" em conjuntos
+    (ValueError se algum ID de sensor não for numérico)
+    """
+    try:
+        ids = {int(s) for s in sensores.split(",") if s.strip()} if sensores else set()
+    except ValueError:
+        raise ValueError(f"sensores deve ser uma lista de IDs separados por vírgula: {sensores}")
+    nomes = {t.strip() for t in topicos.split(",") if t.strip()} if topicos else set()
+    return ids, nomes
+
+
+@router.websocket("/ws/leituras")
+async def leituras_websocket(
+    websocket: WebSocket,
+    sensores: Optional[str] = None,
+    topicos: Optional[str] = None
+):
+    """Envia novas leituras e mensagens MQTT via WebSocket"""
+    try:
+        filtros = _filtros(sensores, topicos)
+    except ValueError as e:
+        # Recusa o handshake com 1008 (violação de política)
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=str(e))
+        return
+
+    # Assina antes do accept para não perder eventos logo após a conexão
+    assinatura = barramento.assinar(*filtros)
+    await websocket.accept()
+
+    async def enviar_eventos():
+        while True:
+            evento = await assinatura.proximo(timeout=INTERVALO_KEEPALIVE)
+            await websocket.send_text(evento.json if evento else '{"tipo":"ping"}')
+
+    async def aguardar_desconexao():
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    tarefas = [asyncio.create_task(enviar_eventos()), asyncio.create_task(aguardar_desconexao())]
+    try:
+        await asyncio.wait(tarefas, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for tarefa in tarefas:
+            tarefa.cancel()
+        barramento.cancelar(assinatura)
+
+
+@router.get("/sse/leituras")
+async def leituras_sse(
+    request: Request,
+    sensores: Optional[str] = Query(None, description="IDs de sensores separados por vírgula"),
+    topicos: Optional[str] = Query(None, description="Tópicos MQTT separados por vírgula")
+):
+    """Envia novas leituras e mensagens MQTT via Server-Sent Events"""
+    try:
+        filtros = _filtros(sensores, topicos)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    assinatura = barramento.assinar(*filtros)
+
+    async def gerar_eventos():
+        try:
+            yield "retry: 3000\n\n"
+            while not await request.is_disconnected():
+                evento = await assinatura.proximo(timeout=INTERVALO_KEEPALIVE)
+                if evento is None:
+                    yield ": keep-alive\n\n"
+                else:
+                    yield f"id: {evento.id}\nevent: {evento.tipo}\ndata: {evento.json}\n\n"
+        finally:
+            barramento.cancelar(assinatura)
+
+    return StreamingResponse(
+        gerar_eventos(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
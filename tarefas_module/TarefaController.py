@@ -0,0 +1,41 @@
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from tarefas_module.executorTarefas import executor_tarefas
+from tarefas_module.tarefaModel import Tarefa
+
+class TarefaController:
+    """
+    Controller das tarefas em segundo plano (usado também pelas rotas de limpeza)
+    """
+    
+    @staticmethod
+    def para_dict(tarefa: Tarefa) -> dict:
+        """
+        Converte a tarefa em dicionário, com o progresso em memória
+        quando ela estiver em execução (mais recente que o do banco)
+        """
+        dados = tarefa.to_dict()
+        progresso = executor_tarefas.progresso(tarefa.id)
+        if progresso is not None:
+            dados["processados"], dados["total"] = progresso
+            dados["progresso"] = round(dados["processados"] / dados["total"], 4) if dados["total"] else None
+        return dados
+    
+    @staticmethod
+    async def enviar(tipo: str, parametros: dict) -> JSONResponse:
+        """
+        Envia uma tarefa ao executor e responde 202 com o endereço para acompanhá-la
+        """
+        try:
+            tarefa = await executor_tarefas.enviar(tipo, parametros)
+        except (ValueError, KeyError, TypeError) as e:
+            raise HTTPException(status_code=400, detail=f"Parâmetros inválidos: {e}")
+        return JSONResponse(
+            status_code=202,
+            content={
+                "message": "Tarefa enviada para execução em segundo plano",
+                "tarefa": TarefaController.para_dict(tarefa),
+                "acompanhar": f"/tarefas/{tarefa.id}"
+            },
+            headers={"Location": f"/tarefas/{tarefa.id}"}
+        )
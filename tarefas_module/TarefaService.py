@@ -0,0 +1,151 @@
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+from datetime import datetime
+from typing import List, Optional
+from tarefas_module.tarefaModel import Tarefa, PENDENTE, EXECUTANDO, CANCELADA, ESTADOS_FINAIS
+import orjson
+
+class TarefaService:
+    """
+    Service para operações da tabela de tarefas em segundo plano
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def criar(self, tipo: str, parametros: dict) -> Tarefa:
+        """
+        Registra uma nova tarefa pendente
+        """
+        try:
+            tarefa = Tarefa(tipo=tipo, parametros=parametros)
+            self.db.add(tarefa)
+            self.db.commit()
+            self.db.refresh(tarefa)
+            return tarefa
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise Exception(f"Erro ao criar tarefa: {str(e)}")
+
+    def buscar_por_id(self, tarefa_id: int) -> Optional[Tarefa]:
+        """
+        Busca uma tarefa por ID
+        """
+        try:
+            return self.db.query(Tarefa).filter(Tarefa.id == tarefa_id).first()
+        except SQLAlchemyError as e:
+            raise Exception(f"Erro ao buscar tarefa: {str(e)}")
+
+    def listar(self, status: Optional[str] = None, limite: int = 100) -> List[Tarefa]:
+        """
+        Lista as tarefas mais recentes, opcionalmente filtradas por status
+        """
+        try:
+            consulta = self.db.query(Tarefa)
+            if status:
+                consulta = consulta.filter(Tarefa.status == status)
+            return consulta.order_by(Tarefa.id.desc()).limit(limite).all()
+        except SQLAlchemyError as e:
+            raise Exception(f"Erro ao listar tarefas: {str(e)}")
+
+    def listar_pendentes(self) -> List[int]:
+        """
+        Devolve para a fila as tarefas interrompidas (ex.: a API foi encerrada
+        durante a execução) e retorna os IDs de todas as pendentes, em ordem
+        """
+        try:
+            self.db.query(Tarefa).filter(Tarefa.status == EXECUTANDO).update(
+                {"status": PENDENTE}, synchronize_session=False
+            )
+            self.db.commit()
+            pendentes = self.db.query(Tarefa.id).filter(Tarefa.status == PENDENTE).order_by(Tarefa.id).all()
+            return [tarefa_id for (tarefa_id,) in pendentes]
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise Exception(f"Erro ao listar tarefas pendentes: {str(e)}")
+
+    def iniciar(self, tarefa_id: int) -> Optional[Tarefa]:
+        """
+        Marca uma tarefa pendente como em execução. Retorna None se ela não
+        estiver mais pendente; se o cancelamento já foi pedido, ela é cancelada.
+        """
+        try:
+            tarefa = self.buscar_por_id(tarefa_id)
+            if tarefa is None or tarefa.status != PENDENTE:
+                return None
+            if tarefa.cancelamento_solicitado:
+                tarefa.status = CANCELADA
+                tarefa.finalizado_em = datetime.utcnow()
+                self.db.commit()
+                return None
+            tarefa.status = EXECUTANDO
+            tarefa.iniciado_em = tarefa.iniciado_em or datetime.utcnow()
+            self.db.commit()
+            return tarefa
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise Exception(f"Erro ao iniciar tarefa: {str(e)}")
+
+    def atualizar_progresso(self, tarefa_id: int, processados: int, total: Optional[int]):
+        """
+        Grava o progresso de uma tarefa em execução
+        """
+        try:
+            self.db.query(Tarefa).filter(Tarefa.id == tarefa_id).update(
+                {"processados": processados, "total": total}, synchronize_session=False
+            )
+            self.db.commit()
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise Exception(f"Erro ao atualizar progresso da tarefa: {str(e)}")
+
+    def finalizar(self, tarefa_id: int, status: str, processados: int, total: Optional[int],
+                  resultado: Optional[dict] = None, erro: Optional[str] = None):
+        """
+        Grava o estado final de uma tarefa (concluída, falhou ou cancelada)
+        """
+        try:
+            self.db.query(Tarefa).filter(Tarefa.id == tarefa_id).update({
+                "status": status,
+                "processados": processados,
+                "total": total,
+                "resultado": orjson.dumps(resultado).decode("utf-8") if resultado is not None else None,
+                "erro": erro,
+                "finalizado_em": datetime.utcnow()
+            }, synchronize_session=False)
+            self.db.commit()
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise Exception(f"Erro ao finalizar tarefa: {str(e)}")
+
+    def interromper(self, tarefa_id: int, processados: int, total: Optional[int]):
+        """
+        Devolve para a fila uma tarefa interrompida pelo encerramento da API
+        """
+        try:
+            self.db.query(Tarefa).filter(Tarefa.id == tarefa_id).update(
+                {"status": PENDENTE, "processados": processados, "total": total}, synchronize_session=False
+            )
+            self.db.commit()
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise Exception(f"Erro ao interromper tarefa: {str(e)}")
+
+    def solicitar_cancelamento(self, tarefa_id: int) -> Optional[Tarefa]:
+        """
+        Pede o cancelamento de uma tarefa. Pendentes são canceladas na hora;
+        em execução, param no fim do bloco atual. Retorna None se não existir.
+        """
+        try:
+            tarefa = self.buscar_por_id(tarefa_id)
+            if tarefa is None or tarefa.status in ESTADOS_FINAIS:
+                return tarefa
+            tarefa.cancelamento_solicitado = True
+            if tarefa.status == PENDENTE:
+                tarefa.status = CANCELADA
+                tarefa.finalizado_em = datetime.utcnow()
+            self.db.commit()
+            return tarefa
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise Exception(f"Erro ao cancelar tarefa: {str(e)}")
@@ -0,0 +1,35 @@
+from tarefas_module.tarefaModel import Tarefa
+from tarefas_module.TarefaService import TarefaService
+from service.ServicoAsync import ServicoAsync
+from typing import List, Optional
+
+class TarefaServiceAsync(ServicoAsync):
+    """
+    Versão assíncrona do service de tarefas em segundo plano
+    """
+    
+    servico_sync = TarefaService
+    
+    async def criar(self, tipo: str, parametros: dict) -> Tarefa:
+        """
+        Registra uma nova tarefa pendente
+        """
+        return await self._escrever(TarefaService.criar, tipo, parametros)
+    
+    async def buscar_por_id(self, tarefa_id: int) -> Optional[Tarefa]:
+        """
+        Busca uma tarefa por ID
+        """
+        return await self._executar(TarefaService.buscar_por_id, tarefa_id)
+    
+    async def listar(self, status: Optional[str] = None, limite: int = 100) -> List[Tarefa]:
+        """
+        Lista as tarefas mais recentes, opcionalmente filtradas por status
+        """
+        return await self._executar(TarefaService.listar, status, limite)
+    
+    async def solicitar_cancelamento(self, tarefa_id: int) -> Optional[Tarefa]:
+        """
+        Pede o cancelamento de uma tarefa
+        """
+        return await self._escrever(TarefaService.solicitar_cancelamento, tarefa_id)
@@ -0,0 +1 @@
+# Módulo Tarefas - Execução de operações longas (limpezas, reprocessamentos) em segundo plano
\ No newline at end of file
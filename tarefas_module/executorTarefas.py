@@ -0,0 +1,282 @@
+import importlib
+import logging
+import os
+import queue
+import threading
+import time
+import orjson
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from config.escritorBanco import escritor
+from tarefas_module.tarefaModel import Tarefa, CONCLUIDA, FALHOU, CANCELADA
+from tarefas_module.TarefaService import TarefaService
+
+logger = logging.getLogger(__name__)
+
+# Quantidade de threads executando tarefas ao mesmo tempo
+NUM_TRABALHADORES = int(os.getenv("TAREFAS_TRABALHADORES", "2"))
+
+# Pausa (s) entre blocos: deixa as escritas e leituras interativas passarem
+PAUSA_ENTRE_BLOCOS = float(os.getenv("TAREFAS_PAUSA", "0.05"))
+
+# Intervalo mínimo (s) entre gravações do progresso no banco
+INTERVALO_PROGRESSO = 1.0
+
+
+class TarefaCancelada(Exception):
+    """Cancelamento pedido pelo usuário (a tarefa termina como cancelada)"""
+
+
+class TarefaInterrompida(Exception):
+    """Encerramento da API (a tarefa volta a pendente e continua na próxima inicialização)"""
+
+
+# Tipos de tarefa registrados: nome -> (função, validação dos parâmetros)
+TIPOS_TAREFA: Dict[str, Tuple[Callable[["ContextoTarefa"], Any], Optional[Callable[[dict], dict]]]] = {}
+
+def tipo_tarefa(nome: str, validar: Optional[Callable[[dict], dict]] = None):
+    """
+    Decorador que registra uma função como tipo de tarefa. A função recebe
+    um ContextoTarefa e retorna o resultado (dict); a validação recebe os
+    parâmetros enviados e retorna os normalizados (ou levanta ValueError).
+    """
+    def registrar(funcao: Callable[["ContextoTarefa"], Any]):
+        TIPOS_TAREFA[nome] = (funcao, validar)
+        return funcao
+    return registrar
+
+
+# Módulo de cada tipo de tarefa: importado (e o tipo registrado pelo
+# decorador) só quando uma tarefa do tipo é enviada ou executada, para não
+# carregar os services do reprocessamento na inicialização da API
+MODULOS_TIPOS = {
+    "limpeza_dados": "tarefas_module.manutencao",
+    "limpeza_valores": "tarefas_module.manutencao",
+    "reprocessar_rejeitados": "processamento_module.reprocessamento",
+}
+
+def _carregar_tipo(nome: str):
+    """
+    Retorna (função, validação) de um tipo de tarefa, importando o módulo
+    dele na primeira vez (ValueError se o tipo não existir)
+    """
+    if nome not in TIPOS_TAREFA and nome in MODULOS_TIPOS:
+        importlib.import_module(MODULOS_TIPOS[nome])
+    if nome not in TIPOS_TAREFA:
+        raise ValueError(f"Tipo de tarefa desconhecido: {nome}")
+    return TIPOS_TAREFA[nome]
+
+
+class ContextoTarefa:
+    """
+    Estado de uma tarefa em execução: parâmetros, progresso e cancelamento
+    """
+
+    def __init__(self, tarefa: Tarefa, parar: threading.Event):
+        self.id = tarefa.id
+        self.parametros: dict = orjson.loads(tarefa.parametros)
+        # Tarefas retomadas continuam a contagem gravada
+        self.processados = tarefa.processados or 0
+        self.total: Optional[int] = tarefa.total
+        self.cancelamento = threading.Event()
+        self._parar = parar
+        self._ultima_gravacao = time.monotonic()
+
+    def definir_total(self, total: Optional[int]):
+        self.total = total
+        self._gravar_progresso()
+
+    def avancar(self, quantidade: int):
+        """
+        Soma itens processados; o progresso vai para o banco no máximo
+        uma vez por INTERVALO_PROGRESSO
+        """
+        self.processados += quantidade
+        if time.monotonic() - self._ultima_gravacao >= INTERVALO_PROGRESSO:
+            self._gravar_progresso()
+
+    def verificar(self):
+        """
+        Levanta TarefaCancelada/TarefaInterrompida se a tarefa deve parar
+        """
+        if self.cancelamento.is_set():
+            raise TarefaCancelada()
+        if self._parar.is_set():
+            raise TarefaInterrompida()
+
+    def repetir_em_blocos(self, funcao: Callable[[Session], int], tamanho_bloco: int,
+                          pausa: float = PAUSA_ENTRE_BLOCOS) -> int:
+        """
+        Executa funcao(db) pelo escritor único até ela processar menos que
+        tamanho_bloco itens. Cada bloco é uma transação curta, com uma pausa
+        entre blocos; cancelamento e encerramento são verificados a cada bloco.
+        Retorna o total processado.
+        """
+        total = 0
+        while True:
+            self.verificar()
+            quantidade = escritor.executar_sync(funcao)
+            total += quantidade
+            self.avancar(quantidade)
+            if quantidade < tamanho_bloco:
+                return total
+            self._parar.wait(pausa)
+
+    def _gravar_progresso(self):
+        self._ultima_gravacao = time.monotonic()
+        processados, total = self.processados, self.total
+        escritor.enviar(lambda db: TarefaService(db).atualizar_progresso(self.id, processados, total))
+
+
+class ExecutorTarefas:
+    """
+    Pool de threads que executa as tarefas em segundo plano. As tarefas
+    ficam na tabela tarefas: as pendentes (inclusive as interrompidas por
+    um encerramento) voltam para a fila quando a API inicia.
+    """
+
+    def __init__(self, num_trabalhadores: int = NUM_TRABALHADORES):
+        self.num_trabalhadores = num_trabalhadores
+        self._fila: "queue.Queue[Optional[int]]" = queue.Queue()
+        self._threads: List[threading.Thread] = []
+        self._parar = threading.Event()
+        self._em_execucao: Dict[int, ContextoTarefa] = {}
+        self._lock = threading.Lock()
+
+    # ==============================================================
+    # ENVIO E CONSULTA
+    # ==============================================================
+
+    async def enviar(self, tipo: str, parametros: dict) -> Tarefa:
+        """
+        Valida os parâmetros, registra a tarefa e a coloca na fila
+        """
+        _, validar = _carregar_tipo(tipo)
+        if validar is not None:
+            parametros = validar(parametros)
+        tarefa = await escritor.executar(lambda db: TarefaService(db).criar(tipo, parametros))
+        self._fila.put(tarefa.id)
+        return tarefa
+
+    def cancelar(self, tarefa_id: int):
+        """
+        Sinaliza o cancelamento de uma tarefa em execução
+        (o status no banco é atualizado pelo TarefaService)
+        """
+        with self._lock:
+            contexto = self._em_execucao.get(tarefa_id)
+        if contexto is not None:
+            contexto.cancelamento.set()
+
+    def progresso(self, tarefa_id: int) -> Optional[Tuple[int, Optional[int]]]:
+        """
+        Progresso atual (processados, total) de uma tarefa em execução,
+        mais recente que o gravado no banco
+        """
+        with self._lock:
+            contexto = self._em_execucao.get(tarefa_id)
+        return (contexto.processados, contexto.total) if contexto is not None else None
+
+    def estatisticas(self) -> dict:
+        with self._lock:
+            em_execucao = list(self._em_execucao)
+        return {
+            "trabalhadores": len([t for t in self._threads if t.is_alive()]),
+            "fila": self._fila.qsize(),
+            "em_execucao": em_execucao,
+            "tipos": sorted(MODULOS_TIPOS)
+        }
+
+    # ==============================================================
+    # CICLO DE VIDA
+    # ==============================================================
+
+    def iniciar(self):
+        """
+        Retoma as tarefas pendentes e inicia as threads de execução
+        """
+        with self._lock:
+            if self._threads:
+                return
+            self._parar.clear()
+            for numero in range(self.num_trabalhadores):
+                thread = threading.Thread(target=self._trabalhar, name=f"tarefas-{numero + 1}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+        pendentes = escritor.executar_sync(lambda db: TarefaService(db).listar_pendentes())
+        for tarefa_id in pendentes:
+            self._fila.put(tarefa_id)
+        if pendentes:
+            logger.info(f"🔁 {len(pendentes)} tarefas pendentes retomadas")
+
+    def parar(self, timeout: float = 10.0):
+        """
+        Interrompe as tarefas em execução (no fim do bloco atual) e encerra as threads
+        """
+        with self._lock:
+            threads, self._threads = self._threads, []
+        if not threads:
+            return
+        self._parar.set()
+        for _ in threads:
+            self._fila.put(None)
+        for thread in threads:
+            thread.join(timeout)
+
+    # ==============================================================
+    # THREADS DE EXECUÇÃO
+    # ==============================================================
+
+    def _trabalhar(self):
+        while True:
+            tarefa_id = self._fila.get()
+            if tarefa_id is None or self._parar.is_set():
+                return
+            try:
+                self._executar(tarefa_id)
+            except Exception as e:
+                logger.error(f"❌ Erro no executor de tarefas (tarefa {tarefa_id}): {e}")
+
+    def _executar(self, tarefa_id: int):
+        tarefa = escritor.executar_sync(lambda db: TarefaService(db).iniciar(tarefa_id))
+        if tarefa is None:
+            # Cancelada antes de começar ou já executada
+            return
+
+        contexto = ContextoTarefa(tarefa, self._parar)
+        with self._lock:
+            self._em_execucao[tarefa_id] = contexto
+
+        if tarefa.cancelamento_solicitado:
+            contexto.cancelamento.set()
+
+        status, resultado, erro = CONCLUIDA, None, None
+        inicio = time.perf_counter()
+        try:
+            funcao, _ = _carregar_tipo(tarefa.tipo)
+            logger.info(f"▶️ Tarefa {tarefa_id} ({tarefa.tipo}) iniciada")
+            resultado = funcao(contexto)
+        except TarefaInterrompida:
+            logger.info(f"⏸️ Tarefa {tarefa_id} interrompida; continua na próxima inicialização")
+            escritor.executar_sync(
+                lambda db: TarefaService(db).interromper(tarefa_id, contexto.processados, contexto.total)
+            )
+            return
+        except TarefaCancelada:
+            status = CANCELADA
+        except Exception as e:
+            logger.error(f"❌ Tarefa {tarefa_id} ({tarefa.tipo}) falhou: {e}")
+            status, erro = FALHOU, str(e)
+        finally:
+            with self._lock:
+                self._em_execucao.pop(tarefa_id, None)
+
+        escritor.executar_sync(lambda db: TarefaService(db).finalizar(
+            tarefa_id, status, contexto.processados, contexto.total, resultado, erro
+        ))
+        logger.info(f"✅ Tarefa {tarefa_id} ({tarefa.tipo}): {status} em {time.perf_counter() - inicio:.1f}s")
+
+
+# Instância global compartilhada pela aplicação
+executor_tarefas = ExecutorTarefas()
@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta
+from config.databaseConfig import sessao_banco
+from all_module.AllService import AllService
+from service.ValoresSensorService import ValoresSensorService
+from tarefas_module.executorTarefas import ContextoTarefa, tipo_tarefa
+
+# Linhas removidas por transação nas limpezas
+TAMANHO_BLOCO_LIMPEZA = 500
+
+
+# ==============================================================
+# LIMPEZA DA TABELA ALL (DELETE /data/cleanup/{dias})
+# ==============================================================
+
+def _validar_limpeza_dados(parametros: dict) -> dict:
+    dias = int(parametros.get("dias", 30))
+    if dias < 1:
+        raise ValueError("Número de dias deve ser maior que 0")
+    return {"dias": dias}
+
+@tipo_tarefa("limpeza_dados", _validar_limpeza_dados)
+def limpar_dados_antigos(contexto: ContextoTarefa) -> dict:
+    """
+    Remove registros da tabela all recebidos há mais de N dias, em blocos
+    """
+    dias = contexto.parametros["dias"]
+    data_limite = datetime.utcnow() - timedelta(days=dias)
+
+    with sessao_banco() as db:
+        contexto.definir_total(contexto.processados + AllService(db).contar_anteriores(data_limite))
+
+    contexto.repetir_em_blocos(
+        lambda db: AllService(db).limpar_bloco_antigos(data_limite, TAMANHO_BLOCO_LIMPEZA),
+        TAMANHO_BLOCO_LIMPEZA
+    )
+    return {"registros_removidos": contexto.processados, "dias": dias}
+
+
+# ==============================================================
+# LIMPEZA DOS VALORES DE UM SENSOR (DELETE /valores/{id}/limpeza)
+# ==============================================================
+
+def _validar_limpeza_valores(parametros: dict) -> dict:
+    id_sensor = int(parametros["id_sensor"])
+    manter_ultimos = int(parametros.get("manter_ultimos", 1000))
+    if manter_ultimos < 0:
+        raise ValueError("manter_ultimos não pode ser negativo")
+    return {"id_sensor": id_sensor, "manter_ultimos": manter_ultimos}
+
+@tipo_tarefa("limpeza_valores", _validar_limpeza_valores)
+def limpar_valores_antigos(contexto: ContextoTarefa) -> dict:
+    """
+    Remove os valores de um sensor, mantendo os N mais recentes, em blocos.
+    O limite (mais antigo dos mantidos) é calculado uma vez: leituras que
+    chegam durante a limpeza com horário mais novo nunca são removidas (as
+    de um backlog, com horário anterior ao limite, podem ser).
+    """
+    id_sensor = contexto.parametros["id_sensor"]
+    manter_ultimos = contexto.parametros["manter_ultimos"]
+
+    with sessao_banco() as db:
+        service = ValoresSensorService(db)
+        limite = service.limite_valores_mantidos(id_sensor, manter_ultimos)
+        restantes = service.contar_anteriores(id_sensor, limite) if limite else 0
+        contexto.definir_total(contexto.processados + restantes)
+
+    if limite:
+        contexto.repetir_em_blocos(
+            lambda db: ValoresSensorService(db).limpar_bloco_antigos(id_sensor, limite, TAMANHO_BLOCO_LIMPEZA),
+            TAMANHO_BLOCO_LIMPEZA
+        )
+    return {"valores_removidos": contexto.processados, "id_sensor": id_sensor, "mantidos": manter_ultimos}
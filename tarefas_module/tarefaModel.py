@@ -0,0 +1,65 @@
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime
+from sqlalchemy.sql import func
+from config.databaseConfig import Base
+import orjson
+
+# Estados de uma tarefa
+PENDENTE = "pendente"
+EXECUTANDO = "executando"
+CONCLUIDA = "concluida"
+FALHOU = "falhou"
+CANCELADA = "cancelada"
+
+# Estados finais (a tarefa não volta a executar)
+ESTADOS_FINAIS = (CONCLUIDA, FALHOU, CANCELADA)
+
+class Tarefa(Base):
+    """
+    Modelo da tabela tarefas no banco de dados.
+    Registra operações longas executadas em segundo plano e o seu progresso.
+    """
+    __tablename__ = "tarefas"
+
+    # Campos da tabela
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    tipo = Column(String(50), nullable=False)  # ex: "limpeza_dados", "limpeza_valores"
+    parametros = Column(Text, nullable=False, default="{}")  # JSON
+    status = Column(String(20), nullable=False, default=PENDENTE, index=True)
+    processados = Column(Integer, nullable=False, default=0)
+    total = Column(Integer, nullable=True)  # None enquanto desconhecido
+    resultado = Column(Text, nullable=True)  # JSON
+    erro = Column(Text, nullable=True)
+    cancelamento_solicitado = Column(Boolean, nullable=False, default=False)
+    criado_em = Column(DateTime, nullable=False, server_default=func.now())
+    iniciado_em = Column(DateTime, nullable=True)
+    finalizado_em = Column(DateTime, nullable=True)
+
+    def __init__(self, tipo: str, parametros: dict):
+        self.tipo = tipo
+        self.parametros = orjson.dumps(parametros).decode("utf-8")
+        self.status = PENDENTE
+        self.processados = 0
+        self.cancelamento_solicitado = False
+
+    def __repr__(self):
+        return f"<Tarefa(id={self.id}, tipo='{self.tipo}', status='{self.status}')>"
+
+    def to_dict(self):
+        """
+        Converte o objeto Tarefa em dicionário para serialização JSON.
+        """
+        return {
+            "id": self.id,
+            "tipo": self.tipo,
+            "parametros": orjson.loads(self.parametros),
+            "status": self.status,
+            "processados": self.processados,
+            "total": self.total,
+            "progresso": round(self.processados / self.total, 4) if self.total else None,
+            "resultado": orjson.loads(self.resultado) if self.resultado else None,
+            "erro": self.erro,
+            "cancelamento_solicitado": self.cancelamento_solicitado,
+            "criado_em": self.criado_em.isoformat() if self.criado_em else None,
+            "iniciado_em": self.iniciado_em.isoformat() if self.iniciado_em else None,
+            "finalizado_em": self.finalizado_em.isoformat() if self.finalizado_em else None
+        }
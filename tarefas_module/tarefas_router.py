@@ -0,0 +1,49 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from config.databaseConfig import get_database_async
+from tarefas_module.executorTarefas import executor_tarefas
+from tarefas_module.TarefaServiceAsync import TarefaServiceAsync
+from tarefas_module.TarefaController import TarefaController
+
+# Criar router para tarefas em segundo plano
+router = APIRouter(
+    prefix="/tarefas",
+    tags=["tarefas"]
+)
+
+@router.post("/")
+async def criar_tarefa(dados: dict):
+    """Envia uma tarefa: {"tipo": "limpeza_dados", "parametros": {"dias": 30}}"""
+    tipo = dados.get("tipo")
+    if not isinstance(tipo, str):
+        raise HTTPException(status_code=400, detail="Campo 'tipo' é obrigatório")
+    return await TarefaController.enviar(tipo, dados.get("parametros") or {})
+
+@router.get("/")
+async def listar_tarefas(status: Optional[str] = None, limite: int = 100, db: AsyncSession = Depends(get_database_async)):
+    """Lista as tarefas mais recentes (filtro opcional por status)"""
+    tarefas = await TarefaServiceAsync(db).listar(status, min(max(limite, 1), 1000))
+    return [TarefaController.para_dict(tarefa) for tarefa in tarefas]
+
+@router.get("/executor")
+async def estado_executor():
+    """Threads, fila e tipos de tarefa disponíveis"""
+    return executor_tarefas.estatisticas()
+
+@router.get("/{tarefa_id}")
+async def obter_tarefa(tarefa_id: int, db: AsyncSession = Depends(get_database_async)):
+    """Status e progresso de uma tarefa"""
+    tarefa = await TarefaServiceAsync(db).buscar_por_id(tarefa_id)
+    if tarefa is None:
+        raise HTTPException(status_code=404, detail="Tarefa não encontrada")
+    return TarefaController.para_dict(tarefa)
+
+@router.post("/{tarefa_id}/cancelar")
+async def cancelar_tarefa(tarefa_id: int, db: AsyncSession = Depends(get_database_async)):
+    """Cancela uma tarefa pendente ou em execução (para no fim do bloco atual)"""
+    tarefa = await TarefaServiceAsync(db).solicitar_cancelamento(tarefa_id)
+    if tarefa is None:
+        raise HTTPException(status_code=404, detail="Tarefa não encontrada")
+    executor_tarefas.cancelar(tarefa_id)
+    return TarefaController.para_dict(tarefa)
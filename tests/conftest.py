@@ -0,0 +1,53 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# O banco (./estacao_esp32.db) fica no diretório atual: os testes rodam em
+# um diretório temporário, escolhido antes de qualquer import da aplicação
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.chdir(tempfile.mkdtemp(prefix="estacao_testes_"))
+
+
+@pytest.fixture(scope="session")
+def cliente():
+    """
+    Cliente da API com a inicialização completa (tabelas, escritor único),
+    compartilhado pelos testes
+    """
+    from fastapi.testclient import TestClient
+    from app import app
+    with TestClient(app) as cliente:
+        yield cliente
+
+
+@pytest.fixture
+def criar_sensor(cliente):
+    """
+    Cria um sensor pela API e retorna o ID
+    """
+    def criar(nome: str) -> int:
+        resposta = cliente.post("/sensores/", params={"nome": nome, "tipo": "teste", "unidade": "u"})
+        assert resposta.status_code == 200, resposta.text
+        return resposta.json()["id"]
+    return criar
+
+
+@pytest.fixture
+def comandos_sql():
+    """
+    Lista os comandos executados no engine principal durante o teste
+    (uma entrada por execução no cursor, com executemany contando uma vez)
+    """
+    from sqlalchemy import event
+    from config.databaseConfig import engine
+    comandos = []
+
+    def registrar(conexao, cursor, comando, parametros, contexto, executemany):
+        comandos.append(comando)
+
+    event.listen(engine, "before_cursor_execute", registrar)
+    yield comandos
+    event.remove(engine, "before_cursor_execute", registrar)
@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta
+from config.databaseConfig import sessao_banco
+from service.AgregadosService import (AgregadosService, JANELA_REORDENACAO, avancar_ultimos, cache_ultimos,
+                                      leitura_atrasada)
+from service.ValoresSensorService import ValoresSensorService
+
+
+def _horas(id_sensor: int) -> dict:
+    with sessao_banco() as db:
+        horas = AgregadosService(db).listar(id_sensor, inicio=datetime(2026, 3, 1, 9), fim=datetime(2026, 3, 1, 13))
+    return {hora["inicio"]: {campo: hora[campo] for campo in
+                             ("quantidade", "minimo", "maximo", "ultimo_valor", "ultimo_timestamp", "atrasadas")}
+            for hora in horas}
+
+
+def test_leituras_fora_de_ordem_e_atrasadas_entram_na_hora_delas(cliente, criar_sensor):
+    id_sensor = criar_sensor("agregados_fora_de_ordem")
+    with sessao_banco() as db:
+        servico = ValoresSensorService(db)
+        # Fora de ordem dentro da janela, em um lote só
+        servico.inserir_linhas([
+            (3.0, id_sensor, "2026-03-01 10:30:00.000000", "2026-03-01 11:00:01.000000", None),
+            (1.0, id_sensor, "2026-03-01 10:05:00.000000", "2026-03-01 11:00:02.000000", None),
+            (7.0, id_sensor, "2026-03-01 11:10:00.000000", "2026-03-01 11:10:01.000000", None),
+            (5.0, id_sensor, "2026-03-01 10:50:00.000000", "2026-03-01 11:05:00.000000", None),
+        ])
+        db.commit()
+        # Backlog que chega depois da janela de reordenação da hora 10
+        servico.inserir_linhas([
+            (9.0, id_sensor, "2026-03-01 10:20:00.000000", "2026-03-01 12:00:00.000000", None),
+        ])
+        db.commit()
+
+    esperado = {
+        "2026-03-01T10:00:00": {"quantidade": 4, "minimo": 1.0, "maximo": 9.0, "ultimo_valor": 5.0,
+                                "ultimo_timestamp": "2026-03-01T10:50:00", "atrasadas": 1},
+        "2026-03-01T11:00:00": {"quantidade": 1, "minimo": 7.0, "maximo": 7.0, "ultimo_valor": 7.0,
+                                "ultimo_timestamp": "2026-03-01T11:10:00", "atrasadas": 0},
+    }
+    assert _horas(id_sensor) == esperado
+
+    # Refazer a partir das leituras chega no mesmo resultado do incremental
+    with sessao_banco() as db:
+        assert AgregadosService(db).recalcular(id_sensor) == 2
+        db.commit()
+    assert _horas(id_sensor) == esperado
+
+
+def test_leitura_atrasada_so_depois_da_janela_de_reordenacao():
+    horario = datetime(2026, 3, 1, 10, 30)
+    fechamento = datetime(2026, 3, 1, 11) + JANELA_REORDENACAO
+    assert not leitura_atrasada(horario, datetime(2026, 3, 1, 10, 59))
+    assert not leitura_atrasada(horario, fechamento)
+    assert leitura_atrasada(horario, fechamento + timedelta(microseconds=1))
+
+
+def test_avancar_ultimos_ignora_leituras_mais_antigas():
+    chave = (987654, None)
+
+    def leitura(id_valor: int, timestamp: str) -> dict:
+        return {"id_valor": id_valor, "id_sensor": 987654, "id_dispositivo": None, "timestamp": timestamp}
+
+    cache_ultimos.definir(chave, leitura(10, "2026-03-01T10:30:00"))
+    try:
+        avancar_ultimos([leitura(11, "2026-03-01T10:00:00")])
+        assert cache_ultimos.espiar(chave)["id_valor"] == 10
+        # Mesmo horário: vale a gravada por último
+        avancar_ultimos([leitura(12, "2026-03-01T10:30:00")])
+        assert cache_ultimos.espiar(chave)["id_valor"] == 12
+        avancar_ultimos([leitura(13, "2026-03-01T10:45:00")])
+        assert cache_ultimos.espiar(chave)["id_valor"] == 13
+    finally:
+        cache_ultimos.invalidar(chave)
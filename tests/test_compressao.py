@@ -0,0 +1,34 @@
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+from http_module.compressao import CompressaoMiddleware
+
+GZIP = {"Accept-Encoding": "gzip"}
+
+
+def test_recursos_com_o_mesmo_etag_nao_compartilham_o_corpo():
+    app = FastAPI()
+    app.add_middleware(CompressaoMiddleware, tamanho_minimo=10)
+
+    @app.get("/itens/{item}")
+    def obter_item(item: int):
+        return JSONResponse({"item": item, "dados": "x" * 100}, headers={"ETag": '"mesma-versao"'})
+
+    with TestClient(app) as cliente:
+        for item in (1, 2, 1):
+            resposta = cliente.get(f"/itens/{item}", headers=GZIP)
+            assert resposta.headers["content-encoding"] == "gzip"
+            assert resposta.json()["item"] == item
+
+
+def test_valores_de_sensores_com_o_mesmo_numero_de_escritas(cliente, criar_sensor):
+    ids = [criar_sensor("compressao_a"), criar_sensor("compressao_b")]
+    for id_sensor in ids:
+        resposta = cliente.post("/valores/lote", json=[{"id_sensor": id_sensor, "valor": 20.0 + i} for i in range(12)])
+        assert resposta.json()["inseridos"] == 12
+
+    respostas = [cliente.get(f"/valores/{id_sensor}", headers=GZIP) for id_sensor in ids]
+    assert respostas[0].headers["etag"] != respostas[1].headers["etag"]
+    for id_sensor, resposta in zip(ids, respostas):
+        assert resposta.headers["content-encoding"] == "gzip"
+        assert {valor["id_sensor"] for valor in resposta.json()} == {id_sensor}
@@ -0,0 +1,14 @@
+from config.databaseConfig import MAX_FORMATOS_SQL, formato_consulta
+
+
+def test_literais_e_listas_viram_o_mesmo_formato():
+    assert formato_consulta("SELECT * FROM t1 WHERE id IN (1, 2, 3) AND nome = 'a''b'") == \
+        formato_consulta("SELECT *  FROM t1\nWHERE id IN (7, 8) AND nome = 'c'") == \
+        "SELECT * FROM t1 WHERE id IN (?, ...) AND nome = ?"
+    assert formato_consulta("SELECT x FROM t WHERE a IN (?, ?, ?) LIMIT 10") == \
+        "SELECT x FROM t WHERE a IN (?, ...) LIMIT ?"
+
+
+def test_formatos_novos_continuam_separados_depois_do_limite():
+    for i in range(MAX_FORMATOS_SQL * 2):
+        assert formato_consulta(f"SELECT coluna_{i} FROM t WHERE a = {i}") == f"SELECT coluna_{i} FROM t WHERE a = ?"
@@ -0,0 +1,26 @@
+import pytest
+from config.databaseConfig import apos_commit
+from config.escritorBanco import EscritorBanco
+
+
+def test_acoes_adiadas_de_tarefa_desfeita_sao_descartadas():
+    escritor = EscritorBanco(url="sqlite:///./escritor_teste.db")
+    executadas = []
+
+    def tarefa_com_falha(sessao):
+        apos_commit(sessao, lambda: executadas.append("falha"))
+        raise ValueError("falhou depois de registrar a ação")
+
+    def tarefa_ok(sessao):
+        apos_commit(sessao, lambda: executadas.append("ok"))
+        return "gravada"
+
+    try:
+        # As duas no mesmo lote: a falha não pode publicar nada
+        falha, ok = escritor.enviar(tarefa_com_falha), escritor.enviar(tarefa_ok)
+        assert ok.result(10) == "gravada"
+        with pytest.raises(ValueError):
+            falha.result(10)
+    finally:
+        escritor.parar()
+    assert executadas == ["ok"]
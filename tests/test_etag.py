@@ -0,0 +1,43 @@
+from config.databaseConfig import sessao_banco
+from service.ValoresSensorService import ValoresSensorService
+
+
+def _etag(cliente, caminho):
+    return cliente.get(caminho).headers["etag"]
+
+
+def test_escritas_mudam_o_etag_so_do_sensor_alterado(cliente, criar_sensor):
+    alterado, outro = criar_sensor("etag_alterado"), criar_sensor("etag_outro")
+    antes = {id_sensor: _etag(cliente, f"/valores/{id_sensor}") for id_sensor in (alterado, outro)}
+
+    resposta = cliente.post("/valores/lote", json=[{"id_sensor": alterado, "valor": float(i)} for i in range(5)])
+    assert resposta.json()["inseridos"] == 5
+    depois_lote = _etag(cliente, f"/valores/{alterado}")
+    assert depois_lote != antes[alterado]
+    assert _etag(cliente, f"/valores/{outro}") == antes[outro]
+
+    # Remoção pelo ORM (evento do flush)
+    id_valor = cliente.get(f"/valores/{alterado}").json()[0]["id_valor"]
+    assert cliente.delete(f"/valores/valor/{id_valor}").status_code == 200
+    assert _etag(cliente, f"/valores/{alterado}") != depois_lote
+    assert _etag(cliente, f"/valores/{outro}") == antes[outro]
+
+
+def test_insercao_desfeita_nao_muda_o_etag(cliente, criar_sensor):
+    id_sensor = criar_sensor("etag_desfeito")
+    antes = _etag(cliente, f"/valores/{id_sensor}")
+    with sessao_banco() as db:
+        ValoresSensorService(db).inserir_linhas([(1.0, id_sensor, "2026-01-01 00:00:00.000000",
+                                                  "2026-01-01 00:00:00.000000", None)])
+        db.rollback()
+    assert _etag(cliente, f"/valores/{id_sensor}") == antes
+
+
+def test_versoes_sao_incrementadas_uma_vez_por_comando(cliente, criar_sensor, comandos_sql):
+    ids = [criar_sensor("etag_comando_a"), criar_sensor("etag_comando_b")]
+    with sessao_banco() as db:
+        ValoresSensorService(db).criar_valores_lote([{"id_sensor": ids[i % 2], "valor": float(i)} for i in range(50)])
+    assert sum("versoes_tabelas" in comando for comando in comandos_sql) == 1
+    with sessao_banco() as db:
+        gatilhos = db.connection().exec_driver_sql("SELECT name FROM sqlite_master WHERE type = 'trigger'").all()
+    assert gatilhos == []
@@ -0,0 +1,45 @@
+import gzip
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+from http_module.lote import MAX_BYTES_LOTE, ErroLote, ler_corpo_lote
+
+
+def test_corpo_maior_que_o_limite_recebe_413():
+    app = FastAPI()
+
+    @app.post("/lote")
+    async def lote(request: Request):
+        try:
+            return {"bytes": len(await ler_corpo_lote(request, max_bytes=100))}
+        except ErroLote as e:
+            raise HTTPException(status_code=e.status_code, detail=str(e))
+
+    with TestClient(app) as cliente:
+        assert cliente.post("/lote", content=b"x" * 100).json() == {"bytes": 100}
+        assert cliente.post("/lote", content=b"x" * 101).status_code == 413
+        # Sem Content-Length (chunked): o limite vale durante a leitura
+        assert cliente.post("/lote", content=iter([b"x" * 60, b"x" * 60])).status_code == 413
+
+
+def test_gzip_que_descomprime_alem_do_limite_recebe_413(cliente):
+    bomba = gzip.compress(b"\n" * (MAX_BYTES_LOTE + 1), compresslevel=9)
+    resposta = cliente.post(
+        "/data/lote", content=bomba,
+        headers={"Content-Type": "application/x-ndjson", "Content-Encoding": "gzip"}
+    )
+    assert resposta.status_code == 413
+
+
+def test_lote_de_mensagens_grava_com_um_unico_insert(cliente, comandos_sql):
+    from datetime import datetime
+    from all_module.AllService import AllService
+    from config.databaseConfig import sessao_banco
+    mensagens = [{"topic": "teste/lote", "payload": f'{{"n": {i}}}', "data_recebimento": datetime(2026, 1, 1, 0, 0, i)}
+                 for i in range(13)]
+    with sessao_banco() as db:
+        ids = AllService(db).criar_lote(mensagens)
+    assert sum(comando.startswith('INSERT INTO "all"') for comando in comandos_sql) == 1
+    with sessao_banco() as db:
+        assert [(registro.id, registro.payload, registro.data_recebimento) for registro in
+                (AllService(db).buscar_por_id(id_registro) for id_registro in ids)] == \
+            [(id_registro, m["payload"], m["data_recebimento"]) for id_registro, m in zip(ids, mensagens)]
@@ -0,0 +1,74 @@
+import pytest
+from config.databaseConfig import sessao_banco
+from processamento_module.MapeamentoService import MapeamentoService
+from processamento_module.conversao import extrair_campos
+from processamento_module.mapeamento import Regra, compilar_extrator, partes_caminho
+
+
+def test_regras_aplicam_escala_deslocamento_e_conversao():
+    extrair = compilar_extrator([
+        Regra("sensores.temperatura", "temperatura", escala=0.1, deslocamento=-40.0),
+        Regra("leituras[1].valor", "umidade"),
+        Regra("contagem", "pulsos", escala=2.0, conversao="inteiro"),
+        Regra("rele", "rele", conversao="booleano"),
+        Regra("ausente", "ausente"),
+    ])
+    campos = extrair({
+        "sensores": {"temperatura": "655"},
+        "leituras": [{"valor": 1}, {"valor": 55.5}],
+        "contagem": 7.9,
+        "rele": "Ligado",
+        "ausente": None,
+    })
+    assert campos == [
+        ("sensores.temperatura", "temperatura", pytest.approx(25.5), "655"),
+        ("leituras[1].valor", "umidade", 55.5, 55.5),
+        ("contagem", "pulsos", 14.0, 7.9),
+        ("rele", "rele", 1.0, "Ligado"),
+    ]
+
+
+def test_valores_invalidos_para_a_conversao_viram_none():
+    extrair = compilar_extrator([
+        Regra("a", "a", escala=10.0, conversao="numero"),
+        Regra("b", "b", conversao="inteiro"),
+        Regra("c", "c", conversao="booleano"),
+        Regra("d[0]", "d"),
+    ])
+    assert [campo[2] for campo in extrair({"a": "x", "b": "nan", "c": "talvez", "d": {"0": 1}})] == [None, None, None]
+    assert extrair({"a": True}) == [("a", "a", None, True)]
+
+
+def test_caminhos_e_regras_invalidas_sao_recusados():
+    assert partes_caminho("leituras[0].valor") == ("leituras", 0, "valor")
+    for caminho in ("", "a..b", "a[x]", ".a"):
+        with pytest.raises(ValueError):
+            partes_caminho(caminho)
+    with pytest.raises(ValueError):
+        MapeamentoService._validar({"topico": "t", "caminho": "a", "sensor": "s", "escala": 1.0,
+                                    "deslocamento": 0.0, "conversao": "texto", "ativa": True})
+
+
+def test_alterar_regras_pela_api_vale_no_proximo_bloco(cliente):
+    topico = "teste/mapeamento_recarga"
+
+    def extrair(payload: dict) -> list:
+        with sessao_banco() as db:
+            return MapeamentoService(db).mapeamento().extrator(topico)(payload)
+
+    # Sem regras: mapeamento padrão (e o mapeamento fica em cache)
+    assert extrair({"bruto": 100}) == extrair_campos({"bruto": 100})
+
+    resposta = cliente.post("/processamento/mapeamentos", json={
+        "topico": topico, "caminho": "bruto", "sensor": "calibrado", "escala": 0.5, "deslocamento": 1.0
+    })
+    assert resposta.status_code == 200, resposta.text
+    regra_id = resposta.json()["id"]
+    assert extrair({"bruto": 100}) == [("bruto", "calibrado", 51.0, 100)]
+
+    resposta = cliente.put(f"/processamento/mapeamentos/{regra_id}", json={"escala": 2.0, "conversao": "inteiro"})
+    assert resposta.status_code == 200, resposta.text
+    assert extrair({"bruto": 100.7}) == [("bruto", "calibrado", 201.0, 100.7)]
+
+    assert cliente.delete(f"/processamento/mapeamentos/{regra_id}").status_code == 200
+    assert extrair({"bruto": 100}) == extrair_campos({"bruto": 100})
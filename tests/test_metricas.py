@@ -0,0 +1,29 @@
+from concurrent.futures import Future
+from datetime import datetime, timedelta
+import pytest
+from metricas_module.metricas import _Metrica
+from metricas_module.instrumentacao import ingestao_atraso
+from all_module.ingestao import _medir_atraso, normalizar_mensagem
+
+
+def test_metrica_sem_amostras_nao_pode_ser_criada():
+    with pytest.raises(TypeError):
+        _Metrica("incompleta", "sem amostras")
+
+
+def _soma(*rotulos):
+    return sum(valor for nome, chave, valor in ingestao_atraso.amostras() if nome.endswith("_sum") and chave == rotulos)
+
+
+def test_atraso_da_ingestao_usa_o_horario_do_payload():
+    publicado = (datetime.utcnow() - timedelta(seconds=90)).isoformat() + "Z"
+    com_horario = normalizar_mensagem("teste/atraso", f'{{"timestamp": "{publicado}", "t": 1}}')
+    sem_horario = normalizar_mensagem("teste/atraso", {"t": 1})
+    assert com_horario["publicado_em"] is not None and sem_horario["publicado_em"] is None
+
+    antes = _soma("teste_metricas", "payload"), _soma("teste_metricas", "recebimento")
+    futuro = Future()
+    futuro.set_result([1, 2])
+    _medir_atraso(futuro, [com_horario, sem_horario], "teste_metricas")
+    assert 90 <= _soma("teste_metricas", "payload") - antes[0] < 120
+    assert 0 <= _soma("teste_metricas", "recebimento") - antes[1] < 5
@@ -0,0 +1,24 @@
+import traceback
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.pool import QueuePool
+from config.monitorConexoes import MonitorConexoes
+
+
+@pytest.mark.parametrize("amostragem, capturadas", [(0.0, 0), (1.0, 3)])
+def test_pilha_so_e_capturada_quando_amostrada(monkeypatch, amostragem, capturadas):
+    chamadas = []
+    extrair = traceback.extract_stack
+    monkeypatch.setattr(traceback, "extract_stack", lambda *a, **k: chamadas.append(1) or extrair(*a, **k))
+
+    monitor = MonitorConexoes(amostragem_pilha=amostragem)
+    engine = create_engine("sqlite://", poolclass=QueuePool, pool_logging_name=f"teste_pilha_{amostragem}")
+    monitor.instrumentar(engine)
+    for _ in range(3):
+        with engine.connect() as conexao:
+            conexao.exec_driver_sql("SELECT 1")
+            # A conexão em uso aparece com a thread, com ou sem pilha
+            [longa] = monitor.conexoes_longas(limite=-1)
+            assert longa["thread"] and longa["pilha"]
+    assert len(chamadas) == capturadas
+    assert monitor.estatisticas()["pools"][f"teste_pilha_{amostragem}"]["checkouts"] == 3
@@ -0,0 +1,36 @@
+from datetime import datetime, timedelta
+import pytest
+from config.databaseConfig import sessao_banco
+from all_module.AllService import AllService
+from processamento_module import processadorContinuo
+from processamento_module.processadorContinuo import ProcessadorContinuo
+
+
+def test_atraso_pendente_vem_do_ultimo_micro_lote_sem_consultar_o_banco(cliente, monkeypatch, comandos_sql):
+    topico = "teste/atraso"
+    recebido = datetime.utcnow() - timedelta(hours=1)
+    with sessao_banco() as db:
+        AllService(db).criar_lote([
+            {"topic": topico, "payload": f'{{"n": {i}}}', "data_recebimento": recebido + timedelta(seconds=i)}
+            for i in range(3)
+        ])
+
+    gravar_bloco = processadorContinuo.gravar_bloco
+
+    def gravar_com_falha(db, topico_bloco, *args, **kwargs):
+        if topico_bloco == topico:
+            raise RuntimeError("falha injetada na gravação")
+        return gravar_bloco(db, topico_bloco, *args, **kwargs)
+
+    processador = ProcessadorContinuo(tamanho_lote=2)
+    monkeypatch.setattr(processadorContinuo, "gravar_bloco", gravar_com_falha)
+    with pytest.raises(RuntimeError):
+        processador.processar_pendentes()
+    monkeypatch.undo()
+
+    comandos_sql.clear()
+    assert processador.atraso_pendente()[topico] >= 3600
+    assert comandos_sql == []
+
+    processador.processar_pendentes()
+    assert processador.atraso_pendente()[topico] == 0.0
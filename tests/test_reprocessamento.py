@@ -0,0 +1,61 @@
+import pytest
+from sqlalchemy import func, select
+from config.databaseConfig import sessao_banco
+from all_module.AllService import AllService
+from model.sensoresModel import Sensor, ValoresSensor
+from service.ValoresSensorService import ValoresSensorService
+from processamento_module.RejeitadoService import RejeitadoService
+from processamento_module.rejeitadoModel import ETAPA_SENSOR
+from processamento_module.reprocessamento import reprocessar_bloco
+
+
+def _rejeitados(db, ids):
+    return [r for r in RejeitadoService(db).listar(limite=1000) if r.id_registro in ids]
+
+
+def _leituras(db, id_sensor):
+    return db.scalar(select(func.count(ValoresSensor.id_valor)).where(ValoresSensor.id_sensor == id_sensor))
+
+
+def test_falha_depois_do_cadastro_automatico_desfaz_o_bloco_inteiro(cliente, criar_sensor, monkeypatch):
+    id_conhecido = criar_sensor("reproc_conhecido")
+    with sessao_banco() as db:
+        # O tópico "a" é reprocessado antes do "b", que cadastra um sensor novo
+        registros = {
+            "teste/a": AllService(db).criar("teste/a", '{"reproc_conhecido": 1.5}').id,
+            "teste/b": AllService(db).criar("teste/b", '{"reproc_novo": 2.5}').id,
+        }
+        for topico, id_registro in registros.items():
+            campo = "reproc_conhecido" if topico == "teste/a" else "reproc_novo"
+            RejeitadoService(db).registrar(topico, [(id_registro, ETAPA_SENSOR, "SensorNaoEncontrado", campo, None)])
+        db.commit()
+    ids = set(registros.values())
+
+    inserir_linhas = ValoresSensorService.inserir_linhas
+    chamadas = []
+
+    def inserir_com_falha(self, linhas):
+        chamadas.append(linhas)
+        if len(chamadas) == 2:
+            raise RuntimeError("falha injetada depois do cadastro automático")
+        return inserir_linhas(self, linhas)
+
+    monkeypatch.setattr(ValoresSensorService, "inserir_linhas", inserir_com_falha)
+    with sessao_banco() as db:
+        with pytest.raises(RuntimeError):
+            reprocessar_bloco(db, _rejeitados(db, ids), auto_cadastro=True)
+    monkeypatch.undo()
+
+    # Nada do bloco ficou gravado: nem as leituras do tópico "a", nem o sensor novo
+    with sessao_banco() as db:
+        assert _leituras(db, id_conhecido) == 0
+        assert db.scalar(select(Sensor.id).where(Sensor.nome == "reproc_novo")) is None
+        assert len(_rejeitados(db, ids)) == 2
+
+    # Reprocessar de novo resolve os dois, sem leituras duplicadas
+    with sessao_banco() as db:
+        totais = reprocessar_bloco(db, _rejeitados(db, ids), auto_cadastro=True)
+    assert totais["resolvidos"] == 2
+    with sessao_banco() as db:
+        assert _leituras(db, id_conhecido) == 1
+        assert _rejeitados(db, ids) == []
@@ -0,0 +1,39 @@
+import asyncio
+import time
+import httpx
+from fastapi import FastAPI
+from scripts import router
+from scripts.router import RotasSobDemanda
+
+
+def test_primeiras_requisicoes_aguardam_as_rotas_sem_bloquear_o_loop(monkeypatch):
+    def configurar_devagar(app):
+        time.sleep(0.3)
+
+        @app.get("/pronto")
+        async def pronto():
+            return {"ok": True}
+
+    monkeypatch.setattr(router, "configure_routes", configurar_devagar)
+    app = FastAPI()
+    app.add_middleware(RotasSobDemanda, aplicacao=app)
+
+    async def cenario():
+        batidas = 0
+
+        async def relogio():
+            nonlocal batidas
+            while True:
+                await asyncio.sleep(0.01)
+                batidas += 1
+
+        tarefa = asyncio.create_task(relogio())
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://teste") as cliente:
+            respostas = await asyncio.gather(*(cliente.get("/pronto") for _ in range(3)))
+        tarefa.cancel()
+        return respostas, batidas
+
+    respostas, batidas = asyncio.run(cenario())
+    assert [resposta.json() for resposta in respostas] == [{"ok": True}] * 3
+    # O loop continuou rodando enquanto as rotas carregavam
+    assert batidas >= 10
@@ -0,0 +1,33 @@
+from sqlalchemy import func, select
+from config.databaseConfig import sessao_banco
+from model.sensoresModel import Sensor
+from service.SensoresService import SensoresService
+
+
+def _quantidade(db, nome):
+    return db.scalar(select(func.count(Sensor.id)).where(Sensor.nome_normalizado == nome.casefold()))
+
+
+def test_garantir_nao_duplica_nomes_com_maiusculas_fora_do_ascii(cliente):
+    with sessao_banco() as db:
+        criado = SensoresService(db).garantir("PRESSÃO_GARANTIDA", "pressao", "hPa")
+        db.commit()
+    with sessao_banco() as db:
+        assert SensoresService(db).garantir("pressão_garantida", "pressao", "hPa") == criado
+        db.commit()
+        assert _quantidade(db, "pressão_garantida") == 1
+
+
+def test_garantir_encontra_sensor_criado_com_outra_caixa(cliente, criar_sensor):
+    id_sensor = criar_sensor("Iluminação_Sala")
+    with sessao_banco() as db:
+        assert SensoresService(db).garantir("ILUMINAÇÃO_SALA", "luminosidade", "lux").id == id_sensor
+        assert _quantidade(db, "iluminação_sala") == 1
+
+
+def test_nome_com_outra_caixa_fora_do_ascii_e_recusado(cliente, criar_sensor):
+    criar_sensor("Ventilação")
+    resposta = cliente.post("/sensores/", params={"nome": "VENTILAÇÃO", "tipo": "teste", "unidade": "u"})
+    assert resposta.status_code != 200
+    with sessao_banco() as db:
+        assert _quantidade(db, "ventilação") == 1
@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta
+from sqlalchemy import func, select
+from config.databaseConfig import sessao_banco
+from all_module.AllService import AllService
+from model.sensoresModel import ValoresSensor
+from processamento_module.CheckpointService import CheckpointService
+from processamento_module.rejeitadoModel import RegistroRejeitado
+from scripts.Tratar_dados import TratarDados
+
+
+def _gravar_registros(topico: str, payloads: list):
+    inicio = datetime(2026, 4, 1, 8)
+    with sessao_banco() as db:
+        AllService(db).criar_lote([
+            {"topic": topico, "payload": payload, "data_recebimento": inicio + timedelta(seconds=i)}
+            for i, payload in enumerate(payloads)
+        ])
+
+
+def _processar(**opcoes) -> TratarDados:
+    with TratarDados(auto_cadastro=False, **opcoes) as tratador:
+        tratador.processar_todos_dados()
+    return tratador
+
+
+def _contar(db, id_sensor: int, topico: str) -> tuple:
+    return (
+        db.scalar(select(func.count(ValoresSensor.id_valor)).where(ValoresSensor.id_sensor == id_sensor)),
+        db.scalar(select(func.count()).select_from(RegistroRejeitado).where(RegistroRejeitado.topico == topico)),
+    )
+
+
+def test_repetir_o_processamento_nao_insere_nada(cliente, criar_sensor):
+    id_sensor = criar_sensor("tratar_repetido")
+    topico = "teste/tratar_repetido"
+    _gravar_registros(topico, [
+        *(f'{{"tratar_repetido": {i}}}' for i in range(20)),
+        "não é json",
+        '{"tratar_repetido_sem_cadastro": 1}',
+    ])
+
+    primeira = _processar(tamanho_bloco=7)
+    with sessao_banco() as db:
+        contagem = _contar(db, id_sensor, topico)
+    assert contagem == (20, 2)
+    assert primeira.leituras >= 20
+
+    segunda = _processar(tamanho_bloco=7)
+    assert (segunda.registros, segunda.leituras, segunda.invalidos) == (0, 0, 0)
+    with sessao_banco() as db:
+        assert _contar(db, id_sensor, topico) == contagem
+
+    # Só os registros novos depois do checkpoint são lidos
+    _gravar_registros(topico, ['{"tratar_repetido": 99}'])
+    terceira = _processar(tamanho_bloco=7)
+    assert (terceira.registros, terceira.leituras) == (1, 1)
+    with sessao_banco() as db:
+        assert _contar(db, id_sensor, topico) == (21, 2)
+
+
+def _leituras_apos(db, id_valor: int) -> list:
+    return [tuple(linha) for linha in db.execute(
+        select(ValoresSensor.id_sensor, ValoresSensor.valor, ValoresSensor.timestamp, ValoresSensor.recebido_em,
+               ValoresSensor.id_dispositivo)
+        .where(ValoresSensor.id_valor > id_valor)
+        .order_by(ValoresSensor.id_valor)
+    )]
+
+
+def test_workers_1_e_n_gravam_as_mesmas_leituras(cliente, criar_sensor):
+    id_sensor = criar_sensor("tratar_workers")
+    topico, outro = "teste/tratar_workers", "teste/tratar_workers_outro"
+    # Tópicos intercalados: as faixas de IDs de cada processo ficam com buracos
+    for i in range(40):
+        _gravar_registros(topico, [
+            f'{{"tratar_workers": {i * 1.5}, "timestamp": "2026-04-01T07:{i:02d}:00", "device_id": "esp{i % 3}"}}'
+            if i % 9 else "inválido"
+        ])
+        _gravar_registros(outro, [f'{{"tratar_workers": {-i}}}'])
+    # Só o tópico comparado é reprocessado a cada rodada
+    _processar()
+
+    resultados = []
+    for workers in (1, 3):
+        with sessao_banco() as db:
+            CheckpointService(db).reiniciar(topico)
+            ultimo = db.scalar(select(func.coalesce(func.max(ValoresSensor.id_valor), 0)))
+        tratador = _processar(tamanho_bloco=5, workers=workers)
+        with sessao_banco() as db:
+            leituras = _leituras_apos(db, ultimo)
+        resultados.append((leituras, tratador.invalidos, dict(tratador.problemas)))
+
+    sequencial, paralelo = resultados
+    assert len(sequencial[0]) == 35 and {leitura[0] for leitura in sequencial[0]} == {id_sensor}
+    assert len({leitura[4] for leitura in sequencial[0]}) == 3
+    assert paralelo == sequencial
@@ -0,0 +1,58 @@
+import asyncio
+import orjson
+from sqlalchemy import select
+from config.databaseConfig import sessao_banco
+from model.sensoresModel import ValoresSensor
+from service.ValoresSensorService import ValoresSensorService
+from stream_module.barramento import barramento
+
+
+def test_inserir_linhas_publica_as_leituras_so_depois_do_commit(cliente, criar_sensor):
+    id_sensor = criar_sensor("massa_publicada")
+
+    async def cenario():
+        assinatura = barramento.assinar({id_sensor})
+        try:
+            with sessao_banco() as db:
+                ValoresSensorService(db).inserir_linhas([(1.0, id_sensor, "2026-01-01 00:00:00.000000",
+                                                          "2026-01-01 00:00:00.000000", None)])
+                db.rollback()
+                ValoresSensorService(db).inserir_linhas([
+                    (2.0, id_sensor, "2026-01-01 10:00:00.000000", "2026-01-01 10:00:05.000000", None),
+                    (3.0, id_sensor, "2026-01-01 10:01:00.000000", "2026-01-01 10:01:05.000000", None),
+                ])
+                await asyncio.sleep(0)
+                assert assinatura.fila.empty()
+                db.commit()
+            eventos = [await assinatura.proximo(timeout=1) for _ in range(2)]
+            assert await assinatura.proximo(timeout=0.1) is None
+            return eventos
+        finally:
+            barramento.cancelar(assinatura)
+
+    eventos = asyncio.run(cenario())
+    with sessao_banco() as db:
+        gravados = [valor.to_dict() for valor in db.scalars(
+            select(ValoresSensor).where(ValoresSensor.id_sensor == id_sensor).order_by(ValoresSensor.id_valor)
+        )]
+    publicados = [orjson.loads(evento.json) for evento in eventos]
+    assert [evento["tipo"] for evento in publicados] == ["leitura", "leitura"]
+    assert [evento["dados"] for evento in publicados] == [{**gravado, "atrasada": False} for gravado in gravados]
+
+
+def test_lote_de_valores_grava_com_um_unico_insert(cliente, criar_sensor, comandos_sql):
+    id_sensor = criar_sensor("lote_um_insert")
+    itens = [{"id_sensor": id_sensor, "valor": float(i)} for i in range(50)]
+    itens.insert(10, {"id_sensor": id_sensor, "valor": "x"})
+    with sessao_banco() as db:
+        resultados = ValoresSensorService(db).criar_valores_lote(itens)
+    assert sum(comando.startswith("INSERT INTO valores_sensor") for comando in comandos_sql) == 1
+
+    assert resultados[10]["status"] == "erro"
+    ids = [resultado["id_valor"] for resultado in resultados if resultado["status"] == "ok"]
+    with sessao_banco() as db:
+        gravados = db.execute(
+            select(ValoresSensor.id_valor, ValoresSensor.valor).where(ValoresSensor.id_sensor == id_sensor)
+            .order_by(ValoresSensor.id_valor)
+        ).all()
+    assert [tuple(linha) for linha in gravados] == list(zip(ids, (float(i) for i in range(50))))